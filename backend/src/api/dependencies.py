@@ -0,0 +1,30 @@
+"""FastAPI dependencies resolving the application-wide resource graph."""
+
+from typing import Callable, Optional
+from fastapi import Header
+from fastapi.requests import HTTPConnection
+from ..application.services import OptimizationService
+from ..domain.deadline import Deadline
+from ..infrastructure.config import settings
+
+
+def get_optimization_service(connection: HTTPConnection) -> OptimizationService:
+    """Return the process-wide optimization service singleton (for HTTP and WebSocket routes)."""
+    return connection.app.container.optimization_service()
+
+
+def endpoint_deadline(endpoint: str) -> Callable[..., Deadline]:
+    """Dependency building the request deadline for ``endpoint``.
+
+    Clients send their own remaining budget as ``X-Request-Timeout-Ms``; otherwise the
+    endpoint default (``deadline_<endpoint>_ms``) applies. Both are capped by ``deadline_max_ms``.
+    """
+    def dependency(
+        x_request_timeout_ms: Optional[int] = Header(
+            None, gt=0, description="Milliseconds the caller will wait for this request"
+        )
+    ) -> Deadline:
+        timeout_ms = x_request_timeout_ms or getattr(settings, f"deadline_{endpoint}_ms")
+        return Deadline.after(min(timeout_ms, settings.deadline_max_ms) / 1000)
+
+    return dependency
@@ -0,0 +1,72 @@
+"""Cancel upstream LLM work when the HTTP client goes away or the request deadline passes."""
+
+import asyncio
+import contextvars
+import logging
+from typing import Awaitable, Optional, TypeVar
+from fastapi import Request
+from ..domain.deadline import Deadline, deadline_var
+from ..domain.exceptions import DeadlineExceededException
+from ..infrastructure.config import settings
+from ..infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Non-standard status (nginx convention) for requests the client abandoned
+CLIENT_CLOSED_REQUEST = 499
+
+cancelled_requests = metrics.counter(
+    "prompt_optimizer_cancelled_requests_total",
+    "Requests whose upstream LLM generation was cancelled because the client disconnected"
+)
+deadline_exceeded_requests = metrics.counter(
+    "prompt_optimizer_deadline_exceeded_total",
+    "Requests abandoned because their deadline passed"
+)
+
+
+class ClientDisconnected(Exception):
+    """The client closed the connection before the response was ready."""
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    work: Awaitable[T],
+    endpoint: str,
+    deadline: Optional[Deadline] = None
+) -> T:
+    """Await ``work`` while polling for client disconnect; cancel it if the client leaves.
+
+    With a ``deadline``, the work runs with it as the current request deadline (so every
+    stage below can size its timeouts) and is cancelled once it passes. Cancelling the
+    task unwinds the LLM client call, which closes the backend HTTP stream so LM Studio
+    stops generating tokens nobody will read.
+    """
+    context = contextvars.copy_context()
+    context.run(deadline_var.set, deadline)
+    task = asyncio.get_running_loop().create_task(work, context=context)
+    interval = settings.disconnect_poll_interval_ms / 1000
+    try:
+        while True:
+            timeout = interval if deadline is None else max(0.0, min(interval, deadline.remaining()))
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if done:
+                if not task.cancelled() and isinstance(task.exception(), DeadlineExceededException):
+                    deadline_exceeded_requests.inc(endpoint=endpoint)
+                return task.result()
+            if deadline is not None and deadline.expired:
+                deadline_exceeded_requests.inc(endpoint=endpoint)
+                raise DeadlineExceededException(f"Request deadline exceeded for {endpoint}")
+            if await request.is_disconnected():
+                break
+    finally:
+        if not task.done():
+            # Client left, deadline passed, or this handler itself was cancelled by the server
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    cancelled_requests.inc(endpoint=endpoint)
+    logger.info(f"Client disconnected, cancelled upstream generation for {endpoint}")
+    raise ClientDisconnected()
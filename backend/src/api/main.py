@@ -1,16 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from .routes import optimization_router, health_router
+from .routes import optimization_router, health_router, metrics_router, history_router, think_session_router
 from ..infrastructure.config import settings
 from ..infrastructure.di import Container
 from ..domain.registries import VendorRegistry
+from ..infrastructure.recording import TrafficRecorderMiddleware
+from ..infrastructure.logs import RequestIdMiddleware, configure_logging
 import logging
 
-# Configure logging
-logging.basicConfig(
+# Configure logging: records are queued and written by a background thread
+configure_logging(
     level=settings.log_level,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    json_output=settings.log_format == "json",
+    sample_rates=settings.log_sample_rates_map,
+    redact_fields=settings.log_redact_fields_list,
+    max_field_chars=settings.log_max_field_chars
 )
 logger = logging.getLogger(__name__)
 
@@ -19,13 +25,37 @@ container = Container()
 Container.initialize_vendor_registry()
 logger.info(f"Vendor registry initialized with {VendorRegistry.count()} adapters")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the shared resource graph once at startup and release it at shutdown."""
+    app.container.optimization_service()
+    await app.container.llm_client().warm_up()
+    logger.info("Application resources initialized")
+    try:
+        yield
+    finally:
+        await app.container.llm_client().close()
+        result_cache = app.container.result_cache()
+        if result_cache is not None:
+            await result_cache.close()
+        history_repository = app.container.history_repository()
+        if history_repository is not None:
+            await history_repository.close()
+        traffic_log = app.container.traffic_log()
+        if traffic_log is not None:
+            traffic_log.close()
+        logger.info("Application resources released")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Local LLM Prompt Optimizer",
     description="Optimize prompts for different LLM vendors using local LM Studio",
     version="1.1.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 # Attach container to app for testing
@@ -40,9 +70,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Capture API traffic for replay when LLM recording is enabled
+traffic_log = container.traffic_log()
+if traffic_log is not None:
+    app.add_middleware(TrafficRecorderMiddleware, traffic_log=traffic_log)
+    logger.info(f"Recording API and LLM traffic to {traffic_log.path}")
+
+# Outermost middleware: request id correlation and access log
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(optimization_router)
+app.include_router(history_router)
+app.include_router(think_session_router)
 
 
 @app.get("/")
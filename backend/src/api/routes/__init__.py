@@ -1,4 +1,7 @@
 from .optimization import router as optimization_router
 from .health import router as health_router
+from .metrics import router as metrics_router
+from .history import router as history_router
+from .think_session import router as think_session_router
 
-__all__ = ["optimization_router", "health_router"]
+__all__ = ["optimization_router", "health_router", "metrics_router", "history_router", "think_session_router"]
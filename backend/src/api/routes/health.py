@@ -1,18 +1,11 @@
 from fastapi import APIRouter, Depends
 from ...application.services import OptimizationService
-from ...infrastructure.di import Container
 from ...domain.registries import VendorRegistry
+from ..dependencies import get_optimization_service
 from ..schemas import HealthResponse
 
 router = APIRouter(tags=["health"])
 
-container = Container()
-
-
-def get_optimization_service() -> OptimizationService:
-    """Dependency injection for optimization service."""
-    return container.optimization_service()
-
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check(
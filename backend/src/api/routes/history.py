@@ -0,0 +1,117 @@
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from ...application.services import OptimizationService
+from ...domain.models import VendorType, HistoryQuery
+from ...domain.exceptions import HistoryDisabledException, HistoryEntryNotFoundException
+from ..dependencies import get_optimization_service
+from ...infrastructure.history import MEDIA_TYPES, check_format, export_entries, export_filename
+from ..schemas import OptimizeResponse, HistoryEntryResponse, HistoryPageResponse
+
+router = APIRouter(prefix="/api/history", tags=["history"])
+
+
+@router.get("", response_model=HistoryPageResponse)
+async def search_history(
+    q: Optional[str] = Query(None, max_length=500, description="Words that must all appear in the prompts"),
+    vendor: Optional[VendorType] = None,
+    since: Optional[datetime] = Query(None, description="Only entries created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only entries created before this time"),
+    cursor: Optional[int] = Query(None, gt=0, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    service: OptimizationService = Depends(get_optimization_service)
+):
+    """
+    Search past optimizations, newest first.
+
+    Full-text search covers the original and optimized prompts. Follow ``next_cursor``
+    for further pages; it is null on the last page.
+    """
+    try:
+        page = await service.search_history(HistoryQuery(
+            text=q, vendor=vendor, since=since, until=until, cursor=cursor, limit=limit
+        ))
+        return HistoryPageResponse(
+            entries=[HistoryEntryResponse(**asdict(entry)) for entry in page.entries],
+            next_cursor=page.next_cursor
+        )
+
+    except HistoryDisabledException as e:
+        raise HTTPException(status_code=404, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"History search failed: {str(e)}")
+
+
+@router.get("/export")
+async def export_history(
+    format: str = Query("jsonl", pattern="^(csv|jsonl|parquet)$"),
+    gzip: bool = Query(False, description="gzip CSV/JSONL output; gzip column chunks for Parquet"),
+    q: Optional[str] = Query(None, max_length=500, description="Words that must all appear in the prompts"),
+    vendor: Optional[VendorType] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    service: OptimizationService = Depends(get_optimization_service)
+):
+    """
+    Export every matching optimization, oldest first, as CSV, JSONL or Parquet.
+
+    Rows are streamed from a server-side cursor, so exports of any size run in constant memory.
+    """
+    try:
+        check_format(format)
+        entries = service.export_history(HistoryQuery(text=q, vendor=vendor, since=since, until=until))
+    except HistoryDisabledException as e:
+        raise HTTPException(status_code=404, detail=e.message)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = "application/gzip" if gzip and format != "parquet" else MEDIA_TYPES[format]
+    return StreamingResponse(
+        export_entries(entries, format, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(format, gzip)}"'}
+    )
+
+
+@router.get("/{entry_id}", response_model=HistoryEntryResponse)
+async def get_history_entry(
+    entry_id: int,
+    service: OptimizationService = Depends(get_optimization_service)
+):
+    """Get one stored optimization."""
+    try:
+        entry = await service.get_history_entry(entry_id)
+        return HistoryEntryResponse(**asdict(entry))
+
+    except (HistoryDisabledException, HistoryEntryNotFoundException) as e:
+        raise HTTPException(status_code=404, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"History lookup failed: {str(e)}")
+
+
+@router.post("/{entry_id}/reuse", response_model=OptimizeResponse)
+async def reuse_optimization(
+    entry_id: int,
+    service: OptimizationService = Depends(get_optimization_service)
+):
+    """
+    Return a stored optimization in the ``/api/optimize`` response format.
+
+    No LLM call is made; the result is marked with ``metadata.reused``.
+    """
+    try:
+        result = await service.reuse_optimization(entry_id)
+        return OptimizeResponse(
+            original=result.original,
+            optimized=result.optimized,
+            vendor=result.vendor,
+            enhancement_notes=result.enhancement_notes,
+            metadata=result.metadata
+        )
+
+    except (HistoryDisabledException, HistoryEntryNotFoundException) as e:
+        raise HTTPException(status_code=404, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reuse failed: {str(e)}")
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ...infrastructure.metrics import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Process metrics in the Prometheus text exposition format.
+
+    Each uvicorn worker keeps its own counters; scrape every worker or run one per container.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
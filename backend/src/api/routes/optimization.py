@@ -1,32 +1,41 @@
-from fastapi import APIRouter, HTTPException, Depends
+from dataclasses import asdict
+from fastapi import APIRouter, HTTPException, Depends, Request
 from ...application.services import OptimizationService
-from ...domain.models import OptimizationRequest as DomainOptimizationRequest
+from ...domain.models import OptimizationRequest as DomainOptimizationRequest, OptimizedPrompt, RefinementRequest
 from ...domain.exceptions import (
+    ContextWindowExceededException,
+    HistoryDisabledException,
+    HistoryEntryNotFoundException,
     VendorNotSupportedException,
     OptimizationFailedException,
-    QuestionGenerationFailedException
+    QuestionGenerationFailedException,
+    DeadlineExceededException
 )
+from ...domain.deadline import Deadline
+from ..dependencies import get_optimization_service, endpoint_deadline
+from ..disconnect import cancel_on_disconnect, ClientDisconnected, CLIENT_CLOSED_REQUEST
 from ..schemas import (
     OptimizeRequest,
     OptimizeResponse,
     GenerateQuestionsRequest,
     GenerateQuestionsResponse,
-    OptimizeWithAnswersRequest
+    OptimizeWithAnswersRequest,
+    ScoreRequest,
+    ScoreResponse,
+    PromptScoreResponse,
+    EstimateResponse,
+    RefineRequest
 )
 
 router = APIRouter(prefix="/api", tags=["optimization"])
 
 
-def get_optimization_service() -> OptimizationService:
-    """Dependency injection for optimization service."""
-    from ..main import container
-    return container.optimization_service()
-
-
 @router.post("/optimize", response_model=OptimizeResponse)
 async def optimize_prompt(
+    http_request: Request,
     request: OptimizeRequest,
-    service: OptimizationService = Depends(get_optimization_service)
+    service: OptimizationService = Depends(get_optimization_service),
+    deadline: Deadline = Depends(endpoint_deadline("optimize"))
 ):
     """
     Optimize a prompt for a specific LLM vendor.
@@ -40,11 +49,14 @@ async def optimize_prompt(
             original_prompt=request.prompt,
             target_vendor=request.vendor,
             context=request.context,
-            max_length=request.max_length
+            max_length=request.max_length,
+            best_of=request.best_of
         )
 
         # Optimize the prompt
-        result = await service.optimize_prompt(domain_request)
+        result = await cancel_on_disconnect(
+            http_request, service.optimize_prompt(domain_request), "optimize", deadline
+        )
 
         # Convert domain model to API response
         return OptimizeResponse(
@@ -55,6 +67,12 @@ async def optimize_prompt(
             metadata=result.metadata
         )
 
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    except DeadlineExceededException as e:
+        raise HTTPException(status_code=504, detail=e.message)
+    except ContextWindowExceededException as e:
+        raise HTTPException(status_code=413, detail=e.message)
     except VendorNotSupportedException as e:
         raise HTTPException(status_code=400, detail=e.message)
     except OptimizationFailedException as e:
@@ -65,10 +83,132 @@ async def optimize_prompt(
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
 
+@router.post("/refine", response_model=OptimizeResponse)
+async def refine_optimization(
+    http_request: Request,
+    request: RefineRequest,
+    service: OptimizationService = Depends(get_optimization_service),
+    deadline: Deadline = Depends(endpoint_deadline("refine"))
+):
+    """
+    Revise an earlier optimization after the prompt was edited or feedback given.
+
+    Pass the earlier result as ``history_id`` or ``previous``, plus the edited ``prompt``
+    and/or ``feedback``. Only the change is sent to the LLM, which answers with targeted
+    edits to the earlier optimized prompt; the result is stored in history linked to its parent.
+    """
+    try:
+        previous = None
+        if request.previous is not None:
+            previous = OptimizedPrompt(
+                original=request.previous.original,
+                optimized=request.previous.optimized,
+                vendor=request.previous.vendor,
+                enhancement_notes="",
+                metadata={"history_id": request.previous.history_id}
+            )
+        domain_request = RefinementRequest(
+            edited_prompt=request.prompt,
+            feedback=request.feedback,
+            parent_id=request.history_id,
+            previous=previous
+        )
+
+        result = await cancel_on_disconnect(
+            http_request, service.refine_optimization(domain_request), "refine", deadline
+        )
+
+        return OptimizeResponse(
+            original=result.original,
+            optimized=result.optimized,
+            vendor=result.vendor,
+            enhancement_notes=result.enhancement_notes,
+            metadata=result.metadata
+        )
+
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    except DeadlineExceededException as e:
+        raise HTTPException(status_code=504, detail=e.message)
+    except ContextWindowExceededException as e:
+        raise HTTPException(status_code=413, detail=e.message)
+    except (HistoryDisabledException, HistoryEntryNotFoundException) as e:
+        raise HTTPException(status_code=404, detail=e.message)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Refinement failed: {str(e)}")
+
+
+@router.post("/score", response_model=ScoreResponse)
+async def score_prompts(
+    request: ScoreRequest,
+    service: OptimizationService = Depends(get_optimization_service)
+):
+    """
+    Score prompts for a vendor with the local heuristic scorer.
+
+    Returns clarity, specificity, structure, vendor compliance and overall scores (0-1)
+    for each prompt without calling the LLM.
+    """
+    try:
+        scores = service.score_prompts(request.prompts, request.vendor)
+        return ScoreResponse(
+            vendor=request.vendor,
+            scores=[PromptScoreResponse(**asdict(score)) for score in scores]
+        )
+
+    except VendorNotSupportedException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
+
+
+@router.post("/estimate", response_model=EstimateResponse)
+async def estimate_optimization(
+    request: OptimizeRequest,
+    service: OptimizationService = Depends(get_optimization_service)
+):
+    """
+    Estimate what ``/api/optimize`` would cost for the same request body, without calling the LLM.
+
+    Counts the exact prompt that would be sent with the local tokenizer and predicts output
+    tokens and latency from recently observed completions.
+    """
+    try:
+        estimate = service.estimate_optimization(DomainOptimizationRequest(
+            original_prompt=request.prompt,
+            target_vendor=request.vendor,
+            context=request.context,
+            max_length=request.max_length,
+            best_of=request.best_of
+        ))
+        return EstimateResponse(
+            vendor=request.vendor,
+            input_tokens=estimate.input_tokens,
+            predicted_output_tokens=estimate.predicted_output_tokens,
+            total_output_tokens=estimate.total_output_tokens,
+            estimated_latency_ms=estimate.estimated_latency_ms,
+            context_window=estimate.context_window,
+            fits_context=estimate.fits_context,
+            tokenizer=estimate.tokenizer,
+            exact=estimate.exact
+        )
+
+    except VendorNotSupportedException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Estimation failed: {str(e)}")
+
+
 @router.post("/think/generate-questions", response_model=GenerateQuestionsResponse)
 async def generate_questions(
+    http_request: Request,
     request: GenerateQuestionsRequest,
-    service: OptimizationService = Depends(get_optimization_service)
+    service: OptimizationService = Depends(get_optimization_service),
+    deadline: Deadline = Depends(endpoint_deadline("generate_questions"))
 ):
     """
     Generate clarifying questions for Think Mode.
@@ -77,10 +217,15 @@ async def generate_questions(
     the user's intent and create the perfect optimized prompt.
     """
     try:
-        questions = await service.generate_questions(
-            prompt=request.prompt,
-            vendor=request.vendor,
-            num_questions=request.num_questions
+        questions = await cancel_on_disconnect(
+            http_request,
+            service.generate_questions(
+                prompt=request.prompt,
+                vendor=request.vendor,
+                num_questions=request.num_questions
+            ),
+            "generate_questions",
+            deadline
         )
 
         return GenerateQuestionsResponse(
@@ -88,6 +233,12 @@ async def generate_questions(
             total=len(questions)
         )
 
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    except DeadlineExceededException as e:
+        raise HTTPException(status_code=504, detail=e.message)
+    except ContextWindowExceededException as e:
+        raise HTTPException(status_code=413, detail=e.message)
     except QuestionGenerationFailedException as e:
         raise HTTPException(status_code=500, detail=e.message)
     except ValueError as e:
@@ -98,8 +249,10 @@ async def generate_questions(
 
 @router.post("/think/optimize-with-answers", response_model=OptimizeResponse)
 async def optimize_with_answers(
+    http_request: Request,
     request: OptimizeWithAnswersRequest,
-    service: OptimizationService = Depends(get_optimization_service)
+    service: OptimizationService = Depends(get_optimization_service),
+    deadline: Deadline = Depends(endpoint_deadline("optimize_with_answers"))
 ):
     """
     Optimize a prompt using user's answers to clarifying questions (Think Mode).
@@ -113,12 +266,19 @@ async def optimize_with_answers(
             raise ValueError("Number of questions and answers must match")
 
         # Optimize with answers
-        result = await service.optimize_with_answers(
-            prompt=request.prompt,
-            vendor=request.vendor,
-            questions=request.questions,
-            answers=request.answers,
-            context=request.context
+        result = await cancel_on_disconnect(
+            http_request,
+            service.optimize_with_answers(
+                prompt=request.prompt,
+                vendor=request.vendor,
+                questions=request.questions,
+                answers=request.answers,
+                context=request.context,
+                asked=request.asked,
+                num_questions=request.num_questions
+            ),
+            "optimize_with_answers",
+            deadline
         )
 
         # Convert domain model to API response
@@ -130,6 +290,12 @@ async def optimize_with_answers(
             metadata=result.metadata
         )
 
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    except DeadlineExceededException as e:
+        raise HTTPException(status_code=504, detail=e.message)
+    except ContextWindowExceededException as e:
+        raise HTTPException(status_code=413, detail=e.message)
     except VendorNotSupportedException as e:
         raise HTTPException(status_code=400, detail=e.message)
     except OptimizationFailedException as e:
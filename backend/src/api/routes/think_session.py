@@ -0,0 +1,248 @@
+"""Think Mode over a single WebSocket: questions, answers and the optimized prompt on one connection.
+
+Protocol (JSON text frames):
+
+client -> server
+    {"type": "start", "prompt": ..., "vendor": ..., "num_questions": 5-25, "context": ...}
+    {"type": "answer", "index": 0, "answer": ...}   any order, may revise an earlier answer
+    {"type": "finish"}                              optimize with the answers given so far
+
+server -> client
+    {"type": "question", "index": 0, "text": ...}   pushed as soon as each question is parsed
+    {"type": "questions_done", "total": 5}
+    {"type": "token", "text": ...}                  chunks of the optimized prompt
+    {"type": "result", ...}                         same fields as POST /api/optimize
+    {"type": "error", "detail": ...}                followed by a close
+
+Binary frames are not accepted and close the session with 1003.
+The session optimizes once every question is answered (or on ``finish``) and then closes.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import suppress
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from ...application.services import OptimizationService
+from ...domain.deadline import Deadline, deadline_var
+from ...domain.exceptions import (
+    ContextWindowExceededException,
+    DeadlineExceededException,
+    QuestionGenerationFailedException,
+    VendorNotSupportedException
+)
+from ...domain.models import OptimizedPrompt
+from ...infrastructure.config import settings
+from ..dependencies import get_optimization_service
+from ..disconnect import ClientDisconnected, cancelled_requests, deadline_exceeded_requests
+from ..schemas import OptimizeResponse, ThinkSessionStart, ThinkSessionAnswer
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/think", tags=["optimization"])
+
+T = TypeVar("T")
+
+ENDPOINT = "think_ws"
+# Application close code (4000-4999 range) mirroring HTTP 408
+IDLE_TIMEOUT_CLOSE = 4408
+
+
+class SessionIdle(Exception):
+    """The client sent nothing within the idle timeout."""
+
+
+class UnsupportedFrame(Exception):
+    """The client sent a frame other than a text frame."""
+
+
+class ThinkSession:
+    """Server-side state of one Think Mode connection."""
+
+    def __init__(self, websocket: WebSocket, service: OptimizationService):
+        self.websocket = websocket
+        self.service = service
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.questions: List[str] = []
+        self.answers: Dict[int, str] = {}
+        # LLM work (question generation or optimization) currently running for this session
+        self.stage: Optional[asyncio.Task] = None
+        self.cancelled = False
+
+    async def run(self) -> OptimizedPrompt:
+        reader = asyncio.create_task(self._read())
+        try:
+            return await self._converse()
+        finally:
+            reader.cancel()
+            if self.stage is not None and not self.stage.done():
+                self.stage.cancel()
+                await asyncio.gather(self.stage, return_exceptions=True)
+                self.cancelled = True
+
+    async def _converse(self) -> OptimizedPrompt:
+        start = ThinkSessionStart.model_validate(await self._next())
+        self.stage = self._start_stage(self._push_questions(start), "generate_questions")
+
+        while True:
+            if self.stage.done():
+                self.stage.result()
+                if len(self.answers) >= len(self.questions):
+                    break
+            message = await self._next(self.stage)
+            if message is None:
+                continue
+            if message.get("type") == "finish":
+                if not self.stage.done():
+                    # The client has enough questions; stop generating the rest
+                    self.stage.cancel()
+                    await asyncio.gather(self.stage, return_exceptions=True)
+                break
+            answer = ThinkSessionAnswer.model_validate(message)
+            if answer.index >= len(self.questions):
+                raise ValueError(f"No question with index {answer.index} has been sent")
+            self.answers[answer.index] = answer.answer
+
+        if not self.answers:
+            raise ValueError("At least one answer is required")
+        indexes = sorted(self.answers)
+        self.stage = self._start_stage(
+            self.service.stream_optimize_with_answers(
+                prompt=start.prompt,
+                vendor=start.vendor,
+                questions=[self.questions[i] for i in indexes],
+                answers=[self.answers[i] for i in indexes],
+                on_token=lambda text: self.websocket.send_json({"type": "token", "text": text}),
+                context=start.context,
+                asked=self.questions,
+                num_questions=start.num_questions
+            ),
+            "optimize_with_answers"
+        )
+        while not self.stage.done():
+            # Only a disconnect matters here; other messages are ignored
+            await self._next(self.stage)
+        return self.stage.result()
+
+    async def _push_questions(self, start: ThinkSessionStart) -> None:
+        async for question in self.service.stream_questions(start.prompt, start.vendor, start.num_questions):
+            await self.websocket.send_json({"type": "question", "index": len(self.questions), "text": question})
+            self.questions.append(question)
+        if not self.questions:
+            raise QuestionGenerationFailedException("No clarifying questions could be generated")
+        await self.websocket.send_json({"type": "questions_done", "total": len(self.questions)})
+
+    def _start_stage(self, work: Awaitable[T], endpoint: str) -> "asyncio.Task[T]":
+        """Run one LLM stage as a task under the endpoint's usual deadline."""
+        deadline = Deadline.after(min(getattr(settings, f"deadline_{endpoint}_ms"), settings.deadline_max_ms) / 1000)
+
+        async def bounded() -> T:
+            # Tasks copy the context, so the deadline only applies to this stage
+            deadline_var.set(deadline)
+            try:
+                return await asyncio.wait_for(work, deadline.remaining())
+            except (asyncio.TimeoutError, DeadlineExceededException):
+                deadline_exceeded_requests.inc(endpoint=ENDPOINT)
+                raise DeadlineExceededException(f"Request deadline exceeded for {endpoint}")
+
+        return asyncio.create_task(bounded())
+
+    async def _read(self) -> None:
+        """Move client frames into the inbox; ``None`` marks the disconnect, an exception a failed read."""
+        try:
+            while True:
+                frame = await self.websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    self.inbox.put_nowait(None)
+                    return
+                if frame.get("text") is None:
+                    raise UnsupportedFrame("Only JSON text frames are accepted")
+                self.inbox.put_nowait(frame["text"])
+        except WebSocketDisconnect:
+            self.inbox.put_nowait(None)
+        except Exception as e:
+            # Ends the session now rather than at the idle timeout
+            self.inbox.put_nowait(e)
+
+    async def _next(self, work: Optional[asyncio.Task] = None) -> Optional[Dict[str, Any]]:
+        """Wait for the next client message, or return ``None`` once ``work`` finishes.
+
+        The idle timeout only runs while nothing is being generated for the client.
+        """
+        getter = asyncio.ensure_future(self.inbox.get())
+        working = work is not None and not work.done()
+        try:
+            await asyncio.wait(
+                {getter, work} if working else {getter},
+                timeout=None if working else settings.think_ws_idle_timeout_seconds,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            received = getter.done()
+            if not received:
+                getter.cancel()
+        if not received:
+            if not working:
+                raise SessionIdle()
+            return None
+
+        text = getter.result()
+        if text is None:
+            raise ClientDisconnected()
+        if isinstance(text, Exception):
+            raise text
+        message = json.loads(text)
+        if not isinstance(message, dict):
+            raise ValueError("Messages must be JSON objects")
+        return message
+
+
+def _close_reason(error: Exception) -> Tuple[int, str]:
+    """WebSocket close code and error detail for a failed session."""
+    if isinstance(error, SessionIdle):
+        return IDLE_TIMEOUT_CLOSE, "Session idle timeout"
+    if isinstance(error, UnsupportedFrame):
+        return status.WS_1003_UNSUPPORTED_DATA, str(error)
+    if isinstance(error, (VendorNotSupportedException, ContextWindowExceededException)):
+        return status.WS_1008_POLICY_VIOLATION, error.message
+    if isinstance(error, ValueError):
+        # Malformed JSON, schema violations and out-of-order answers
+        return status.WS_1008_POLICY_VIOLATION, str(error)
+    if isinstance(error, (DeadlineExceededException, QuestionGenerationFailedException)):
+        return status.WS_1011_INTERNAL_ERROR, error.message
+    logger.error("Think Mode session failed", exc_info=error)
+    return status.WS_1011_INTERNAL_ERROR, f"Think Mode session failed: {str(error)}"
+
+
+@router.websocket("/ws")
+async def think_session(
+    websocket: WebSocket,
+    service: OptimizationService = Depends(get_optimization_service)
+):
+    """Run a whole Think Mode conversation over one WebSocket (see the module docstring)."""
+    await websocket.accept()
+    session = ThinkSession(websocket, service)
+    try:
+        result = await session.run()
+        response = OptimizeResponse(
+            original=result.original,
+            optimized=result.optimized,
+            vendor=result.vendor,
+            enhancement_notes=result.enhancement_notes,
+            metadata=result.metadata
+        )
+        message, code = {"type": "result", **response.model_dump(mode="json")}, status.WS_1000_NORMAL_CLOSURE
+    except ClientDisconnected:
+        if session.cancelled:
+            cancelled_requests.inc(endpoint=ENDPOINT)
+            logger.info(f"Client disconnected, cancelled upstream generation for {ENDPOINT}")
+        return
+    except Exception as e:
+        code, detail = _close_reason(e)
+        message = {"type": "error", "detail": detail}
+
+    # The client may already be gone
+    with suppress(Exception):
+        await websocket.send_json(message)
+        await websocket.close(code=code)
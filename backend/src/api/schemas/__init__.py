@@ -1,12 +1,41 @@
-from .requests import OptimizeRequest, GenerateQuestionsRequest, OptimizeWithAnswersRequest
-from .responses import OptimizeResponse, HealthResponse, ErrorResponse, GenerateQuestionsResponse
+from .requests import (
+    OptimizeRequest,
+    GenerateQuestionsRequest,
+    OptimizeWithAnswersRequest,
+    ScoreRequest,
+    PreviousResult,
+    RefineRequest,
+    ThinkSessionStart,
+    ThinkSessionAnswer
+)
+from .responses import (
+    OptimizeResponse,
+    HealthResponse,
+    ErrorResponse,
+    GenerateQuestionsResponse,
+    PromptScoreResponse,
+    ScoreResponse,
+    EstimateResponse,
+    HistoryEntryResponse,
+    HistoryPageResponse
+)
 
 __all__ = [
     "OptimizeRequest",
     "GenerateQuestionsRequest",
     "OptimizeWithAnswersRequest",
+    "ScoreRequest",
+    "PreviousResult",
+    "RefineRequest",
+    "ThinkSessionStart",
+    "ThinkSessionAnswer",
     "OptimizeResponse",
     "GenerateQuestionsResponse",
+    "PromptScoreResponse",
+    "ScoreResponse",
+    "EstimateResponse",
+    "HistoryEntryResponse",
+    "HistoryPageResponse",
     "HealthResponse",
     "ErrorResponse"
 ]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 from ...domain.models import VendorType
 
 
@@ -10,6 +10,10 @@ class OptimizeRequest(BaseModel):
     vendor: VendorType = Field(..., description="Target LLM vendor")
     context: Optional[str] = Field(None, description="Additional context for optimization")
     max_length: Optional[int] = Field(None, gt=0, description="Maximum length constraint")
+    best_of: int = Field(
+        1, ge=1, le=8,
+        description="Generate this many candidates in parallel and return the best-scoring one"
+    )
 
     class Config:
         json_schema_extra = {
@@ -17,7 +21,8 @@ class OptimizeRequest(BaseModel):
                 "prompt": "Write a function to calculate fibonacci",
                 "vendor": "openai",
                 "context": "This is for a Python tutorial",
-                "max_length": 500
+                "max_length": 500,
+                "best_of": 1
             }
         }
 
@@ -47,6 +52,12 @@ class OptimizeWithAnswersRequest(BaseModel):
     questions: List[str] = Field(..., min_items=1, description="List of questions that were asked")
     answers: List[str] = Field(..., min_items=1, description="User's answers to the questions")
     context: Optional[str] = Field(None, description="Additional context")
+    asked: Optional[List[str]] = Field(
+        None, description="Every question returned by generate-questions, when only some were answered"
+    )
+    num_questions: Optional[int] = Field(
+        None, ge=5, le=25, description="Number of questions requested from generate-questions"
+    )
 
     class Config:
         json_schema_extra = {
@@ -57,3 +68,83 @@ class OptimizeWithAnswersRequest(BaseModel):
                 "answers": ["Beginner", "Vectors and matrices"]
             }
         }
+
+
+class PreviousResult(BaseModel):
+    """An earlier optimization result passed back for refinement."""
+
+    original: str = Field(..., min_length=1, description="The prompt that was optimized")
+    optimized: str = Field(..., min_length=1, description="The optimized prompt returned for it")
+    vendor: VendorType = Field(..., description="Vendor it was optimized for")
+    history_id: Optional[int] = Field(
+        None, gt=0, description="History entry it was stored as, if any; linked only if its optimized prompt matches"
+    )
+
+
+class RefineRequest(BaseModel):
+    """Request schema for revising an earlier result after the prompt was edited or feedback given."""
+
+    history_id: Optional[int] = Field(None, gt=0, description="History entry of the earlier result")
+    previous: Optional[PreviousResult] = Field(None, description="The earlier result, when history is not used")
+    prompt: Optional[str] = Field(None, min_length=1, description="The edited original prompt")
+    feedback: Optional[str] = Field(None, min_length=1, description="What to change in the optimized prompt")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "history_id": 42,
+                "prompt": "Write a Python function to calculate fibonacci with memoization",
+                "feedback": "Ask for type hints"
+            }
+        }
+
+
+class ThinkSessionStart(BaseModel):
+    """First message of a Think Mode WebSocket session."""
+
+    type: Literal["start"]
+    prompt: str = Field(..., min_length=1, description="The original user prompt")
+    vendor: VendorType = Field(..., description="Target LLM vendor")
+    num_questions: int = Field(..., ge=5, le=25, description="Number of questions to generate (5, 10, or 25)")
+    context: Optional[str] = Field(None, description="Additional context")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "start",
+                "prompt": "расскажи мне про линейную алгебру",
+                "vendor": "openai",
+                "num_questions": 5
+            }
+        }
+
+
+class ThinkSessionAnswer(BaseModel):
+    """Answer to one pushed question in a Think Mode WebSocket session."""
+
+    type: Literal["answer"]
+    index: int = Field(..., ge=0, description="Index of the question being answered")
+    answer: str = Field(..., min_length=1, description="User's answer")
+
+    class Config:
+        json_schema_extra = {
+            "example": {"type": "answer", "index": 0, "answer": "Beginner"}
+        }
+
+
+class ScoreRequest(BaseModel):
+    """Request schema for heuristic prompt scoring."""
+
+    prompts: List[str] = Field(..., min_items=1, max_items=100, description="Prompts to score")
+    vendor: VendorType = Field(..., description="Target LLM vendor")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "prompts": [
+                    "Write a function to calculate fibonacci",
+                    "<task>Review this contract.</task>\n<constraints>Flag risky clauses.</constraints>"
+                ],
+                "vendor": "claude"
+            }
+        }
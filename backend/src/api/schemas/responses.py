@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Dict, Any, List
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional
 from ...domain.models import VendorType
 
 
@@ -22,7 +23,17 @@ class OptimizeResponse(BaseModel):
                 "metadata": {
                     "vendor": "openai",
                     "format": "markdown",
-                    "temperature_recommendation": "0.2"
+                    "temperature_recommendation": "0.2",
+                    "usage": {
+                        "model": "qwen3-30b-a3b",
+                        "finish_reason": "stop",
+                        "prompt_tokens": 612,
+                        "completion_tokens": 148,
+                        "total_tokens": 760,
+                        "wall_time_ms": 3120.5,
+                        "ttft_ms": 402.1
+                    },
+                    "truncated": False
                 }
             }
         }
@@ -47,6 +58,108 @@ class GenerateQuestionsResponse(BaseModel):
         }
 
 
+class PromptScoreResponse(BaseModel):
+    """Heuristic score of a single prompt (all metrics 0-1)."""
+
+    clarity: float
+    specificity: float
+    structure: float
+    vendor_compliance: float
+    overall: float
+
+
+class ScoreResponse(BaseModel):
+    """Response schema for heuristic prompt scoring."""
+
+    vendor: VendorType
+    scores: List[PromptScoreResponse]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "vendor": "claude",
+                "scores": [
+                    {
+                        "clarity": 0.75,
+                        "specificity": 0.12,
+                        "structure": 0.7,
+                        "vendor_compliance": 0.9,
+                        "overall": 0.589
+                    }
+                ]
+            }
+        }
+
+
+class EstimateResponse(BaseModel):
+    """Response schema for a pre-flight token and latency estimate."""
+
+    vendor: VendorType
+    input_tokens: int = Field(..., description="Tokens in the exact prompt that would be sent")
+    predicted_output_tokens: int = Field(..., description="Expected tokens per generated candidate")
+    total_output_tokens: int = Field(..., description="Predicted output tokens across all best_of candidates")
+    estimated_latency_ms: float
+    context_window: Optional[int] = Field(None, description="Model context length, if known")
+    fits_context: bool
+    tokenizer: str
+    exact: bool = Field(..., description="Whether counts come from the model's own vocabulary")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "vendor": "claude",
+                "input_tokens": 612,
+                "predicted_output_tokens": 180,
+                "total_output_tokens": 180,
+                "estimated_latency_ms": 6612.0,
+                "context_window": 8192,
+                "fits_context": True,
+                "tokenizer": "approximate",
+                "exact": False
+            }
+        }
+
+
+class HistoryEntryResponse(BaseModel):
+    """Stored optimization result."""
+
+    id: int
+    created_at: datetime
+    mode: str
+    original: str
+    optimized: str
+    vendor: VendorType
+    enhancement_notes: str
+    metadata: Dict[str, Any]
+    parent_id: Optional[int] = Field(None, description="Entry this refinement revised")
+
+
+class HistoryPageResponse(BaseModel):
+    """One page of history search results, newest first."""
+
+    entries: List[HistoryEntryResponse]
+    next_cursor: Optional[int]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "entries": [
+                    {
+                        "id": 42,
+                        "created_at": "2025-10-05T14:03:11.201000Z",
+                        "mode": "optimize",
+                        "original": "Write a function to calculate fibonacci",
+                        "optimized": "Create a Python function that calculates...",
+                        "vendor": "openai",
+                        "enhancement_notes": "Enhanced for OpenAI with...",
+                        "metadata": {"vendor": "openai", "truncated": False}
+                    }
+                ],
+                "next_cursor": 42
+            }
+        }
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
 
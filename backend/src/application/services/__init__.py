@@ -1,3 +1,4 @@
 from .optimization_service import OptimizationService
+from .token_estimator import TokenEstimator
 
-__all__ = ["OptimizationService"]
+__all__ = ["OptimizationService", "TokenEstimator"]
@@ -1,13 +1,171 @@
-from ...domain.models import VendorType, OptimizationRequest, OptimizedPrompt
-from ...domain.interfaces import ILLMClient, IVendorAdapter
+import hashlib
+import json
+import logging
+import time
+from contextlib import aclosing, nullcontext
+from dataclasses import asdict, replace
+from typing import AsyncIterator, Awaitable, Callable, ContextManager, List, Optional, Sequence, Tuple
+from ...domain.models import (
+    VendorType, OptimizationRequest, OptimizedPrompt, RefinementRequest, LLMCompletion, PromptScore,
+    HistoryEntry, HistoryQuery, HistoryPage, TokenEstimate
+)
+from ...domain.interfaces import ILLMClient, IVendorAdapter, IResultCache, IHistoryRepository, render_examples
+from ...domain.exceptions import (
+    HistoryDisabledException, HistoryEntryNotFoundException, ContextWindowExceededException
+)
 from ...domain.registries import VendorRegistry
+from ...domain.affinity import affinity_key, pinned
+from ...domain.scoring import PromptScorer
+from ...domain.fewshot import ExampleSelector
+from ...domain.language import detect_language, with_response_language, without_response_language
+from ...domain.refinement import NO_CHANGES, apply_revisions, describe_changes, parse_revisions
+from .question_parser import QuestionStreamParser, questions_response_format
+from .token_estimator import TokenEstimator
+
+logger = logging.getLogger(__name__)
+
+OPTIMIZE_MAX_TOKENS = 2048
+QUESTIONS_MAX_TOKENS = 1024
+
+
+def _result_metadata(adapter: IVendorAdapter, completion: LLMCompletion) -> dict:
+    """Vendor metadata plus LLM usage/timing; flags output cut off at max_tokens."""
+    metadata = adapter.get_metadata()
+    metadata["usage"] = completion.usage_metadata()
+    metadata["truncated"] = completion.truncated
+    if completion.truncated:
+        logger.warning("LLM output truncated at max_tokens (finish_reason=length)")
+    return metadata
+
+
+def _finish(optimized: str, language: Optional[str]) -> str:
+    """The LLM output with the response-language instruction appended here rather than by the model."""
+    return with_response_language(optimized, language) if language else optimized.strip()
+
+
+def _response_language_rule(language: Optional[str]) -> str:
+    if language is None:
+        # Undetected (e.g. a code-only prompt): leave it to the model
+        return 'End the optimized prompt with "Respond in [the language of the original prompt]".'
+    return f'The user writes in {language}. "Respond in {language}." is appended automatically; leave it out.'
+
+
+def _think_affinity(prompt: str, vendor: VendorType) -> str:
+    """Both Think Mode steps for a prompt derive the same key, so they land on the same slot."""
+    return affinity_key("think", vendor.value, prompt)
+
+
+def _cache_key(request: OptimizationRequest) -> str:
+    """Cache key for an optimization request."""
+    payload = json.dumps(
+        [request.target_vendor.value, request.original_prompt, request.context, request.max_length, request.best_of],
+        ensure_ascii=False
+    )
+    return "optimize:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _questions_cache_key(prompt: str, vendor: VendorType) -> str:
+    """Cache key for a prompt's clarifying questions; case and whitespace do not matter."""
+    normalized = " ".join(prompt.split()).casefold()
+    payload = json.dumps([vendor.value, normalized], ensure_ascii=False)
+    return "questions:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 class OptimizationService:
     """Application service for prompt optimization."""
 
-    def __init__(self, llm_client: ILLMClient):
+    def __init__(
+        self,
+        llm_client: ILLMClient,
+        result_cache: Optional[IResultCache] = None,
+        json_questions: bool = False,
+        prompt_scorer: Optional[PromptScorer] = None,
+        score_skip_threshold: Optional[float] = None,
+        history: Optional[IHistoryRepository] = None,
+        example_selector: Optional[ExampleSelector] = None,
+        token_estimator: Optional[TokenEstimator] = None
+    ):
         self.llm_client = llm_client
+        self.result_cache = result_cache
+        self.history = history
+        # Ask for clarifying questions as schema-constrained JSON where the backend supports it
+        self.json_questions = json_questions
+        self.prompt_scorer = prompt_scorer or PromptScorer()
+        # Prompts scoring at least this overall are returned unchanged without an LLM call
+        self.score_skip_threshold = score_skip_threshold
+        self.example_selector = example_selector or ExampleSelector()
+        # Counts prompts before sending them and rejects those that cannot fit the context window
+        self.token_estimator = token_estimator
+
+    def _admit(
+        self,
+        messages: List[dict],
+        kind: str,
+        max_tokens: int,
+        max_length: Optional[int] = None,
+        candidates: int = 1
+    ) -> Optional[TokenEstimate]:
+        """Estimate a request before the LLM call; raises if it cannot fit the context window."""
+        if self.token_estimator is None:
+            return None
+        estimate = self.token_estimator.estimate(
+            messages, kind, max_tokens, self.llm_client.capabilities.context_window, max_length, candidates
+        )
+        if not estimate.fits_context:
+            raise ContextWindowExceededException(
+                f"Request needs about {estimate.input_tokens} prompt and {estimate.predicted_output_tokens} "
+                f"output tokens, more than the model's {estimate.context_window}-token context window"
+            )
+        return estimate
+
+    def _observe(self, kind: str, estimate: Optional[TokenEstimate], completion: LLMCompletion) -> None:
+        if estimate is not None:
+            self.token_estimator.observe(kind, estimate.input_tokens, completion)
+
+    def estimate_optimization(self, request: OptimizationRequest) -> TokenEstimate:
+        """Token counts and latency ``optimize_prompt`` would incur, without calling the LLM."""
+        if self.token_estimator is None:
+            raise ValueError("Token estimation is not configured")
+        adapter = VendorRegistry.get(request.target_vendor)
+        return self.token_estimator.estimate(
+            self._optimization_messages(request, adapter),
+            f"optimize:{request.target_vendor.value}",
+            OPTIMIZE_MAX_TOKENS,
+            self.llm_client.capabilities.context_window,
+            request.max_length,
+            request.best_of
+        )
+
+    def score_prompts(self, prompts: List[str], vendor: VendorType) -> List[PromptScore]:
+        """Score prompts for a vendor with the local heuristic scorer (no LLM call)."""
+        return self.prompt_scorer.score_many(prompts, vendor)
+
+    def _already_optimized(self, request: OptimizationRequest, adapter: IVendorAdapter) -> Optional[OptimizedPrompt]:
+        """Return the prompt as is, with the response-language line, if it already scores above the skip threshold."""
+        if self.score_skip_threshold is None or request.context:
+            # Extra context has to be worked into the prompt, so always optimize
+            return None
+        if request.max_length and len(request.original_prompt) > request.max_length:
+            return None
+
+        score = self.prompt_scorer.score(request.original_prompt, request.target_vendor)
+        if score.overall < self.score_skip_threshold:
+            return None
+
+        language = detect_language(request.original_prompt)
+        metadata = adapter.get_metadata()
+        metadata["score"] = asdict(score)
+        metadata["skipped_llm"] = True
+        metadata["language"] = language
+        return OptimizedPrompt(
+            original=request.original_prompt,
+            optimized=_finish(request.original_prompt, language),
+            vendor=request.target_vendor,
+            enhancement_notes=(
+                f"Prompt already scores {score.overall:.2f} for {request.target_vendor.value}; returned unchanged."
+            ),
+            metadata=metadata
+        )
 
     async def optimize_prompt(self, request: OptimizationRequest) -> OptimizedPrompt:
         """Optimize a prompt for a specific vendor."""
@@ -15,58 +173,318 @@ class OptimizationService:
         # Get vendor adapter from registry
         adapter = VendorRegistry.get(request.target_vendor)
 
-        # Generate optimized prompt using LLM with vendor-specific guidance
-        optimized_prompt = await self._generate_base_optimization(request, adapter)
+        unchanged = self._already_optimized(request, adapter)
+        if unchanged is not None:
+            return unchanged
+
+        cache_key = _cache_key(request)
+        if self.result_cache is not None:
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                return OptimizedPrompt(
+                    original=request.original_prompt,
+                    optimized=cached["optimized"],
+                    vendor=request.target_vendor,
+                    enhancement_notes=cached["enhancement_notes"],
+                    metadata={**cached["metadata"], "cached": True}
+                )
 
+        # Generate optimized prompt using LLM with vendor-specific guidance
+        if request.best_of > 1:
+            completion, metadata = await self._generate_best_of(request, adapter)
+        else:
+            completion = await self._generate_base_optimization(request, adapter)
+            metadata = _result_metadata(adapter, completion)
+
+        language = detect_language(request.original_prompt)
+        metadata["language"] = language
         # Return result with metadata (no additional structure added)
-        return OptimizedPrompt(
+        result = OptimizedPrompt(
             original=request.original_prompt,
-            optimized=optimized_prompt,
+            optimized=_finish(completion.content, language),
             vendor=request.target_vendor,
             enhancement_notes=adapter.get_enhancement_notes(),
-            metadata=adapter.get_metadata()
+            metadata=metadata
+        )
+
+        await self._remember(result, "optimize")
+
+        # Truncated output is not worth serving again
+        if self.result_cache is not None and not completion.truncated:
+            await self.result_cache.set(cache_key, {
+                "optimized": result.optimized,
+                "enhancement_notes": result.enhancement_notes,
+                "metadata": result.metadata
+            })
+        return result
+
+    async def _remember(self, result: OptimizedPrompt, mode: str, parent_id: Optional[int] = None) -> None:
+        """Store an LLM-produced result in the history; a failing store never fails the request."""
+        if self.history is None:
+            return
+        try:
+            result.metadata["history_id"] = await self.history.add(result, mode, parent_id)
+        except Exception as e:
+            logger.warning(f"Could not store optimization in history: {e}")
+
+    def _require_history(self) -> IHistoryRepository:
+        if self.history is None:
+            raise HistoryDisabledException()
+        return self.history
+
+    async def search_history(self, query: HistoryQuery) -> HistoryPage:
+        """Search stored optimizations (full text over original and optimized prompts)."""
+        return await self._require_history().search(query)
+
+    def export_history(self, query: HistoryQuery) -> AsyncIterator[HistoryEntry]:
+        """Stream every stored optimization matching the query's filters, oldest first."""
+        return self._require_history().iter_entries(query)
+
+    async def get_history_entry(self, entry_id: int) -> HistoryEntry:
+        """Return one stored optimization."""
+        entry = await self._require_history().get(entry_id)
+        if entry is None:
+            raise HistoryEntryNotFoundException(f"History entry {entry_id} not found")
+        return entry
+
+    async def reuse_optimization(self, entry_id: int) -> OptimizedPrompt:
+        """Return a stored optimization as a fresh result, without an LLM call."""
+        entry = await self.get_history_entry(entry_id)
+        return OptimizedPrompt(
+            original=entry.original,
+            optimized=entry.optimized,
+            vendor=entry.vendor,
+            enhancement_notes=entry.enhancement_notes,
+            metadata={**entry.metadata, "history_id": entry.id, "reused": True}
         )
 
+    async def _stored_as(self, result: OptimizedPrompt) -> Optional[int]:
+        """History id of a result passed back inline, if it really is that stored entry.
+
+        The id comes from the client, so it is only used as the refinement's parent when the
+        entry exists and holds the same optimized prompt; otherwise the link is dropped.
+        """
+        entry_id = result.metadata.get("history_id")
+        if entry_id is None or self.history is None:
+            return None
+        try:
+            entry = await self.history.get(entry_id)
+        except Exception as e:
+            logger.warning(f"Could not look up history entry {entry_id}: {e}")
+            return None
+        if entry is None or entry.optimized != result.optimized:
+            logger.info(f"Not linking refinement to history entry {entry_id}: it does not match the previous result")
+            return None
+        return entry_id
+
+    async def refine_optimization(self, request: RefinementRequest) -> OptimizedPrompt:
+        """Revise an earlier result for an edited prompt and/or feedback.
+
+        The LLM gets the earlier optimized prompt, a word-level diff of the original prompt and
+        the feedback, and answers with FIND/REPLACE edit blocks that are applied here, so its
+        output grows with the change rather than with the prompt. A reply whose edits do not
+        apply is followed by one full rewrite.
+        """
+        if not request.edited_prompt and not request.feedback:
+            raise ValueError("Refinement needs the edited prompt, feedback or both")
+        if (request.parent_id is None) == (request.previous is None):
+            raise ValueError("Refine either a history entry or a previous result")
+        previous = request.previous or await self.reuse_optimization(request.parent_id)
+        parent_id = request.parent_id if request.parent_id is not None else await self._stored_as(previous)
+        edited = request.edited_prompt or previous.original
+        changes = describe_changes(previous.original, edited)
+        if not changes and not request.feedback:
+            raise ValueError("Nothing to refine: the prompt is unchanged and no feedback was given")
+
+        vendor = previous.vendor
+        adapter = VendorRegistry.get(vendor)
+        language = detect_language(edited)
+        if language:
+            # The response-language line is re-appended below, for the edited prompt's language
+            previous = replace(previous, optimized=without_response_language(previous.optimized))
+        completion = await self._refinement_call(
+            self._refinement_messages(previous, changes, request.feedback, language), f"refine:{vendor.value}"
+        )
+        revisions = None if completion.truncated else parse_revisions(completion.content)
+        optimized = apply_revisions(previous.optimized, revisions) if revisions is not None else None
+        strategy = "edits" if revisions else "unchanged"
+        if optimized is None:
+            logger.info("Refinement edits did not apply; rewriting the whole prompt")
+            strategy = "rewrite"
+            completion = await self._refinement_call(
+                self._refinement_messages(previous, changes, request.feedback, language, rewrite=True),
+                f"refine_rewrite:{vendor.value}"
+            )
+            optimized = completion.content
+
+        metadata = _result_metadata(adapter, completion)
+        metadata["refinement"] = {
+            "parent_id": parent_id,
+            "strategy": strategy,
+            "edits": None if strategy == "rewrite" else len(revisions),
+            "changes": changes,
+            "feedback": request.feedback
+        }
+        metadata["language"] = language
+        result = OptimizedPrompt(
+            original=edited,
+            optimized=_finish(optimized, language),
+            vendor=vendor,
+            enhancement_notes=f"{adapter.get_enhancement_notes()} Refined from an earlier optimization.",
+            metadata=metadata
+        )
+        await self._remember(result, "refine", parent_id)
+        return result
+
+    async def _refinement_call(self, messages: List[dict], kind: str) -> LLMCompletion:
+        estimate = self._admit(messages, kind, OPTIMIZE_MAX_TOKENS)
+        completion = await self.llm_client.generate(
+            messages=messages,
+            temperature=0.2,  # Edits must quote the current prompt exactly
+            max_tokens=OPTIMIZE_MAX_TOKENS
+        )
+        self._observe(kind, estimate, completion)
+        return completion
+
     async def _generate_base_optimization(
         self,
         request: OptimizationRequest,
         adapter: IVendorAdapter
-    ) -> str:
+    ) -> LLMCompletion:
         """Generate base optimization using LLM."""
+        messages = self._optimization_messages(request, adapter)
+        kind = f"optimize:{request.target_vendor.value}"
+        estimate = self._admit(messages, kind, OPTIMIZE_MAX_TOKENS, request.max_length)
+        completion = await self.llm_client.generate(
+            messages=messages,
+            temperature=0.3,  # Lower temperature for more consistent optimization
+            max_tokens=OPTIMIZE_MAX_TOKENS
+        )
+        self._observe(kind, estimate, completion)
+        return completion
+
+    async def _generate_best_of(
+        self,
+        request: OptimizationRequest,
+        adapter: IVendorAdapter
+    ) -> Tuple[LLMCompletion, dict]:
+        """Generate ``best_of`` candidates from one shared prompt and keep the best-scoring one."""
+        messages = self._optimization_messages(request, adapter)
+        kind = f"optimize:{request.target_vendor.value}"
+        estimate = self._admit(messages, kind, OPTIMIZE_MAX_TOKENS, request.max_length, request.best_of)
+        completions = await self.llm_client.generate_many(
+            messages=messages,
+            n=request.best_of,
+            temperature=0.7,  # Higher than single-shot so the candidates actually differ
+            max_tokens=OPTIMIZE_MAX_TOKENS
+        )
+        for completion in completions:
+            self._observe(kind, estimate, completion)
+        language = detect_language(request.original_prompt)
+        candidates = [_finish(completion.content, language) for completion in completions]
+        scores = self.prompt_scorer.score_many(candidates, request.target_vendor)
+
+        def rank(index: int) -> tuple:
+            # Complete candidates within max_length first, then by heuristic score
+            fits = not request.max_length or len(candidates[index]) <= request.max_length
+            return (not completions[index].truncated, fits, scores[index].overall)
+
+        best = max(range(len(completions)), key=rank)
+        metadata = _result_metadata(adapter, completions[best])
+        metadata["best_of"] = {
+            "n": len(completions),
+            "selected": best,
+            "candidates": [
+                {"score": asdict(score), "truncated": completion.truncated}
+                for completion, score in zip(completions, scores)
+            ]
+        }
+        return completions[best], metadata
+
+    def _examples(self, adapter: IVendorAdapter, prompt: str) -> str:
+        """Few-shot examples for the prompt, placed last in the system message.
+
+        They are the only part of the system message that varies per prompt, so the vendor
+        rules before them stay a shared prefix.
+        """
+        return render_examples(self.example_selector.select(adapter, prompt))
+
+    def _optimization_messages(self, request: OptimizationRequest, adapter: IVendorAdapter) -> List[dict]:
+        """Build the optimization prompt; identical for every candidate so the prefix is shared."""
 
         system_message = f"""You are an expert prompt engineer. \
 Your task is to improve user prompts for LLM interactions.
 
-{adapter.get_system_instructions()}
+{adapter.get_core_instructions()}
 
 Key principles:
 - Make prompts clear and unambiguous
 - Add necessary context and constraints
 - Structure information logically
 - Optimize for the target LLM vendor's strengths
-- Preserve the user's intent while enhancing effectiveness"""
+- Preserve the user's intent while enhancing effectiveness{self._examples(adapter, request.original_prompt)}"""
 
         user_message = f"""Original prompt to optimize:
 {request.original_prompt}
 
 Target vendor: {request.target_vendor.value}
+{_response_language_rule(detect_language(request.original_prompt))}
 {f"Additional context: {request.context}" if request.context else ""}
 {f"Max length constraint: {request.max_length} characters" if request.max_length else ""}
 
 Provide an improved version of this prompt optimized for {request.target_vendor.value}."""
 
-        messages = [
+        return [
             {"role": "system", "content": system_message},
             {"role": "user", "content": user_message}
         ]
 
-        result = await self.llm_client.generate(
-            messages=messages,
-            temperature=0.3,  # Lower temperature for more consistent optimization
-            max_tokens=2048
-        )
-
-        return result.strip()
+    def _refinement_messages(
+        self,
+        previous: OptimizedPrompt,
+        changes: str,
+        feedback: Optional[str],
+        language: Optional[str] = None,
+        rewrite: bool = False
+    ) -> List[dict]:
+        """Revision prompt: the earlier output plus only what changed since it was written.
+
+        Without ``rewrite`` the model answers with edit blocks instead of the whole prompt.
+        """
+        if rewrite:
+            output_rules = "Return ONLY the complete revised prompt, without explanations."
+        else:
+            output_rules = f"""Reply with one edit block per change to the optimized prompt:
+<<<<<<< FIND
+exact text copied from the current optimized prompt
+=======
+the text to put in its place
+>>>>>>> REPLACE
+
+- FIND text must match the optimized prompt exactly and be just long enough to be unique
+- To add text, FIND the line it should follow and repeat that line before the addition
+- Reply {NO_CHANGES} if the optimized prompt already reflects the change
+- No other text or explanations"""
+
+        system_message = f"""You are an expert prompt engineer revising a prompt you optimized \
+earlier for {previous.vendor.value}. Change only what the user's edits or feedback require and keep \
+everything else as it is.
+
+{output_rules}"""
+
+        user_message = f"""Current optimized prompt:
+<prompt>
+{previous.optimized}
+</prompt>
+
+{changes}
+{f"Feedback on the optimized prompt: {feedback}" if feedback else ""}
+{_response_language_rule(language)}"""
+
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message.rstrip()}
+        ]
 
     async def health_check(self) -> bool:
         """Check if the optimization service is healthy."""
@@ -78,70 +496,302 @@ Provide an improved version of this prompt optimized for {request.target_vendor.
         vendor: VendorType,
         num_questions: int
     ) -> list[str]:
-        """Generate clarifying questions for Think Mode."""
+        """Generate clarifying questions for Think Mode.
 
+        Output is streamed and parsed incrementally; generation stops as soon as
+        ``num_questions`` questions have arrived.
+        """
+        return [question async for question in self.stream_questions(prompt, vendor, num_questions)]
+
+    async def stream_questions(
+        self,
+        prompt: str,
+        vendor: VendorType,
+        num_questions: int
+    ) -> AsyncIterator[str]:
+        """Yield clarifying questions one at a time, as soon as each is parsed from the LLM output.
+
+        With a result cache, the largest set generated for a prompt and vendor is kept: smaller
+        requests are served from it without an LLM call, and larger ones start with it and only
+        generate the missing questions.
+        """
+        cached = await self._cached_questions(prompt, vendor)
+        for question in cached[:num_questions]:
+            yield question
+        if len(cached) >= num_questions:
+            return
+
+        generated = []
+        more = self._generate_questions(prompt, vendor, num_questions, cached)
+        async with aclosing(more) as questions:
+            async for question in questions:
+                generated.append(question)
+                yield question
+        await self._cache_questions(prompt, vendor, cached + generated)
+
+    async def _cached_questions(self, prompt: str, vendor: VendorType) -> List[str]:
+        if self.result_cache is None:
+            return []
+        cached = await self.result_cache.get(_questions_cache_key(prompt, vendor))
+        return list(cached["questions"]) if cached else []
+
+    async def _cache_questions(self, prompt: str, vendor: VendorType, questions: List[str]) -> None:
+        """Keep the largest question set; a concurrent request may have stored a larger one meanwhile."""
+        if self.result_cache is None or not questions:
+            return
+        if len(await self._cached_questions(prompt, vendor)) < len(questions):
+            await self.result_cache.set(_questions_cache_key(prompt, vendor), {"questions": questions})
+
+    async def _generate_questions(
+        self,
+        prompt: str,
+        vendor: VendorType,
+        num_questions: int,
+        known: Sequence[str] = ()
+    ) -> AsyncIterator[str]:
+        """Generate the questions of a ``num_questions`` set that are not ``known`` yet."""
+        capabilities = self.llm_client.capabilities
+        json_output = self._json_questions()
+        messages = self._questions_messages(prompt, vendor, num_questions, known)
+        num_questions -= len(known)
+        kind = f"questions:{vendor.value}"
+        estimate = self._admit(messages, kind, QUESTIONS_MAX_TOKENS)
+        parser = QuestionStreamParser(num_questions, json_output=json_output)
+        params = {
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": QUESTIONS_MAX_TOKENS,
+            "response_format": questions_response_format(num_questions) if json_output else None
+        }
+
+        emitted = 0
+        with self._think_turn(prompt, vendor):
+            if capabilities.streaming:
+                parts = []
+                ttft_ms = None
+                started = time.perf_counter()
+                # Leaving the block closes the stream, which cancels the rest of the generation
+                async with aclosing(self.llm_client.stream(**params)) as chunks:
+                    async for chunk in chunks:
+                        if ttft_ms is None:
+                            ttft_ms = (time.perf_counter() - started) * 1000
+                        parts.append(chunk)
+                        parser.feed(chunk)
+                        for question in parser.questions[emitted:num_questions]:
+                            emitted += 1
+                            yield question
+                        if parser.done:
+                            break
+                self._observe(kind, estimate, LLMCompletion(
+                    content="".join(parts),
+                    wall_time_ms=(time.perf_counter() - started) * 1000,
+                    ttft_ms=ttft_ms
+                ))
+            else:
+                completion = await self.llm_client.generate(**params)
+                self._observe(kind, estimate, completion)
+                if completion.truncated:
+                    logger.warning(f"Question generation truncated at max_tokens (requested {num_questions})")
+                parser.feed(completion.content)
+
+        questions = parser.finish()
+        for question in questions[emitted:]:
+            yield question
+        if len(questions) < num_questions:
+            logger.warning(f"Parsed {len(questions)} of {num_questions} requested clarifying questions")
+
+    async def optimize_with_answers(
+        self,
+        prompt: str,
+        vendor: VendorType,
+        questions: list[str],
+        answers: list[str],
+        context: str | None = None,
+        asked: list[str] | None = None,
+        num_questions: int | None = None
+    ) -> OptimizedPrompt:
+        """Optimize prompt with user's answers to clarifying questions.
+
+        ``asked`` lists every question that was generated when only some were answered, and
+        ``num_questions`` is how many were requested; both default to the answered questions.
+        """
+
+        # Get vendor adapter from registry
+        adapter = VendorRegistry.get(vendor)
+
+        messages = self._answers_messages(prompt, vendor, questions, answers, context, adapter, asked, num_questions)
+        estimate = self._admit(messages, f"think:{vendor.value}", OPTIMIZE_MAX_TOKENS)
+        with self._think_turn(prompt, vendor):
+            completion = await self.llm_client.generate(
+                messages=messages,
+                temperature=0.3,
+                max_tokens=OPTIMIZE_MAX_TOKENS
+            )
+        self._observe(f"think:{vendor.value}", estimate, completion)
+        return await self._answers_result(prompt, vendor, questions, adapter, completion)
+
+    async def stream_optimize_with_answers(
+        self,
+        prompt: str,
+        vendor: VendorType,
+        questions: list[str],
+        answers: list[str],
+        on_token: Callable[[str], Awaitable[None]],
+        context: str | None = None,
+        asked: list[str] | None = None,
+        num_questions: int | None = None
+    ) -> OptimizedPrompt:
+        """Like ``optimize_with_answers``, handing each chunk of the output to ``on_token`` as it arrives.
+
+        Backends without streaming produce the whole prompt as a single chunk.
+        """
+        adapter = VendorRegistry.get(vendor)
+        params = {
+            "messages": self._answers_messages(
+                prompt, vendor, questions, answers, context, adapter, asked, num_questions
+            ),
+            "temperature": 0.3,
+            "max_tokens": OPTIMIZE_MAX_TOKENS
+        }
+        estimate = self._admit(params["messages"], f"think:{vendor.value}", OPTIMIZE_MAX_TOKENS)
+
+        with self._think_turn(prompt, vendor):
+            if not self.llm_client.capabilities.streaming:
+                completion = await self.llm_client.generate(**params)
+                await on_token(completion.content)
+            else:
+                completion = await self._stream_completion(params, on_token)
+        self._observe(f"think:{vendor.value}", estimate, completion)
+        return await self._answers_result(prompt, vendor, questions, adapter, completion)
+
+    async def _stream_completion(self, params: dict, on_token: Callable[[str], Awaitable[None]]) -> LLMCompletion:
+        parts = []
+        ttft_ms = None
+        started = time.perf_counter()
+        async with aclosing(self.llm_client.stream(**params)) as chunks:
+            async for chunk in chunks:
+                if ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - started) * 1000
+                parts.append(chunk)
+                await on_token(chunk)
+        return LLMCompletion(
+            content="".join(parts),
+            wall_time_ms=(time.perf_counter() - started) * 1000,
+            ttft_ms=ttft_ms
+        )
+
+    def _questions_messages(
+        self,
+        prompt: str,
+        vendor: VendorType,
+        num_questions: int,
+        known: Sequence[str]
+    ) -> List[dict]:
+        """The questions turn for ``num_questions``, then any known questions and a request for the rest.
+
+        Known questions are sent as an earlier answer to the questions turn, so the questions
+        turn itself stays the same as in the final step.
+        """
+        messages = self._think_messages(prompt, vendor, VendorRegistry.get(vendor), num_questions)
+        if not known:
+            return messages
+        missing = num_questions - len(known)
+        return messages + [
+            {"role": "assistant", "content": self._questions_turn(list(known))},
+            {"role": "user", "content": (
+                f"Generate {missing} essential questions in addition to these, "
+                "without repeating or rephrasing them.\n"
+                f"{self._questions_rules(missing)}"
+            )}
+        ]
+
+    def _think_turn(self, prompt: str, vendor: VendorType) -> ContextManager[None]:
+        """Mark a Think Mode call as a turn of its conversation on backends that cache prompt prefixes."""
+        if not self.llm_client.capabilities.prefix_caching:
+            return nullcontext()
+        return pinned(_think_affinity(prompt, vendor))
+
+    def _json_questions(self) -> bool:
+        return self.json_questions and self.llm_client.capabilities.json_schema
+
+    def _think_messages(
+        self,
+        prompt: str,
+        vendor: VendorType,
+        adapter: IVendorAdapter,
+        num_questions: int
+    ) -> List[dict]:
+        """System message and questions turn of the Think Mode conversation.
+
+        The final step resends them unchanged and appends the questions and answers as new
+        turns, so a backend that kept the conversation's KV cache only prefills those.
+        """
         system_message = (
-            f"You are an expert prompt engineer. Generate exactly {num_questions} clarifying questions to "
-            f"better understand the user's intent and create the perfect prompt.\n"
+            "You are an expert prompt engineer working in two steps: first ask clarifying questions "
+            "to better understand the user's intent, then use the answers to create the PERFECT "
+            "optimized prompt.\n"
             "\n"
-            "CRITICAL RULES:\n"
-            "- DETECT the language of the user's original prompt\n"
-            "- Generate questions in THE SAME LANGUAGE as the user's prompt\n"
+            "CRITICAL RULES for clarifying questions:\n"
+            "- Write the questions in the user's language, as given in the request\n"
             "- Ask questions that will significantly improve the final prompt\n"
             "- Focus on: user's knowledge level, specific goals, preferred format, depth of detail, context\n"
             "- Questions should be concise and specific\n"
-            f"- Return ONLY the questions, numbered 1-{num_questions}\n"
-            "- Each question on a new line\n"
-            "- No additional text or explanations\n"
             "\n"
-            "Example:\n"
-            'If user\'s prompt is in Russian: "расскажи про физику"\n'
-            'Generate questions in Russian: "1. Какой у вас текущий уровень знаний физики?"\n'
+            "When creating the final prompt, use the Q&A to deeply understand what the user wants "
+            "and create an ideal prompt.\n"
             "\n"
-            'If user\'s prompt is in English: "tell me about physics"\n'
-            'Generate questions in English: "1. What is your current knowledge level in physics?"\n'
+            f"{adapter.get_core_instructions()}"
+            f"{self._examples(adapter, prompt)}"
         )
 
+        language = detect_language(prompt)
         user_message = f"""User's original prompt: "{prompt}"
 Target vendor: {vendor.value}
+User's language: {language or "the language of the original prompt"}
 
-Generate {num_questions} essential questions to optimize this prompt perfectly."""
+Generate {num_questions} essential questions to optimize this prompt perfectly.
+{self._questions_rules(num_questions)}"""
 
-        messages = [
+        return [
             {"role": "system", "content": system_message},
             {"role": "user", "content": user_message}
         ]
 
-        result = await self.llm_client.generate(
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1024
+    def _questions_rules(self, num_questions: int) -> str:
+        if self._json_questions():
+            return (
+                f'- Return ONLY a JSON object: {{"questions": [...]}} with exactly {num_questions} strings\n'
+                "- No additional text or explanations"
+            )
+        return (
+            f"- Return ONLY the questions, numbered 1-{num_questions}\n"
+            "- Each question on a new line\n"
+            "- No additional text or explanations"
         )
 
-        # Parse questions from numbered list
-        questions = []
-        for line in result.strip().split('\n'):
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                # Remove numbering and clean up
-                question = line.lstrip('0123456789.-• \t')
-                if question:
-                    questions.append(question)
-
-        return questions[:num_questions]  # Ensure we return exactly the requested number
+    def _questions_turn(self, questions: List[str]) -> str:
+        """The questions as the assistant would have answered the questions turn."""
+        if self._json_questions():
+            return json.dumps({"questions": questions}, ensure_ascii=False)
+        return "\n".join(f"{number}. {question}" for number, question in enumerate(questions, 1))
 
-    async def optimize_with_answers(
+    def _answers_messages(
         self,
         prompt: str,
         vendor: VendorType,
         questions: list[str],
         answers: list[str],
-        context: str | None = None
-    ) -> OptimizedPrompt:
-        """Optimize prompt with user's answers to clarifying questions."""
-
-        # Get vendor adapter from registry
-        adapter = VendorRegistry.get(vendor)
+        context: str | None,
+        adapter: IVendorAdapter,
+        asked: list[str] | None = None,
+        num_questions: int | None = None
+    ) -> List[dict]:
+        """Continue the Think Mode conversation with the asked questions and the user's answers.
+
+        The questions turn is rebuilt with the number of questions requested, not the number
+        parsed, so it matches the generation request byte for byte.
+        """
+        asked = asked or questions
 
         # Build Q&A context
         qa_context = "\n".join([
@@ -149,43 +799,39 @@ Generate {num_questions} essential questions to optimize this prompt perfectly."
             for q, a in zip(questions, answers)
         ])
 
-        system_message = (
-            f"You are an expert prompt engineer. Create the PERFECT optimized prompt using the user's "
-            f"answers to clarifying questions.\n"
-            f"\n"
-            f"{adapter.get_system_instructions()}\n"
-            f"\n"
-            f"Use the Q&A to deeply understand what the user wants and create an ideal prompt."
-        )
-
-        user_message = f"""Original prompt: "{prompt}"
-Target vendor: {vendor.value}
-
-Clarifying Q&A:
+        answers_message = f"""Clarifying Q&A:
 {qa_context}
 
 {f"Additional context: {context}" if context else ""}
 
-Create the PERFECT optimized prompt for {vendor.value} based on all this information."""
+Create the PERFECT optimized prompt for {vendor.value} based on all this information.
+{_response_language_rule(detect_language(prompt))}"""
 
-        messages = [
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": user_message}
+        return self._think_messages(prompt, vendor, adapter, num_questions or len(asked)) + [
+            {"role": "assistant", "content": self._questions_turn(asked)},
+            {"role": "user", "content": answers_message}
         ]
 
-        optimized_prompt = await self.llm_client.generate(
-            messages=messages,
-            temperature=0.3,
-            max_tokens=2048
-        )
-
-        return OptimizedPrompt(
+    async def _answers_result(
+        self,
+        prompt: str,
+        vendor: VendorType,
+        questions: list[str],
+        adapter: IVendorAdapter,
+        completion: LLMCompletion
+    ) -> OptimizedPrompt:
+        language = detect_language(prompt)
+        metadata = _result_metadata(adapter, completion)
+        metadata["language"] = language
+        result = OptimizedPrompt(
             original=prompt,
-            optimized=optimized_prompt.strip(),
+            optimized=_finish(completion.content, language),
             vendor=vendor,
             enhancement_notes=(
                 f"{adapter.get_enhancement_notes()} Enhanced with {len(questions)} clarifying questions "
                 f"for precision."
             ),
-            metadata=adapter.get_metadata()
+            metadata=metadata
         )
+        await self._remember(result, "think")
+        return result
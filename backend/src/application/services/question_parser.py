@@ -0,0 +1,115 @@
+import json
+import re
+from typing import List
+
+# "1. Question", "2) Question", "3- Question", "4 Question", "- Question", "• Question"
+QUESTION_LINE = re.compile(r"^\s*(?:\d+\s*[.):-]|\d+\s|[-•*])\s*(.+?)\s*$")
+
+
+def questions_response_format(num_questions: int) -> dict:
+    """OpenAI-style ``response_format`` constraining output to exactly ``num_questions`` strings."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "clarifying_questions",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "questions": {
+                        "type": "array",
+                        "items": {"type": "string", "minLength": 1},
+                        "minItems": num_questions,
+                        "maxItems": num_questions
+                    }
+                },
+                "required": ["questions"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+class QuestionStreamParser:
+    """Extract clarifying questions from model output as it streams in.
+
+    Handles a numbered/bulleted list (a question is accepted once its line is complete)
+    or a ``{"questions": [...]}`` JSON object (accepted once each string closes).
+    ``done`` turns true as soon as ``num_questions`` questions have been seen, so the
+    caller can stop generation without paying for trailing tokens.
+    """
+
+    def __init__(self, num_questions: int, json_output: bool = False):
+        self.num_questions = num_questions
+        self.json_output = json_output
+        self.questions: List[str] = []
+        self._buffer = ""
+        # JSON scanner state
+        self._pos = 0
+        self._in_array = False
+        self._string_start = None
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        return len(self.questions) >= self.num_questions
+
+    def feed(self, text: str) -> None:
+        """Consume the next chunk of generated text."""
+        if self.done:
+            return
+        self._buffer += text
+        if self.json_output:
+            self._scan_json()
+        else:
+            self._scan_lines(final=False)
+
+    def finish(self) -> List[str]:
+        """Flush a trailing unterminated line and return at most ``num_questions`` questions."""
+        if not self.json_output:
+            self._scan_lines(final=True)
+        return self.questions[:self.num_questions]
+
+    def _add(self, question: str) -> None:
+        question = question.strip()
+        if question and not self.done:
+            self.questions.append(question)
+
+    def _scan_lines(self, final: bool) -> None:
+        *lines, self._buffer = self._buffer.split("\n")
+        if final:
+            lines.append(self._buffer)
+            self._buffer = ""
+        for line in lines:
+            match = QUESTION_LINE.match(line)
+            if match:
+                self._add(match.group(1))
+
+    def _scan_json(self) -> None:
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer) and not self.done:
+            char = buffer[i]
+            if self._string_start is not None:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    if self._in_array:
+                        self._add_json_string(buffer[self._string_start:i + 1])
+                    self._string_start = None
+            elif char == '"':
+                self._string_start = i
+            elif char == "[":
+                self._in_array = True
+            elif char == "]":
+                self._in_array = False
+            i += 1
+        self._pos = i
+
+    def _add_json_string(self, literal: str) -> None:
+        try:
+            self._add(json.loads(literal))
+        except ValueError:
+            pass
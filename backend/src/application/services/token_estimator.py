@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional
+from ...domain.interfaces import ITokenizer
+from ...domain.models import LLMCompletion, TokenEstimate
+
+# Optimized prompts are written in English
+CHARS_PER_OUTPUT_TOKEN = 4
+
+
+def _ewma(previous: Optional[float], value: float, smoothing: float) -> float:
+    return value if previous is None else previous + smoothing * (value - previous)
+
+
+class TokenEstimator:
+    """Counts the exact prompt sent to the LLM and predicts output size and latency.
+
+    Output length is tracked per request kind (e.g. ``optimize:claude``) and prefill/decode
+    throughput per backend, as exponentially weighted averages of observed completions;
+    configured defaults apply until the first observation.
+    """
+
+    def __init__(
+        self,
+        tokenizer: ITokenizer,
+        default_output_tokens: int = 512,
+        prefill_tokens_per_second: float = 1000.0,
+        decode_tokens_per_second: float = 30.0,
+        smoothing: float = 0.2
+    ):
+        self.tokenizer = tokenizer
+        self.default_output_tokens = default_output_tokens
+        self.default_prefill_tokens_per_second = prefill_tokens_per_second
+        self.default_decode_tokens_per_second = decode_tokens_per_second
+        self.smoothing = smoothing
+        self._output_tokens: Dict[str, float] = {}
+        self._prefill_tokens_per_second: Optional[float] = None
+        self._decode_tokens_per_second: Optional[float] = None
+
+    @property
+    def prefill_tokens_per_second(self) -> float:
+        return self._prefill_tokens_per_second or self.default_prefill_tokens_per_second
+
+    @property
+    def decode_tokens_per_second(self) -> float:
+        return self._decode_tokens_per_second or self.default_decode_tokens_per_second
+
+    def predicted_output_tokens(self, kind: str, max_tokens: int, max_length: Optional[int] = None) -> int:
+        predicted = self._output_tokens.get(kind, self.default_output_tokens)
+        if max_length:
+            predicted = min(predicted, -(-max_length // CHARS_PER_OUTPUT_TOKEN))
+        return max(1, min(round(predicted), max_tokens))
+
+    def estimate(
+        self,
+        messages: List[Dict[str, str]],
+        kind: str,
+        max_tokens: int,
+        context_window: Optional[int] = None,
+        max_length: Optional[int] = None,
+        candidates: int = 1
+    ) -> TokenEstimate:
+        """Estimate one request; ``kind`` selects the observed output length to predict from."""
+        input_tokens = self.tokenizer.count_messages(messages)
+        output_tokens = self.predicted_output_tokens(kind, max_tokens, max_length)
+        latency_ms = 1000 * (
+            input_tokens / self.prefill_tokens_per_second + output_tokens / self.decode_tokens_per_second
+        )
+        return TokenEstimate(
+            input_tokens=input_tokens,
+            predicted_output_tokens=output_tokens,
+            estimated_latency_ms=round(latency_ms, 1),
+            context_window=context_window,
+            tokenizer=self.tokenizer.name,
+            exact=self.tokenizer.exact,
+            candidates=candidates
+        )
+
+    def observe(self, kind: str, input_tokens: int, completion: LLMCompletion) -> None:
+        """Update the predictions from a finished completion.
+
+        Backend-reported usage is preferred; without it the output is counted locally.
+        Throughput is only learned from streamed completions, which report time to first token.
+        """
+        output_tokens = completion.completion_tokens
+        if output_tokens is None:
+            output_tokens = self.tokenizer.count(completion.content)
+        if not completion.truncated:
+            # A cut-off completion says nothing about how long the answer wanted to be
+            self._output_tokens[kind] = _ewma(self._output_tokens.get(kind), output_tokens, self.smoothing)
+
+        if not completion.ttft_ms or not completion.wall_time_ms:
+            return
+        prompt_tokens = completion.prompt_tokens or input_tokens
+        self._prefill_tokens_per_second = _ewma(
+            self._prefill_tokens_per_second, prompt_tokens / (completion.ttft_ms / 1000), self.smoothing
+        )
+        decode_ms = completion.wall_time_ms - completion.ttft_ms
+        if output_tokens > 1 and decode_ms > 0:
+            self._decode_tokens_per_second = _ewma(
+                self._decode_tokens_per_second, (output_tokens - 1) / (decode_ms / 1000), self.smoothing
+            )
@@ -0,0 +1,32 @@
+"""Conversation affinity: LLM calls of one conversation share a backend slot and its KV cache."""
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+affinity_var: ContextVar[Optional[str]] = ContextVar("llm_affinity", default=None)
+
+
+def affinity_key(*parts: str) -> str:
+    """Stable key for a conversation, the same in every worker and across requests."""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def slot_for(key: str, slots: int) -> int:
+    """Backend slot a conversation is pinned to."""
+    return int(key, 16) % slots
+
+
+@contextmanager
+def pinned(key: str) -> Iterator[None]:
+    """Mark the LLM calls made inside the block as turns of the conversation ``key``."""
+    token = affinity_var.set(key)
+    try:
+        yield
+    finally:
+        try:
+            affinity_var.reset(token)
+        except ValueError:
+            # An async generator closed by the garbage collector runs in another context
+            pass
@@ -0,0 +1,42 @@
+"""Per-request deadlines propagated to every stage through a context variable."""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from .exceptions import DeadlineExceededException
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute point in time (monotonic clock) by which a request must finish."""
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left; zero or negative once expired."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> None:
+        """Raise if the deadline has already passed before ``stage`` starts."""
+        if self.expired:
+            raise DeadlineExceededException(f"Request deadline exceeded before {stage}")
+
+
+deadline_var: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def budget(ceiling: float, stage: str) -> float:
+    """Seconds ``stage`` may take: ``ceiling`` capped by the current deadline, if any."""
+    deadline = deadline_var.get()
+    if deadline is None:
+        return ceiling
+    deadline.check(stage)
+    return min(ceiling, deadline.remaining())
@@ -45,3 +45,27 @@ class CacheException(DomainException):
     """Cache operation failed."""
     code = "CACHE_ERROR"
     message = "Cache operation failed"
+
+
+class DeadlineExceededException(DomainException):
+    """Request deadline passed before the work finished."""
+    code = "DEADLINE_EXCEEDED"
+    message = "Request deadline exceeded"
+
+
+class ContextWindowExceededException(DomainException):
+    """Prompt and expected output do not fit in the model's context window."""
+    code = "CONTEXT_WINDOW_EXCEEDED"
+    message = "Request exceeds the model's context window"
+
+
+class HistoryDisabledException(DomainException):
+    """Optimization history is not enabled."""
+    code = "HISTORY_DISABLED"
+    message = "Optimization history is disabled"
+
+
+class HistoryEntryNotFoundException(DomainException):
+    """History entry does not exist."""
+    code = "HISTORY_ENTRY_NOT_FOUND"
+    message = "History entry not found"
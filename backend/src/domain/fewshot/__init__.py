@@ -0,0 +1,5 @@
+"""Retrieval of few-shot examples for vendor instructions."""
+
+from .example_selector import ExampleIndex, ExampleSelector
+
+__all__ = ["ExampleIndex", "ExampleSelector"]
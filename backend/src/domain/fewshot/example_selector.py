@@ -0,0 +1,79 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+from ..interfaces import IVendorAdapter
+from ..models import VendorType, ExampleTransformation
+
+WORD = re.compile(r"\w+")
+
+
+def _terms(text: str) -> Counter:
+    """Lowercased words plus their character trigrams.
+
+    Trigrams match inflected forms ("физику" / "физика") and unsegmented scripts
+    ("解释量子计算" / "量子计算机"), where whole words rarely coincide.
+    """
+    terms = Counter()
+    for word in WORD.findall(text.lower()):
+        terms[word] += 1
+        padded = f"<{word}>"
+        for i in range(len(padded) - 2):
+            terms["#" + padded[i:i + 3]] += 1
+    return terms
+
+
+class ExampleIndex:
+    """TF-IDF index over one vendor's example library, built once and queried per request."""
+
+    def __init__(self, examples: Sequence[ExampleTransformation]):
+        self.examples = list(examples)
+        documents = [_terms(f"{example.prompt}\n{example.optimized}") for example in self.examples]
+        document_frequency = Counter(term for document in documents for term in document)
+        count = len(documents)
+        self.idf = {term: math.log((1 + count) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        self.vectors = [self._vector(document) for document in documents]
+
+    def _vector(self, terms: Counter) -> Dict[str, float]:
+        weights = {
+            term: (1 + math.log(tf)) * self.idf[term]
+            for term, tf in terms.items()
+            if term in self.idf
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+    def scores(self, prompt: str) -> List[float]:
+        """Cosine similarity of the prompt to each example, in library order."""
+        query = self._vector(_terms(prompt))
+        return [sum(weight * vector.get(term, 0.0) for term, weight in query.items()) for vector in self.vectors]
+
+    def top(self, prompt: str, k: int) -> List[ExampleTransformation]:
+        """The k most similar examples, most similar first; ties keep library order."""
+        scores = self.scores(prompt)
+        ranked = sorted(range(len(self.examples)), key=lambda i: -scores[i])
+        return [self.examples[i] for i in ranked[:k]]
+
+
+class ExampleSelector:
+    """Picks the few-shot examples sent with a request.
+
+    ``top_k`` of ``None`` sends each vendor's whole library (the previous behaviour);
+    otherwise only the ``top_k`` examples lexically closest to the prompt are sent.
+    Indexes are built on first use per vendor and kept for the process lifetime.
+    """
+
+    def __init__(self, top_k: Optional[int] = None):
+        self.top_k = top_k
+        self._indexes: Dict[VendorType, ExampleIndex] = {}
+
+    def index(self, adapter: IVendorAdapter) -> ExampleIndex:
+        index = self._indexes.get(adapter.vendor_type)
+        if index is None:
+            index = self._indexes[adapter.vendor_type] = ExampleIndex(adapter.get_examples())
+        return index
+
+    def select(self, adapter: IVendorAdapter, prompt: str) -> List[ExampleTransformation]:
+        if self.top_k is None:
+            return adapter.get_examples()
+        return self.index(adapter).top(prompt, self.top_k)
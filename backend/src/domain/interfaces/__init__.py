@@ -1,4 +1,7 @@
 from .llm_client import ILLMClient
-from .vendor_adapter import IVendorAdapter
+from .vendor_adapter import IVendorAdapter, render_examples
+from .result_cache import IResultCache
+from .history_repository import IHistoryRepository
+from .tokenizer import ITokenizer
 
-__all__ = ["ILLMClient", "IVendorAdapter"]
+__all__ = ["ILLMClient", "IVendorAdapter", "render_examples", "IResultCache", "IHistoryRepository", "ITokenizer"]
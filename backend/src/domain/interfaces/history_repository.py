@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+from ..models import OptimizedPrompt, HistoryEntry, HistoryQuery, HistoryPage
+
+
+class IHistoryRepository(ABC):
+    """Interface for the searchable store of past optimization results."""
+
+    @abstractmethod
+    async def add(self, result: OptimizedPrompt, mode: str = "optimize", parent_id: Optional[int] = None) -> int:
+        """Store a result and return its id; ``parent_id`` links a refinement to the entry it revised."""
+        pass
+
+    @abstractmethod
+    async def get(self, entry_id: int) -> Optional[HistoryEntry]:
+        """Return the entry with this id, or None."""
+        pass
+
+    @abstractmethod
+    async def search(self, query: HistoryQuery) -> HistoryPage:
+        """Return matching entries, newest first, one keyset page at a time."""
+        pass
+
+    @abstractmethod
+    def iter_entries(self, query: HistoryQuery, batch_size: int = 1000) -> AsyncIterator[HistoryEntry]:
+        """Yield every entry matching ``query``'s filters, oldest first, in constant memory.
+
+        ``cursor`` and ``limit`` are ignored; rows are fetched ``batch_size`` at a time.
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release database resources; called once at application shutdown."""
+        pass
@@ -1,21 +1,108 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
+from ..models import LLMCompletion, LLMCapabilities
 
 
 class ILLMClient(ABC):
     """Interface for LLM client implementations."""
 
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        """Features this backend supports; plain completion only by default."""
+        return LLMCapabilities()
+
+    @property
+    def streamed_model(self) -> Optional[str]:
+        """Model the backend named in its latest streamed response, or None if unknown.
+
+        Streams only yield text, so wrappers read the serving model from here.
+        """
+        return None
+
     @abstractmethod
     async def generate(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
-        max_tokens: int = 2048
-    ) -> str:
-        """Generate text from messages."""
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> LLMCompletion:
+        """Generate text from messages.
+
+        ``response_format`` is an OpenAI-style constraint (e.g. a JSON schema) and is only
+        sent when ``capabilities.json_schema`` is set.
+        """
         pass
 
+    async def generate_many(
+        self,
+        messages: List[Dict[str, str]],
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> List[LLMCompletion]:
+        """Generate ``n`` independent completions for the same messages.
+
+        The default issues ``n`` concurrent requests with an identical prompt, so backends
+        with prefix caching can reuse one prefill; clients with ``capabilities.multiple_choices``
+        override this to request all candidates in a single call.
+        """
+        return list(await asyncio.gather(*(
+            self.generate(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format
+            )
+            for _ in range(n)
+        )))
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> List[LLMCompletion]:
+        """Generate one completion per conversation, in order.
+
+        Clients with ``capabilities.batching`` send all of them in one backend request; the
+        default issues concurrent ``generate`` calls.
+        """
+        return list(await asyncio.gather(*(
+            self.generate(messages=messages, temperature=temperature, max_tokens=max_tokens)
+            for messages in conversations
+        )))
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Yield generated text incrementally; closing the iterator early stops generation.
+
+        The default yields the whole completion at once for backends without streaming.
+        """
+        completion = await self.generate(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format
+        )
+        yield completion.content
+
     @abstractmethod
     async def health_check(self) -> bool:
         """Check if LLM service is available."""
         pass
+
+    async def warm_up(self) -> None:
+        """Prepare the backend (e.g. load the model) once at startup; nothing by default."""
+        pass
+
+    async def close(self) -> None:
+        """Release pooled connections; called once at application shutdown."""
+        pass
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class IResultCache(ABC):
+    """Interface for caches of JSON-serializable optimization results."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        """Return the cached value for key, or None on a miss."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: dict) -> None:
+        """Store value under key, evicting older entries if over budget."""
+        pass
+
+    async def close(self) -> None:
+        """Release cache resources; called once at application shutdown."""
+        pass
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+# Chat templates wrap each message in role markers and prime the assistant reply
+# (OpenAI's published accounting; close enough for the usual local model templates)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+
+class ITokenizer(ABC):
+    """Interface for local token counters."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Identifier reported with estimates, e.g. ``approximate`` or ``tiktoken:cl100k_base``."""
+        pass
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the model's real vocabulary rather than a heuristic."""
+        return False
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Number of tokens in ``text``."""
+        pass
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Prompt tokens for a chat request, including the chat template overhead."""
+        return sum(self.count(message["content"]) + TOKENS_PER_MESSAGE for message in messages) + TOKENS_PER_REPLY
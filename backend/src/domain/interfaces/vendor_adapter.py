@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
-from ..models import VendorType
+from typing import List, Optional, Sequence
+from ..models import VendorType, PromptFeatures, ExampleTransformation
+
+
+def render_examples(examples: Sequence[ExampleTransformation]) -> str:
+    """Render examples as the "Example transformations" block appended to instructions."""
+    if not examples:
+        return ""
+    return "\n\nExample transformations:\n" + "\n\n".join(example.render() for example in examples)
 
 
 class IVendorAdapter(ABC):
@@ -12,19 +20,38 @@ class IVendorAdapter(ABC):
         pass
 
     @abstractmethod
-    def get_system_instructions(self) -> str:
+    def get_core_instructions(self) -> str:
         """
-        Get vendor-specific system instructions for the LLM optimizer.
+        Get the vendor-specific rules for the LLM optimizer, without examples.
 
         These instructions guide the LLM on how to optimize prompts for this vendor.
         Should include:
         - Best practices for the vendor
-        - Language detection and response language handling
+        - The language the optimized prompt is written in (the response-language
+          instruction is appended by the service for the locally detected language)
         - Formatting preferences
         - What to avoid
         """
         pass
 
+    def get_examples(self) -> List[ExampleTransformation]:
+        """
+        Get the library of example transformations for this vendor.
+
+        Only the examples most similar to the incoming prompt are sent with a request
+        (see ``ExampleSelector``), so the library can grow without growing every prompt.
+        """
+        return []
+
+    def get_system_instructions(self, examples: Optional[Sequence[ExampleTransformation]] = None) -> str:
+        """
+        Get the core instructions followed by example transformations.
+
+        ``examples`` defaults to the whole library.
+        """
+        examples = self.get_examples() if examples is None else examples
+        return self.get_core_instructions() + render_examples(examples)
+
     @abstractmethod
     def get_enhancement_notes(self) -> str:
         """
@@ -47,3 +74,13 @@ class IVendorAdapter(ABC):
         - features: list[str]
         """
         pass
+
+    def score_compliance(self, features: PromptFeatures) -> float:
+        """
+        Score (0-1) how well a prompt already follows this vendor's conventions.
+
+        The default covers the rules shared by all adapters: the prompt is written
+        in English and ends with an explicit "Respond in [language]" instruction.
+        Adapters override this to add their own format preferences.
+        """
+        return 0.5 * features.ascii_ratio + 0.5 * features.has_response_language
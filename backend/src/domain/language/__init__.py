@@ -0,0 +1,5 @@
+"""Local identification of the language a prompt is written in."""
+
+from .language_detector import detect_language, with_response_language, without_response_language
+
+__all__ = ["detect_language", "with_response_language", "without_response_language"]
@@ -0,0 +1,133 @@
+"""Language identification from Unicode scripts and common words, with no model call.
+
+The dominant script decides most languages outright (Cyrillic, CJK, Arabic, ...). Latin-script
+text is scored on frequent function words and letters specific to each language; text with
+no English words either, such as a code-only prompt, is left undetected.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Optional
+
+SCRIPTS = {
+    "latin": re.compile(r"[A-Za-zÀ-ɏḀ-ỿ]"),
+    "cyrillic": re.compile(r"[Ѐ-ӿ]"),
+    "greek": re.compile(r"[Ͱ-Ͽ]"),
+    "armenian": re.compile(r"[԰-֏]"),
+    "hebrew": re.compile(r"[֐-׿]"),
+    "arabic": re.compile(r"[؀-ۿ]"),
+    "devanagari": re.compile(r"[ऀ-ॿ]"),
+    "thai": re.compile(r"[฀-๿]"),
+    "georgian": re.compile(r"[Ⴀ-ჿ]"),
+    "hangul": re.compile(r"[ᄀ-ᇿ㄰-㆏가-힯]"),
+    "cjk": re.compile(r"[぀-ヿ㐀-䶿一-鿿]"),
+}
+SCRIPT_LANGUAGES = {
+    "greek": "Greek",
+    "armenian": "Armenian",
+    "hebrew": "Hebrew",
+    "devanagari": "Hindi",
+    "thai": "Thai",
+    "georgian": "Georgian",
+    "hangul": "Korean",
+}
+KANA = re.compile(r"[぀-ヿ]")
+UKRAINIAN_LETTERS = re.compile(r"[іїєґІЇЄҐ]")
+PERSIAN_LETTERS = re.compile(r"[پچژگکی]")
+
+WORD = re.compile(r"[^\W\d_]+")
+# Frequent words of each language; short ones that English shares ("a", "in", "do") are
+# listed for English too, so an English prompt always scores at least as much on them
+COMMON_WORDS: Dict[str, set] = {
+    "English": {"the", "and", "of", "to", "for", "with", "how", "what", "about", "this", "that", "please", "write",
+                "explain", "my", "your", "can", "you", "is", "are", "from", "it", "tell", "give", "create",
+                "a", "an", "in", "on", "as", "do"},
+    "Spanish": {"el", "la", "los", "las", "y", "del", "para", "una", "por", "con", "como", "sobre", "qué", "cómo", "es",
+                "escribe", "explica", "dame", "mi", "muy", "está"},
+    "French": {"le", "la", "les", "des", "et", "est", "une", "pour", "dans", "sur", "avec", "du", "au", "qui", "pas",
+               "écris", "explique", "moi", "mon", "ma", "sont"},
+    "German": {"der", "die", "das", "und", "ist", "nicht", "ein", "eine", "mit", "für", "zu", "den", "auf", "ich",
+               "wie", "über", "schreibe", "erkläre", "mir", "einen"},
+    "Portuguese": {"a", "o", "os", "as", "um", "uma", "não", "com", "do", "da", "em", "é", "escreva", "explique",
+                   "você", "meu", "minha", "são"},
+    "Italian": {"il", "lo", "la", "gli", "in", "di", "che", "è", "per", "della", "non", "sono", "scrivi", "spiega", "mio",
+                "come", "questo", "delle"},
+    "Dutch": {"het", "een", "en", "van", "niet", "op", "voor", "met", "dat", "schrijf", "leg", "uit", "mijn", "ik",
+              "hoe", "wat"},
+    "Polish": {"się", "nie", "jest", "że", "jak", "napisz", "wyjaśnij", "dla", "czy", "mi", "na", "w", "z"},
+    "Turkish": {"ve", "bir", "bu", "için", "ile", "ne", "nasıl", "yaz", "açıkla", "bana", "çok", "gibi"},
+    "Indonesian": {"dan", "yang", "untuk", "dengan", "ini", "itu", "apa", "tentang", "jelaskan", "tulis", "saya",
+                   "buat"},
+}
+# Letters specific to one language (or nearly); each counts more than a common word
+LETTERS = {
+    "Spanish": re.compile(r"[ñ¿¡]"),
+    "French": re.compile(r"[çœèêëàâîïûù]"),
+    "German": re.compile(r"[äöüß]"),
+    "Portuguese": re.compile(r"[ãõ]"),
+    "Polish": re.compile(r"[ąęłśźżćń]"),
+    "Turkish": re.compile(r"[ğşı]"),
+    "Vietnamese": re.compile(r"[ơưđăạảấầẩẫậắằẳẵặẹẻẽếềểễệỉịọỏốồổỗộớờởỡợụủứừửữựỳỵỷỹ]"),
+}
+LETTER_WEIGHT = 2
+# A single common word ("die", "una") is not enough to decide on a language
+MIN_EVIDENCE = 2
+
+RESPONSE_LANGUAGE_LINE = re.compile(r"(\s*)(?:\*\*)?Respond in [^\n.]{1,40}\.?(?:\*\*)?\s*$", re.IGNORECASE)
+
+
+def _latin_language(text: str) -> Optional[str]:
+    lowered = text.lower()
+    scores = Counter()
+    for word in WORD.findall(lowered):
+        for language, words in COMMON_WORDS.items():
+            if word in words:
+                scores[language] += 1
+    for language, letters in LETTERS.items():
+        scores[language] += LETTER_WEIGHT * len(letters.findall(lowered))
+    english = scores.pop("English", 0)
+    if scores:
+        language, score = scores.most_common(1)[0]
+        # Another language has to outscore English, not just tie it on the shared words
+        if score >= MIN_EVIDENCE and score > english:
+            return language
+    return "English" if english else None
+
+
+def detect_language(text: str) -> Optional[str]:
+    """English name of the language ``text`` is written in, or None if it cannot be told."""
+    counts = Counter({script: len(pattern.findall(text)) for script, pattern in SCRIPTS.items()})
+    script, letters = counts.most_common(1)[0]
+    if not letters:
+        return None
+    if script == "latin":
+        return _latin_language(text)
+    if script == "cyrillic":
+        return "Ukrainian" if UKRAINIAN_LETTERS.search(text) else "Russian"
+    if script == "arabic":
+        return "Persian" if PERSIAN_LETTERS.search(text) else "Arabic"
+    if script == "cjk":
+        return "Japanese" if KANA.search(text) else "Chinese"
+    return SCRIPT_LANGUAGES[script]
+
+
+def without_response_language(prompt: str) -> str:
+    """The prompt without a trailing "Respond in ..." instruction."""
+    return RESPONSE_LANGUAGE_LINE.sub("", prompt.rstrip())
+
+
+def with_response_language(prompt: str, language: str) -> str:
+    """End the optimized prompt with exactly one "Respond in <language>." instruction.
+
+    A response-language line the model wrote itself is replaced in place, keeping its spacing.
+    """
+    prompt = prompt.rstrip()
+    body = without_response_language(prompt)
+    if not body:
+        return f"Respond in {language}."
+    existing = RESPONSE_LANGUAGE_LINE.search(prompt)
+    if existing and existing.group(1):
+        separator = existing.group(1)
+    else:
+        separator = "\n\n" if "\n" in body else " "
+    return f"{body}{separator}Respond in {language}."
@@ -2,12 +2,26 @@ from .prompt import (
     VendorType,
     OptimizationRequest,
     OptimizedPrompt,
-    PromptScore
+    RefinementRequest,
+    PromptScore,
+    PromptFeatures,
+    ExampleTransformation
 )
+from .llm import LLMCompletion, LLMCapabilities, TokenEstimate
+from .history import HistoryEntry, HistoryQuery, HistoryPage
 
 __all__ = [
     "VendorType",
     "OptimizationRequest",
     "OptimizedPrompt",
-    "PromptScore"
+    "RefinementRequest",
+    "PromptScore",
+    "PromptFeatures",
+    "ExampleTransformation",
+    "LLMCompletion",
+    "LLMCapabilities",
+    "TokenEstimate",
+    "HistoryEntry",
+    "HistoryQuery",
+    "HistoryPage"
 ]
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+from .prompt import VendorType
+
+
+@dataclass
+class HistoryEntry:
+    """Stored optimization result."""
+    id: int
+    created_at: datetime
+    original: str
+    optimized: str
+    vendor: VendorType
+    enhancement_notes: str
+    metadata: dict
+    mode: str = "optimize"  # "optimize", "think" or "refine"
+    parent_id: Optional[int] = None  # the entry a refinement revised
+
+
+@dataclass
+class HistoryQuery:
+    """History search: full-text ``text`` plus filters, newest first, paged by ``cursor``."""
+    text: Optional[str] = None
+    vendor: Optional[VendorType] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    cursor: Optional[int] = None  # return entries with ids below this (from HistoryPage.next_cursor)
+    limit: int = 20
+
+
+@dataclass
+class HistoryPage:
+    """One page of history entries."""
+    entries: List[HistoryEntry] = field(default_factory=list)
+    next_cursor: Optional[int] = None
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class LLMCapabilities:
+    """Optional features an LLM backend supports beyond plain chat completion."""
+    streaming: bool = False
+    json_schema: bool = False
+    multiple_choices: bool = False  # one request can return ``n`` completions
+    context_window: Optional[int] = None  # prompt + output token limit of the loaded model, if known
+    prefix_caching: bool = False  # reuses the KV cache of a prompt prefix shared with an earlier request
+    batching: bool = False  # one request can carry several different prompts
+
+
+@dataclass
+class LLMCompletion:
+    """Result of a single LLM generation with usage and timing."""
+    content: str
+    model: Optional[str] = None
+    finish_reason: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    wall_time_ms: Optional[float] = None
+    ttft_ms: Optional[float] = None
+    batch_size: Optional[int] = None  # calls sent together in one backend request, when micro-batched
+    batch_wait_ms: Optional[float] = None  # time spent waiting for the batch to fill
+
+    @property
+    def truncated(self) -> bool:
+        """Whether generation stopped because it hit max_tokens."""
+        return self.finish_reason == "length"
+
+    @property
+    def total_tokens(self) -> Optional[int]:
+        if self.prompt_tokens is None or self.completion_tokens is None:
+            return None
+        return self.prompt_tokens + self.completion_tokens
+
+    def usage_metadata(self) -> dict:
+        """Usage and timing block for OptimizedPrompt.metadata."""
+        usage = {
+            "model": self.model,
+            "finish_reason": self.finish_reason,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "wall_time_ms": self.wall_time_ms,
+            "ttft_ms": self.ttft_ms
+        }
+        if self.batch_size is not None:
+            usage["batch_size"] = self.batch_size
+            usage["batch_wait_ms"] = self.batch_wait_ms
+        return usage
+
+
+@dataclass
+class TokenEstimate:
+    """Predicted size and latency of an LLM request, computed locally before sending it."""
+    input_tokens: int
+    predicted_output_tokens: int
+    estimated_latency_ms: float
+    context_window: Optional[int]
+    tokenizer: str
+    exact: bool
+    candidates: int = 1  # best-of-n requests generate this many outputs in parallel
+
+    @property
+    def total_output_tokens(self) -> int:
+        return self.predicted_output_tokens * self.candidates
+
+    @property
+    def fits_context(self) -> bool:
+        """Whether the prompt plus the predicted output fit in the model's context window."""
+        return self.context_window is None or self.input_tokens + self.predicted_output_tokens <= self.context_window
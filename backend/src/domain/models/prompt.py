@@ -20,6 +20,7 @@ class OptimizationRequest:
     target_vendor: VendorType
     context: Optional[str] = None
     max_length: Optional[int] = None
+    best_of: int = 1
 
 
 @dataclass
@@ -32,6 +33,18 @@ class OptimizedPrompt:
     metadata: dict
 
 
+@dataclass
+class RefinementRequest:
+    """Request to revise an earlier optimization after the prompt was edited or feedback given.
+
+    The earlier result is either ``previous`` or the history entry ``parent_id``.
+    """
+    edited_prompt: Optional[str] = None
+    feedback: Optional[str] = None
+    parent_id: Optional[int] = None
+    previous: Optional[OptimizedPrompt] = None
+
+
 @dataclass
 class PromptScore:
     """Scoring metrics for a prompt."""
@@ -40,3 +53,35 @@ class PromptScore:
     structure: float
     vendor_compliance: float
     overall: float
+
+
+@dataclass
+class PromptFeatures:
+    """Text features of a prompt, extracted once and shared by all scoring rules."""
+    word_count: int
+    sentence_count: int
+    avg_sentence_words: float
+    line_count: int
+    list_items: int
+    headings: int
+    xml_tags: int
+    code_blocks: int
+    task_verbs: int
+    constraint_markers: int
+    format_markers: int
+    vague_terms: int
+    numbers: int
+    has_role: bool
+    has_response_language: bool
+    ascii_ratio: float
+
+
+@dataclass(frozen=True)
+class ExampleTransformation:
+    """A few-shot example: a user prompt and its optimized version for a vendor."""
+    language: str
+    prompt: str
+    optimized: str
+
+    def render(self) -> str:
+        return f'User ({self.language}): "{self.prompt}"\nOptimized: "{self.optimized}"'
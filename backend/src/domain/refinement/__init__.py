@@ -0,0 +1,14 @@
+"""Incremental refinement: prompt diffs sent to the LLM and the edit blocks it answers with."""
+
+from .prompt_diff import PromptEdit, diff_prompts, describe_changes
+from .revisions import Revision, parse_revisions, apply_revisions, NO_CHANGES
+
+__all__ = [
+    "PromptEdit",
+    "diff_prompts",
+    "describe_changes",
+    "Revision",
+    "parse_revisions",
+    "apply_revisions",
+    "NO_CHANGES"
+]
@@ -0,0 +1,64 @@
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import List
+
+TOKEN = re.compile(r"\s+|\S+")
+# Words before an edit quoted to say where it happened
+CONTEXT_WORDS = 3
+
+
+@dataclass
+class PromptEdit:
+    """One word-level change between two versions of a prompt."""
+    before: str
+    after: str
+    context: str  # the words just before the change, empty at the start of the prompt
+
+    def render(self) -> str:
+        where = f' (after "{self.context}")' if self.context else " (at the start)"
+        if not self.before:
+            return f'- insert "{self.after}"{where}'
+        if not self.after:
+            return f'- delete "{self.before}"{where}'
+        return f'- replace "{self.before}" with "{self.after}"{where}'
+
+
+def diff_prompts(original: str, edited: str) -> List[PromptEdit]:
+    """Word-level edits turning ``original`` into ``edited``; whitespace-only changes are ignored.
+
+    Changes separated only by whitespace are merged, so "a beginner" -> "an intern" is one edit.
+    """
+    old = TOKEN.findall(original)
+    new = TOKEN.findall(edited)
+    spans: List[List[int]] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+        if tag == "equal":
+            continue
+        if spans and all(token.isspace() for token in old[spans[-1][1]:i1]):
+            spans[-1][1], spans[-1][3] = i2, j2
+        else:
+            spans.append([i1, i2, j1, j2])
+
+    edits = []
+    for i1, i2, j1, j2 in spans:
+        before = "".join(old[i1:i2]).strip()
+        after = "".join(new[j1:j2]).strip()
+        if before == after:
+            continue
+        context = [token for token in old[:i1] if not token.isspace()][-CONTEXT_WORDS:]
+        edits.append(PromptEdit(before=before, after=after, context=" ".join(context)))
+    return edits
+
+
+def describe_changes(original: str, edited: str) -> str:
+    """How the prompt changed, as an edit list, or the whole new prompt when that is shorter.
+
+    Empty when nothing but whitespace changed.
+    """
+    edits = diff_prompts(original, edited)
+    if not edits:
+        return ""
+    listed = "The user edited their original prompt:\n" + "\n".join(edit.render() for edit in edits)
+    rewritten = f'The user rewrote their original prompt; it now reads:\n"{edited.strip()}"'
+    return listed if len(listed) <= len(rewritten) else rewritten
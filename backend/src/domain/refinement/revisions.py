@@ -0,0 +1,41 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Reply meaning the optimized prompt already satisfies the change
+NO_CHANGES = "NO_CHANGES"
+
+EDIT_BLOCK = re.compile(r"<<<<<<< FIND\n(.*?)\n=======\n(.*?)\n?>>>>>>> REPLACE", re.DOTALL)
+
+
+@dataclass
+class Revision:
+    """Replace the first occurrence of ``find`` in the optimized prompt with ``replace``."""
+    find: str
+    replace: str
+
+
+def parse_revisions(reply: str) -> Optional[List[Revision]]:
+    """Edit blocks in an LLM reply; an empty list for NO_CHANGES and None if the reply has neither."""
+    blocks = EDIT_BLOCK.findall(reply)
+    if blocks:
+        return [Revision(find=find, replace=replace) for find, replace in blocks]
+    if reply.strip() == NO_CHANGES:
+        return []
+    return None
+
+
+def apply_revisions(prompt: str, revisions: List[Revision]) -> Optional[str]:
+    """Apply the revisions in order; None if any FIND text is not in the prompt.
+
+    A partially applied revision is worse than none, so one miss rejects them all.
+    """
+    for revision in revisions:
+        find = revision.find
+        if find not in prompt:
+            # Models often drop the indentation or trailing spaces of the quoted text
+            find = find.strip()
+        if not find or find not in prompt:
+            return None
+        prompt = prompt.replace(find, revision.replace if find == revision.find else revision.replace.strip(), 1)
+    return prompt
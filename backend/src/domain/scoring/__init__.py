@@ -0,0 +1,5 @@
+"""Heuristic prompt scoring."""
+
+from .prompt_scorer import PromptScorer, extract_features
+
+__all__ = ["PromptScorer", "extract_features"]
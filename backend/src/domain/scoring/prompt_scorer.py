@@ -0,0 +1,132 @@
+import re
+from typing import List
+from ..models import VendorType, PromptScore, PromptFeatures
+from ..registries import VendorRegistry
+
+
+def _words(*terms: str) -> re.Pattern:
+    return re.compile(r"\b(?:" + "|".join(terms) + r")\b")
+
+
+TASK_VERBS = _words(
+    "write", "create", "explain", "describe", "summari[sz]e", "analy[sz]e", "list", "generate",
+    "compare", "review", "implement", "design", "build", "translate", "draft", "evaluate", "outline",
+    "refactor", "debug", "calculate", "classify", "extract", "rewrite", "plan", "propose", "identify"
+)
+CONSTRAINT_MARKERS = _words(
+    "must", "should", "include", "avoid", "exclude", "only", "at least", "at most", "no more than",
+    "within", "limit", "maximum", "minimum", "ensure", "do not", "don't", "never", "always"
+)
+FORMAT_MARKERS = _words(
+    "json", "table", "bullets?", "markdown", "format", "headings?", "sections?", "paragraphs?",
+    "step-by-step", "steps", "csv", "yaml", "code block", "examples?"
+)
+VAGUE_TERMS = _words(
+    "something", "stuff", "things?", "anything", "whatever", "maybe", "somehow", "etc", "kind of", "sort of"
+)
+ROLE = re.compile(r"\b(?:you are|act as|as an? (?:expert|senior|experienced))\b")
+RESPONSE_LANGUAGE = re.compile(r"\brespond in [a-z]+")
+NUMBER = re.compile(r"\b\d+\b")
+WORD = re.compile(r"\w+")
+SENTENCE_END = re.compile(r"[.!?]+(?:\s|$)|\n+")
+# Line items ("1.", "-", "•") and inline enumerations ("Include: 1) ..., 2) ...")
+LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+|(?<=\s)\d+\)\s", re.MULTILINE)
+HEADING = re.compile(r"^\s*#{1,6}\s", re.MULTILINE)
+XML_CLOSING_TAG = re.compile(r"</[A-Za-z_][\w-]*>")
+
+WEIGHTS = {"clarity": 0.3, "specificity": 0.3, "structure": 0.15, "vendor_compliance": 0.25}
+
+
+def _clamp(value: float) -> float:
+    return max(0.0, min(1.0, value))
+
+
+def extract_features(prompt: str) -> PromptFeatures:
+    """Extract the text features all scoring rules work from."""
+    text = prompt.lower()
+    word_count = len(WORD.findall(text))
+    sentence_count = max(1, len([s for s in SENTENCE_END.split(prompt) if s.strip()]))
+    letters = [c for c in prompt if c.isalpha()]
+    return PromptFeatures(
+        word_count=word_count,
+        sentence_count=sentence_count,
+        avg_sentence_words=word_count / sentence_count,
+        line_count=len([line for line in prompt.splitlines() if line.strip()]),
+        list_items=len(LIST_ITEM.findall(prompt)),
+        headings=len(HEADING.findall(prompt)),
+        xml_tags=len(XML_CLOSING_TAG.findall(prompt)),
+        code_blocks=prompt.count("```") // 2,
+        task_verbs=len(TASK_VERBS.findall(text)),
+        constraint_markers=len(CONSTRAINT_MARKERS.findall(text)),
+        format_markers=len(FORMAT_MARKERS.findall(text)),
+        vague_terms=len(VAGUE_TERMS.findall(text)),
+        numbers=len(NUMBER.findall(text)),
+        has_role=bool(ROLE.search(text)),
+        has_response_language=bool(RESPONSE_LANGUAGE.search(text)),
+        ascii_ratio=sum(c.isascii() for c in letters) / len(letters) if letters else 1.0
+    )
+
+
+class PromptScorer:
+    """LLM-free heuristic prompt scoring on a 0-1 scale.
+
+    Clarity, specificity and structure come from generic text features; vendor
+    compliance is delegated to the vendor adapter's ``score_compliance``.
+    """
+
+    def score(self, prompt: str, vendor: VendorType) -> PromptScore:
+        """Score a single prompt for a vendor."""
+        return self.score_many([prompt], vendor)[0]
+
+    def score_many(self, prompts: List[str], vendor: VendorType) -> List[PromptScore]:
+        """Score a batch of prompts for one vendor, resolving the adapter once."""
+        adapter = VendorRegistry.get(vendor)
+        scores = []
+        for prompt in prompts:
+            features = extract_features(prompt)
+            metrics = {
+                "clarity": self._clarity(features),
+                "specificity": self._specificity(features),
+                "structure": self._structure(features),
+                "vendor_compliance": _clamp(adapter.score_compliance(features))
+            }
+            overall = sum(WEIGHTS[name] * value for name, value in metrics.items())
+            scores.append(PromptScore(
+                **{name: round(value, 3) for name, value in metrics.items()},
+                overall=round(overall, 3)
+            ))
+        return scores
+
+    @staticmethod
+    def _clarity(f: PromptFeatures) -> float:
+        sentence_length = 1.0 if f.avg_sentence_words <= 25 else _clamp(1 - (f.avg_sentence_words - 25) / 25)
+        vagueness = _clamp(10 * f.vague_terms / max(f.word_count, 1))
+        return _clamp(
+            0.35 * (f.task_verbs > 0)
+            + 0.25 * sentence_length
+            + 0.2 * min(1.0, f.word_count / 8)
+            + 0.2 * (1 - vagueness)
+        )
+
+    @staticmethod
+    def _specificity(f: PromptFeatures) -> float:
+        return _clamp(
+            0.3 * min(1.0, f.word_count / 60)
+            + 0.3 * min(1.0, f.constraint_markers / 3)
+            + 0.2 * min(1.0, f.format_markers / 2)
+            + 0.1 * min(1.0, f.numbers / 2)
+            + 0.1 * f.has_role
+        )
+
+    @staticmethod
+    def _structure(f: PromptFeatures) -> float:
+        structure = _clamp(
+            0.4 * min(1.0, f.list_items / 3)
+            + 0.3 * (f.headings + f.xml_tags > 0)
+            + 0.2 * (f.line_count > 2)
+            + 0.1 * (f.code_blocks > 0)
+        )
+        if f.word_count < 25:
+            # Short, single-purpose prompts don't need sections or lists
+            structure = max(structure, 0.7)
+        return structure
@@ -1,5 +1,72 @@
+from typing import List
 from ..interfaces import IVendorAdapter
-from ..models import VendorType
+from ..models import VendorType, PromptFeatures, ExampleTransformation
+
+EXAMPLES = [
+    ExampleTransformation(
+        "Russian",
+        "напиши код для сортировки массива",
+        "You are an expert programmer. Write a clean, efficient implementation of an array sorting algorithm. "
+        "Include: 1) The main sorting function, 2) Time complexity analysis, 3) A usage example with sample data. "
+        "Use clear variable names and add brief comments."
+    ),
+    ExampleTransformation(
+        "English",
+        "analyze this business proposal",
+        "<task>You are a business analyst. Analyze the following business proposal.</task>\n\n"
+        "<instructions>\n"
+        "1. Evaluate market viability\n"
+        "2. Assess financial projections\n"
+        "3. Identify risks and opportunities\n"
+        "4. Provide actionable recommendations\n"
+        "</instructions>\n\n"
+        "<output_format>\n"
+        "Structure your analysis with clear headings for each section.\n"
+        "</output_format>"
+    ),
+    ExampleTransformation(
+        "English",
+        "summarize this research paper",
+        "<task>You are a research scientist. Summarize the research paper in the <document> tags.</task>\n\n"
+        "<document>\n[paper text]\n</document>\n\n"
+        "<instructions>\n"
+        "1. State the research question and why it matters\n"
+        "2. Describe the methodology in two or three sentences\n"
+        "3. List the key findings with their supporting evidence\n"
+        "4. Note the limitations the authors acknowledge\n"
+        "</instructions>\n\n"
+        "Keep the summary under 300 words."
+    ),
+    ExampleTransformation(
+        "Russian",
+        "помоги написать письмо клиенту о задержке заказа",
+        "You are an experienced customer success manager. Write a polite, professional email to a client "
+        "informing them that their order is delayed. Apologize sincerely without over-explaining, give the new "
+        "expected delivery date, and offer a concrete gesture of goodwill. Keep it under 150 words with a warm "
+        "but businesslike tone."
+    ),
+    ExampleTransformation(
+        "English",
+        "refactor this legacy python module",
+        "<task>You are a senior Python engineer. Refactor the legacy module below without changing its "
+        "behavior.</task>\n\n"
+        "<code>\n[module source]\n</code>\n\n"
+        "<constraints>\n"
+        "- Keep the public function signatures unchanged\n"
+        "- Add type hints and split functions longer than 40 lines\n"
+        "- Replace duplicated logic with shared helpers\n"
+        "</constraints>\n\n"
+        "Think step-by-step about risky changes first, then return the refactored code followed by a short "
+        "list of what changed and why."
+    ),
+    ExampleTransformation(
+        "Spanish",
+        "escribe un cuento corto para niños",
+        "You are an award-winning children's author. Write a short bedtime story (about 400 words) for "
+        "children aged 5-7. Give it a friendly animal protagonist, a small problem solved through kindness or "
+        "curiosity, simple vocabulary, and a gentle, reassuring ending."
+    ),
+]
 
 
 class ClaudeAdapter(IVendorAdapter):
@@ -9,15 +76,13 @@ class ClaudeAdapter(IVendorAdapter):
     def vendor_type(self) -> VendorType:
         return VendorType.CLAUDE
 
-    def get_system_instructions(self) -> str:
+    def get_core_instructions(self) -> str:
         return """You are optimizing prompts for Claude (Anthropic) models - specifically Claude Sonnet 4.5.
 
 CRITICAL RULES:
-1. **Language Detection**: Detect the user's original prompt language
-2. **Response Language**: Add "Respond in [detected language]" at the END
-3. **Prompt Language**: Write optimized prompt in ENGLISH
-4. **XML for Structure**: Claude works BEST with XML tags for structure (if needed)
-5. **No Forced Templates**: Add XML only if it helps organize complex requests
+1. **Prompt Language**: Write optimized prompt in ENGLISH
+2. **XML for Structure**: Claude works BEST with XML tags for structure (if needed)
+3. **No Forced Templates**: Add XML only if it helps organize complex requests
 
 Claude Sonnet 4.5 best practices:
 - Claude excels at long-form content and detailed analysis
@@ -27,32 +92,11 @@ Claude Sonnet 4.5 best practices:
 - Claude is great at following multi-step instructions
 - Use "thinking" blocks for complex reasoning: ask Claude to think step-by-step
 
-Example transformations:
-User (Russian): "напиши код для сортировки массива"
-Optimized: "You are an expert programmer. Write a clean, efficient
-implementation of an array sorting algorithm. Include: 1) The main
-sorting function, 2) Time complexity analysis, 3) A usage example
-with sample data. Use clear variable names and add brief comments.
-Respond in Russian."
-
-User (English - complex task): "analyze this business proposal"
-Optimized: "<task>You are a business analyst. Analyze the following business proposal.</task>
-
-<instructions>
-1. Evaluate market viability
-2. Assess financial projections
-3. Identify risks and opportunities
-4. Provide actionable recommendations
-</instructions>
-
-<output_format>
-Structure your analysis with clear headings for each section.
-</output_format>
-
-Respond in English."
-
 Return ONLY the enhanced prompt."""
 
+    def get_examples(self) -> List[ExampleTransformation]:
+        return list(EXAMPLES)
+
     def get_enhancement_notes(self) -> str:
         return (
             "Enhanced for Claude Sonnet 4.5: Conversational tone with "
@@ -78,3 +122,9 @@ Return ONLY the enhanced prompt."""
                 "computer-use"
             ]
         }
+
+    def score_compliance(self, features: PromptFeatures) -> float:
+        # XML tags are only expected once a request is complex enough to need sections
+        complex_request = features.word_count >= 40 or features.list_items >= 3
+        xml = min(1.0, features.xml_tags / 3) if complex_request else 1.0
+        return 0.6 * super().score_compliance(features) + 0.4 * xml
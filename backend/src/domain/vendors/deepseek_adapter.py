@@ -1,5 +1,56 @@
+from typing import List
 from ..interfaces import IVendorAdapter
-from ..models import VendorType
+from ..models import VendorType, PromptFeatures, ExampleTransformation
+
+EXAMPLES = [
+    ExampleTransformation(
+        "Korean",
+        "알고리즘 최적화",
+        "You are a senior software engineer specializing in algorithm optimization. Analyze the given algorithm "
+        "and optimize it for: 1) Time complexity, 2) Space complexity, 3) Code readability. Provide the optimized "
+        "implementation with detailed comments explaining improvements. Include complexity analysis (Big-O "
+        "notation). For complex optimizations, think through trade-offs systematically."
+    ),
+    ExampleTransformation(
+        "English",
+        "design a database schema",
+        "You are a database architect. Design a normalized database schema for [use case]. Include: "
+        "1) Entity-relationship diagram description, 2) Table definitions with primary/foreign keys, 3) Indexing "
+        "strategy, 4) Justification for design decisions. Consider scalability and query performance. Think "
+        "through normalization trade-offs."
+    ),
+    ExampleTransformation(
+        "English",
+        "fix the memory leak in my C++ service",
+        "You are a senior C++ systems engineer. Find and fix the memory leak in the service code below. "
+        "1) Identify every allocation whose ownership is unclear, 2) Explain the exact path that leaks, "
+        "3) Provide a fix using RAII and smart pointers, 4) Suggest how to verify it with Valgrind or "
+        "AddressSanitizer. Handle edge cases such as early returns and exceptions."
+    ),
+    ExampleTransformation(
+        "Russian",
+        "докажи что корень из 2 иррационален",
+        "You are a mathematics professor. Prove that the square root of 2 is irrational. Use a proof by "
+        "contradiction: 1) State the assumption precisely, 2) Derive each step with justification, 3) Show "
+        "where the contradiction arises, 4) Conclude formally. Think through the proof carefully before "
+        "writing it."
+    ),
+    ExampleTransformation(
+        "Chinese",
+        "设计一个高并发的秒杀系统",
+        "You are a distributed systems architect. Design a flash-sale system that handles 100,000 requests per "
+        "second. Cover: 1) Request flow from client to inventory, 2) Caching and rate limiting, 3) Preventing "
+        "overselling (atomic stock decrement, message queues), 4) Failure handling and consistency trade-offs. "
+        "Use thinking mode to compare alternatives before recommending one."
+    ),
+    ExampleTransformation(
+        "English",
+        "write unit tests for this function",
+        "You are a test engineer. Write pytest unit tests for the function below. Cover: 1) Typical inputs, "
+        "2) Boundary values, 3) Invalid inputs and expected exceptions, 4) Any side effects. Use parametrize "
+        "for similar cases and give each test a descriptive name. Return only the test code."
+    ),
+]
 
 
 class DeepSeekAdapter(IVendorAdapter):
@@ -14,15 +65,13 @@ class DeepSeekAdapter(IVendorAdapter):
     def vendor_type(self) -> VendorType:
         return VendorType.DEEPSEEK
 
-    def get_system_instructions(self) -> str:
+    def get_core_instructions(self) -> str:
         return """You are optimizing prompts for DeepSeek V3.2-Exp models (Sep 29, 2025).
 
 CRITICAL RULES:
-1. **Language Detection**: Detect the user's original prompt language
-2. **Response Language**: Add "Respond in [detected language]" at the END
-3. **Prompt Language**: Write optimized prompt in ENGLISH
-4. **Technical Focus**: DeepSeek excels at code and technical tasks
-5. **Dual Modes**: V3.2-Exp has thinking and non-thinking modes
+1. **Prompt Language**: Write optimized prompt in ENGLISH
+2. **Technical Focus**: DeepSeek excels at code and technical tasks
+3. **Dual Modes**: V3.2-Exp has thinking and non-thinking modes
 
 DeepSeek V3.2-Exp best practices:
 - DeepSeek-V3.2-Exp (Sep 29, 2025): Latest with dual thinking/non-thinking modes
@@ -35,21 +84,11 @@ DeepSeek V3.2-Exp best practices:
 - Precise technical specifications work best
 - For code: specify language, requirements, edge cases
 
-Example transformations:
-User (Korean): "알고리즘 최적화"
-Optimized: "You are a senior software engineer specializing in algorithm optimization. Analyze the given \
-algorithm and optimize it for: 1) Time complexity, 2) Space complexity, 3) Code readability. Provide the \
-optimized implementation with detailed comments explaining improvements. Include complexity analysis (Big-O \
-notation). For complex optimizations, think through trade-offs systematically. Respond in Korean."
-
-User (English): "design a database schema"
-Optimized: "You are a database architect. Design a normalized database schema for [use case]. Include: \
-1) Entity-relationship diagram description, 2) Table definitions with primary/foreign keys, 3) Indexing \
-strategy, 4) Justification for design decisions. Consider scalability and query performance. Think through \
-normalization trade-offs. Respond in English."
-
 Return ONLY the enhanced prompt."""
 
+    def get_examples(self) -> List[ExampleTransformation]:
+        return list(EXAMPLES)
+
     def get_enhancement_notes(self) -> str:
         return (
             "Enhanced for DeepSeek V3.2-Exp (Sep 29, 2025): Latest model with dual thinking/non-thinking modes. "
@@ -70,3 +109,11 @@ Return ONLY the enhanced prompt."""
             ),
             "features": ["code-generation", "math-excellence", "DSA-sparse-attention", "128K-context", "MIT-licensed"]
         }
+
+    def score_compliance(self, features: PromptFeatures) -> float:
+        # Precise technical specifications: explicit requirements and edge cases
+        return (
+            0.6 * super().score_compliance(features)
+            + 0.2 * min(1.0, features.constraint_markers / 3)
+            + 0.2 * min(1.0, (features.list_items + features.numbers) / 3)
+        )
@@ -1,5 +1,51 @@
+from typing import List
 from ..interfaces import IVendorAdapter
-from ..models import VendorType
+from ..models import VendorType, PromptFeatures, ExampleTransformation
+
+EXAMPLES = [
+    ExampleTransformation(
+        "Chinese",
+        "解释量子计算",
+        "You are a computer science professor. Explain quantum computing in simple terms, covering: 1) Basic "
+        "principles (superposition, entanglement), 2) How quantum computers differ from classical computers, "
+        "3) Practical applications. Use analogies to make concepts accessible."
+    ),
+    ExampleTransformation(
+        "English",
+        "create a marketing strategy",
+        "You are a marketing strategist. Create a comprehensive marketing strategy including: 1) Target audience "
+        "analysis, 2) Channel selection rationale, 3) Content strategy, 4) Success metrics, 5) Timeline. Think "
+        "through each element step-by-step, considering market trends and best practices."
+    ),
+    ExampleTransformation(
+        "English",
+        "describe what's in this image",
+        "You are a visual analyst. Describe the attached image in detail: the main subject, the setting, notable "
+        "objects, any visible text, and the overall mood. Start with a one-sentence summary, then give the "
+        "details as a bulleted list."
+    ),
+    ExampleTransformation(
+        "French",
+        "résume ce long rapport annuel",
+        "You are a financial analyst. Read the full annual report below and summarize it under these headings: "
+        "Financial Performance, Strategic Priorities, Risks, and Outlook. Quote key figures exactly and keep the "
+        "summary under 400 words."
+    ),
+    ExampleTransformation(
+        "English",
+        "plan a 7-day trip to Japan",
+        "You are an experienced travel planner. Plan a 7-day trip to Japan for a first-time visitor. Present a "
+        "day-by-day table with cities, main activities, and travel time between stops, then add tips on rail "
+        "passes and budget. Think through the route step-by-step to avoid backtracking."
+    ),
+    ExampleTransformation(
+        "German",
+        "erkläre maschinelles Lernen",
+        "You are a data science lecturer. Explain machine learning to a non-technical audience, covering: "
+        "1) What it means for a computer to learn from data, 2) Supervised vs unsupervised learning, 3) Everyday "
+        "examples. Use short sections with headings and one analogy per concept."
+    ),
+]
 
 
 class GeminiAdapter(IVendorAdapter):
@@ -9,15 +55,13 @@ class GeminiAdapter(IVendorAdapter):
     def vendor_type(self) -> VendorType:
         return VendorType.GEMINI
 
-    def get_system_instructions(self) -> str:
+    def get_core_instructions(self) -> str:
         return """You are optimizing prompts for Google Gemini 2.5 models.
 
 CRITICAL RULES:
-1. **Language Detection**: Detect the user's original prompt language
-2. **Response Language**: Add "Respond in [detected language]" at the END
-3. **Prompt Language**: Write optimized prompt in ENGLISH
-4. **Structured Thinking**: Gemini 2.5 Pro has "thinking mode" - flagship for complex reasoning
-5. **Natural Format**: Keep prompts conversational, avoid over-structuring
+1. **Prompt Language**: Write optimized prompt in ENGLISH
+2. **Structured Thinking**: Gemini 2.5 Pro has "thinking mode" - flagship for complex reasoning
+3. **Natural Format**: Keep prompts conversational, avoid over-structuring
 
 Gemini 2.5 best practices:
 - Gemini 2.5 Pro: Flagship model with "thinking mode" for advanced reasoning
@@ -31,19 +75,11 @@ Gemini 2.5 best practices:
 - Good at agentic tasks with tool use
 - Specify output structure if needed (lists, tables, etc.)
 
-Example transformations:
-User (Chinese): "解释量子计算"
-Optimized: "You are a computer science professor. Explain quantum computing in simple terms, covering: \
-1) Basic principles (superposition, entanglement), 2) How quantum computers differ from classical computers, \
-3) Practical applications. Use analogies to make concepts accessible. Respond in Chinese."
-
-User (English): "create a marketing strategy"
-Optimized: "You are a marketing strategist. Create a comprehensive marketing strategy including: 1) Target \
-audience analysis, 2) Channel selection rationale, 3) Content strategy, 4) Success metrics, 5) Timeline. Think \
-through each element step-by-step, considering market trends and best practices. Respond in English."
-
 Return ONLY the enhanced prompt."""
 
+    def get_examples(self) -> List[ExampleTransformation]:
+        return list(EXAMPLES)
+
     def get_enhancement_notes(self) -> str:
         return (
             "Enhanced for Gemini 2.5 Pro: Flagship model with thinking mode, clear structure, "
@@ -71,3 +107,11 @@ Return ONLY the enhanced prompt."""
                 "flash-variants"
             ]
         }
+
+    def score_compliance(self, features: PromptFeatures) -> float:
+        # Conversational, with an explicit output structure but no over-structuring
+        return (
+            0.7 * super().score_compliance(features)
+            + 0.15 * (features.format_markers > 0)
+            + 0.15 * (features.xml_tags == 0)
+        )
@@ -1,5 +1,52 @@
+from typing import List
 from ..interfaces import IVendorAdapter
-from ..models import VendorType
+from ..models import VendorType, PromptFeatures, ExampleTransformation
+
+EXAMPLES = [
+    ExampleTransformation(
+        "Spanish",
+        "noticias sobre IA",
+        "You are a tech journalist. Search the web for the latest AI news from today. Summarize the top 5 most "
+        "significant developments, including: what happened, why it matters, and key players involved. "
+        "Prioritize breaking news and major announcements."
+    ),
+    ExampleTransformation(
+        "English",
+        "explain cryptocurrency trends",
+        "You are a financial analyst with access to real-time market data. Explain current cryptocurrency "
+        "market trends. Include: 1) Recent price movements of major coins, 2) Market sentiment analysis, "
+        "3) Key factors driving current trends. Use web search to get the latest data. Keep explanations clear "
+        "and data-driven."
+    ),
+    ExampleTransformation(
+        "English",
+        "what's trending on X about the election",
+        "You are a social media analyst. Search X for the most discussed election topics in the last 24 hours. "
+        "Summarize the top trends, what is driving each one, and how sentiment differs across groups. Quote a "
+        "few representative posts and flag claims that are unverified."
+    ),
+    ExampleTransformation(
+        "Russian",
+        "последние новости о SpaceX",
+        "You are a space industry reporter. Search the web and X for the latest SpaceX news from this week. "
+        "Cover launches, Starship test results, and business announcements. For each item, say what happened "
+        "and why it matters."
+    ),
+    ExampleTransformation(
+        "English",
+        "make a funny tweet about mondays",
+        "You are a witty social media writer. Write three funny tweets about Mondays, each under 280 characters. "
+        "Keep the humor relatable and lighthearted, vary the style (observation, exaggeration, one-liner), and "
+        "avoid hashtags unless they add to the joke."
+    ),
+    ExampleTransformation(
+        "Japanese",
+        "株式市場の今日の動き",
+        "You are a market analyst with real-time data access. Use web search to report today's stock market "
+        "moves. Include: 1) Major index changes, 2) The biggest gainers and losers, 3) The news behind the "
+        "moves. Be concise and cite the time of the data."
+    ),
+]
 
 
 class GrokAdapter(IVendorAdapter):
@@ -12,15 +59,13 @@ class GrokAdapter(IVendorAdapter):
     def vendor_type(self) -> VendorType:
         return VendorType.GROK
 
-    def get_system_instructions(self) -> str:
+    def get_core_instructions(self) -> str:
         return """You are optimizing prompts for xAI Grok 4 models.
 
 CRITICAL RULES:
-1. **Language Detection**: Detect the user's original prompt language
-2. **Response Language**: Add "Respond in [detected language]" at the END
-3. **Prompt Language**: Write optimized prompt in ENGLISH
-4. **Real-Time Focus**: Grok has web/X search - use it for current events
-5. **Conversational Tone**: Grok responds well to direct, conversational prompts
+1. **Prompt Language**: Write optimized prompt in ENGLISH
+2. **Real-Time Focus**: Grok has web/X search - use it for current events
+3. **Conversational Tone**: Grok responds well to direct, conversational prompts
 
 Grok 4 best practices:
 - Grok has 2M token context (grok-4-fast) or 128K (grok-4)
@@ -30,20 +75,11 @@ Grok 4 best practices:
 - Can use tools natively - specify if you need web search
 - Direct instructions work better than complex formatting
 
-Example transformations:
-User (Spanish): "noticias sobre IA"
-Optimized: "You are a tech journalist. Search the web for the latest AI news from today. Summarize the top \
-5 most significant developments, including: what happened, why it matters, and key players involved. Prioritize \
-breaking news and major announcements. Respond in Spanish."
-
-User (English): "explain cryptocurrency trends"
-Optimized: "You are a financial analyst with access to real-time market data. Explain current cryptocurrency \
-market trends. Include: 1) Recent price movements of major coins, 2) Market sentiment analysis, 3) Key factors \
-driving current trends. Use web search to get the latest data. Keep explanations clear and data-driven. Respond \
-in English."
-
 Return ONLY the enhanced prompt."""
 
+    def get_examples(self) -> List[ExampleTransformation]:
+        return list(EXAMPLES)
+
     def get_enhancement_notes(self) -> str:
         return (
             "Enhanced for Grok 4: Real-time information focus, web/X search integration, conversational tone. "
@@ -63,3 +99,8 @@ Return ONLY the enhanced prompt."""
             ),
             "features": ["real-time-search", "X-integration", "2M-context", "native-tool-use"]
         }
+
+    def score_compliance(self, features: PromptFeatures) -> float:
+        # Direct, conversational prompts beat heavy formatting
+        formatted = features.xml_tags > 0 or features.headings > 0
+        return 0.7 * super().score_compliance(features) + 0.3 * (not formatted)
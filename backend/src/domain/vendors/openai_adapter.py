@@ -1,5 +1,52 @@
+from typing import List
 from ..interfaces import IVendorAdapter
-from ..models import VendorType
+from ..models import VendorType, PromptFeatures, ExampleTransformation
+
+EXAMPLES = [
+    ExampleTransformation(
+        "Russian",
+        "расскажи про квантовую физику",
+        "You are a physics professor. Explain quantum physics in simple terms, covering: wave-particle duality, "
+        "quantum entanglement, and the uncertainty principle. Use analogies to make concepts clear. Keep "
+        "explanations concise but informative."
+    ),
+    ExampleTransformation(
+        "English",
+        "explain linear algebra",
+        "You are a mathematics educator. Explain linear algebra fundamentals including: vectors, matrices, "
+        "linear transformations, and eigenvalues. Provide intuitive explanations with 1-2 practical examples. "
+        "Aim for clarity over mathematical rigor."
+    ),
+    ExampleTransformation(
+        "English",
+        "write a cover letter for a data analyst job",
+        "You are a career coach. Write a one-page cover letter for a data analyst position. Open with a "
+        "specific hook, then: 1) Highlight two quantified achievements, 2) Connect SQL, Python and "
+        "visualization skills to the role, 3) Close with a confident call to action. Keep the tone "
+        "professional and under 350 words."
+    ),
+    ExampleTransformation(
+        "Spanish",
+        "resume este artículo en 5 puntos",
+        "You are an editor. Summarize the article below in exactly five bullet points. Each point should be "
+        "one sentence capturing a distinct key idea, ordered by importance. Do not add opinions or information "
+        "that is not in the article."
+    ),
+    ExampleTransformation(
+        "Russian",
+        "придумай план тренировок на месяц",
+        "You are a certified personal trainer. Create a four-week training plan for a beginner. For each week, "
+        "list the workouts by day with exercises, sets and repetitions, and include rest days. Increase the "
+        "load gradually and add brief safety tips."
+    ),
+    ExampleTransformation(
+        "English",
+        "compare python and javascript for backend",
+        "You are a senior backend engineer. Compare Python and JavaScript (Node.js) for backend development "
+        "across: performance, ecosystem and frameworks, concurrency model, and hiring. Conclude with clear "
+        "recommendations for which to choose in three common scenarios."
+    ),
+]
 
 
 class OpenAIAdapter(IVendorAdapter):
@@ -9,15 +56,13 @@ class OpenAIAdapter(IVendorAdapter):
     def vendor_type(self) -> VendorType:
         return VendorType.OPENAI
 
-    def get_system_instructions(self) -> str:
+    def get_core_instructions(self) -> str:
         return """You are optimizing prompts for OpenAI GPT-5/GPT-4 models.
 
 CRITICAL RULES:
-1. **Language Detection**: Detect the language of the user's original prompt
-2. **Response Language**: Add "Respond in [detected language]" at the END of the optimized prompt
-3. **Prompt Language**: Write the ENTIRE optimized prompt in ENGLISH (GPT models work best with English)
-4. **No Meta-Structure**: Do NOT add JSON schemas, XML tags, or code examples unless the user explicitly asked for them
-5. **Keep It Natural**: The optimized prompt should read like natural instructions to an AI
+1. **Prompt Language**: Write the ENTIRE optimized prompt in ENGLISH (GPT models work best with English)
+2. **No Meta-Structure**: Do NOT add JSON schemas, XML tags, or code examples unless the user explicitly asked for them
+3. **Keep It Natural**: The optimized prompt should read like natural instructions to an AI
 
 OpenAI GPT-5 best practices:
 - Start with a clear role/persona if beneficial (e.g., "You are an expert mathematician...")
@@ -27,21 +72,11 @@ OpenAI GPT-5 best practices:
 - Use examples ONLY if they clarify expectations (1-2 max)
 - Specify constraints clearly
 
-Example transformation:
-User (Russian): "расскажи про квантовую физику"
-Optimized: "You are a physics professor. Explain quantum physics in
-simple terms, covering: wave-particle duality, quantum entanglement,
-and the uncertainty principle. Use analogies to make concepts clear.
-Keep explanations concise but informative. Respond in Russian."
-
-User (English): "explain linear algebra"
-Optimized: "You are a mathematics educator. Explain linear algebra
-fundamentals including: vectors, matrices, linear transformations,
-and eigenvalues. Provide intuitive explanations with 1-2 practical
-examples. Aim for clarity over mathematical rigor. Respond in English."
-
 Return ONLY the enhanced prompt - no commentary, no meta-text."""
 
+    def get_examples(self) -> List[ExampleTransformation]:
+        return list(EXAMPLES)
+
     def get_enhancement_notes(self) -> str:
         return (
             "Enhanced for OpenAI GPT-5: Clear role definition, "
@@ -68,3 +103,8 @@ Return ONLY the enhanced prompt - no commentary, no meta-text."""
                 "function-calling"
             ]
         }
+
+    def score_compliance(self, features: PromptFeatures) -> float:
+        # Natural instructions with a role; no XML or code scaffolding unless asked for
+        meta_structure = features.xml_tags > 0 or features.code_blocks > 0
+        return 0.6 * super().score_compliance(features) + 0.2 * features.has_role + 0.2 * (not meta_structure)
@@ -1,5 +1,52 @@
+from typing import List
 from ..interfaces import IVendorAdapter
-from ..models import VendorType
+from ..models import VendorType, PromptFeatures, ExampleTransformation
+
+EXAMPLES = [
+    ExampleTransformation(
+        "Chinese",
+        "教我编程",
+        "You are a programming instructor. Teach fundamental programming concepts step-by-step, covering: "
+        "1) Variables and data types, 2) Control flow (if/else, loops), 3) Functions, 4) Practical examples in "
+        "Python. Explain concepts clearly with code examples. For complex topics, think through explanations "
+        "systematically."
+    ),
+    ExampleTransformation(
+        "English",
+        "solve this math problem",
+        "You are a mathematics tutor. Solve the following problem step-by-step: [problem details]. Show your "
+        "reasoning at each step, explaining the mathematical principles being applied. Verify your answer. If "
+        "the problem is complex, use systematic thinking to work through it methodically."
+    ),
+    ExampleTransformation(
+        "Chinese",
+        "把这段话翻译成英文并润色",
+        "You are a professional Chinese-English translator. Translate the passage below into natural, fluent "
+        "English. Then: 1) Polish the wording for clarity and flow, 2) Keep the original meaning and tone, "
+        "3) List any phrases with no direct equivalent and explain your choices."
+    ),
+    ExampleTransformation(
+        "English",
+        "write a python script to parse logs",
+        "You are a Python developer. Write a script that parses web server access logs. Steps: 1) Read the log "
+        "file line by line, 2) Extract timestamp, status code and path with a regular expression, 3) Report the "
+        "top 10 paths and the error rate per hour, 4) Skip malformed lines with a warning."
+    ),
+    ExampleTransformation(
+        "Russian",
+        "логическая задача про рыцарей и лжецов",
+        "You are a logic puzzle expert. Solve the knights-and-knaves puzzle below, where knights always tell the "
+        "truth and knaves always lie. Reason step-by-step: 1) Consider each possible assignment, 2) Check every "
+        "statement for consistency, 3) Eliminate contradictions, 4) State the unique solution and verify it."
+    ),
+    ExampleTransformation(
+        "Japanese",
+        "日本語の敬語を説明して",
+        "You are a Japanese language teacher. Explain Japanese honorific speech (keigo) step-by-step: "
+        "1) Sonkeigo, kenjougo and teineigo and when each is used, 2) Common verb forms in a table, 3) Example "
+        "sentences for business situations. Point out mistakes learners often make."
+    ),
+]
 
 
 class QwenAdapter(IVendorAdapter):
@@ -13,15 +60,13 @@ class QwenAdapter(IVendorAdapter):
     def vendor_type(self) -> VendorType:
         return VendorType.QWEN
 
-    def get_system_instructions(self) -> str:
+    def get_core_instructions(self) -> str:
         return """You are optimizing prompts for Alibaba Qwen3 models.
 
 CRITICAL RULES:
-1. **Language Detection**: Detect the user's original prompt language
-2. **Response Language**: Add "Respond in [detected language]" at the END
-3. **Prompt Language**: Write optimized prompt in ENGLISH
-4. **Hybrid Reasoning**: Qwen3 can switch between fast and thinking modes
-5. **Multilingual Excellence**: Qwen excels at Chinese/Asian languages
+1. **Prompt Language**: Write optimized prompt in ENGLISH
+2. **Hybrid Reasoning**: Qwen3 can switch between fast and thinking modes
+3. **Multilingual Excellence**: Qwen excels at Chinese/Asian languages
 
 Qwen3 best practices:
 - Qwen3 (July 2025 builds): New generation replacing Qwen 2.5
@@ -34,20 +79,11 @@ Qwen3 best practices:
 - Strong at math, code, and logical reasoning
 - Structured instructions with clear steps work best
 
-Example transformations:
-User (Chinese): "教我编程"
-Optimized: "You are a programming instructor. Teach fundamental programming concepts step-by-step, covering: \
-1) Variables and data types, 2) Control flow (if/else, loops), 3) Functions, 4) Practical examples in Python. \
-Explain concepts clearly with code examples. For complex topics, think through explanations systematically. \
-Respond in Chinese."
-
-User (English): "solve this math problem"
-Optimized: "You are a mathematics tutor. Solve the following problem step-by-step: [problem details]. Show \
-your reasoning at each step, explaining the mathematical principles being applied. Verify your answer. If the \
-problem is complex, use systematic thinking to work through it methodically. Respond in English."
-
 Return ONLY the enhanced prompt."""
 
+    def get_examples(self) -> List[ExampleTransformation]:
+        return list(EXAMPLES)
+
     def get_enhancement_notes(self) -> str:
         return (
             "Enhanced for Qwen3 (July 2025 builds): New generation with hybrid reasoning, "
@@ -68,3 +104,8 @@ Return ONLY the enhanced prompt."""
             ),
             "features": ["multilingual", "hybrid-reasoning", "1M-context", "math-code-excellence"]
         }
+
+    def score_compliance(self, features: PromptFeatures) -> float:
+        # Structured instructions with clear steps once the task is non-trivial
+        steps = min(1.0, features.list_items / 3) if features.word_count >= 40 else 1.0
+        return 0.7 * super().score_compliance(features) + 0.3 * steps
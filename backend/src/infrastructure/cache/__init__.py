@@ -0,0 +1,24 @@
+from typing import Optional
+from ...domain.interfaces import IResultCache
+from ..config import settings
+from .memory_cache import InMemoryResultCache
+from .mmap_cache import MmapResultCache
+
+
+def create_result_cache() -> Optional[IResultCache]:
+    """Build the configured result cache backend (``none``, ``memory`` or ``mmap``)."""
+    backend = settings.cache_backend.lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return InMemoryResultCache(max_bytes=settings.cache_max_bytes)
+    if backend == "mmap":
+        return MmapResultCache(
+            settings.cache_mmap_path,
+            max_bytes=settings.cache_max_bytes,
+            num_slots=settings.cache_mmap_slots
+        )
+    raise ValueError(f"Unknown cache backend: {settings.cache_backend}")
+
+
+__all__ = ["InMemoryResultCache", "MmapResultCache", "create_result_cache"]
@@ -0,0 +1,35 @@
+import json
+from collections import OrderedDict
+from typing import Optional
+from ...domain.interfaces import IResultCache
+
+
+class InMemoryResultCache(IResultCache):
+    """Per-process LRU cache bounded by the serialized size of its values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        data = self._entries.get(key)
+        if data is None:
+            return None
+        self._entries.move_to_end(key)
+        return json.loads(data)
+
+    async def set(self, key: str, value: dict) -> None:
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = data
+        self._size += len(data)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
@@ -0,0 +1,187 @@
+"""Node-local result cache shared by all worker processes through a memory-mapped file.
+
+File layout::
+
+    header | slot table (open addressing, linear probing) | data ring
+
+Values are appended to the data ring at a monotonically increasing *logical* offset;
+the physical position is ``logical % capacity``. A record is still intact while fewer
+than ``capacity`` bytes have been written after it, so eviction is FIFO and the data
+region never exceeds the configured byte budget. All access is serialized with
+``flock`` (shared for reads, exclusive for writes), which works across processes; the
+async methods take it without blocking, polling with a growing interval while another process
+holds it, and give up after ``LOCK_TIMEOUT_SECONDS``: a read is then a miss and a write is skipped.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Optional, Tuple
+from ...domain.interfaces import IResultCache
+
+MAGIC = b"POCACHE1"
+HEADER = struct.Struct("<8sIIQQ")      # magic, version, num_slots, capacity, write_pos
+SLOT = struct.Struct("<QQI4x")          # key hash, logical offset, record length
+RECORD = struct.Struct("<QII")          # key hash, key length, value length
+VERSION = 1
+MAX_PROBE = 8
+# Poll interval while another process holds the lock, doubling up to the maximum; critical
+# sections last microseconds, so a long wait means contention and a miss is cheaper
+LOCK_RETRY_SECONDS = 0.0005
+LOCK_MAX_RETRY_SECONDS = 0.02
+LOCK_TIMEOUT_SECONDS = 0.25
+
+
+def _key_hash(key: bytes) -> int:
+    # 0 marks an empty slot, so never hand it out
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+class MmapResultCache(IResultCache):
+    """Cross-process, restart-surviving cache on a lock-protected memory-mapped hash table."""
+
+    def __init__(self, path: str, max_bytes: int, num_slots: int = 65536):
+        self.path = path
+        self.capacity = max_bytes
+        self.num_slots = num_slots
+        self._slots_offset = HEADER.size
+        self._data_offset = HEADER.size + num_slots * SLOT.size
+        size = self._data_offset + max_bytes
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked(fcntl.LOCK_EX):
+            if not self._has_valid_header(size):
+                # New file or different geometry: start from an empty table
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, VERSION, num_slots, max_bytes, 0), 0)
+        self._mm = mmap.mmap(self._fd, size)
+
+    def _has_valid_header(self, size: int) -> bool:
+        if os.fstat(self._fd).st_size != size:
+            return False
+        magic, version, num_slots, capacity, _ = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+        return (magic, version, num_slots, capacity) == (MAGIC, VERSION, self.num_slots, self.capacity)
+
+    @contextmanager
+    def _locked(self, mode: int):
+        fcntl.flock(self._fd, mode)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @asynccontextmanager
+    async def _locked_async(self, mode: int) -> AsyncIterator[bool]:
+        """Like ``_locked``, but waits on the event loop instead of blocking it; yields whether it got the lock."""
+        loop = asyncio.get_running_loop()
+        give_up = loop.time() + LOCK_TIMEOUT_SECONDS
+        retry = LOCK_RETRY_SECONDS
+        while True:
+            try:
+                fcntl.flock(self._fd, mode | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if loop.time() + retry > give_up:
+                    yield False
+                    return
+                await asyncio.sleep(retry)
+                retry = min(retry * 2, LOCK_MAX_RETRY_SECONDS)
+        try:
+            yield True
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _write_pos(self) -> int:
+        return HEADER.unpack_from(self._mm, 0)[4]
+
+    def _slot(self, index: int) -> Tuple[int, int, int]:
+        return SLOT.unpack_from(self._mm, self._slots_offset + index * SLOT.size)
+
+    def _is_live(self, logical: int, write_pos: int) -> bool:
+        """A record survives until ``capacity`` more bytes have been appended after it."""
+        return write_pos - logical <= self.capacity
+
+    def _find(self, key: bytes, key_hash: int) -> Optional[memoryview]:
+        """Locate ``key`` and return a view of its value bytes in the mapping."""
+        write_pos = self._write_pos()
+        for probe in range(MAX_PROBE):
+            slot_hash, logical, length = self._slot((key_hash + probe) % self.num_slots)
+            if slot_hash == 0:
+                return None
+            if slot_hash != key_hash or not self._is_live(logical, write_pos):
+                continue
+
+            start = self._data_offset + logical % self.capacity
+            record_hash, key_len, value_len = RECORD.unpack_from(self._mm, start)
+            key_start = start + RECORD.size
+            view = memoryview(self._mm)
+            if record_hash == key_hash and view[key_start:key_start + key_len] == key:
+                return view[key_start + key_len:key_start + key_len + value_len]
+        return None
+
+    async def get(self, key: str) -> Optional[dict]:
+        key_bytes = key.encode("utf-8")
+        async with self._locked_async(fcntl.LOCK_SH) as locked:
+            value = self._find(key_bytes, _key_hash(key_bytes)) if locked else None
+            if value is None:
+                return None
+            try:
+                # Decode while the lock is held; a writer may reuse these bytes afterwards
+                return json.loads(str(value, "utf-8"))
+            finally:
+                value.release()
+
+    def _choose_slot(self, key_hash: int, write_pos: int) -> int:
+        """Pick the slot for ``key_hash``: same key, then empty or stale, else the oldest."""
+        candidates = [(key_hash + probe) % self.num_slots for probe in range(MAX_PROBE)]
+        for index in candidates:
+            if self._slot(index)[0] == key_hash:
+                return index
+        for index in candidates:
+            slot_hash, logical, _ = self._slot(index)
+            if slot_hash == 0 or not self._is_live(logical, write_pos):
+                return index
+        return min(candidates, key=lambda index: self._slot(index)[1])
+
+    async def set(self, key: str, value: dict) -> None:
+        key_bytes = key.encode("utf-8")
+        value_bytes = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        length = RECORD.size + len(key_bytes) + len(value_bytes)
+        if length > self.capacity:
+            return
+
+        key_hash = _key_hash(key_bytes)
+        async with self._locked_async(fcntl.LOCK_EX) as locked:
+            if not locked:
+                return
+            logical = self._write_pos()
+            physical = logical % self.capacity
+            if physical + length > self.capacity:
+                # Records never wrap; skip the tail of the ring
+                logical += self.capacity - physical
+                physical = 0
+            write_pos = logical + length
+
+            start = self._data_offset + physical
+            RECORD.pack_into(self._mm, start, key_hash, len(key_bytes), len(value_bytes))
+            self._mm[start + RECORD.size:start + length] = key_bytes + value_bytes
+
+            index = self._choose_slot(key_hash, write_pos)
+            SLOT.pack_into(self._mm, self._slots_offset + index * SLOT.size, key_hash, logical, length)
+            HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self.num_slots, self.capacity, write_pos)
+
+    async def close(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+            os.close(self._fd)
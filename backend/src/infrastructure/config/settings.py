@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,6 +17,22 @@ class Settings(BaseSettings):
     app_host: str = "0.0.0.0"  # nosec B104 - Required for Docker container networking
     app_port: int = 8000
     log_level: str = "INFO"
+    # "json" (one structured object per line) or "text"
+    log_format: str = "json"
+    # Share of records below WARNING kept per logger family, e.g. "api.access=0.1,httpx=0.05"
+    log_sample_rates: str = ""
+    # Fields passed via ``extra=`` that are never written; other long values are truncated
+    log_redact_fields: str = "authorization,api_key,token,password,prompt,context,answers,messages"
+    log_max_field_chars: int = 1024
+    # How often in-flight optimization requests check whether the client is still connected
+    disconnect_poll_interval_ms: int = 250
+
+    # Request deadlines: per-endpoint defaults, overridable (up to the max) by X-Request-Timeout-Ms
+    deadline_optimize_ms: int = 90000
+    deadline_generate_questions_ms: int = 60000
+    deadline_optimize_with_answers_ms: int = 110000
+    deadline_refine_ms: int = 90000
+    deadline_max_ms: int = 300000
 
     # LM Studio
     lm_studio_base_url: str = "http://127.0.0.1:1234/v1"
@@ -25,7 +41,99 @@ class Settings(BaseSettings):
     lm_studio_max_tokens: int = 2048
     lm_studio_temperature: float = 0.7
     lm_studio_top_p: float = 0.9
+    lm_studio_stream: bool = True
     request_timeout_seconds: int = 120
+    lm_studio_max_connections: int = 16
+    # Retries for connection failures and 429/502/503/504, with exponential backoff
+    lm_studio_max_retries: int = 2
+    lm_studio_retry_backoff_ms: int = 250
+    # Adaptive (AIMD) limit on in-flight LLM requests, driven by latency relative to the no-load baseline
+    llm_adaptive_concurrency: bool = True
+    llm_concurrency_initial: int = 4
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 16
+    llm_latency_tolerance: float = 2.0
+    llm_concurrency_backoff: float = 0.75
+    # Structured output (response_format json_schema), supported by LM Studio 0.3+
+    lm_studio_json_schema: bool = True
+    # Backend honours the OpenAI ``n`` parameter (LM Studio ignores it; vLLM and OpenAI support it)
+    lm_studio_multiple_choices: bool = False
+    # Context length of the loaded model; requests that cannot fit are rejected before the LLM call
+    # (unset to disable the check)
+    lm_studio_context_window: Optional[int] = 8192
+
+    # LLM backend driver: "lm_studio" (any OpenAI-compatible server), "llama_cpp", "ollama" or "vllm".
+    # Pool, retry, streaming and top_p settings above apply to every driver
+    llm_backend: str = "lm_studio"
+    # llama.cpp server (``llama-server``)
+    llama_cpp_base_url: str = "http://127.0.0.1:8080/v1"
+    llama_cpp_api_key: Optional[str] = None
+    # Server slots (``--parallel``); when set, both Think Mode steps of a prompt are pinned to one
+    # slot (``id_slot``) so the final step reuses the KV cache of the questions step
+    llama_cpp_slots: Optional[int] = None
+    # Context length of one slot (``--ctx-size`` divided by ``--parallel``)
+    llama_cpp_context_window: Optional[int] = 8192
+    # Ollama
+    ollama_base_url: str = "http://127.0.0.1:11434"
+    ollama_model: str = "qwen2.5:7b-instruct"
+    # How long Ollama keeps the model loaded after a call (duration such as "30m"; "-1" keeps it loaded)
+    ollama_keep_alive: str = "30m"
+    # Context length requested on every call; also the context window requests are checked against
+    ollama_num_ctx: int = 8192
+    # Load the model at startup so the first request does not wait for it
+    ollama_preload: bool = True
+    # vLLM, or any server taking prompt lists on ``/v1/completions``
+    vllm_base_url: str = "http://127.0.0.1:8001/v1"
+    vllm_api_key: Optional[str] = None
+    vllm_model: Optional[str] = None
+    # Template batched conversations are rendered with: "chatml" or "llama3" (must match the model);
+    # unset disables batching, since a wrong template silently malforms every batched prompt
+    vllm_chat_template: Optional[str] = None
+    vllm_context_window: Optional[int] = 8192
+    # Micro-batching of concurrent generate calls on backends that accept several prompts per request:
+    # a batch is sent once it has LLM_BATCH_MAX_SIZE calls or its first call has waited LLM_BATCH_MAX_WAIT_MS
+    llm_micro_batching: bool = False
+    llm_batch_max_size: int = 8
+    llm_batch_max_wait_ms: float = 5.0
+
+    # Token accounting: "approximate" (regex/byte heuristic), "tiktoken[:<encoding>]" or
+    # "huggingface:<tokenizer.json path or hub id>"; exact tokenizers fall back to the heuristic
+    # when their package or file is missing
+    tokenizer: str = "approximate"
+    # Starting points for /api/estimate; replaced by running averages of observed completions
+    estimate_default_output_tokens: int = 512
+    estimate_prefill_tokens_per_second: float = 1000.0
+    estimate_decode_tokens_per_second: float = 30.0
+
+    # Think Mode: request clarifying questions as a JSON-schema constrained array
+    think_mode_json_output: bool = False
+    # Think Mode WebSocket sessions close after this long without a client message
+    think_ws_idle_timeout_seconds: float = 300
+
+    # Few-shot examples sent per request: the N from the vendor's library closest to the prompt
+    # (local TF-IDF retrieval); unset to send the whole library
+    fewshot_top_k: Optional[int] = 2
+
+    # Return prompts whose heuristic overall score (0-1) is at least this unchanged, skipping the LLM
+    score_skip_threshold: Optional[float] = None
+
+    # LLM traffic recording / replay
+    llm_record_path: Optional[str] = None
+    llm_record_max_bytes: int = 50 * 1024 * 1024
+    llm_record_backup_count: int = 5
+    llm_replay_path: Optional[str] = None
+    llm_replay_emulate_timing: bool = False
+
+    # Result cache: "none", "memory" (per worker) or "mmap" (shared by all workers on the node)
+    cache_backend: str = "none"
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_mmap_path: str = "/tmp/prompt-optimizer-cache.bin"  # nosec B108 - node-local cache file
+    cache_mmap_slots: int = 65536
+
+    # Searchable history of optimization results: SQLite (FTS5) on a single node, or a
+    # postgresql:// URL (tsvector + GIN) when several backends share it
+    history_enabled: bool = False
+    history_database_url: str = "sqlite:///./data/history.db"
 
     # Telegram
     telegram_bot_token: Optional[str] = None
@@ -48,6 +156,21 @@ class Settings(BaseSettings):
         """Get CORS origins as a list."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def log_sample_rates_map(self) -> Dict[str, float]:
+        """Get log sampling rates as a logger name -> rate mapping."""
+        rates = {}
+        for item in self.log_sample_rates.split(","):
+            if item.strip():
+                name, _, rate = item.partition("=")
+                rates[name.strip()] = float(rate)
+        return rates
+
+    @property
+    def log_redact_fields_list(self) -> List[str]:
+        """Get redacted log fields as a list."""
+        return [field.strip() for field in self.log_redact_fields.split(",") if field.strip()]
+
     @property
     def telegram_allowed_user_ids_list(self) -> List[int]:
         """Get allowed Telegram user IDs as a list of integers."""
@@ -6,8 +6,14 @@ from ...domain.vendors import (
     GeminiAdapter, QwenAdapter, DeepSeekAdapter
 )
 from ...domain.registries import VendorRegistry
-from ..llm import LMStudioClient
-from ...application.services import OptimizationService
+from ..llm import create_llm_client, create_traffic_log
+from ..cache import create_result_cache
+from ..history import create_history_repository
+from ..tokenizers import create_tokenizer
+from ..config import settings
+from ...domain.scoring import PromptScorer
+from ...domain.fewshot import ExampleSelector
+from ...application.services import OptimizationService, TokenEstimator
 
 
 class Container(containers.DeclarativeContainer):
@@ -15,7 +21,13 @@ class Container(containers.DeclarativeContainer):
 
     config = providers.Configuration()
 
-    llm_client = providers.Singleton(LMStudioClient)
+    traffic_log = providers.Singleton(create_traffic_log)
+
+    llm_client = providers.Singleton(create_llm_client, traffic_log=traffic_log)
+
+    result_cache = providers.Singleton(create_result_cache)
+
+    history_repository = providers.Singleton(create_history_repository)
 
     openai_adapter = providers.Singleton(OpenAIAdapter)
     claude_adapter = providers.Singleton(ClaudeAdapter)
@@ -24,9 +36,31 @@ class Container(containers.DeclarativeContainer):
     qwen_adapter = providers.Singleton(QwenAdapter)
     deepseek_adapter = providers.Singleton(DeepSeekAdapter)
 
-    optimization_service = providers.Factory(
+    prompt_scorer = providers.Singleton(PromptScorer)
+
+    example_selector = providers.Singleton(ExampleSelector, top_k=settings.fewshot_top_k)
+
+    tokenizer = providers.Singleton(create_tokenizer)
+
+    token_estimator = providers.Singleton(
+        TokenEstimator,
+        tokenizer=tokenizer,
+        default_output_tokens=settings.estimate_default_output_tokens,
+        prefill_tokens_per_second=settings.estimate_prefill_tokens_per_second,
+        decode_tokens_per_second=settings.estimate_decode_tokens_per_second
+    )
+
+    # One service instance per process; it is stateless apart from shared resources
+    optimization_service = providers.Singleton(
         OptimizationService,
-        llm_client=llm_client
+        llm_client=llm_client,
+        result_cache=result_cache,
+        history=history_repository,
+        json_questions=settings.think_mode_json_output,
+        prompt_scorer=prompt_scorer,
+        score_skip_threshold=settings.score_skip_threshold,
+        example_selector=example_selector,
+        token_estimator=token_estimator
     )
 
     @classmethod
@@ -0,0 +1,23 @@
+from typing import Optional
+from ...domain.interfaces import IHistoryRepository
+from ..config import settings
+from .sql_history import SqlHistoryRepository
+from .export import EXPORT_FORMATS, MEDIA_TYPES, check_format, export_entries, export_filename
+
+
+def create_history_repository() -> Optional[IHistoryRepository]:
+    """Build the optimization history store if enabled (SQLite or PostgreSQL by URL)."""
+    if not settings.history_enabled:
+        return None
+    return SqlHistoryRepository(settings.history_database_url)
+
+
+__all__ = [
+    "SqlHistoryRepository",
+    "create_history_repository",
+    "EXPORT_FORMATS",
+    "MEDIA_TYPES",
+    "check_format",
+    "export_entries",
+    "export_filename"
+]
@@ -0,0 +1,165 @@
+"""Streaming encoders for history exports (CSV, JSONL, Parquet).
+
+Entries are encoded as they arrive and emitted in chunks of roughly ``CHUNK_BYTES``, so
+memory use does not grow with the number of rows. Parquet needs the optional ``pyarrow``
+package and writes one row group per ``PARQUET_ROW_GROUP`` rows.
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, List
+from ...domain.models import HistoryEntry
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+COLUMNS = ["id", "created_at", "vendor", "mode", "original", "optimized", "enhancement_notes", "metadata", "parent_id"]
+CHUNK_BYTES = 64 * 1024
+PARQUET_ROW_GROUP = 10000
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _row(entry: HistoryEntry) -> dict:
+    return {
+        "id": entry.id,
+        "created_at": entry.created_at.isoformat(),
+        "vendor": entry.vendor.value,
+        "mode": entry.mode,
+        "original": entry.original,
+        "optimized": entry.optimized,
+        "enhancement_notes": entry.enhancement_notes,
+        "metadata": entry.metadata,
+        "parent_id": entry.parent_id,
+    }
+
+
+def check_format(fmt: str) -> None:
+    """Raise ValueError for unknown formats or a Parquet export without pyarrow installed."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export requires the pyarrow package")
+
+
+def export_filename(fmt: str, gzip: bool) -> str:
+    return f"history.{fmt}" + (".gz" if gzip and fmt != "parquet" else "")
+
+
+async def _csv(entries: AsyncIterator[HistoryEntry]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    writer.writeheader()
+    async for entry in entries:
+        row = _row(entry)
+        row["metadata"] = json.dumps(row["metadata"], ensure_ascii=False)
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+async def _jsonl(entries: AsyncIterator[HistoryEntry]) -> AsyncIterator[bytes]:
+    lines: List[str] = []
+    size = 0
+    async for entry in entries:
+        line = json.dumps(_row(entry), ensure_ascii=False) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(lines).encode("utf-8")
+            lines, size = [], 0
+    yield "".join(lines).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the caller instead of storing them."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+async def _parquet(entries: AsyncIterator[HistoryEntry], compression: str) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("vendor", pa.string()),
+        ("mode", pa.string()),
+        ("original", pa.string()),
+        ("optimized", pa.string()),
+        ("enhancement_notes", pa.string()),
+        ("metadata", pa.string()),
+        ("parent_id", pa.int64()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    columns = {name: [] for name in COLUMNS}
+
+    def flush() -> None:
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+        for values in columns.values():
+            values.clear()
+
+    async for entry in entries:
+        for name, value in _row(entry).items():
+            columns[name].append(value)
+        columns["created_at"][-1] = entry.created_at
+        columns["metadata"][-1] = json.dumps(entry.metadata, ensure_ascii=False)
+        if len(columns["id"]) >= PARQUET_ROW_GROUP:
+            flush()
+            yield sink.drain()
+    if columns["id"]:
+        flush()
+    writer.close()
+    yield sink.drain()
+
+
+async def _gzipped(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_entries(entries: AsyncIterator[HistoryEntry], fmt: str, gzip: bool = False) -> AsyncIterator[bytes]:
+    """Encode ``entries`` as a byte stream in ``fmt``.
+
+    ``gzip`` wraps CSV and JSONL in a gzip stream; Parquet compresses its column chunks
+    with gzip instead of the default snappy.
+    """
+    check_format(fmt)
+    if fmt == "parquet":
+        return _parquet(entries, "gzip" if gzip else "snappy")
+    chunks = _csv(entries) if fmt == "csv" else _jsonl(entries)
+    return _gzipped(chunks) if gzip else chunks
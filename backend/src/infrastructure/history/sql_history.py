@@ -0,0 +1,233 @@
+"""Optimization history in SQL with full-text search.
+
+PostgreSQL keeps a generated ``tsvector`` column under a GIN index; SQLite (single node)
+mirrors the text columns into an external-content FTS5 table maintained by triggers. Both
+use the ``simple`` / ``unicode61`` tokenization without stemming, because prompts are
+written in many languages. Pages are ordered by id (insertion order) and continue from
+the last id seen, so deep pages cost the same as the first.
+"""
+
+import asyncio
+import os
+import re
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from sqlalchemy import (
+    JSON, Column, Computed, DateTime, Index, Integer, MetaData, String, Table, Text,
+    create_engine, func, insert, inspect, select, text
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import make_url
+from ...domain.interfaces import IHistoryRepository
+from ...domain.models import OptimizedPrompt, VendorType, HistoryEntry, HistoryQuery, HistoryPage
+
+TABLE = "optimization_history"
+FTS_TABLE = "optimization_history_fts"
+
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"original, optimized, content='{TABLE}', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, original, optimized) VALUES (new.id, new.original, new.optimized); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, original, optimized) "
+    f"VALUES ('delete', old.id, old.original, old.optimized); END",
+]
+
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _history_table(metadata: MetaData, dialect: str) -> Table:
+    columns = [
+        Column("id", Integer, primary_key=True),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Column("vendor", String(32), nullable=False),
+        Column("mode", String(16), nullable=False),
+        Column("original", Text, nullable=False),
+        Column("optimized", Text, nullable=False),
+        Column("enhancement_notes", Text, nullable=False),
+        Column("result_metadata", JSON, nullable=False),
+        Column("parent_id", Integer, nullable=True),
+        Index(f"ix_{TABLE}_vendor_id", "vendor", "id"),
+        Index(f"ix_{TABLE}_created_at", "created_at"),
+        Index(f"ix_{TABLE}_parent_id", "parent_id"),
+    ]
+    if dialect == "postgresql":
+        columns += [
+            Column("search_vector", TSVECTOR, Computed(
+                "to_tsvector('simple', coalesce(original, '') || ' ' || coalesce(optimized, ''))",
+                persisted=True
+            )),
+            Index(f"ix_{TABLE}_search_vector", "search_vector", postgresql_using="gin"),
+        ]
+    # AUTOINCREMENT keeps SQLite ids monotonic, which keyset pagination relies on
+    return Table(TABLE, metadata, *columns, sqlite_autoincrement=True)
+
+
+def fts5_query(search: str) -> Optional[str]:
+    """Quote each word so user input is matched as plain terms (all required), never as FTS5 syntax."""
+    words = WORD.findall(search)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
+
+class SqlHistoryRepository(IHistoryRepository):
+    """History repository on SQLAlchemy Core (PostgreSQL or SQLite).
+
+    The drivers are blocking, so every query runs in a worker thread.
+    """
+
+    def __init__(self, database_url: str):
+        url = make_url(database_url)
+        connect_args = {}
+        if url.get_backend_name() == "sqlite":
+            connect_args["check_same_thread"] = False
+            if url.database and url.database != ":memory:":
+                directory = os.path.dirname(url.database)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+        self.engine = create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+        self.dialect = self.engine.dialect.name
+        self.table = _history_table(MetaData(), self.dialect)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        self._migrate_add_parent_id()
+        self.table.metadata.create_all(self.engine)
+        if self.dialect == "sqlite":
+            with self.engine.begin() as connection:
+                for statement in SQLITE_FTS_DDL:
+                    connection.exec_driver_sql(statement)
+
+    def _migrate_add_parent_id(self) -> None:
+        """One-off migration for tables created before refinement lineage: add ``parent_id``.
+
+        ``create_all`` skips a table that exists, index included, so both are added here. This
+        is the only schema change so far; later ones belong in migration tooling, not here.
+        """
+        inspector = inspect(self.engine)
+        if not inspector.has_table(TABLE):
+            return
+        if "parent_id" in {column["name"] for column in inspector.get_columns(TABLE)}:
+            return
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(f"ALTER TABLE {TABLE} ADD COLUMN parent_id INTEGER")
+            connection.exec_driver_sql(f"CREATE INDEX ix_{TABLE}_parent_id ON {TABLE} (parent_id)")
+
+    async def add(self, result: OptimizedPrompt, mode: str = "optimize", parent_id: Optional[int] = None) -> int:
+        return await asyncio.to_thread(self._add, result, mode, parent_id)
+
+    async def get(self, entry_id: int) -> Optional[HistoryEntry]:
+        return await asyncio.to_thread(self._get, entry_id)
+
+    async def search(self, query: HistoryQuery) -> HistoryPage:
+        return await asyncio.to_thread(self._search, query)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.engine.dispose)
+
+    def _add(self, result: OptimizedPrompt, mode: str, parent_id: Optional[int]) -> int:
+        with self.engine.begin() as connection:
+            inserted = connection.execute(insert(self.table).values(
+                created_at=self._timestamp(datetime.now(timezone.utc)),
+                vendor=result.vendor.value,
+                mode=mode,
+                original=result.original,
+                optimized=result.optimized,
+                enhancement_notes=result.enhancement_notes,
+                result_metadata=result.metadata,
+                parent_id=parent_id
+            ))
+            return inserted.inserted_primary_key[0]
+
+    def _get(self, entry_id: int) -> Optional[HistoryEntry]:
+        with self.engine.connect() as connection:
+            row = connection.execute(select(self.table).where(self.table.c.id == entry_id)).first()
+        return self._entry(row) if row is not None else None
+
+    def _search(self, query: HistoryQuery) -> HistoryPage:
+        statement = self._filtered(query)
+        if statement is None:
+            return HistoryPage()
+        statement = statement.order_by(self.table.c.id.desc()).limit(query.limit + 1)
+        if query.cursor is not None:
+            statement = statement.where(self.table.c.id < query.cursor)
+
+        with self.engine.connect() as connection:
+            rows = connection.execute(statement).all()
+        entries = [self._entry(row) for row in rows[:query.limit]]
+        next_cursor = entries[-1].id if len(rows) > query.limit else None
+        return HistoryPage(entries=entries, next_cursor=next_cursor)
+
+    async def iter_entries(self, query: HistoryQuery, batch_size: int = 1000) -> AsyncIterator[HistoryEntry]:
+        """Stream matches oldest first through a server-side cursor, ``batch_size`` rows at a time."""
+        statement = self._filtered(query)
+        if statement is None:
+            return
+        statement = statement.order_by(self.table.c.id)
+
+        connection = await asyncio.to_thread(self.engine.connect)
+        try:
+            # psycopg2 uses a named (server-side) cursor; SQLite steps through the query lazily anyway
+            result = await asyncio.to_thread(
+                connection.execution_options(stream_results=True, yield_per=batch_size).execute, statement
+            )
+            while True:
+                rows = await asyncio.to_thread(result.fetchmany, batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._entry(row)
+        finally:
+            await asyncio.to_thread(connection.close)
+
+    def _filtered(self, query: HistoryQuery):
+        """SELECT with the query's text, vendor and date filters; None if the text cannot match anything."""
+        t = self.table
+        statement = select(t)
+        if query.vendor is not None:
+            statement = statement.where(t.c.vendor == query.vendor.value)
+        if query.since is not None:
+            statement = statement.where(t.c.created_at >= self._timestamp(query.since))
+        if query.until is not None:
+            statement = statement.where(t.c.created_at < self._timestamp(query.until))
+        if query.text and query.text.strip():
+            statement = self._match(statement, query.text)
+        return statement
+
+    def _match(self, statement, search: str):
+        if self.dialect == "postgresql":
+            return statement.where(self.table.c.search_vector.op("@@")(func.plainto_tsquery("simple", search)))
+        match = fts5_query(search)
+        if match is None:
+            return None
+        matching_ids = text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match").bindparams(match=match)
+        return statement.where(self.table.c.id.in_(matching_ids.columns(rowid=Integer)))
+
+    def _timestamp(self, value: datetime) -> datetime:
+        """Normalize a filter bound to UTC (naive values are taken as UTC)."""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        if self.dialect == "sqlite":
+            # Stored as naive UTC text, compared lexically
+            return value.replace(tzinfo=None)
+        return value.replace(tzinfo=value.tzinfo or timezone.utc)
+
+    @staticmethod
+    def _entry(row) -> HistoryEntry:
+        created_at = row.created_at
+        if created_at.tzinfo is None:
+            # SQLite stores naive datetimes; everything written here is UTC
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return HistoryEntry(
+            id=row.id,
+            created_at=created_at,
+            original=row.original,
+            optimized=row.optimized,
+            vendor=VendorType(row.vendor),
+            enhancement_notes=row.enhancement_notes,
+            metadata=row.result_metadata,
+            mode=row.mode,
+            parent_id=row.parent_id
+        )
@@ -1,3 +1,28 @@
+from .http_client import HTTPLLMClient
+from .openai_client import OpenAICompatibleClient
 from .lm_studio_client import LMStudioClient
+from .llama_cpp_client import LlamaCppClient
+from .ollama_client import OllamaClient
+from .vllm_client import VLLMClient
+from .batching_client import MicroBatchingLLMClient
+from .concurrency import AdaptiveConcurrencyLimiter
+from .limited_client import ConcurrencyLimitedLLMClient
+from .recording_client import RecordingLLMClient
+from .replay_client import ReplayLLMClient
+from .factory import create_llm_client, create_traffic_log
 
-__all__ = ["LMStudioClient"]
+__all__ = [
+    "HTTPLLMClient",
+    "OpenAICompatibleClient",
+    "LMStudioClient",
+    "LlamaCppClient",
+    "OllamaClient",
+    "VLLMClient",
+    "MicroBatchingLLMClient",
+    "AdaptiveConcurrencyLimiter",
+    "ConcurrencyLimitedLLMClient",
+    "RecordingLLMClient",
+    "ReplayLLMClient",
+    "create_llm_client",
+    "create_traffic_log"
+]
@@ -0,0 +1,196 @@
+import asyncio
+import contextvars
+import time
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from ...domain.deadline import Deadline, deadline_var
+from ...domain.exceptions import LLMClientException
+from ...domain.interfaces import ILLMClient
+from ...domain.models import LLMCompletion, LLMCapabilities
+from ..metrics import metrics
+
+batches_sent = metrics.counter(
+    "prompt_optimizer_llm_batches_total",
+    "Batched backend requests sent by the micro-batcher"
+)
+batched_calls = metrics.counter(
+    "prompt_optimizer_llm_batched_calls_total",
+    "Generate calls sent in batches; divided by the batch count this is the mean batch size"
+)
+batch_wait_ms = metrics.counter(
+    "prompt_optimizer_llm_batch_wait_ms_total",
+    "Time generate calls spent waiting for their batch to fill, in milliseconds"
+)
+
+BatchKey = Tuple[float, int]
+
+
+@dataclass
+class _Pending:
+    messages: List[Dict[str, str]]
+    deadline: Optional[Deadline]
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+def _latest(deadlines: List[Optional[Deadline]]) -> Optional[Deadline]:
+    """Deadline a batch runs under: the latest of its members, or none if any member has none."""
+    if any(deadline is None for deadline in deadlines):
+        return None
+    return max(deadlines, key=lambda deadline: deadline.expires_at)
+
+
+class MicroBatchingLLMClient(ILLMClient):
+    """ILLMClient decorator that groups concurrent ``generate`` calls into batched backend requests.
+
+    Calls with the same sampling parameters are collected for up to ``max_wait_ms`` or until
+    ``max_batch_size`` are waiting, sent with one ``generate_batch`` call and the completions are
+    handed back to their callers; a call left alone goes out as a plain ``generate``. Streams,
+    multi-choice and schema-constrained calls pass straight through, as does everything when the
+    backend cannot batch.
+    """
+
+    def __init__(self, inner: ILLMClient, max_batch_size: int = 8, max_wait_ms: float = 5.0):
+        self.inner = inner
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queues: Dict[BatchKey, List[_Pending]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self._in_flight: set = set()
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return self.inner.capabilities
+
+    @property
+    def streamed_model(self) -> Optional[str]:
+        return self.inner.streamed_model
+
+    async def generate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> LLMCompletion:
+        if response_format is not None or not self.inner.capabilities.batching:
+            return await self.inner.generate(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format
+            )
+
+        loop = asyncio.get_running_loop()
+        key = (temperature, max_tokens)
+        pending = _Pending(messages, deadline_var.get(), loop.create_future())
+        queue = self._queues.setdefault(key, [])
+        queue.append(pending)
+        if len(queue) >= self.max_batch_size:
+            self._flush(key)
+        elif len(queue) == 1:
+            self._timers[key] = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+        # A caller cancelled while waiting is dropped from its batch when the batch is sent
+        return await pending.future
+
+    def _flush(self, key: BatchKey) -> None:
+        """Send the calls waiting under ``key`` as one batch."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = [pending for pending in self._queues.pop(key, []) if not pending.future.done()]
+        if not batch:
+            return
+        # The batch outlives any single caller, so it runs in its own task under the latest deadline
+        context = contextvars.copy_context()
+        context.run(deadline_var.set, _latest([pending.deadline for pending in batch]))
+        task = asyncio.get_running_loop().create_task(self._send(key, batch), context=context)
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, key: BatchKey, batch: List[_Pending]) -> None:
+        sent = time.perf_counter()
+        waits = [round((sent - pending.enqueued) * 1000, 3) for pending in batch]
+        batches_sent.inc()
+        batched_calls.inc(len(batch))
+        batch_wait_ms.inc(sum(waits))
+        try:
+            completions = await self._call(key, batch)
+            for pending, completion, wait in zip(batch, completions, waits):
+                completion.batch_size = len(batch)
+                completion.batch_wait_ms = wait
+                if not pending.future.done():
+                    pending.future.set_result(completion)
+        except Exception as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+        finally:
+            # Cancelled (e.g. at shutdown) before the results were handed out: no caller may hang
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.cancel()
+
+    async def _call(self, key: BatchKey, batch: List[_Pending]) -> List[LLMCompletion]:
+        temperature, max_tokens = key
+        if len(batch) == 1:
+            # Nothing to batch with; the backend's chat endpoint handles a single call best
+            return [await self.inner.generate(
+                messages=batch[0].messages, temperature=temperature, max_tokens=max_tokens
+            )]
+        completions = await self.inner.generate_batch(
+            [pending.messages for pending in batch], temperature, max_tokens
+        )
+        if len(completions) != len(batch):
+            raise LLMClientException(f"Batch of {len(batch)} calls returned {len(completions)} completions")
+        return completions
+
+    async def generate_many(
+        self,
+        messages: List[Dict[str, str]],
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> List[LLMCompletion]:
+        return await self.inner.generate_many(
+            messages=messages,
+            n=n,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format
+        )
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> List[LLMCompletion]:
+        return await self.inner.generate_batch(conversations, temperature, max_tokens)
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        async with aclosing(self.inner.stream(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format
+        )) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+    async def health_check(self) -> bool:
+        return await self.inner.health_check()
+
+    async def warm_up(self) -> None:
+        await self.inner.warm_up()
+
+    async def close(self) -> None:
+        await self.inner.close()
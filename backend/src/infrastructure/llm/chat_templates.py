@@ -0,0 +1,21 @@
+"""Chat templates for backends whose batch endpoint takes raw prompts instead of messages."""
+
+from typing import Dict, List
+
+CHAT_TEMPLATES = {
+    # Qwen, Yi, and most fine-tunes trained on ChatML
+    "chatml": ("<|im_start|>{role}\n{content}<|im_end|>\n", "<|im_start|>assistant\n", ""),
+    "llama3": (
+        "<|start_header_id|>{role}<|end_header_id|>\n\n{content}<|eot_id|>",
+        "<|start_header_id|>assistant<|end_header_id|>\n\n",
+        "<|begin_of_text|>"
+    ),
+}
+
+
+def render_chat(messages: List[Dict[str, str]], template: str) -> str:
+    """Render messages as one prompt string ending with the assistant turn header."""
+    if template not in CHAT_TEMPLATES:
+        raise ValueError(f"Unknown chat template '{template}'; expected one of {', '.join(CHAT_TEMPLATES)}")
+    turn, generation_prompt, prefix = CHAT_TEMPLATES[template]
+    return prefix + "".join(turn.format(**message) for message in messages) + generation_prompt
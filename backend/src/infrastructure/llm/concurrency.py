@@ -0,0 +1,121 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+from ..metrics import metrics
+
+concurrency_limit = metrics.gauge(
+    "prompt_optimizer_llm_concurrency_limit",
+    "Current adaptive limit on in-flight LLM requests"
+)
+in_flight_requests = metrics.gauge(
+    "prompt_optimizer_llm_in_flight_requests",
+    "LLM requests currently holding a concurrency slot"
+)
+
+# How fast the no-load latency baseline creeps up towards observed latency (it drops immediately)
+BASELINE_DRIFT = 0.01
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight requests to one LLM backend.
+
+    Latency is compared with a no-load baseline: samples within ``tolerance`` times the
+    baseline grow the limit additively (by about one per limit's worth of requests) while
+    the limit is in use; slower samples and backend errors shrink it multiplicatively by
+    ``backoff``. Only the first overload signal from requests admitted under the current
+    limit backs off, so one burst of timeouts does not collapse it to the minimum. Each kind
+    of latency signal (TTFT, time per token, whole call) has its own baseline, and the
+    baselines are reset whenever the backend reports a different model.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        tolerance: float = 2.0,
+        backoff: float = 0.75
+    ):
+        self.backend = backend
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.in_flight = 0
+        self.baselines: Dict[str, float] = {}
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._epoch = 0
+        self._model: Optional[str] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, timeout: float) -> int:
+        """Wait up to ``timeout`` seconds for a slot; returns the epoch the request was admitted in."""
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            self._publish()
+            return self._epoch
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        return self._epoch
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self, latency_ms: float, model: Optional[str], epoch: int, signal: str = "ttft") -> None:
+        """Record the latency of a completed request, compared with the baseline of its ``signal``."""
+        if model is not None and model != self._model:
+            self._model = model
+            self.baselines.clear()
+        baseline = self.baselines.get(signal)
+        if baseline is None or latency_ms < baseline:
+            baseline = latency_ms
+        else:
+            baseline += BASELINE_DRIFT * (latency_ms - baseline)
+        self.baselines[signal] = baseline
+
+        if latency_ms > baseline * self.tolerance:
+            self.on_overload(epoch)
+        elif self.in_flight >= self.limit:
+            self._limit = min(self._limit + 1.0 / self._limit, float(self.max_limit))
+            self._wake()
+
+    def on_overload(self, epoch: int) -> None:
+        """Back off after a timeout, backend error or latency spike."""
+        if epoch != self._epoch:
+            return
+        self._epoch += 1
+        self._limit = max(self._limit * self.backoff, float(self.min_limit))
+        self._publish()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+        self._publish()
+
+    def _publish(self) -> None:
+        concurrency_limit.set(self.limit, backend=self.backend)
+        in_flight_requests.set(self.in_flight, backend=self.backend)
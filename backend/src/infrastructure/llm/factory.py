@@ -0,0 +1,61 @@
+from typing import Optional
+from ...domain.interfaces import ILLMClient
+from ..config import settings
+from ..recording import TrafficLog, read_traffic
+from .concurrency import AdaptiveConcurrencyLimiter
+from .limited_client import ConcurrencyLimitedLLMClient
+from .lm_studio_client import LMStudioClient
+from .llama_cpp_client import LlamaCppClient
+from .ollama_client import OllamaClient
+from .vllm_client import VLLMClient
+from .batching_client import MicroBatchingLLMClient
+from .recording_client import RecordingLLMClient
+from .replay_client import ReplayLLMClient
+
+
+def create_traffic_log() -> Optional[TrafficLog]:
+    """Create the traffic capture log if recording is enabled."""
+    if not settings.llm_record_path:
+        return None
+    return TrafficLog(
+        settings.llm_record_path,
+        max_bytes=settings.llm_record_max_bytes,
+        backup_count=settings.llm_record_backup_count
+    )
+
+
+BACKENDS = {
+    "lm_studio": LMStudioClient,
+    "llama_cpp": LlamaCppClient,
+    "ollama": OllamaClient,
+    "vllm": VLLMClient
+}
+
+
+def create_llm_client(traffic_log: Optional[TrafficLog] = None) -> ILLMClient:
+    """Build the configured LLM client (replay, or the backend driver with optional recording and concurrency limit)."""
+    if settings.llm_replay_path:
+        return ReplayLLMClient(
+            read_traffic(settings.llm_replay_path),
+            emulate_timing=settings.llm_replay_emulate_timing
+        )
+
+    if settings.llm_backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{settings.llm_backend}'; expected one of {', '.join(BACKENDS)}")
+    client: ILLMClient = BACKENDS[settings.llm_backend]()
+    if traffic_log is not None:
+        client = RecordingLLMClient(client, traffic_log)
+    if settings.llm_adaptive_concurrency:
+        # Queueing time is neither recorded nor counted as backend latency
+        client = ConcurrencyLimitedLLMClient(client, AdaptiveConcurrencyLimiter(
+            settings.llm_backend,
+            initial=settings.llm_concurrency_initial,
+            min_limit=settings.llm_concurrency_min,
+            max_limit=settings.llm_concurrency_max,
+            tolerance=settings.llm_latency_tolerance,
+            backoff=settings.llm_concurrency_backoff
+        ))
+    if settings.llm_micro_batching and client.capabilities.batching:
+        # Outermost, so calls are grouped before admission and each batch takes one slot
+        client = MicroBatchingLLMClient(client, settings.llm_batch_max_size, settings.llm_batch_max_wait_ms)
+    return client
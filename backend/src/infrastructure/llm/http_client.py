@@ -0,0 +1,104 @@
+import asyncio
+import httpx
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from ...domain.deadline import budget, deadline_var
+from ...domain.exceptions import DeadlineExceededException
+from ...domain.interfaces import ILLMClient
+from ..config import settings
+
+T = TypeVar("T")
+
+# Failures where the request never reached the model, or the backend asked us to come back later
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class HTTPLLMClient(ILLMClient):
+    """Connection pool, deadline-bounded timeouts and retries shared by the HTTP backend drivers."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.timeout = settings.request_timeout_seconds
+        self.transport = transport
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._streamed_model: Optional[str] = None
+
+    @property
+    def streamed_model(self) -> Optional[str]:
+        return self._streamed_model
+
+    @property
+    def root_url(self) -> str:
+        """Server address without the OpenAI ``/v1`` prefix, for engine-specific endpoints."""
+        return self.base_url.rstrip("/").rsplit("/v1", 1)[0]
+
+    def _client(self) -> httpx.AsyncClient:
+        """Shared connection pool, created on first use and closed by ``close()``."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=settings.lm_studio_max_connections,
+                    max_keepalive_connections=settings.lm_studio_max_connections
+                )
+            )
+        return self._http_client
+
+    def _headers(self) -> Dict[str, str]:
+        if self.api_key:
+            return {"Authorization": f"Bearer {self.api_key}"}
+        return {}
+
+    async def _with_retries(self, attempt: Callable[[httpx.Timeout], Awaitable[T]]) -> T:
+        """Run ``attempt`` with the remaining deadline as its timeout, retrying transient failures.
+
+        A retry is only made if the backoff still fits in the request deadline.
+        """
+        retries = 0
+        while True:
+            try:
+                return await attempt(httpx.Timeout(budget(self.timeout, "LLM request")))
+            except httpx.TimeoutException as e:
+                deadline = deadline_var.get()
+                if deadline is not None and deadline.expired:
+                    # Timed out because the deadline ran out: report that, not a transport error
+                    raise DeadlineExceededException("Request deadline exceeded during the LLM call") from e
+                if not isinstance(e, RETRYABLE_ERRORS) or retries >= settings.lm_studio_max_retries:
+                    raise
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if not self._retryable(e) or retries >= settings.lm_studio_max_retries:
+                    raise
+
+            delay = settings.lm_studio_retry_backoff_ms / 1000 * 2 ** retries
+            if budget(self.timeout, "LLM retry") <= delay:
+                raise DeadlineExceededException("Request deadline leaves no time to retry the LLM call")
+            await asyncio.sleep(delay)
+            retries += 1
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS
+        return isinstance(error, RETRYABLE_ERRORS)
+
+    async def _get_ok(self, url: str) -> bool:
+        try:
+            response = await self._client().get(url, headers=self._headers(), timeout=5.0)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
@@ -0,0 +1,181 @@
+import time
+import httpx
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple
+from ...domain.deadline import budget, deadline_var
+from ...domain.exceptions import DeadlineExceededException, LLMClientException
+from ...domain.interfaces import ILLMClient
+from ...domain.models import LLMCompletion, LLMCapabilities
+from ..config import settings
+from .concurrency import AdaptiveConcurrencyLimiter
+
+
+def is_overload(error: BaseException) -> bool:
+    """Whether a failure signals that the backend is saturated (as opposed to a bad request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, DeadlineExceededException))
+
+
+def latency_signal(completion: LLMCompletion, elapsed_ms: float) -> Tuple[str, float]:
+    """Latency compared across requests, with its kind: only samples of the same kind are comparable.
+
+    TTFT when streamed, otherwise time per generated token, or the whole call when the backend
+    reported no usage.
+    """
+    if completion.ttft_ms is not None:
+        return "ttft", completion.ttft_ms
+    if completion.completion_tokens:
+        return "per_token", elapsed_ms / completion.completion_tokens
+    return "wall", elapsed_ms
+
+
+class ConcurrencyLimitedLLMClient(ILLMClient):
+    """ILLMClient decorator that admits requests through an adaptive concurrency limiter.
+
+    Requests over the limit wait in FIFO order, for at most the remaining request deadline.
+    """
+
+    def __init__(self, inner: ILLMClient, limiter: AdaptiveConcurrencyLimiter):
+        self.inner = inner
+        self.limiter = limiter
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return self.inner.capabilities
+
+    @property
+    def streamed_model(self) -> Optional[str]:
+        return self.inner.streamed_model
+
+    async def _acquire(self) -> int:
+        try:
+            return await self.limiter.acquire(budget(settings.request_timeout_seconds, "LLM queue"))
+        except TimeoutError:
+            deadline = deadline_var.get()
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceededException("Request deadline exceeded while waiting for an LLM slot")
+            raise LLMClientException(f"Timed out waiting for a free {self.limiter.backend} slot")
+
+    async def generate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> LLMCompletion:
+        epoch = await self._acquire()
+        started = time.perf_counter()
+        try:
+            completion = await self.inner.generate(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format
+            )
+        except Exception as e:
+            if is_overload(e):
+                self.limiter.on_overload(epoch)
+            raise
+        else:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            signal, latency_ms = latency_signal(completion, elapsed_ms)
+            self.limiter.on_success(latency_ms, completion.model, epoch, signal)
+            return completion
+        finally:
+            self.limiter.release()
+
+    async def generate_many(
+        self,
+        messages: List[Dict[str, str]],
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> List[LLMCompletion]:
+        """One slot per backend request: a single ``n``-choice call, or ``n`` separately admitted calls."""
+        if not self.inner.capabilities.multiple_choices:
+            return await super().generate_many(
+                messages=messages,
+                n=n,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format
+            )
+
+        return await self._in_one_slot(lambda: self.inner.generate_many(
+            messages=messages,
+            n=n,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format
+        ))
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> List[LLMCompletion]:
+        """A batched backend request takes one slot; otherwise each conversation is admitted separately."""
+        if not self.inner.capabilities.batching:
+            return await super().generate_batch(conversations, temperature, max_tokens)
+        return await self._in_one_slot(lambda: self.inner.generate_batch(conversations, temperature, max_tokens))
+
+    async def _in_one_slot(self, call: Callable[[], Awaitable[List[LLMCompletion]]]) -> List[LLMCompletion]:
+        epoch = await self._acquire()
+        started = time.perf_counter()
+        try:
+            completions = await call()
+        except Exception as e:
+            if is_overload(e):
+                self.limiter.on_overload(epoch)
+            raise
+        else:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            signal, latency_ms = latency_signal(completions[0], elapsed_ms)
+            self.limiter.on_success(latency_ms, completions[0].model, epoch, signal)
+            return completions
+        finally:
+            self.limiter.release()
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Hold a slot for the life of the stream; time to the first chunk is the latency signal."""
+        epoch = await self._acquire()
+        started = time.perf_counter()
+        first_chunk = True
+        try:
+            async with aclosing(self.inner.stream(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format
+            )) as chunks:
+                async for chunk in chunks:
+                    if first_chunk:
+                        first_chunk = False
+                        self.limiter.on_success(
+                            (time.perf_counter() - started) * 1000, self.inner.streamed_model, epoch, "ttft"
+                        )
+                    yield chunk
+        except Exception as e:
+            if is_overload(e):
+                self.limiter.on_overload(epoch)
+            raise
+        finally:
+            self.limiter.release()
+
+    async def health_check(self) -> bool:
+        return await self.inner.health_check()
+
+    async def warm_up(self) -> None:
+        await self.inner.warm_up()
+
+    async def close(self) -> None:
+        await self.inner.close()
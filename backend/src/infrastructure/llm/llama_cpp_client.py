@@ -0,0 +1,78 @@
+import httpx
+from typing import Dict, List, Optional
+from ...domain.affinity import affinity_var, slot_for
+from ...domain.models import LLMCapabilities
+from ..config import settings
+from ..metrics import metrics
+from .openai_client import OpenAICompatibleClient
+
+backend_slots = metrics.gauge(
+    "prompt_optimizer_llm_backend_slots", "llama.cpp server slots by state, as of the last /slots poll"
+)
+
+
+class LlamaCppClient(OpenAICompatibleClient):
+    """Native llama.cpp server driver.
+
+    Uses the server's OpenAI-compatible endpoint with its extensions: ``cache_prompt`` keeps
+    the prompt's KV cache in the slot, ``id_slot`` pins a conversation to one slot and
+    ``n_predict`` caps the output. ``/slots`` is polled by the health check.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(
+            base_url=settings.llama_cpp_base_url,
+            api_key=settings.llama_cpp_api_key,
+            top_p=settings.lm_studio_top_p,
+            stream_responses=settings.lm_studio_stream,
+            transport=transport
+        )
+        self.slots = settings.llama_cpp_slots
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return LLMCapabilities(
+            streaming=True,
+            json_schema=True,
+            prefix_caching=True,
+            context_window=settings.llama_cpp_context_window
+        )
+
+    def _payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[dict],
+        stream: bool
+    ) -> dict:
+        payload = super()._payload(messages, temperature, max_tokens, response_format, stream)
+        payload["n_predict"] = max_tokens
+        payload["cache_prompt"] = True
+
+        affinity = affinity_var.get()
+        if affinity is not None and self.slots:
+            # Turns of one conversation land on the slot that already holds its prefix
+            payload["id_slot"] = slot_for(affinity, self.slots)
+        return payload
+
+    async def slot_status(self) -> Optional[List[dict]]:
+        """Current ``/slots`` report, or None when the server has slot monitoring disabled."""
+        try:
+            response = await self._client().get(f"{self.root_url}/slots", headers=self._headers(), timeout=5.0)
+        except httpx.HTTPError:
+            return None
+        if response.status_code != 200:
+            return None
+        slots = response.json()
+        processing = sum(1 for slot in slots if slot.get("is_processing"))
+        backend_slots.set(processing, state="processing")
+        backend_slots.set(len(slots) - processing, state="idle")
+        return slots
+
+    async def health_check(self) -> bool:
+        """Check the server's ``/health`` (503 while the model loads) and refresh slot metrics."""
+        if not await self._get_ok(f"{self.root_url}/health"):
+            return False
+        await self.slot_status()
+        return True
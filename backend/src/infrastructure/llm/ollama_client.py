@@ -0,0 +1,150 @@
+import json
+import logging
+import time
+import httpx
+from typing import AsyncIterator, Dict, List, Optional
+from ...domain.deadline import budget
+from ...domain.exceptions import LLMClientException
+from ...domain.models import LLMCompletion, LLMCapabilities
+from ..config import settings
+from .http_client import HTTPLLMClient
+
+logger = logging.getLogger(__name__)
+
+
+class OllamaClient(HTTPLLMClient):
+    """Native Ollama driver using ``/api/chat``.
+
+    Every call sends ``keep_alive``, so the model stays loaded between requests, and
+    ``num_ctx``, so the context is the configured size instead of Ollama's small default.
+    ``warm_up`` loads the model at startup.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(settings.ollama_base_url, model=settings.ollama_model, transport=transport)
+        self.keep_alive = settings.ollama_keep_alive
+        self.num_ctx = settings.ollama_num_ctx
+        self.stream_responses = settings.lm_studio_stream
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return LLMCapabilities(
+            streaming=True,
+            json_schema=True,
+            prefix_caching=True,
+            context_window=self.num_ctx
+        )
+
+    def _payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[dict],
+        stream: bool
+    ) -> dict:
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": temperature,
+                "top_p": settings.lm_studio_top_p,
+                "num_predict": max_tokens,
+                "num_ctx": self.num_ctx
+            }
+        }
+        if response_format and response_format.get("type") == "json_schema":
+            # Ollama takes the JSON schema itself as ``format``
+            payload["format"] = response_format["json_schema"]["schema"]
+        return payload
+
+    @staticmethod
+    async def _lines(response: httpx.Response) -> AsyncIterator[dict]:
+        """Decode Ollama's newline-delimited JSON; a non-streamed reply is a single line."""
+        async for line in response.aiter_lines():
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if "error" in data:
+                raise LLMClientException(f"Ollama error: {data['error']}")
+            yield data
+
+    async def generate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> LLMCompletion:
+        """Generate a chat completion, capturing usage, model and timing."""
+        payload = self._payload(messages, temperature, max_tokens, response_format, stream=self.stream_responses)
+
+        async def attempt(timeout: httpx.Timeout) -> LLMCompletion:
+            started = time.perf_counter()
+            completion = LLMCompletion(content="")
+            parts = []
+            async with self._client().stream(
+                "POST", f"{self.root_url}/api/chat", json=payload, headers=self._headers(), timeout=timeout
+            ) as response:
+                response.raise_for_status()
+                async for data in self._lines(response):
+                    content = (data.get("message") or {}).get("content")
+                    if content:
+                        if completion.ttft_ms is None and self.stream_responses:
+                            completion.ttft_ms = round((time.perf_counter() - started) * 1000, 3)
+                        parts.append(content)
+                    if data.get("done"):
+                        completion.model = data.get("model")
+                        completion.finish_reason = data.get("done_reason")
+                        completion.prompt_tokens = data.get("prompt_eval_count")
+                        completion.completion_tokens = data.get("eval_count")
+
+            completion.content = "".join(parts)
+            completion.wall_time_ms = round((time.perf_counter() - started) * 1000, 3)
+            return completion
+
+        return await self._with_retries(attempt)
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Yield content deltas; closing early drops the connection so Ollama stops generating.
+
+        Not retried, since chunks may already have been consumed.
+        """
+        payload = self._payload(messages, temperature, max_tokens, response_format, stream=True)
+        async with self._client().stream(
+            "POST", f"{self.root_url}/api/chat", json=payload, headers=self._headers(),
+            timeout=httpx.Timeout(budget(self.timeout, "LLM request"))
+        ) as response:
+            response.raise_for_status()
+            async for data in self._lines(response):
+                self._streamed_model = data.get("model") or self._streamed_model
+                content = (data.get("message") or {}).get("content")
+                if content:
+                    yield content
+
+    async def warm_up(self) -> None:
+        """Load the model now (a request without a prompt) so the first call skips the load."""
+        if not settings.ollama_preload:
+            return
+        try:
+            response = await self._client().post(
+                f"{self.root_url}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive},
+                headers=self._headers()
+            )
+            response.raise_for_status()
+            logger.info(f"Ollama model {self.model} loaded")
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not preload Ollama model {self.model}: {e}")
+
+    async def health_check(self) -> bool:
+        """Check that Ollama answers its model list."""
+        return await self._get_ok(f"{self.root_url}/api/tags")
@@ -0,0 +1,223 @@
+import json
+import time
+import httpx
+from typing import AsyncIterator, List, Dict, Optional
+from ...domain.deadline import budget
+from ...domain.models import LLMCompletion
+from .http_client import HTTPLLMClient
+
+
+def _spread(total: Optional[int], weights: List[int]) -> List[Optional[int]]:
+    """Split a request-wide token count in proportion to ``weights``, keeping the sum exact."""
+    if total is None:
+        return [None] * len(weights)
+    if not any(weights):
+        weights = [1] * len(weights)
+    shares = [total * weight / sum(weights) for weight in weights]
+    counts = [int(share) for share in shares]
+    # Largest remainders get the tokens lost to rounding down
+    for index in sorted(range(len(shares)), key=lambda i: counts[i] - shares[i])[:total - sum(counts)]:
+        counts[index] += 1
+    return counts
+
+
+class OpenAICompatibleClient(HTTPLLMClient):
+    """Client for the OpenAI ``/v1/chat/completions`` API; engine drivers extend the payload."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        top_p: float = 0.9,
+        stream_responses: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        super().__init__(base_url, api_key, model, transport)
+        self.top_p = top_p
+        self.stream_responses = stream_responses
+
+    def _payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[dict],
+        stream: bool
+    ) -> dict:
+        payload = {
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": self.top_p
+        }
+
+        if self.model:
+            payload["model"] = self.model
+
+        if response_format and self.capabilities.json_schema:
+            payload["response_format"] = response_format
+
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+
+        return payload
+
+    async def generate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> LLMCompletion:
+        """Generate a chat completion, capturing usage, model and timing."""
+        # Streaming is the only way to observe time-to-first-token
+        payload = self._payload(messages, temperature, max_tokens, response_format, stream=self.stream_responses)
+
+        async def attempt(timeout: httpx.Timeout) -> LLMCompletion:
+            started = time.perf_counter()
+            async with self._client().stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=self._headers(),
+                timeout=timeout
+            ) as response:
+                response.raise_for_status()
+                if response.headers.get("content-type", "").startswith("text/event-stream"):
+                    completion = await self._read_stream(response, started)
+                else:
+                    completion = self._parse_completion(json.loads(await response.aread()))
+
+            completion.wall_time_ms = round((time.perf_counter() - started) * 1000, 3)
+            return completion
+
+        return await self._with_retries(attempt)
+
+    async def generate_many(
+        self,
+        messages: List[Dict[str, str]],
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> List[LLMCompletion]:
+        """Request all ``n`` candidates in one call (one prefill) when the backend honours ``n``."""
+        if n == 1 or not self.capabilities.multiple_choices:
+            return await super().generate_many(messages, n, temperature, max_tokens, response_format)
+
+        payload = self._payload(messages, temperature, max_tokens, response_format, stream=False)
+        payload["n"] = n
+
+        async def attempt(timeout: httpx.Timeout) -> List[LLMCompletion]:
+            started = time.perf_counter()
+            response = await self._client().post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=self._headers(),
+                timeout=timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+            wall_time_ms = round((time.perf_counter() - started) * 1000, 3)
+
+            completions = [self._parse_completion(data, index) for index in range(len(data["choices"]))]
+            # Usage covers every choice; each gets its share of the output, so none counts all of it
+            completion_tokens = _spread(
+                completions[0].completion_tokens if completions else None,
+                [len(completion.content) for completion in completions]
+            )
+            for completion, completion_count in zip(completions, completion_tokens):
+                completion.wall_time_ms = wall_time_ms
+                completion.completion_tokens = completion_count
+            return completions
+
+        return await self._with_retries(attempt)
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Yield content deltas; closing early drops the connection so the server stops generating.
+
+        Not retried, since chunks may already have been consumed.
+        """
+        payload = self._payload(messages, temperature, max_tokens, response_format, stream=True)
+        async with self._client().stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json=payload,
+            headers=self._headers(),
+            timeout=httpx.Timeout(budget(self.timeout, "LLM request"))
+        ) as response:
+            response.raise_for_status()
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                completion = self._parse_completion(json.loads(await response.aread()))
+                self._streamed_model = completion.model or self._streamed_model
+                yield completion.content
+                return
+            async for chunk in self._sse_chunks(response):
+                self._streamed_model = chunk.get("model") or self._streamed_model
+                for choice in chunk.get("choices") or []:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+
+    @staticmethod
+    def _parse_completion(data: dict, index: int = 0) -> LLMCompletion:
+        """Parse one choice of a non-streaming chat completion response.
+
+        Usage is reported per request, so with ``n`` choices it covers all of them; ``generate_many``
+        splits the output count across the choices.
+        """
+        choice = data["choices"][index]
+        usage = data.get("usage") or {}
+        return LLMCompletion(
+            content=choice["message"]["content"],
+            model=data.get("model"),
+            finish_reason=choice.get("finish_reason"),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens")
+        )
+
+    @staticmethod
+    async def _sse_chunks(response: httpx.Response) -> AsyncIterator[dict]:
+        """Decode the ``data:`` events of an SSE chat completion stream."""
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                return
+            yield json.loads(data)
+
+    @classmethod
+    async def _read_stream(cls, response: httpx.Response, started: float) -> LLMCompletion:
+        """Accumulate an SSE chat completion stream."""
+        completion = LLMCompletion(content="")
+        parts = []
+        async for chunk in cls._sse_chunks(response):
+            completion.model = chunk.get("model") or completion.model
+            usage = chunk.get("usage")
+            if usage:
+                completion.prompt_tokens = usage.get("prompt_tokens")
+                completion.completion_tokens = usage.get("completion_tokens")
+            for choice in chunk.get("choices") or []:
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    if completion.ttft_ms is None:
+                        completion.ttft_ms = round((time.perf_counter() - started) * 1000, 3)
+                    parts.append(content)
+                if choice.get("finish_reason"):
+                    completion.finish_reason = choice["finish_reason"]
+
+        completion.content = "".join(parts)
+        return completion
+
+    async def health_check(self) -> bool:
+        """Check that the server answers the model list."""
+        return await self._get_ok(f"{self.root_url}/v1/models")
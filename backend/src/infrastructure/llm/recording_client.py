@@ -0,0 +1,180 @@
+import hashlib
+import json
+import time
+from contextlib import aclosing
+from dataclasses import asdict
+from typing import AsyncIterator, List, Dict, Optional
+from ...domain.interfaces import ILLMClient
+from ...domain.models import LLMCompletion, LLMCapabilities
+from ..recording import TrafficLog, capture_id_var
+
+
+def request_fingerprint(
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    response_format: Optional[dict] = None
+) -> str:
+    """Stable hash of an LLM call, used to match replayed calls to recorded ones."""
+    params = {"messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+    if response_format is not None:
+        params["response_format"] = response_format
+    key = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class RecordingLLMClient(ILLMClient):
+    """ILLMClient decorator that records every call to a rotating traffic log.
+
+    The wrapped client's capabilities are recorded first, and again at the start of every
+    rotated file, so replay makes the same calls.
+    """
+
+    def __init__(self, inner: ILLMClient, traffic_log: TrafficLog):
+        self.inner = inner
+        self.traffic_log = traffic_log
+        self.traffic_log.write_header({
+            "kind": "capabilities",
+            "ts": time.time(),
+            "capabilities": asdict(inner.capabilities),
+        })
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return self.inner.capabilities
+
+    @property
+    def streamed_model(self) -> Optional[str]:
+        return self.inner.streamed_model
+
+    def _record(
+        self,
+        messages: List[Dict[str, str]],
+        params: dict,
+        response: Optional[str],
+        error: Optional[str],
+        started: float,
+        usage: Optional[dict]
+    ) -> None:
+        self.traffic_log.write({
+            "kind": "llm",
+            "capture_id": capture_id_var.get(),
+            "ts": time.time(),
+            "fingerprint": request_fingerprint(messages, **params),
+            "messages": messages,
+            "params": params,
+            "response": response,
+            "error": error,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "usage": usage,
+        })
+
+    @staticmethod
+    def _params(temperature: float, max_tokens: int, response_format: Optional[dict]) -> dict:
+        params = {"temperature": temperature, "max_tokens": max_tokens}
+        if response_format is not None:
+            params["response_format"] = response_format
+        return params
+
+    async def generate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> LLMCompletion:
+        """Generate via the wrapped client and record messages, params, response, usage and timing."""
+        params = self._params(temperature, max_tokens, response_format)
+        started = time.perf_counter()
+        completion = None
+        error = None
+        try:
+            completion = await self.inner.generate(messages=messages, **params)
+            return completion
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._record(
+                messages,
+                params,
+                completion.content if completion else None,
+                error,
+                started,
+                completion.usage_metadata() if completion else None
+            )
+
+    async def generate_many(
+        self,
+        messages: List[Dict[str, str]],
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> List[LLMCompletion]:
+        """Generate via the wrapped client; each candidate is recorded as a separate call.
+
+        Records carry the single-call fingerprint, so replay serves them back through
+        the default parallel ``generate_many`` regardless of how they were produced.
+        """
+        params = self._params(temperature, max_tokens, response_format)
+        started = time.perf_counter()
+        try:
+            completions = await self.inner.generate_many(messages=messages, n=n, **params)
+        except Exception as e:
+            self._record(messages, params, None, f"{type(e).__name__}: {e}", started, None)
+            raise
+        for completion in completions:
+            self._record(messages, params, completion.content, None, started, completion.usage_metadata())
+        return completions
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> List[LLMCompletion]:
+        """Generate via the wrapped client; each conversation is recorded as a separate call."""
+        params = self._params(temperature, max_tokens, None)
+        started = time.perf_counter()
+        try:
+            completions = await self.inner.generate_batch(conversations, **params)
+        except Exception as e:
+            for messages in conversations:
+                self._record(messages, params, None, f"{type(e).__name__}: {e}", started, None)
+            raise
+        for messages, completion in zip(conversations, completions):
+            self._record(messages, params, completion.content, None, started, completion.usage_metadata())
+        return completions
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Stream via the wrapped client and record the text received before the stream ended or was closed."""
+        params = self._params(temperature, max_tokens, response_format)
+        started = time.perf_counter()
+        parts = []
+        error = None
+        try:
+            async with aclosing(self.inner.stream(messages=messages, **params)) as chunks:
+                async for chunk in chunks:
+                    parts.append(chunk)
+                    yield chunk
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._record(messages, params, "".join(parts), error, started, None)
+
+    async def health_check(self) -> bool:
+        return await self.inner.health_check()
+
+    async def warm_up(self) -> None:
+        await self.inner.warm_up()
+
+    async def close(self) -> None:
+        await self.inner.close()
@@ -0,0 +1,89 @@
+import asyncio
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, List, Optional
+from ...domain.interfaces import ILLMClient
+from ...domain.exceptions import LLMClientException
+from ...domain.models import LLMCompletion, LLMCapabilities
+from ..recording import capture_id_var
+from .recording_client import request_fingerprint
+
+
+class ReplayLLMClient(ILLMClient):
+    """ILLMClient that serves recorded LLM calls back instead of calling a model.
+
+    Calls are matched by request fingerprint first; if the prompt templates changed since
+    the capture, calls made while replaying a captured HTTP request fall back to that
+    request's recorded calls in order. Capabilities are those of the recording backend, as
+    recorded in the capture.
+    """
+
+    def __init__(self, records: Iterable[dict], emulate_timing: bool = False, timing_scale: float = 1.0):
+        self.emulate_timing = emulate_timing
+        self.timing_scale = timing_scale
+        self._by_fingerprint: Dict[str, Deque[dict]] = defaultdict(deque)
+        self._by_capture: Dict[str, Deque[dict]] = defaultdict(deque)
+        self.served_ms: Dict[Optional[str], float] = defaultdict(float)
+        self.misses = 0
+        # Captures made before capabilities were recorded came from a streaming, schema-capable backend
+        self._capabilities = LLMCapabilities(streaming=True, json_schema=True)
+
+        for record in records:
+            if record.get("kind") == "capabilities":
+                self._capabilities = LLMCapabilities(**record["capabilities"])
+            if record.get("kind") != "llm":
+                continue
+            self._by_fingerprint[record["fingerprint"]].append(record)
+            if record.get("capture_id"):
+                self._by_capture[record["capture_id"]].append(record)
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        # Match the recording backend so the service issues the same (fingerprinted) calls
+        return self._capabilities
+
+    def _take(self, fingerprint: str, capture_id: Optional[str]) -> Optional[dict]:
+        queue = self._by_fingerprint.get(fingerprint)
+        if queue:
+            record = queue.popleft()
+            queue.append(record)  # identical calls cycle through their recorded responses
+            return record
+        queue = self._by_capture.get(capture_id) if capture_id else None
+        if queue:
+            return queue.popleft()
+        return None
+
+    async def generate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        response_format: Optional[dict] = None
+    ) -> LLMCompletion:
+        """Return the recorded response for this call, optionally with its original latency."""
+        capture_id = capture_id_var.get()
+        record = self._take(request_fingerprint(messages, temperature, max_tokens, response_format), capture_id)
+        if record is None:
+            self.misses += 1
+            raise LLMClientException("No recorded LLM response matches this request")
+
+        if self.emulate_timing:
+            delay_ms = record["duration_ms"] * self.timing_scale
+            await asyncio.sleep(delay_ms / 1000)
+            self.served_ms[capture_id] += delay_ms
+
+        if record.get("error"):
+            raise LLMClientException(f"Recorded LLM failure: {record['error']}")
+
+        usage = record.get("usage") or {}
+        return LLMCompletion(
+            content=record["response"],
+            model=usage.get("model"),
+            finish_reason=usage.get("finish_reason"),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            wall_time_ms=usage.get("wall_time_ms"),
+            ttft_ms=usage.get("ttft_ms")
+        )
+
+    async def health_check(self) -> bool:
+        return True
@@ -0,0 +1,95 @@
+import time
+import httpx
+from typing import Dict, List, Optional
+from ...domain.exceptions import LLMClientException
+from ...domain.models import LLMCompletion, LLMCapabilities
+from ..config import settings
+from .chat_templates import render_chat
+from .openai_client import OpenAICompatibleClient, _spread
+
+
+class VLLMClient(OpenAICompatibleClient):
+    """vLLM driver: chat calls use the OpenAI API, batches go to ``/v1/completions`` as a prompt list.
+
+    The completions endpoint takes raw prompts, so batched conversations are rendered with
+    ``VLLM_CHAT_TEMPLATE``, which must match the served model; without it the client does not batch.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(
+            base_url=settings.vllm_base_url,
+            api_key=settings.vllm_api_key,
+            model=settings.vllm_model,
+            top_p=settings.lm_studio_top_p,
+            stream_responses=settings.lm_studio_stream,
+            transport=transport
+        )
+        self.chat_template = settings.vllm_chat_template
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return LLMCapabilities(
+            streaming=True,
+            json_schema=True,
+            multiple_choices=True,
+            prefix_caching=True,
+            batching=self.chat_template is not None,
+            context_window=settings.vllm_context_window
+        )
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> List[LLMCompletion]:
+        """Send every conversation in one completions request and return the choices in order.
+
+        Usage is reported for the whole request; it is split across the completions in proportion
+        to the length of each prompt and output.
+        """
+        if self.chat_template is None:
+            return await super().generate_batch(conversations, temperature, max_tokens)
+        payload = {
+            "prompt": [render_chat(messages, self.chat_template) for messages in conversations],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": self.top_p
+        }
+        if self.model:
+            payload["model"] = self.model
+
+        async def attempt(timeout: httpx.Timeout) -> List[LLMCompletion]:
+            started = time.perf_counter()
+            response = await self._client().post(
+                f"{self.base_url}/completions",
+                json=payload,
+                headers=self._headers(),
+                timeout=timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+            wall_time_ms = round((time.perf_counter() - started) * 1000, 3)
+
+            completions: List[Optional[LLMCompletion]] = [None] * len(conversations)
+            for choice in data["choices"]:
+                completions[choice["index"]] = LLMCompletion(
+                    content=choice["text"],
+                    model=data.get("model"),
+                    finish_reason=choice.get("finish_reason"),
+                    wall_time_ms=wall_time_ms
+                )
+            if any(completion is None for completion in completions):
+                raise LLMClientException("Batched completion response is missing choices")
+
+            usage = data.get("usage") or {}
+            prompt_tokens = _spread(usage.get("prompt_tokens"), [len(prompt) for prompt in payload["prompt"]])
+            completion_tokens = _spread(
+                usage.get("completion_tokens"), [len(completion.content) for completion in completions]
+            )
+            for completion, prompt_count, completion_count in zip(completions, prompt_tokens, completion_tokens):
+                completion.prompt_tokens = prompt_count
+                completion.completion_tokens = completion_count
+            return completions
+
+        return await self._with_retries(attempt)
@@ -0,0 +1,16 @@
+"""Structured, non-blocking application logging."""
+
+from .formatter import JsonFormatter
+from .filters import RequestIdFilter, SamplingFilter
+from .middleware import RequestIdMiddleware, request_id_var
+from .setup import configure_logging, shutdown_logging
+
+__all__ = [
+    "JsonFormatter",
+    "RequestIdFilter",
+    "SamplingFilter",
+    "RequestIdMiddleware",
+    "request_id_var",
+    "configure_logging",
+    "shutdown_logging"
+]
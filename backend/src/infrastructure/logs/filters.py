@@ -0,0 +1,46 @@
+import logging
+import threading
+from typing import Dict, Optional
+from .middleware import request_id_var
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the HTTP request being handled (``-`` outside requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of records below WARNING from hot-path loggers.
+
+    ``rates`` maps logger names to the share of records kept (0-1); a logger inherits the
+    rate of its closest configured ancestor. Sampling is deterministic: with a rate of 0.1
+    the 1st, 11th, 21st... record of that logger family are kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._credit: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _configured(self, name: str) -> Optional[str]:
+        while name:
+            if name in self.rates:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        name = self._configured(record.name)
+        if name is None:
+            return True
+        with self._lock:
+            credit = self._credit.get(name, 1.0)
+            keep = credit >= 1.0
+            self._credit[name] = credit - 1.0 + self.rates[name] if keep else credit + self.rates[name]
+        return keep
@@ -0,0 +1,61 @@
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+MAX_LIST_ITEMS = 20
+REDACTED = "[REDACTED]"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with sensitive fields redacted and long values truncated.
+
+    Fields passed via ``extra=`` are included; keys listed in ``redact_fields`` are replaced
+    at any nesting depth, and strings longer than ``max_field_chars`` (the message included)
+    are cut with a note of how much was dropped.
+    """
+
+    def __init__(self, redact_fields: Iterable[str] = (), max_field_chars: int = 1024):
+        super().__init__()
+        self.redact_fields = {field.lower() for field in redact_fields}
+        self.max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": self._truncate(record.getMessage()),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id and request_id != "-":
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = self._scrub(key, value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+    def _scrub(self, key: str, value: Any) -> Any:
+        if key.lower() in self.redact_fields:
+            return REDACTED
+        if isinstance(value, dict):
+            return {str(k): self._scrub(str(k), v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            items = [self._scrub(key, item) for item in value[:MAX_LIST_ITEMS]]
+            if len(value) > MAX_LIST_ITEMS:
+                items.append(f"... (+{len(value) - MAX_LIST_ITEMS} items)")
+            return items
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        return self._truncate(str(value))
+
+    def _truncate(self, text: str) -> str:
+        if len(text) <= self.max_field_chars:
+            return text
+        return f"{text[:self.max_field_chars]}... (+{len(text) - self.max_field_chars} chars)"
@@ -0,0 +1,53 @@
+"""ASGI middleware that assigns each request an id for log correlation."""
+
+import logging
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+access_logger = logging.getLogger("api.access")
+
+# Accept caller-supplied ids (e.g. from a proxy) only if they are short and log-safe
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """Bind ``X-Request-ID`` (or a fresh id) to the request context, echo it and log the request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        supplied = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        request_id = supplied if VALID_REQUEST_ID.match(supplied) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status = {"code": None}
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            access_logger.info(
+                "%s %s %s", scope["method"], scope["path"], status["code"],
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status["code"],
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+            )
+            request_id_var.reset(token)
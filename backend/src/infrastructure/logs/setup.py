@@ -0,0 +1,78 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Optional, TextIO
+from .filters import RequestIdFilter, SamplingFilter
+from .formatter import JsonFormatter
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class LogQueueHandler(QueueHandler):
+    """Queue handler that keeps ``extra`` fields and renders tracebacks before enqueueing."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_output: bool = True,
+    sample_rates: Optional[Dict[str, float]] = None,
+    redact_fields: Iterable[str] = (),
+    max_field_chars: int = 1024,
+    stream: Optional[TextIO] = None
+) -> QueueListener:
+    """Route all logging through a queue drained by a background thread.
+
+    Callers on the event loop only enqueue the record; formatting and writing to ``stream``
+    (stderr by default) happen on the listener thread. Request ids are attached and sampling
+    applied before enqueueing, so dropped records cost almost nothing. Replaces any previous
+    configuration made by this function.
+    """
+    global _listener
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if json_output:
+        output.setFormatter(JsonFormatter(redact_fields, max_field_chars))
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    handler = LogQueueHandler(queue.SimpleQueue())
+    handler.addFilter(RequestIdFilter())
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(handler.queue, output)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and detach the handler installed by ``configure_logging``."""
+    global _listener
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, LogQueueHandler)]:
+        root.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
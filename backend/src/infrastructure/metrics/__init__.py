@@ -0,0 +1,5 @@
+"""In-process application metrics."""
+
+from .registry import Counter, Gauge, MetricsRegistry, metrics
+
+__all__ = ["Counter", "Gauge", "MetricsRegistry", "metrics"]
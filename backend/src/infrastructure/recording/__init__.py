@@ -0,0 +1,4 @@
+from .traffic_log import TrafficLog, read_traffic, capture_id_var
+from .middleware import TrafficRecorderMiddleware
+
+__all__ = ["TrafficLog", "read_traffic", "capture_id_var", "TrafficRecorderMiddleware"]
@@ -0,0 +1,56 @@
+"""ASGI middleware that captures API requests for later replay."""
+
+import json
+import time
+import uuid
+
+from .traffic_log import TrafficLog, capture_id_var
+
+
+class TrafficRecorderMiddleware:
+    """Record ``POST /api/*`` requests (path, JSON body, status, duration) to a traffic log."""
+
+    def __init__(self, app, traffic_log: TrafficLog):
+        self.app = app
+        self.traffic_log = traffic_log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        capture_id = uuid.uuid4().hex
+        token = capture_id_var.set(capture_id)
+        body = bytearray()
+        status = {"code": None}
+        started = time.perf_counter()
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                body.extend(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            capture_id_var.reset(token)
+            try:
+                payload = json.loads(body) if body else None
+            except ValueError:
+                payload = None
+            self.traffic_log.write({
+                "kind": "http",
+                "id": capture_id,
+                "ts": time.time(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "body": payload,
+                "status": status["code"],
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            })
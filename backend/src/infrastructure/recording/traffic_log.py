@@ -0,0 +1,120 @@
+"""Compact rotating JSONL log for captured API and LLM traffic."""
+
+import json
+import os
+import queue
+import threading
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+# Correlates LLM calls with the HTTP request that triggered them
+capture_id_var: ContextVar[Optional[str]] = ContextVar("capture_id", default=None)
+
+
+class TrafficLog:
+    """Append-only JSONL writer that rotates by size (``path``, ``path.1`` ... ``path.N``).
+
+    Callers on the event loop only serialize and enqueue a record; writing, flushing and
+    rotation happen on a background thread, started on the first write and stopped by ``close``.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._queue: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._headers: List[bytes] = []
+
+    def write(self, record: dict) -> None:
+        """Queue one record for appending."""
+        self._put(self._encode(record))
+
+    def write_header(self, record: dict) -> None:
+        """Queue a record that is also repeated at the start of every rotated file.
+
+        For records that later ones depend on, so each file can be read without its backups.
+        """
+        data = self._encode(record)
+        with self._lock:
+            self._headers.append(data)
+        self._put(data)
+
+    @staticmethod
+    def _encode(record: dict) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _put(self, data: bytes) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain, name="traffic-log", daemon=True)
+                self._writer.start()
+            self._queue.put(data)
+
+    def _drain(self) -> None:
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            self._append(data)
+
+    def _append(self, data: bytes) -> None:
+        """Append one line, rotating first if it would exceed ``max_bytes``."""
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+
+        if self.max_bytes > 0 and self._file.tell() + len(data) > self.max_bytes and self._file.tell() > 0:
+            self._rotate()
+
+        self._file.write(data)
+        self._file.flush()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+        with self._lock:
+            headers = list(self._headers)
+        for header in headers:
+            self._file.write(header)
+
+    def close(self) -> None:
+        """Write out every queued record and close the file."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                self._queue.put(None)
+        if writer is not None:
+            writer.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_traffic(path: str) -> Iterator[dict]:
+    """Yield records from ``path`` and its rotated backups, oldest first."""
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        index += 1
+
+    for file_path in list(reversed(backups)) + [path]:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,35 @@
+import logging
+from ...domain.interfaces import ITokenizer
+from ..config import settings
+from .approximate import ApproximateTokenizer
+from .tiktoken_tokenizer import TiktokenTokenizer
+from .huggingface_tokenizer import HuggingFaceTokenizer
+
+logger = logging.getLogger(__name__)
+
+
+def create_tokenizer(spec: str = None) -> ITokenizer:
+    """Build the configured tokenizer: ``approximate``, ``tiktoken[:<encoding>]`` or ``huggingface:<source>``.
+
+    Exact tokenizers need optional packages (and, for Hugging Face, the tokenizer file);
+    when they are unavailable the approximate tokenizer is used instead.
+    """
+    spec = spec or settings.tokenizer
+    kind, _, argument = spec.partition(":")
+    kind = kind.lower()
+    if kind == "approximate":
+        return ApproximateTokenizer()
+    if kind not in ("tiktoken", "huggingface"):
+        raise ValueError(f"Unknown tokenizer: {spec}")
+    try:
+        if kind == "tiktoken":
+            return TiktokenTokenizer(argument or "cl100k_base")
+        if not argument:
+            raise ValueError("huggingface tokenizer needs a tokenizer.json path or model id")
+        return HuggingFaceTokenizer(argument)
+    except Exception as e:
+        logger.warning(f"Tokenizer {spec} unavailable ({e}); using the approximate tokenizer")
+        return ApproximateTokenizer()
+
+
+__all__ = ["ApproximateTokenizer", "TiktokenTokenizer", "HuggingFaceTokenizer", "create_tokenizer"]
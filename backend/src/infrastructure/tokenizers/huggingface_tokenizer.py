@@ -0,0 +1,30 @@
+import os
+from ...domain.interfaces import ITokenizer
+
+
+class HuggingFaceTokenizer(ITokenizer):
+    """Exact counts for the served model via the optional ``tokenizers`` package.
+
+    ``source`` is a ``tokenizer.json`` file (shipped with most local model downloads)
+    or a Hugging Face Hub model id.
+    """
+
+    def __init__(self, source: str):
+        from tokenizers import Tokenizer
+
+        self.source = source
+        if os.path.isfile(source):
+            self._tokenizer = Tokenizer.from_file(source)
+        else:
+            self._tokenizer = Tokenizer.from_pretrained(source)
+
+    @property
+    def name(self) -> str:
+        return f"huggingface:{self.source}"
+
+    @property
+    def exact(self) -> bool:
+        return True
+
+    def count(self, text: str) -> int:
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
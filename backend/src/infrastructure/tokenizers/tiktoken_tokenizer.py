@@ -0,0 +1,22 @@
+from ...domain.interfaces import ITokenizer
+
+
+class TiktokenTokenizer(ITokenizer):
+    """Exact counts for OpenAI vocabularies via the optional ``tiktoken`` package."""
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        import tiktoken
+
+        self.encoding_name = encoding
+        self._encoding = tiktoken.get_encoding(encoding)
+
+    @property
+    def name(self) -> str:
+        return f"tiktoken:{self.encoding_name}"
+
+    @property
+    def exact(self) -> bool:
+        return True
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
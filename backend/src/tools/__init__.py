@@ -0,0 +1 @@
+"""Operational tooling (load testing, fake backends, maintenance CLIs)."""
@@ -0,0 +1,258 @@
+"""Optimize a corpus of prompts for one or more vendors.
+
+Prompts are read from JSONL (``prompt`` plus optional ``id`` and ``context`` fields) or CSV
+(columns of the same names) and optimized with bounded concurrency, either in-process
+through ``OptimizationService`` or against a running API with ``--base-url``::
+
+    python -m src.tools.bulk_optimize prompts.jsonl --vendors claude,openai --output results.jsonl
+    python -m src.tools.bulk_optimize prompts.csv --vendors qwen --base-url http://localhost:8000 \\
+        --concurrency 8 --output results.jsonl
+
+Each result is appended to the output as one JSON line as soon as it is ready. The output is
+also the checkpoint: rerunning the same command skips every (id, vendor) pair that already has
+a successful line, so an interrupted run resumes where it stopped; ids must therefore be unique.
+Failed pairs are written with an ``error`` field and retried on the next run.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, List, Optional, Set, TextIO, Tuple
+
+import httpx
+
+from ..domain.models import OptimizationRequest, VendorType
+
+Optimizer = Callable[["BulkItem", VendorType], Awaitable[dict]]
+
+
+@dataclass
+class BulkItem:
+    """One prompt of the corpus; ``id`` defaults to its 1-based position in the file."""
+    id: str
+    prompt: str
+    context: Optional[str] = None
+
+
+def read_items(path: str, fmt: Optional[str] = None) -> List[BulkItem]:
+    """Read prompts from a JSONL or CSV file (format from the extension unless given).
+
+    Ids key the checkpoint, so a repeated id (given, or clashing with a default one) is rejected.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            rows: Iterable[dict] = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        items = []
+        ids = set()
+        for position, row in enumerate(rows, start=1):
+            if not row.get("prompt"):
+                raise ValueError(f"Record {position} of {path} has no prompt")
+            item = BulkItem(id=str(row.get("id") or position), prompt=row["prompt"], context=row.get("context") or None)
+            if item.id in ids:
+                raise ValueError(f"Record {position} of {path} repeats id {item.id!r}")
+            ids.add(item.id)
+            items.append(item)
+    return items
+
+
+def parse_vendors(value: str) -> List[VendorType]:
+    """Parse ``claude,openai`` into vendor types."""
+    return [VendorType(name.strip()) for name in value.split(",") if name.strip()]
+
+
+def load_checkpoint(path: str) -> Set[Tuple[str, str]]:
+    """Return the (id, vendor) pairs already optimized successfully in the output file.
+
+    A trailing line cut off by an interrupted write is removed so appending stays valid JSONL.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            f.truncate(complete)
+    done = set()
+    for line in data[:complete].decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "error" not in record:
+            done.add((record["id"], record["vendor"]))
+    return done
+
+
+class Progress:
+    """Counts finished pairs and renders throughput and ETA for this run."""
+
+    def __init__(self, total: int, skipped: int = 0):
+        self.total = total
+        self.skipped = skipped
+        self.done = 0
+        self.errors = 0
+        self.started = time.monotonic()
+
+    def record(self, ok: bool) -> None:
+        self.done += 1
+        self.errors += not ok
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        remaining = self.total - self.skipped - self.done
+        return remaining / self.rate if self.rate > 0 else None
+
+    def render(self) -> str:
+        finished = self.skipped + self.done
+        eta = self.eta_seconds()
+        eta_text = "--:--:--" if eta is None else time.strftime("%H:%M:%S", time.gmtime(eta))
+        percent = 100 * finished / self.total if self.total else 100.0
+        return (
+            f"{finished}/{self.total} ({percent:.1f}%) | {self.rate:.2f} prompts/s | "
+            f"ETA {eta_text} | errors {self.errors}"
+        )
+
+
+def service_optimizer(service) -> Optimizer:
+    """Optimize in-process with an ``OptimizationService``."""
+    async def optimize(item: BulkItem, vendor: VendorType) -> dict:
+        result = await service.optimize_prompt(OptimizationRequest(
+            original_prompt=item.prompt,
+            target_vendor=vendor,
+            context=item.context
+        ))
+        return {
+            "optimized": result.optimized,
+            "enhancement_notes": result.enhancement_notes,
+            "metadata": result.metadata
+        }
+
+    return optimize
+
+
+def api_optimizer(client: httpx.AsyncClient) -> Optimizer:
+    """Optimize through ``POST /api/optimize`` of a running backend."""
+    async def optimize(item: BulkItem, vendor: VendorType) -> dict:
+        payload = {"prompt": item.prompt, "vendor": vendor.value}
+        if item.context:
+            payload["context"] = item.context
+        response = await client.post("/api/optimize", json=payload)
+        response.raise_for_status()
+        body = response.json()
+        return {key: body[key] for key in ("optimized", "enhancement_notes", "metadata")}
+
+    return optimize
+
+
+async def bulk_optimize(
+    items: List[BulkItem],
+    vendors: List[VendorType],
+    optimize: Optimizer,
+    output: TextIO,
+    concurrency: int = 4,
+    done: Optional[Set[Tuple[str, str]]] = None,
+    progress: Optional[Progress] = None
+) -> Progress:
+    """Optimize every (item, vendor) pair not in ``done``, appending results to ``output``."""
+    done = done or set()
+    pairs = [(item, vendor) for item in items for vendor in vendors if (item.id, vendor.value) not in done]
+    progress = progress or Progress(len(items) * len(vendors))
+    progress.skipped = progress.total - len(pairs)
+    pending = iter(pairs)
+
+    async def worker() -> None:
+        # Workers pull from one shared iterator, so at most ``concurrency`` calls are in flight
+        for item, vendor in pending:
+            record = {"id": item.id, "vendor": vendor.value, "original": item.prompt}
+            try:
+                record.update(await optimize(item, vendor))
+            except Exception as e:
+                record["error"] = str(e) or type(e).__name__
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            progress.record("error" not in record)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return progress
+
+
+async def _report(progress: Progress, stream: TextIO, interval: float) -> None:
+    # Redraw in place on a terminal, one line per interval otherwise
+    end = "\r" if stream.isatty() else "\n"
+    while True:
+        await asyncio.sleep(interval)
+        stream.write(progress.render() + end)
+        stream.flush()
+
+
+async def _optimizer_run(args: argparse.Namespace, optimize: Optimizer) -> Progress:
+    items = read_items(args.input, args.input_format)
+    done = load_checkpoint(args.output)
+    progress = Progress(len(items) * len(args.vendors))
+    reporter = asyncio.create_task(_report(progress, sys.stderr, args.progress_interval))
+    try:
+        with open(args.output, "a", encoding="utf-8") as output:
+            return await bulk_optimize(items, args.vendors, optimize, output, args.concurrency, done, progress)
+    finally:
+        reporter.cancel()
+        sys.stderr.write(progress.render() + "\n")
+
+
+async def _main(args: argparse.Namespace) -> Progress:
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+            return await _optimizer_run(args, api_optimizer(client))
+
+    from ..infrastructure.di import Container
+
+    # Same startup and shutdown as the API's lifespan
+    Container.initialize_vendor_registry()
+    container = Container()
+    service = container.optimization_service()
+    await container.llm_client().warm_up()
+    try:
+        return await _optimizer_run(args, service_optimizer(service))
+    finally:
+        await container.llm_client().close()
+        result_cache = container.result_cache()
+        if result_cache is not None:
+            await result_cache.close()
+        history_repository = container.history_repository()
+        if history_repository is not None:
+            await history_repository.close()
+        traffic_log = container.traffic_log()
+        if traffic_log is not None:
+            traffic_log.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Optimize a corpus of prompts, resuming interrupted runs")
+    parser.add_argument("input", help="JSONL or CSV file with a 'prompt' field (optional 'id', 'context')")
+    parser.add_argument("--input-format", choices=["jsonl", "csv"], help="Default: from the file extension")
+    parser.add_argument(
+        "--vendors", type=parse_vendors, required=True, help="Comma-separated target vendors, e.g. claude,openai"
+    )
+    parser.add_argument("--output", required=True, help="Results JSONL, appended to and used as the checkpoint")
+    parser.add_argument("--concurrency", type=int, default=4, help="Optimizations in flight at once")
+    parser.add_argument("--base-url", help="Use a running API instead of optimizing in-process")
+    parser.add_argument("--timeout", type=float, default=180.0, help="Per-request timeout with --base-url")
+    parser.add_argument("--progress-interval", type=float, default=2.0, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    progress = asyncio.run(_main(args))
+    sys.exit(1 if progress.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Export the optimization history for offline analysis or fine-tuning datasets.
+
+Rows are streamed from the history database through a server-side cursor and written
+as they are encoded, so exports of any size run in constant memory::
+
+    python -m src.tools.export_history --format parquet --output history.parquet --vendor claude
+    python -m src.tools.export_history --format jsonl --gzip --since 2026-01-01 > history.jsonl.gz
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import BinaryIO, Optional
+
+from ..domain.models import VendorType, HistoryQuery
+from ..infrastructure.config import settings
+from ..infrastructure.history import EXPORT_FORMATS, SqlHistoryRepository, check_format, export_entries
+
+
+async def export_history(
+    database_url: str,
+    output: BinaryIO,
+    fmt: str = "jsonl",
+    gzip: bool = False,
+    query: Optional[HistoryQuery] = None,
+    batch_size: int = 1000
+) -> int:
+    """Write matching history entries to ``output``; returns the number of bytes written."""
+    check_format(fmt)
+    repository = SqlHistoryRepository(database_url)
+    written = 0
+    try:
+        entries = repository.iter_entries(query or HistoryQuery(), batch_size=batch_size)
+        async for chunk in export_entries(entries, fmt, gzip):
+            output.write(chunk)
+            written += len(chunk)
+    finally:
+        await repository.close()
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the optimization history")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    parser.add_argument("--gzip", action="store_true", help="gzip CSV/JSONL; gzip column chunks for Parquet")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--database-url", default=settings.history_database_url)
+    parser.add_argument("--query", help="Words that must all appear in the prompts")
+    parser.add_argument("--vendor", choices=[vendor.value for vendor in VendorType])
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Created at or after (ISO-8601)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Created before (ISO-8601)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows fetched per round trip")
+    args = parser.parse_args()
+
+    query = HistoryQuery(
+        text=args.query,
+        vendor=VendorType(args.vendor) if args.vendor else None,
+        since=args.since,
+        until=args.until
+    )
+    try:
+        check_format(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output:
+        with open(args.output, "wb") as output:
+            asyncio.run(export_history(args.database_url, output, args.format, args.gzip, query, args.batch_size))
+    else:
+        asyncio.run(export_history(
+            args.database_url, sys.stdout.buffer, args.format, args.gzip, query, args.batch_size
+        ))
+
+
+if __name__ == "__main__":
+    main()
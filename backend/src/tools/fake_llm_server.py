@@ -0,0 +1,287 @@
+"""Deterministic fake OpenAI-compatible LLM server for load testing.
+
+Serves ``/v1/models``, ``/v1/chat/completions`` (streaming and non-streaming) and
+``/v1/completions`` with prompt lists (one batch per request), with configurable
+time-to-first-token, decode speed, error rate and concurrency, so the backend can be
+capacity-tested without a real model.
+
+Run it in place of LM Studio::
+
+    python -m src.tools.fake_llm_server --port 1234 --ttft-ms 300 --tokens-per-second 40
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = [
+    "clear", "concise", "expert", "context", "structured", "explain", "steps", "example",
+    "constraints", "audience", "format", "detailed", "summary", "analysis", "goal", "output",
+    "role", "specific", "language", "task", "criteria", "review", "improve", "precise",
+]
+
+QUESTIONS_PATTERN = re.compile(r"Generate (\d+) essential questions", re.IGNORECASE)
+
+
+@dataclass
+class FakeLLMConfig:
+    """Behaviour of the fake backend."""
+    ttft_ms: float = 200.0
+    tokens_per_second: float = 50.0
+    completion_tokens: int = 128
+    error_rate: float = 0.0
+    max_concurrency: int = 1
+    max_queue: int = 64
+    seed: int = 42
+    model: str = "fake-llm"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def render_tokens(messages: List[Dict[str, str]], num_tokens: int, seed: int, json_output: bool = False) -> List[str]:
+    """Render a deterministic completion for the given conversation as a list of tokens."""
+    digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+    rng = random.Random(f"{seed}:{digest}")
+
+    # Think Mode is one conversation; only its latest turn says which step is being asked for
+    match = QUESTIONS_PATTERN.search(messages[-1].get("content", "")) if messages else None
+    if match:
+        # Think Mode: answer with real questions, as a JSON object when a schema was requested
+        questions = [
+            "What " + " ".join(rng.choice(WORDS) for _ in range(6)) + "?"
+            for _ in range(int(match.group(1)))
+        ]
+        if json_output:
+            text = json.dumps({"questions": questions})
+        else:
+            text = "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+    return [("" if i == 0 else " ") + rng.choice(WORDS) for i in range(num_tokens)]
+
+
+class FakeLLMServer:
+    """OpenAI-compatible stub with deterministic output and simulated timing."""
+
+    def __init__(self, config: FakeLLMConfig):
+        self.config = config
+        self._slots = asyncio.Semaphore(config.max_concurrency)
+        self._inflight = 0
+        self._request_count = 0
+        # Prompts per /v1/completions request, in arrival order
+        self.completion_batches: List[int] = []
+        self.app = self._build_app()
+
+    def _should_fail(self, request_number: int) -> bool:
+        """Deterministically decide whether a request gets an injected error."""
+        if self.config.error_rate <= 0:
+            return False
+        return random.Random(f"{self.config.seed}:error:{request_number}").random() < self.config.error_rate
+
+    def _reject(self, request_number: int) -> Optional[JSONResponse]:
+        """Error response for an injected failure, or a 503 once every slot and the queue are taken."""
+        if self._should_fail(request_number):
+            return JSONResponse(status_code=500, content={"error": {"message": "Injected failure"}})
+        if self._inflight >= self.config.max_concurrency + self.config.max_queue:
+            return JSONResponse(status_code=503, content={"error": {"message": "Server overloaded"}})
+        return None
+
+    async def _pace(self, started: float, index: int) -> None:
+        """Sleep until token ``index`` is due, given TTFT and decode speed."""
+        due = started + self.config.ttft_ms / 1000.0 + index / max(self.config.tokens_per_second, 1e-6)
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _plan(self, payload: dict, choice: int = 0, messages: Optional[List[Dict[str, str]]] = None) -> tuple:
+        """Return (tokens, finish_reason, prompt_tokens) for one choice of a chat completion payload."""
+        messages = payload.get("messages", []) if messages is None else messages
+        max_tokens = int(payload.get("max_tokens") or self.config.completion_tokens)
+        json_output = (payload.get("response_format") or {}).get("type") == "json_schema"
+        tokens = render_tokens(messages, self.config.completion_tokens, self.config.seed + choice, json_output)
+        finish_reason = "stop"
+        if len(tokens) > max_tokens:
+            tokens = tokens[:max_tokens]
+            finish_reason = "length"
+        prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+        return tokens, finish_reason, prompt_tokens
+
+    def _chunk(self, completion_id: str, delta: dict, finish_reason=None) -> str:
+        body = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "model": self.config.model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    async def _complete(self, completion_id: str, payload: dict) -> dict:
+        # ``n`` choices share one prefill and decode in lockstep
+        plans = [self._plan(payload, choice) for choice in range(int(payload.get("n") or 1))]
+        prompt_tokens = plans[0][2]
+        completion_tokens = sum(len(tokens) for tokens, _, _ in plans)
+        async with self._slots:
+            started = time.monotonic()
+            await self._pace(started, max(len(tokens) for tokens, _, _ in plans))
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.config.model,
+            "choices": [
+                {
+                    "index": index,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": finish_reason,
+                }
+                for index, (tokens, finish_reason, _) in enumerate(plans)
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    async def _complete_prompts(self, completion_id: str, payload: dict) -> dict:
+        # A prompt list is one batch: a single prefill pass, then all prompts decode in lockstep
+        prompts = payload.get("prompt") or ""
+        prompts = [prompts] if isinstance(prompts, str) else prompts
+        plans = [self._plan(payload, messages=[{"role": "user", "content": prompt}]) for prompt in prompts]
+        prompt_tokens = sum(plan[2] for plan in plans)
+        completion_tokens = sum(len(tokens) for tokens, _, _ in plans)
+        async with self._slots:
+            started = time.monotonic()
+            await self._pace(started, max(len(tokens) for tokens, _, _ in plans))
+        return {
+            "id": completion_id,
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": self.config.model,
+            "choices": [
+                {"index": index, "text": "".join(tokens), "finish_reason": finish_reason}
+                for index, (tokens, finish_reason, _) in enumerate(plans)
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    async def _stream(self, completion_id: str, payload: dict) -> AsyncIterator[str]:
+        # Counted here rather than in the handler: a body that is never iterated never runs the finally
+        self._inflight += 1
+        tokens, finish_reason, prompt_tokens = self._plan(payload)
+        try:
+            async with self._slots:
+                started = time.monotonic()
+                yield self._chunk(completion_id, {"role": "assistant", "content": ""})
+                for index, token in enumerate(tokens):
+                    await self._pace(started, index)
+                    yield self._chunk(completion_id, {"content": token})
+                yield self._chunk(completion_id, {}, finish_reason)
+                if (payload.get("stream_options") or {}).get("include_usage"):
+                    usage = {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": len(tokens),
+                        "total_tokens": prompt_tokens + len(tokens),
+                    }
+                    body = {"id": completion_id, "object": "chat.completion.chunk",
+                            "model": self.config.model, "choices": [], "usage": usage}
+                    yield f"data: {json.dumps(body)}\n\n"
+                yield "data: [DONE]\n\n"
+        finally:
+            self._inflight -= 1
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake LLM Server")
+
+        @app.get("/v1/models")
+        async def list_models():
+            return {"object": "list", "data": [{"id": self.config.model, "object": "model"}]}
+
+        @app.post("/v1/chat/completions")
+        async def chat_completions(request: Request):
+            payload = await request.json()
+            self._request_count += 1
+            completion_id = f"chatcmpl-fake-{self._request_count}"
+
+            rejected = self._reject(self._request_count)
+            if rejected is not None:
+                return rejected
+
+            if payload.get("stream"):
+                return StreamingResponse(self._stream(completion_id, payload), media_type="text/event-stream")
+            self._inflight += 1
+            try:
+                return await self._complete(completion_id, payload)
+            finally:
+                self._inflight -= 1
+
+        @app.post("/v1/completions")
+        async def completions(request: Request):
+            payload = await request.json()
+            self._request_count += 1
+            self.completion_batches.append(len(payload["prompt"]) if isinstance(payload.get("prompt"), list) else 1)
+
+            rejected = self._reject(self._request_count)
+            if rejected is not None:
+                return rejected
+            self._inflight += 1
+            try:
+                return await self._complete_prompts(f"cmpl-fake-{self._request_count}", payload)
+            finally:
+                self._inflight -= 1
+
+        return app
+
+
+def create_app(config: FakeLLMConfig = None) -> FastAPI:
+    """Create the fake server ASGI app."""
+    return FakeLLMServer(config or FakeLLMConfig()).app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deterministic fake OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--ttft-ms", type=float, default=FakeLLMConfig.ttft_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=FakeLLMConfig.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=FakeLLMConfig.completion_tokens)
+    parser.add_argument("--error-rate", type=float, default=FakeLLMConfig.error_rate)
+    parser.add_argument("--max-concurrency", type=int, default=FakeLLMConfig.max_concurrency)
+    parser.add_argument("--max-queue", type=int, default=FakeLLMConfig.max_queue)
+    parser.add_argument("--seed", type=int, default=FakeLLMConfig.seed)
+    parser.add_argument("--model", default=FakeLLMConfig.model)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeLLMConfig(
+        ttft_ms=args.ttft_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        seed=args.seed,
+        model=args.model,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Open-loop load generator for the optimizer API.
+
+Drives ``/api/optimize`` and the Think Mode endpoints at a target request rate with
+a realistic prompt mix, then prints a JSON report with latency percentiles,
+throughput and an error breakdown per endpoint::
+
+    python -m src.tools.load_generator --base-url http://localhost:8000 --rps 5 --duration 60 \\
+        --mix optimize=0.7,think=0.3 --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+VENDORS = ["openai", "claude", "grok", "gemini", "qwen", "deepseek"]
+
+# Short and long prompts, several languages, roughly matching production traffic
+DEFAULT_PROMPTS = [
+    "Write a function to calculate fibonacci",
+    "explain linear algebra",
+    "analyze this business proposal",
+    "напиши код для сортировки массива",
+    "расскажи мне про линейную алгебру",
+    "Summarize the attached meeting notes into action items for each team member",
+    "Create a study plan for learning Rust in three months, I already know Python and Go",
+    "Write a cover letter for a senior backend engineer position at a fintech startup",
+    "Explica cómo funciona la fotosíntesis para estudiantes de secundaria",
+    "Review this SQL query for performance problems and suggest indexes",
+    "Design a REST API for a library management system with authentication, "
+    "book reservations, overdue fines and an admin dashboard. Include data models.",
+    "Translate our onboarding guide into a friendly tone and keep all technical terms intact",
+]
+
+QUESTION_COUNTS = [(5, 0.5), (10, 0.35), (25, 0.15)]
+
+SCENARIOS = ("optimize", "think")
+
+
+@dataclass
+class Sample:
+    """Outcome of a single HTTP request."""
+    endpoint: str
+    latency_ms: float
+    status: Optional[int]
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of ``values`` (pct in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(samples: List[Sample], duration_seconds: float) -> dict:
+    """Aggregate samples into counts, latency percentiles and an error breakdown."""
+    latencies = [s.latency_ms for s in samples if s.ok]
+    errors: Dict[str, int] = {}
+    for sample in samples:
+        if not sample.ok:
+            errors[sample.error] = errors.get(sample.error, 0) + 1
+
+    return {
+        "requests": len(samples),
+        "successes": len(latencies),
+        "failures": len(samples) - len(latencies),
+        "throughput_rps": round(len(latencies) / duration_seconds, 3) if duration_seconds > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "max": round(max(latencies), 2) if latencies else 0.0,
+        },
+        "errors": errors,
+    }
+
+
+class LoadGenerator:
+    """Open-loop (Poisson arrivals) load generator against a running API."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mix: Dict[str, float],
+        prompts: Optional[List[str]] = None,
+        seed: int = 0
+    ):
+        unknown = set(mix) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        self.client = client
+        self.mix = mix
+        self.prompts = prompts or DEFAULT_PROMPTS
+        self.rng = random.Random(seed)
+        self.samples: List[Sample] = []
+
+    async def run(self, rps: float, duration_seconds: float) -> dict:
+        """Start scenarios at ``rps`` for ``duration_seconds`` and return the JSON report."""
+        tasks = []
+        started = time.monotonic()
+        next_arrival = started
+        while next_arrival - started < duration_seconds:
+            delay = next_arrival - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            scenario = self._pick_scenario()
+            tasks.append(asyncio.create_task(getattr(self, f"_{scenario}")()))
+            next_arrival += self.rng.expovariate(rps)
+
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+        endpoints = sorted({s.endpoint for s in self.samples})
+        report = summarize(self.samples, elapsed)
+        report.update({
+            "target_rps": rps,
+            "duration_seconds": round(elapsed, 3),
+            "scenarios_started": len(tasks),
+            "mix": self.mix,
+            "endpoints": {
+                endpoint: summarize([s for s in self.samples if s.endpoint == endpoint], elapsed)
+                for endpoint in endpoints
+            },
+        })
+        return report
+
+    def _pick_scenario(self) -> str:
+        names = list(self.mix)
+        return self.rng.choices(names, weights=[self.mix[n] for n in names])[0]
+
+    async def _request(self, endpoint: str, payload: dict) -> Optional[dict]:
+        """POST ``payload`` to ``endpoint`` and record the outcome."""
+        started = time.perf_counter()
+        status = None
+        error = None
+        body = None
+        try:
+            response = await self.client.post(endpoint, json=payload)
+            status = response.status_code
+            if response.is_success:
+                body = response.json()
+            else:
+                error = f"HTTP {status}"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.samples.append(Sample(endpoint, latency_ms, status, error))
+        return body
+
+    async def _optimize(self) -> None:
+        await self._request("/api/optimize", {
+            "prompt": self.rng.choice(self.prompts),
+            "vendor": self.rng.choice(VENDORS),
+        })
+
+    async def _think(self) -> None:
+        prompt = self.rng.choice(self.prompts)
+        vendor = self.rng.choice(VENDORS)
+        num_questions = self.rng.choices(
+            [count for count, _ in QUESTION_COUNTS],
+            weights=[weight for _, weight in QUESTION_COUNTS]
+        )[0]
+
+        result = await self._request("/api/think/generate-questions", {
+            "prompt": prompt,
+            "vendor": vendor,
+            "num_questions": num_questions,
+        })
+        if not result or not result.get("questions"):
+            return
+
+        questions = result["questions"]
+        await self._request("/api/think/optimize-with-answers", {
+            "prompt": prompt,
+            "vendor": vendor,
+            "questions": questions,
+            "answers": [f"Answer {i + 1}" for i in range(len(questions))],
+            "num_questions": num_questions,
+        })
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse ``optimize=0.7,think=0.3`` into a weights dict."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def load_prompts(path: str) -> List[str]:
+    """Load prompts from a text file (one per line) or JSONL with a ``prompt`` field."""
+    prompts = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            prompts.append(json.loads(line)["prompt"] if line.startswith("{") else line)
+    return prompts
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        generator = LoadGenerator(
+            client,
+            mix=parse_mix(args.mix),
+            prompts=load_prompts(args.prompts) if args.prompts else None,
+            seed=args.seed
+        )
+        return await generator.run(rps=args.rps, duration_seconds=args.duration)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load generator for the prompt optimizer API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rps", type=float, default=2.0, help="Target scenario arrival rate")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to generate load for")
+    parser.add_argument("--mix", default="optimize=0.7,think=0.3", help="Scenario weights")
+    parser.add_argument("--prompts", help="Prompt file (text lines or JSONL with 'prompt')")
+    parser.add_argument("--timeout", type=float, default=180.0)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(_main(args)), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure the prefill tokens saved by retrieving few-shot examples instead of sending all.
+
+For every prompt and vendor, compares the vendor instructions with the whole example
+library against the instructions with only the top-k retrieved examples, and prints a
+JSON report per vendor::
+
+    python -m src.tools.prefill_savings --top-k 2
+    python -m src.tools.prefill_savings --prompts prompts.jsonl --top-k 1 --vendor claude
+
+Tokens are counted with the configured tokenizer (``TOKENIZER``, or ``--tokenizer``).
+The rest of the request is identical either way, so the difference is the saving.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+from ..domain.fewshot import ExampleSelector
+from ..domain.interfaces import ITokenizer, IVendorAdapter, render_examples
+from ..domain.models import VendorType
+from ..domain.registries import VendorRegistry
+from ..infrastructure.di import Container
+from ..infrastructure.tokenizers import ApproximateTokenizer, create_tokenizer
+from .load_generator import DEFAULT_PROMPTS, load_prompts
+
+
+def measure(
+    adapter: IVendorAdapter,
+    prompts: List[str],
+    selector: ExampleSelector,
+    tokenizer: ITokenizer
+) -> dict:
+    """Average instruction tokens with all examples and with retrieved examples."""
+    full = tokenizer.count(adapter.get_system_instructions())
+    core = adapter.get_core_instructions()
+    selected = [tokenizer.count(core + render_examples(selector.select(adapter, prompt))) for prompt in prompts]
+    selected_avg = sum(selected) / len(selected)
+    return {
+        "prompts": len(prompts),
+        "library_examples": len(adapter.get_examples()),
+        "full_tokens": full,
+        "selected_tokens_avg": round(selected_avg, 1),
+        "saved_tokens_avg": round(full - selected_avg, 1),
+        "saved_pct": round(100 * (full - selected_avg) / full, 1) if full else 0.0
+    }
+
+
+def prefill_savings(
+    prompts: List[str],
+    top_k: int,
+    vendors: Optional[List[VendorType]] = None,
+    tokenizer: Optional[ITokenizer] = None
+) -> Dict[str, dict]:
+    """Per-vendor savings report for the prompt corpus."""
+    selector = ExampleSelector(top_k=top_k)
+    tokenizer = tokenizer or ApproximateTokenizer()
+    adapters = VendorRegistry.all()
+    return {
+        vendor.value: measure(adapters[vendor], prompts, selector, tokenizer)
+        for vendor in vendors or list(adapters)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure prefill tokens saved by few-shot example retrieval")
+    parser.add_argument("--prompts", help="Prompt file (text lines or JSONL with 'prompt'); default: built-in mix")
+    parser.add_argument("--top-k", type=int, default=2, help="Examples retrieved per request")
+    parser.add_argument("--vendor", action="append", choices=[v.value for v in VendorType],
+                        help="Vendor to measure (repeatable); default: all")
+    parser.add_argument("--tokenizer", help="Tokenizer spec; default: the TOKENIZER setting")
+    args = parser.parse_args()
+
+    Container.initialize_vendor_registry()
+    tokenizer = create_tokenizer(args.tokenizer)
+    report = {
+        "tokenizer": tokenizer.name,
+        "top_k": args.top_k,
+        "vendors": prefill_savings(
+            load_prompts(args.prompts) if args.prompts else DEFAULT_PROMPTS,
+            args.top_k,
+            [VendorType(v) for v in args.vendor] if args.vendor else None,
+            tokenizer
+        )
+    }
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
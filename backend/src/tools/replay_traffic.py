@@ -0,0 +1,165 @@
+"""Re-drive a captured traffic window against the current build.
+
+LLM calls are served from the capture by ``ReplayLLMClient`` and the captured API requests
+are re-issued in-process, so the report isolates backend overhead (API latency minus LLM
+time) per endpoint, next to the overhead observed when the traffic was recorded::
+
+    python -m src.tools.replay_traffic traffic.jsonl --since 2026-01-05T10:00 --until 2026-01-05T11:00 \\
+        --output after.json --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+from ..infrastructure.llm import ReplayLLMClient
+from ..infrastructure.recording import read_traffic, capture_id_var
+from .load_generator import percentile
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Parse an epoch timestamp or ISO-8601 datetime into epoch seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _percentiles(values: List[float]) -> dict:
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+    }
+
+
+async def replay(
+    app,
+    records: List[dict],
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    emulate_timing: bool = False,
+    concurrency: int = 1
+) -> dict:
+    """Replay the captured HTTP requests in ``[since, until]`` against ``app``."""
+    requests = [
+        r for r in records
+        if r.get("kind") == "http"
+        and (since is None or r["ts"] >= since)
+        and (until is None or r["ts"] <= until)
+    ]
+    captured_llm_ms: Dict[str, float] = defaultdict(float)
+    for record in records:
+        if record.get("kind") == "llm" and record.get("capture_id"):
+            captured_llm_ms[record["capture_id"]] += record["duration_ms"]
+
+    llm_client = ReplayLLMClient(records, emulate_timing=emulate_timing)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def drive(client: httpx.AsyncClient, record: dict) -> None:
+        async with semaphore:
+            token = capture_id_var.set(record["id"])
+            started = time.perf_counter()
+            try:
+                response = await client.post(record["path"], json=record["body"])
+                status = response.status_code
+            finally:
+                capture_id_var.reset(token)
+            latency_ms = (time.perf_counter() - started) * 1000
+            results.append((record, status, latency_ms))
+
+    # The service is a singleton, so rebuild it around the replay client and back again
+    app.container.llm_client.override(llm_client)
+    app.container.optimization_service.reset()
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://replay") as client:
+            await asyncio.gather(*(drive(client, record) for record in requests))
+    finally:
+        app.container.llm_client.reset_last_overriding()
+        app.container.optimization_service.reset()
+
+    endpoints: Dict[str, dict] = defaultdict(lambda: {"captured": [], "replayed": [], "errors": 0, "mismatches": 0})
+    for record, status, latency_ms in results:
+        stats = endpoints[record["path"]]
+        stats["captured"].append(record["duration_ms"] - captured_llm_ms[record["id"]])
+        stats["replayed"].append(latency_ms - llm_client.served_ms.get(record["id"], 0.0))
+        stats["errors"] += status >= 400
+        stats["mismatches"] += status != record["status"]
+
+    return {
+        "requests": len(results),
+        "llm_misses": llm_client.misses,
+        "endpoints": {
+            path: {
+                "requests": len(stats["replayed"]),
+                "errors": stats["errors"],
+                "status_mismatches": stats["mismatches"],
+                "overhead_ms": {
+                    "captured": _percentiles(stats["captured"]),
+                    "replayed": _percentiles(stats["replayed"]),
+                },
+            }
+            for path, stats in sorted(endpoints.items())
+        },
+    }
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Add replayed-overhead deltas against a previous report for the same capture."""
+    for path, stats in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(path)
+        if not before:
+            continue
+        stats["delta_vs_baseline_ms"] = {
+            key: round(stats["overhead_ms"]["replayed"][key] - before["overhead_ms"]["replayed"][key], 2)
+            for key in ("p50", "p95", "p99")
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay captured traffic against the current build")
+    parser.add_argument("capture", help="Traffic log path (rotated backups are read too)")
+    parser.add_argument("--since", help="Window start (epoch seconds or ISO-8601)")
+    parser.add_argument("--until", help="Window end (epoch seconds or ISO-8601)")
+    parser.add_argument("--emulate-timing", action="store_true", help="Sleep for the recorded LLM latency")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    from ..api.main import app
+
+    records = list(read_traffic(args.capture))
+    report = asyncio.run(replay(
+        app,
+        records,
+        since=parse_time(args.since),
+        until=parse_time(args.until),
+        emulate_timing=args.emulate_timing,
+        concurrency=args.concurrency
+    ))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from src.api.main import app
 from src.infrastructure.llm import LMStudioClient
 from src.application.services import OptimizationService
 from src.infrastructure.di.container import Container
+from src.domain.models import LLMCompletion, LLMCapabilities
 
 
 @pytest.fixture
@@ -25,6 +26,7 @@ async def async_client():
     """Fixture for async HTTP client with mocked LLM client."""
     # Create a mock LLM client with smart responses
     mock_llm_client = AsyncMock()
+    mock_llm_client.capabilities = LLMCapabilities()
 
     def mock_generate_response(*args, **kwargs):
         """Smart mock that returns appropriate responses based on context."""
@@ -38,12 +40,12 @@ async def async_client():
                     num_questions = 10
                 elif '25 essential questions' in user_content:
                     num_questions = 25
-                return "\n".join([f"{i}. Question {i}?" for i in range(1, num_questions + 1)])
+                return LLMCompletion(content="\n".join([f"{i}. Question {i}?" for i in range(1, num_questions + 1)]))
             # Check if this is optimization with answers
             elif 'Q:' in user_content and 'A:' in user_content:
-                return "Optimized prompt based on user answers"
+                return LLMCompletion(content="Optimized prompt based on user answers")
         # Default optimization response
-        return "Optimized test prompt"
+        return LLMCompletion(content="Optimized test prompt")
 
     mock_llm_client.generate = AsyncMock(side_effect=mock_generate_response)
     mock_llm_client.health_check = AsyncMock(return_value=True)
@@ -52,9 +54,12 @@ async def async_client():
     with patch.object(Container, 'llm_client', return_value=mock_llm_client):
         # Reinitialize the app's container with mocked client
         app.container.llm_client.override(mock_llm_client)
+        app.container.token_estimator.reset()
+        app.container.optimization_service.reset()
 
         async with AsyncClient(app=app, base_url="http://test") as client:
             yield client
 
         # Reset override after test
         app.container.llm_client.reset_override()
+        app.container.optimization_service.reset()
@@ -0,0 +1,116 @@
+"""Tests for the native llama.cpp and Ollama backend drivers."""
+import json
+import httpx
+import pytest
+from src.application.services.question_parser import questions_response_format
+from src.domain.exceptions import LLMClientException
+from src.infrastructure.config import settings
+from src.infrastructure.llm import (
+    ConcurrencyLimitedLLMClient,
+    LlamaCppClient,
+    LMStudioClient,
+    MicroBatchingLLMClient,
+    OllamaClient,
+    VLLMClient,
+    create_llm_client
+)
+from src.infrastructure.metrics import metrics
+
+MESSAGES = [{"role": "user", "content": "Write a function"}]
+
+
+def ollama_backend(lines, requests, stream=True) -> OllamaClient:
+    """Ollama driver against a mock server replying with the given NDJSON lines."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.url.path, json.loads(request.content or b"null")))
+        body = "".join(json.dumps(line) + "\n" for line in lines)
+        return httpx.Response(200, text=body, headers={"content-type": "application/x-ndjson"})
+
+    client = OllamaClient(transport=httpx.MockTransport(handler))
+    client.base_url = "http://ollama"
+    client.stream_responses = stream
+    return client
+
+
+OLLAMA_STREAM = [
+    {"model": "qwen", "message": {"role": "assistant", "content": "Hello"}, "done": False},
+    {"model": "qwen", "message": {"role": "assistant", "content": " world"}, "done": False},
+    {"model": "qwen", "message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "length",
+     "prompt_eval_count": 12, "eval_count": 2},
+]
+
+
+@pytest.mark.asyncio
+async def test_ollama_sends_native_options_and_reads_usage():
+    """Test keep_alive, num_ctx and the schema as ``format`` on /api/chat."""
+    requests = []
+    client = ollama_backend(OLLAMA_STREAM, requests)
+
+    completion = await client.generate(MESSAGES, max_tokens=64, response_format=questions_response_format(3))
+
+    path, payload = requests[0]
+    assert path == "/api/chat"
+    assert payload["keep_alive"] == client.keep_alive
+    assert payload["options"]["num_ctx"] == client.num_ctx and payload["options"]["num_predict"] == 64
+    assert payload["format"]["properties"]["questions"]["maxItems"] == 3
+    assert completion.content == "Hello world" and completion.model == "qwen"
+    assert completion.prompt_tokens == 12 and completion.completion_tokens == 2
+    assert completion.truncated and completion.ttft_ms is not None
+    assert client.capabilities.context_window == client.num_ctx and client.capabilities.prefix_caching
+
+
+@pytest.mark.asyncio
+async def test_ollama_stream_preload_and_errors():
+    """Test streamed deltas, the startup model load and errors reported in the stream."""
+    requests = []
+    client = ollama_backend(OLLAMA_STREAM, requests)
+
+    assert [chunk async for chunk in client.stream(MESSAGES)] == ["Hello", " world"]
+    await client.warm_up()
+    assert requests[-1] == ("/api/generate", {"model": client.model, "keep_alive": client.keep_alive})
+
+    failing = ollama_backend([{"error": "model 'qwen' not found"}], [])
+    with pytest.raises(LLMClientException):
+        await failing.generate(MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_llama_cpp_health_polls_slots():
+    """Test that the health check reads /health and publishes /slots occupancy."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        if request.url.path == "/slots":
+            return httpx.Response(200, json=[{"id": 0, "is_processing": True}, {"id": 1, "is_processing": False},
+                                             {"id": 2, "is_processing": False}])
+        return httpx.Response(404)
+
+    client = LlamaCppClient(transport=httpx.MockTransport(handler))
+    client.base_url = "http://llama/v1"
+
+    assert await client.health_check() is True
+    gauge = metrics.gauge("prompt_optimizer_llm_backend_slots", "")
+    assert gauge.value(state="processing") == 1 and gauge.value(state="idle") == 2
+    assert client.capabilities.prefix_caching and not client.capabilities.multiple_choices
+
+
+def test_factory_selects_backend_driver(monkeypatch):
+    """Test LLM_BACKEND selection and rejection of unknown drivers."""
+    monkeypatch.setattr(settings, "llm_replay_path", None)
+    monkeypatch.setattr(settings, "llm_adaptive_concurrency", True)
+    for backend, driver in [("lm_studio", LMStudioClient), ("llama_cpp", LlamaCppClient), ("ollama", OllamaClient)]:
+        monkeypatch.setattr(settings, "llm_backend", backend)
+        client = create_llm_client()
+        assert isinstance(client, ConcurrencyLimitedLLMClient) and isinstance(client.inner, driver)
+
+    monkeypatch.setattr(settings, "llm_backend", "vllm")
+    assert isinstance(create_llm_client(), ConcurrencyLimitedLLMClient)
+    monkeypatch.setattr(settings, "llm_micro_batching", True)
+    assert isinstance(create_llm_client(), ConcurrencyLimitedLLMClient)  # no chat template configured
+    monkeypatch.setattr(settings, "vllm_chat_template", "chatml")
+    batching = create_llm_client()
+    assert isinstance(batching, MicroBatchingLLMClient) and isinstance(batching.inner.inner, VLLMClient)
+
+    monkeypatch.setattr(settings, "llm_backend", "tgi")
+    with pytest.raises(ValueError):
+        create_llm_client()
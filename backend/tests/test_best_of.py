@@ -0,0 +1,128 @@
+"""Tests for best-of-N candidate generation."""
+import httpx
+import pytest
+from httpx import AsyncClient
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.interfaces import ILLMClient
+from src.domain.models import VendorType, OptimizationRequest, LLMCompletion
+from src.infrastructure.config import settings
+from src.infrastructure.llm import LMStudioClient
+from src.tools.fake_llm_server import FakeLLMConfig, FakeLLMServer
+
+GOOD = """You are an expert Python developer. Write a function that returns the n-th Fibonacci number.
+1. Use an iterative approach
+2. Include type hints and a docstring
+3. Add at least 3 usage examples
+Respond in English."""
+
+
+class ParallelMock(ILLMClient):
+    """Client that only implements ``generate``, so ``generate_many`` uses the default fan-out."""
+
+    def __init__(self, completions):
+        self.completions = list(completions)
+        self.calls = []
+
+    async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None):
+        self.calls.append({"messages": messages, "temperature": temperature})
+        return self.completions.pop(0)
+
+    async def health_check(self):
+        return True
+
+
+def fake_backend(server: FakeLLMServer) -> LMStudioClient:
+    client = LMStudioClient(transport=httpx.ASGITransport(app=server.app))
+    client.base_url = "http://fake/v1"
+    client.stream_responses = False
+    return client
+
+
+@pytest.mark.asyncio
+async def test_best_of_returns_highest_scoring_candidate():
+    """Test that candidates share one prompt and the best-scoring one is returned."""
+    client = ParallelMock([
+        LLMCompletion(content="do stuff", finish_reason="stop"),
+        LLMCompletion(content=GOOD, finish_reason="stop"),
+        LLMCompletion(content="write something maybe", finish_reason="stop"),
+    ])
+    service = OptimizationService(client)
+
+    result = await service.optimize_prompt(OptimizationRequest(
+        original_prompt="fibonacci function", target_vendor=VendorType.OPENAI, best_of=3
+    ))
+
+    assert result.optimized == GOOD
+    best_of = result.metadata["best_of"]
+    assert best_of["n"] == 3
+    assert best_of["selected"] == 1
+    overall = [candidate["score"]["overall"] for candidate in best_of["candidates"]]
+    assert overall[1] == max(overall)
+
+    assert len(client.calls) == 3
+    assert all(call["messages"] == client.calls[0]["messages"] for call in client.calls)
+    assert all(call["temperature"] == 0.7 for call in client.calls)
+
+
+@pytest.mark.asyncio
+async def test_best_of_avoids_truncated_candidates():
+    """Test that a cut-off candidate loses to a complete one even if it scores higher."""
+    client = ParallelMock([
+        LLMCompletion(content=GOOD, finish_reason="length"),
+        LLMCompletion(content="Write a Fibonacci function.", finish_reason="stop"),
+    ])
+    service = OptimizationService(client)
+
+    result = await service.optimize_prompt(OptimizationRequest(
+        original_prompt="fibonacci function", target_vendor=VendorType.CLAUDE, best_of=2
+    ))
+
+    assert result.optimized == "Write a Fibonacci function."
+    assert result.metadata["truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_single_sample_does_not_use_generate_many():
+    """Test that the default path keeps one low-temperature sample."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized"))
+    service = OptimizationService(mock_client)
+
+    result = await service.optimize_prompt(
+        OptimizationRequest(original_prompt="Test", target_vendor=VendorType.OPENAI)
+    )
+
+    mock_client.generate_many.assert_not_called()
+    assert "best_of" not in result.metadata
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("multiple_choices, expected_requests", [(True, 1), (False, 3)])
+async def test_lm_studio_generate_many(monkeypatch, multiple_choices, expected_requests):
+    """Test one ``n``-choice request when supported, parallel requests otherwise."""
+    monkeypatch.setattr(settings, "lm_studio_multiple_choices", multiple_choices)
+    server = FakeLLMServer(FakeLLMConfig(ttft_ms=0, tokens_per_second=100000, completion_tokens=10))
+
+    completions = await fake_backend(server).generate_many(
+        messages=[{"role": "user", "content": "Write a function"}], n=3
+    )
+
+    assert len(completions) == 3
+    assert all(len(completion.content.split()) == 10 for completion in completions)
+    # Each choice carries its share of the output tokens, not the whole request's
+    assert sum(completion.completion_tokens for completion in completions) == 30
+    assert server._request_count == expected_requests
+    if multiple_choices:
+        assert len({completion.content for completion in completions}) == 3
+
+
+@pytest.mark.asyncio
+async def test_best_of_is_validated(async_client: AsyncClient):
+    """Test the API limit on candidates."""
+    response = await async_client.post(
+        "/api/optimize",
+        json={"prompt": "Test", "vendor": "openai", "best_of": 9}
+    )
+
+    assert response.status_code == 422
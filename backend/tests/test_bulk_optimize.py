@@ -0,0 +1,131 @@
+"""Tests for the resumable bulk optimizer CLI."""
+import asyncio
+import io
+import json
+import pytest
+from httpx import AsyncClient
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.models import VendorType, LLMCompletion
+from src.tools.bulk_optimize import (
+    BulkItem, Progress, api_optimizer, bulk_optimize, load_checkpoint, read_items, service_optimizer
+)
+
+
+def test_read_items_from_jsonl_and_csv(tmp_path):
+    """Test both input formats, positional default ids and optional context."""
+    jsonl = tmp_path / "prompts.jsonl"
+    jsonl.write_text('{"prompt": "explain physics"}\n\n{"id": "b", "prompt": "sort a list", "context": "Python"}\n')
+    table = tmp_path / "prompts.csv"
+    table.write_text('id,prompt,context\nx,"multi\nline",\n,second,ctx\n')
+
+    assert read_items(str(jsonl)) == [BulkItem("1", "explain physics"), BulkItem("b", "sort a list", "Python")]
+    assert read_items(str(table)) == [BulkItem("x", "multi\nline"), BulkItem("2", "second", "ctx")]
+
+
+def test_repeated_ids_are_rejected(tmp_path):
+    """Test that ids stay unique, since each one keys a checkpoint line."""
+    jsonl = tmp_path / "prompts.jsonl"
+    jsonl.write_text('{"id": "a", "prompt": "one"}\n{"id": "a", "prompt": "two"}\n')
+    clash = tmp_path / "clash.jsonl"
+    clash.write_text('{"id": "2", "prompt": "one"}\n{"prompt": "two"}\n')
+
+    with pytest.raises(ValueError, match="repeats id 'a'"):
+        read_items(str(jsonl))
+    with pytest.raises(ValueError, match="repeats id '2'"):
+        read_items(str(clash))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_results_are_appended():
+    """Test that no more than ``concurrency`` optimizations run at once and every pair is written."""
+    running = []
+    peak = []
+
+    async def optimize(item, vendor):
+        running.append(item)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(item)
+        return {"optimized": f"{item.prompt} for {vendor.value}"}
+
+    output = io.StringIO()
+    items = [BulkItem(str(i), f"prompt {i}") for i in range(6)]
+    progress = await bulk_optimize(items, [VendorType.CLAUDE, VendorType.QWEN], optimize, output, concurrency=3)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert max(peak) == 3
+    assert len(records) == 12 and progress.done == 12
+    assert {(r["id"], r["vendor"]) for r in records} == {(str(i), v) for i in range(6) for v in ("claude", "qwen")}
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_without_redoing_work(tmp_path):
+    """Test that successes are skipped, failures retried, and a torn last line is discarded."""
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        '{"id": "1", "vendor": "claude", "optimized": "done"}\n'
+        '{"id": "2", "vendor": "claude", "error": "HTTP 503"}\n'
+        '{"id": "3", "vendor": "cla'
+    )
+    calls = []
+
+    async def optimize(item, vendor):
+        calls.append(item.id)
+        return {"optimized": "new"}
+
+    done = load_checkpoint(str(path))
+    with open(path, "a", encoding="utf-8") as output:
+        progress = await bulk_optimize(
+            [BulkItem(str(i), f"prompt {i}") for i in range(1, 4)], [VendorType.CLAUDE], optimize, output, done=done
+        )
+
+    assert done == {("1", "claude")}
+    assert sorted(calls) == ["2", "3"]
+    assert progress.skipped == 1
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 4 and lines[-1]["optimized"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_failures_are_recorded_and_counted():
+    """Test that one failing prompt does not stop the run."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(side_effect=[LLMCompletion(content="Optimized"), RuntimeError("backend down")])
+    output = io.StringIO()
+
+    progress = await bulk_optimize(
+        [BulkItem("1", "a"), BulkItem("2", "b")], [VendorType.GROK],
+        service_optimizer(OptimizationService(mock_client)), output, concurrency=1
+    )
+
+    first, second = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert first["optimized"] == "Optimized Respond in English." and first["metadata"]["vendor"] == "grok"
+    assert second["error"] == "backend down"
+    assert progress.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_optimizes_through_the_api(async_client: AsyncClient):
+    """Test the --base-url mode against the app."""
+    output = io.StringIO()
+
+    item = BulkItem("1", "explain physics", "for kids")
+    await bulk_optimize([item], [VendorType.GEMINI], api_optimizer(async_client), output)
+
+    record = json.loads(output.getvalue())
+    assert record["optimized"] == "Optimized test prompt Respond in English."
+    assert record["vendor"] == "gemini"
+
+
+def test_progress_reports_throughput_and_eta(monkeypatch):
+    """Test the rate and ETA computed from this run's completions only."""
+    progress = Progress(total=10, skipped=4)
+    monkeypatch.setattr(progress, "started", progress.started - 2)
+    progress.record(True)
+    progress.record(False)
+
+    assert progress.rate == pytest.approx(1.0, rel=0.05)
+    assert progress.eta_seconds() == pytest.approx(4.0, rel=0.05)
+    assert progress.render().startswith("6/10 (60.0%) | 1.00 prompts/s | ETA 00:00:0")
+    assert progress.render().endswith("errors 1")
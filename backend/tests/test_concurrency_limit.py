@@ -0,0 +1,235 @@
+"""Tests for the adaptive LLM concurrency limit."""
+import asyncio
+import httpx
+import pytest
+from src.domain.deadline import Deadline, deadline_var
+from src.domain.exceptions import DeadlineExceededException
+from src.domain.interfaces import ILLMClient
+from src.domain.models import LLMCompletion
+from src.infrastructure.llm import AdaptiveConcurrencyLimiter, ConcurrencyLimitedLLMClient, create_llm_client
+from src.infrastructure.llm.concurrency import concurrency_limit
+from src.infrastructure.metrics import metrics
+
+
+class GatedClient(ILLMClient):
+    """Client whose calls block until released, reporting a configurable TTFT."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.started = []
+        self.ttft_ms = 100.0
+        self.model = "model-a"
+        self.error = None
+
+    async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None):
+        self.started.append(messages[0]["content"])
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return LLMCompletion(content="ok", model=self.model, ttft_ms=self.ttft_ms)
+
+    async def health_check(self):
+        return True
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://backend/v1/chat/completions")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def limited(inner: ILLMClient, **kwargs) -> ConcurrencyLimitedLLMClient:
+    return ConcurrencyLimitedLLMClient(inner, AdaptiveConcurrencyLimiter("test", **kwargs))
+
+
+def call(client: ILLMClient, name: str):
+    return asyncio.create_task(client.generate(messages=[{"role": "user", "content": name}]))
+
+
+def test_limit_grows_while_saturated_and_backs_off_once_per_window():
+    """Test additive increase under stable latency and one multiplicative decrease per overload burst."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial=2, max_limit=4)
+    limiter.in_flight = 2
+
+    for _ in range(4):
+        limiter.on_success(100.0, "model-a", epoch=0)
+    assert limiter.limit == 3
+
+    limiter.on_success(250.0, "model-a", epoch=0)
+    assert limiter.limit == 2
+    limiter.on_overload(epoch=0)  # a request admitted before the back-off reports late
+    assert limiter.limit == 2
+
+
+def test_limit_stays_put_when_not_in_use():
+    """Test that fast responses do not raise a limit the traffic is not using."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial=4)
+    limiter.in_flight = 1
+
+    for _ in range(20):
+        limiter.on_success(100.0, "model-a", epoch=0)
+
+    assert limiter.limit == 4
+
+
+def test_model_swap_resets_latency_baseline():
+    """Test that a slower model loaded in the backend is not mistaken for overload."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial=4)
+    limiter.on_success(100.0, "small-model", epoch=0)
+
+    limiter.on_success(900.0, "large-model", epoch=0)
+
+    assert limiter.baselines == {"ttft": 900.0}
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_model_swap_resets_latency_baseline_when_streaming():
+    """Test that streams report their serving model, so a slower model is not taken for overload."""
+    class SwappingClient(ILLMClient):
+        def __init__(self):
+            self.model, self.delay = "small-model", 0.01
+
+        @property
+        def streamed_model(self):
+            return self.model
+
+        async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None):
+            raise NotImplementedError
+
+        async def stream(self, messages, temperature=0.7, max_tokens=2048, response_format=None):
+            await asyncio.sleep(self.delay)
+            yield "ok"
+
+        async def health_check(self):
+            return True
+
+    inner = SwappingClient()
+    client = limited(inner, initial=4)
+    assert [chunk async for chunk in client.stream(messages=[{"role": "user", "content": "a"}])] == ["ok"]
+    inner.model, inner.delay = "large-model", 0.2
+
+    assert [chunk async for chunk in client.stream(messages=[{"role": "user", "content": "a"}])] == ["ok"]
+    assert client.limiter.baselines["ttft"] >= 200.0
+    assert client.limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_latency_kinds_have_separate_baselines():
+    """Test that a low per-token latency does not make later TTFT samples look like overload."""
+    class MixedClient(ILLMClient):
+        async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None):
+            if messages[0]["content"] == "batch":
+                return LLMCompletion(content="ok", model="model-a", completion_tokens=160)
+            return LLMCompletion(content="ok", model="model-a", ttft_ms=300.0)
+
+        async def health_check(self):
+            return True
+
+    client = limited(MixedClient(), initial=8)
+    await client.generate(messages=[{"role": "user", "content": "batch"}])
+    for _ in range(4):
+        await client.generate(messages=[{"role": "user", "content": "stream"}])
+
+    assert set(client.limiter.baselines) == {"per_token", "ttft"}
+    assert client.limiter.baselines["ttft"] == 300.0
+    assert client.limiter.limit == 8
+
+
+@pytest.mark.asyncio
+async def test_requests_over_the_limit_queue_in_order():
+    """Test FIFO admission once in-flight requests finish."""
+    inner = GatedClient()
+    client = limited(inner, initial=1)
+
+    tasks = [call(client, name) for name in ("a", "b", "c")]
+    await asyncio.sleep(0.01)
+    assert inner.started == ["a"]
+    assert client.limiter.queued == 2
+
+    inner.gate.set()
+    await asyncio.gather(*tasks)
+
+    assert inner.started == ["a", "b", "c"]
+    assert client.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, backs_off", [(503, True), (429, True), (400, False)])
+async def test_backend_errors_shrink_limit(status, backs_off):
+    """Test that overload responses back off while client errors do not."""
+    inner = GatedClient()
+    inner.error = status_error(status)
+    inner.gate.set()
+    client = limited(inner, initial=4)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await call(client, "a")
+
+    assert client.limiter.limit == (3 if backs_off else 4)
+    assert client.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_bounded_by_deadline():
+    """Test that a request queued behind a slow one gives up when its deadline passes."""
+    inner = GatedClient()
+    client = limited(inner, initial=1)
+    first = call(client, "a")
+    await asyncio.sleep(0)
+
+    token = deadline_var.set(Deadline.after(0.05))
+    try:
+        with pytest.raises(DeadlineExceededException):
+            await client.generate(messages=[{"role": "user", "content": "b"}])
+    finally:
+        deadline_var.reset(token)
+
+    assert client.limiter.queued == 0
+    inner.gate.set()
+    await first
+    assert inner.started == ["a"]
+    assert client.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    """Test that cancelling a queued request leaves the slot count consistent."""
+    inner = GatedClient()
+    client = limited(inner, initial=1)
+    first = call(client, "a")
+    second = call(client, "b")
+    await asyncio.sleep(0.01)
+
+    second.cancel()
+    inner.gate.set()
+    await first
+    with pytest.raises(asyncio.CancelledError):
+        await second
+
+    assert client.limiter.in_flight == 0
+    assert inner.started == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_slot_until_closed():
+    """Test that a stream occupies a slot for its whole lifetime."""
+    inner = GatedClient()
+    inner.gate.set()
+    client = limited(inner, initial=2)
+
+    chunks = client.stream(messages=[{"role": "user", "content": "a"}])
+    assert await chunks.__anext__() == "ok"
+    assert client.limiter.in_flight == 1
+    await chunks.aclose()
+
+    assert client.limiter.in_flight == 0
+
+
+def test_limit_is_exported_as_metric():
+    """Test the per-backend gauge and the default client wiring."""
+    limiter = AdaptiveConcurrencyLimiter("metric-test", initial=6)
+
+    assert concurrency_limit.value(backend="metric-test") == 6
+    assert 'prompt_optimizer_llm_concurrency_limit{backend="metric-test"} 6' in metrics.render()
+    assert limiter.limit == 6
+    assert isinstance(create_llm_client(), ConcurrencyLimitedLLMClient)
@@ -0,0 +1,182 @@
+"""Tests for request deadline propagation."""
+import asyncio
+import httpx
+import pytest
+from httpx import AsyncClient
+from src.api.main import app
+from src.api.disconnect import deadline_exceeded_requests
+from src.domain.deadline import Deadline, budget, deadline_var
+from src.domain.exceptions import DeadlineExceededException
+from src.domain.interfaces import ILLMClient
+from src.infrastructure.config import settings
+from src.infrastructure.llm import LMStudioClient
+
+COMPLETION = {
+    "model": "test",
+    "choices": [{"message": {"content": "Optimized"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 1}
+}
+
+
+class SlowClient(ILLMClient):
+    """LLM client that records the deadline it sees and never finishes."""
+
+    def __init__(self):
+        self.deadline = None
+        self.cancelled = False
+
+    async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None):
+        self.deadline = deadline_var.get()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    async def health_check(self):
+        return True
+
+
+@pytest.fixture
+def slow_client():
+    client = SlowClient()
+    app.container.llm_client.override(client)
+    app.container.optimization_service.reset()
+    yield client
+    app.container.llm_client.reset_last_overriding()
+    app.container.optimization_service.reset()
+
+
+def mock_backend(handler) -> LMStudioClient:
+    client = LMStudioClient(transport=httpx.MockTransport(handler))
+    client.base_url = "http://mock/v1"
+    client.stream_responses = False
+    return client
+
+
+def test_budget_is_capped_by_current_deadline():
+    """Test stage budgets without, within and after a deadline."""
+    assert budget(30.0, "stage") == 30.0
+
+    token = deadline_var.set(Deadline.after(2.0))
+    try:
+        assert 1.5 < budget(30.0, "stage") <= 2.0
+        assert budget(0.5, "stage") == 0.5
+    finally:
+        deadline_var.reset(token)
+
+    token = deadline_var.set(Deadline.after(-1))
+    try:
+        with pytest.raises(DeadlineExceededException):
+            budget(30.0, "stage")
+    finally:
+        deadline_var.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_header_deadline_abandons_work(slow_client):
+    """Test that the caller's budget propagates to the LLM call and ends in a 504."""
+    before = deadline_exceeded_requests.value(endpoint="optimize")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/optimize",
+            json={"prompt": "Test", "vendor": "openai"},
+            headers={"X-Request-Timeout-Ms": "50"}
+        )
+
+    assert response.status_code == 504
+    assert slow_client.cancelled is True
+    assert slow_client.deadline is not None
+    assert deadline_exceeded_requests.value(endpoint="optimize") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_endpoint_default_deadline_is_capped(slow_client, monkeypatch):
+    """Test per-endpoint defaults and the global cap on client-provided budgets."""
+    monkeypatch.setattr(settings, "deadline_generate_questions_ms", 40)
+    monkeypatch.setattr(settings, "deadline_max_ms", 60)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        default = await client.post(
+            "/api/think/generate-questions",
+            json={"prompt": "Test", "vendor": "openai", "num_questions": 5}
+        )
+        capped = await client.post(
+            "/api/optimize",
+            json={"prompt": "Test", "vendor": "openai"},
+            headers={"X-Request-Timeout-Ms": "600000"}
+        )
+
+    assert default.status_code == 504
+    assert capped.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_invalid_deadline_header_is_rejected(async_client: AsyncClient):
+    """Test header validation."""
+    response = await async_client.post(
+        "/api/optimize",
+        json={"prompt": "Test", "vendor": "openai"},
+        headers={"X-Request-Timeout-Ms": "0"}
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_llm_client_retries_transient_failures(monkeypatch):
+    """Test that 503s are retried with backoff and the request timeout follows the deadline."""
+    monkeypatch.setattr(settings, "lm_studio_retry_backoff_ms", 1)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.extensions["timeout"]["read"])
+        if len(attempts) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json=COMPLETION)
+
+    token = deadline_var.set(Deadline.after(5.0))
+    try:
+        completion = await mock_backend(handler).generate(messages=[{"role": "user", "content": "Hi"}])
+    finally:
+        deadline_var.reset(token)
+
+    assert completion.content == "Optimized"
+    assert len(attempts) == 3
+    assert all(timeout <= 5.0 for timeout in attempts)
+
+
+@pytest.mark.asyncio
+async def test_llm_client_does_not_retry_past_deadline(monkeypatch):
+    """Test that a retry whose backoff would overrun the deadline is not attempted."""
+    monkeypatch.setattr(settings, "lm_studio_retry_backoff_ms", 1000)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(503)
+
+    token = deadline_var.set(Deadline.after(0.2))
+    try:
+        with pytest.raises(DeadlineExceededException):
+            await mock_backend(handler).generate(messages=[{"role": "user", "content": "Hi"}])
+    finally:
+        deadline_var.reset(token)
+
+    assert len(attempts) == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_client_does_not_retry_client_errors():
+    """Test that non-transient statuses fail immediately."""
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await mock_backend(handler).generate(messages=[{"role": "user", "content": "Hi"}])
+
+    assert len(attempts) == 1
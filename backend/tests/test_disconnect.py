@@ -0,0 +1,125 @@
+"""Tests for cancelling upstream generation on client disconnect, and the metrics endpoint."""
+import asyncio
+import json
+import pytest
+from httpx import AsyncClient
+from src.api.main import app
+from src.api.disconnect import cancelled_requests
+from src.domain.interfaces import ILLMClient
+from src.infrastructure.config import settings
+from src.infrastructure.metrics import MetricsRegistry
+
+
+class HangingClient(ILLMClient):
+    """LLM client whose generation never finishes unless cancelled."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None):
+        self.started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    async def health_check(self):
+        return True
+
+
+async def call_and_disconnect(path: str, body: dict) -> list:
+    """Drive the ASGI app directly, sending ``http.disconnect`` once generation has started."""
+    client = app.container.llm_client()
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    pending = [{"type": "http.request", "body": payload, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if pending:
+            return pending.pop(0)
+        await client.started.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    return sent
+
+
+@pytest.fixture
+def hanging_client(monkeypatch):
+    """Install a hanging LLM client in the app container."""
+    monkeypatch.setattr(settings, "disconnect_poll_interval_ms", 10)
+    client = HangingClient()
+    app.container.llm_client.override(client)
+    app.container.optimization_service.reset()
+    yield client
+    app.container.llm_client.reset_last_overriding()
+    app.container.optimization_service.reset()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_upstream_generation(hanging_client):
+    """Test that a client disconnect cancels the in-flight LLM call and is counted."""
+    before = cancelled_requests.value(endpoint="optimize")
+
+    sent = await call_and_disconnect("/api/optimize", {"prompt": "Test", "vendor": "openai"})
+
+    assert hanging_client.cancelled is True
+    assert sent[0]["status"] == 499
+    assert cancelled_requests.value(endpoint="optimize") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_question_generation(hanging_client):
+    """Test cancellation on the Think Mode endpoint."""
+    before = cancelled_requests.value(endpoint="generate_questions")
+
+    sent = await call_and_disconnect(
+        "/api/think/generate-questions",
+        {"prompt": "Test", "vendor": "claude", "num_questions": 5}
+    )
+
+    assert hanging_client.cancelled is True
+    assert sent[0]["status"] == 499
+    assert cancelled_requests.value(endpoint="generate_questions") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_cancellations(async_client: AsyncClient):
+    """Test the Prometheus text output."""
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE prompt_optimizer_cancelled_requests_total counter" in response.text
+
+
+def test_metrics_registry_renders_labels():
+    """Test counter and gauge rendering with labels."""
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests")
+    counter.inc(endpoint="optimize")
+    counter.inc(2, endpoint="optimize")
+    registry.gauge("limit", "Concurrency limit").set(4.5, backend='lm "studio"')
+
+    assert registry.counter("requests_total", "Requests") is counter
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{endpoint="optimize"} 3',
+        "# HELP limit Concurrency limit",
+        "# TYPE limit gauge",
+        'limit{backend="lm \\"studio\\""} 4.5',
+    ]
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests")
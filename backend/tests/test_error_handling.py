@@ -3,7 +3,7 @@ import pytest
 from httpx import AsyncClient
 from unittest.mock import AsyncMock
 from src.application.services import OptimizationService
-from src.domain.models import VendorType
+from src.domain.models import VendorType, LLMCapabilities
 
 
 @pytest.mark.asyncio
@@ -151,6 +151,7 @@ async def test_optimization_service_llm_failure():
 async def test_generate_questions_llm_failure():
     """Test question generation handles LLM failures."""
     mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities()
     mock_client.generate = AsyncMock(side_effect=Exception("LLM unavailable"))
 
     service = OptimizationService(mock_client)
@@ -0,0 +1,94 @@
+"""Tests for few-shot example retrieval."""
+import pytest
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.fewshot import ExampleIndex, ExampleSelector
+from src.domain.models import VendorType, OptimizationRequest, LLMCompletion, ExampleTransformation
+from src.domain.vendors import (
+    OpenAIAdapter,
+    ClaudeAdapter,
+    GrokAdapter,
+    GeminiAdapter,
+    QwenAdapter,
+    DeepSeekAdapter
+)
+from src.tools.prefill_savings import prefill_savings
+
+ADAPTERS = [OpenAIAdapter, ClaudeAdapter, GrokAdapter, GeminiAdapter, QwenAdapter, DeepSeekAdapter]
+
+
+@pytest.mark.parametrize("adapter_class", ADAPTERS)
+def test_adapters_split_core_rules_from_example_library(adapter_class):
+    """Test that core rules carry no examples and the full instructions carry all of them."""
+    adapter = adapter_class()
+    core = adapter.get_core_instructions()
+    examples = adapter.get_examples()
+
+    assert "Example transformations" not in core
+    assert len(examples) >= 4
+    full = adapter.get_system_instructions()
+    assert full.startswith(core)
+    assert all(example.prompt in full for example in examples)
+    assert adapter.get_system_instructions(examples=[]) == core
+
+
+@pytest.mark.parametrize("adapter_class,prompt,expected", [
+    (OpenAIAdapter, "расскажи про физику", "расскажи про квантовую физику"),
+    (OpenAIAdapter, "explain calculus basics", "explain linear algebra"),
+    (GeminiAdapter, "量子计算机是什么", "解释量子计算"),
+    (GrokAdapter, "новости SpaceX за неделю", "последние новости о SpaceX"),
+    (DeepSeekAdapter, "write pytest tests for my parser", "write unit tests for this function"),
+])
+def test_selector_prefers_lexically_similar_examples(adapter_class, prompt, expected):
+    """Test that the closest example by language and topic ranks first."""
+    selected = ExampleSelector(top_k=2).select(adapter_class(), prompt)
+
+    assert len(selected) == 2
+    assert selected[0].prompt == expected
+
+
+def test_index_is_deterministic_and_keeps_library_order_on_ties():
+    """Test ranking ties (including prompts sharing no terms) fall back to library order."""
+    examples = [
+        ExampleTransformation("English", "first", "alpha"),
+        ExampleTransformation("English", "second", "beta"),
+        ExampleTransformation("English", "third", "beta gamma"),
+    ]
+    index = ExampleIndex(examples)
+
+    assert index.top("zzz", 2) == examples[:2]
+    assert index.top("gamma", 1) == [examples[2]]
+    assert ExampleIndex([]).top("anything", 3) == []
+
+
+def test_selector_without_top_k_sends_whole_library():
+    """Test the backwards-compatible default."""
+    adapter = QwenAdapter()
+    assert ExampleSelector().select(adapter, "教我编程") == adapter.get_examples()
+
+
+@pytest.mark.asyncio
+async def test_service_appends_selected_examples_after_a_stable_prefix():
+    """Test only the retrieved examples are sent, after the vendor rules."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized"))
+    service = OptimizationService(mock_client, example_selector=ExampleSelector(top_k=1))
+
+    for prompt in ["escribe un cuento corto", "refactor my python code"]:
+        await service.optimize_prompt(OptimizationRequest(original_prompt=prompt, target_vendor=VendorType.CLAUDE))
+
+    first, second = [call.kwargs["messages"][0]["content"] for call in mock_client.generate.call_args_list]
+    head = first.index("Example transformations")
+    assert first[:head] == second[:head]
+    assert first.count('User (') == 1 and "escribe un cuento corto para niños" in first
+    assert "refactor this legacy python module" in second
+
+
+def test_prefill_savings_report():
+    """Test the savings tool over a small corpus."""
+    report = prefill_savings(["explain linear algebra", "напиши код"], top_k=1, vendors=[VendorType.OPENAI])
+
+    openai = report["openai"]
+    assert openai["prompts"] == 2 and openai["library_examples"] == 6
+    assert openai["selected_tokens_avg"] < openai["full_tokens"]
+    assert openai["saved_pct"] > 50
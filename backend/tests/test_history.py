@@ -0,0 +1,179 @@
+"""Tests for the searchable optimization history."""
+import pytest
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from unittest.mock import AsyncMock
+from src.api.main import app
+from src.application.services import OptimizationService
+from src.domain.models import VendorType, OptimizationRequest, OptimizedPrompt, LLMCompletion, HistoryQuery
+from src.infrastructure.history import SqlHistoryRepository
+from src.infrastructure.history.sql_history import fts5_query
+
+
+def result(original: str, optimized: str, vendor: VendorType = VendorType.OPENAI) -> OptimizedPrompt:
+    return OptimizedPrompt(
+        original=original,
+        optimized=optimized,
+        vendor=vendor,
+        enhancement_notes="notes",
+        metadata={"vendor": vendor.value}
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    repository = SqlHistoryRepository(f"sqlite:///{tmp_path / 'history.db'}")
+    yield repository
+    repository.engine.dispose()
+
+
+@pytest.fixture
+def history_app(history):
+    """Enable history in the app container, backed by a temporary SQLite database."""
+    app.container.history_repository.override(history)
+    app.container.optimization_service.reset()
+    yield history
+    app.container.history_repository.reset_last_overriding()
+    app.container.optimization_service.reset()
+
+
+@pytest.mark.asyncio
+async def test_full_text_search_over_both_prompts(history):
+    """Test that words from the original or optimized prompt match, and all words are required."""
+    await history.add(result("fibonacci function", "Write a Python function returning Fibonacci numbers"))
+    await history.add(result("расскажи про физику", "Объясни основы физики для новичка"))
+    await history.add(result("sort a list", "Write a Python function that sorts a list"))
+
+    python = await history.search(HistoryQuery(text="python"))
+    both = await history.search(HistoryQuery(text="python fibonacci"))
+    russian = await history.search(HistoryQuery(text="физику"))
+
+    assert [entry.original for entry in python.entries] == ["sort a list", "fibonacci function"]
+    assert [entry.original for entry in both.entries] == ["fibonacci function"]
+    assert [entry.original for entry in russian.entries] == ["расскажи про физику"]
+
+
+@pytest.mark.asyncio
+async def test_search_syntax_is_treated_as_plain_words(history):
+    """Test that FTS operators and punctuation in user input cannot break the query."""
+    await history.add(result("explain NEAR fields", "Explain electric fields"))
+
+    page = await history.search(HistoryQuery(text='fields" (NEAR*'))
+
+    assert len(page.entries) == 1
+    assert fts5_query("  **  ") is None
+    assert (await history.search(HistoryQuery(text="**"))).entries == []
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_walks_all_entries(history):
+    """Test that following next_cursor visits every entry exactly once, newest first."""
+    ids = [await history.add(result(f"prompt {i}", f"optimized {i}")) for i in range(7)]
+
+    seen = []
+    cursor = None
+    while True:
+        page = await history.search(HistoryQuery(cursor=cursor, limit=3))
+        seen += [entry.id for entry in page.entries]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == list(reversed(ids))
+
+
+@pytest.mark.asyncio
+async def test_vendor_and_date_filters(history):
+    """Test filtering by vendor and creation time."""
+    await history.add(result("a", "a", VendorType.CLAUDE))
+    await history.add(result("b", "b", VendorType.GROK))
+    now = datetime.now(timezone.utc)
+
+    claude = await history.search(HistoryQuery(vendor=VendorType.CLAUDE))
+    future = await history.search(HistoryQuery(since=now + timedelta(minutes=1)))
+    past = await history.search(HistoryQuery(until=now - timedelta(minutes=1)))
+    window = await history.search(HistoryQuery(
+        since=(now - timedelta(minutes=1)).astimezone(timezone(timedelta(hours=3))),
+        until=now + timedelta(minutes=1)
+    ))
+
+    assert [entry.original for entry in claude.entries] == ["a"]
+    assert future.entries == [] and past.entries == []
+    assert len(window.entries) == 2
+    assert window.entries[0].created_at.tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_service_records_llm_results(history):
+    """Test that LLM results from both modes are stored and tagged with their history id."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized"))
+    service = OptimizationService(mock_client, history=history)
+
+    optimized = await service.optimize_prompt(
+        OptimizationRequest(original_prompt="Test", target_vendor=VendorType.QWEN)
+    )
+    think = await service.optimize_with_answers("Test", VendorType.QWEN, ["Q?"], ["A"])
+
+    page = await history.search(HistoryQuery())
+    assert [entry.mode for entry in page.entries] == ["think", "optimize"]
+    assert optimized.metadata["history_id"] == page.entries[1].id
+    assert think.metadata["history_id"] == page.entries[0].id
+
+
+@pytest.mark.asyncio
+async def test_history_failure_does_not_fail_optimization():
+    """Test that a broken history store only logs."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized"))
+    broken = AsyncMock()
+    broken.add = AsyncMock(side_effect=RuntimeError("database is locked"))
+    service = OptimizationService(mock_client, history=broken)
+
+    optimized = await service.optimize_prompt(
+        OptimizationRequest(original_prompt="Test", target_vendor=VendorType.QWEN)
+    )
+
+    assert optimized.optimized == "Optimized"
+    assert "history_id" not in optimized.metadata
+
+
+@pytest.mark.asyncio
+async def test_history_api_search_and_reuse(async_client: AsyncClient, history_app):
+    """Test searching stored optimizations and reusing one without an LLM call."""
+    await async_client.post("/api/optimize", json={"prompt": "Explain quantum tunnelling", "vendor": "gemini"})
+    await async_client.post("/api/optimize", json={"prompt": "Summarize this article", "vendor": "claude"})
+    llm_calls = app.container.llm_client().generate.call_count
+
+    search = await async_client.get("/api/history", params={"q": "quantum", "vendor": "gemini"})
+    assert search.status_code == 200
+    entries = search.json()["entries"]
+    assert [entry["original"] for entry in entries] == ["Explain quantum tunnelling"]
+    assert search.json()["next_cursor"] is None
+
+    reused = await async_client.post(f"/api/history/{entries[0]['id']}/reuse")
+    assert reused.status_code == 200
+    assert reused.json()["optimized"] == entries[0]["optimized"]
+    assert reused.json()["metadata"]["reused"] is True
+    assert app.container.llm_client().generate.call_count == llm_calls
+
+    first_page = await async_client.get("/api/history", params={"limit": 1})
+    second_page = await async_client.get("/api/history", params={"limit": 1, "cursor": first_page.json()["next_cursor"]})
+    assert first_page.json()["entries"][0]["original"] == "Summarize this article"
+    assert second_page.json()["entries"][0]["original"] == "Explain quantum tunnelling"
+
+
+@pytest.mark.asyncio
+async def test_history_api_not_found(async_client: AsyncClient, history_app):
+    """Test unknown entries."""
+    assert (await async_client.get("/api/history/999")).status_code == 404
+    assert (await async_client.post("/api/history/999/reuse")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_history_api_disabled(async_client: AsyncClient):
+    """Test that history endpoints report the feature as unavailable by default."""
+    response = await async_client.get("/api/history")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Optimization history is disabled"
@@ -0,0 +1,141 @@
+"""Tests for streaming history exports."""
+import csv
+import gzip
+import io
+import json
+import sys
+import pytest
+from httpx import AsyncClient
+from src.api.main import app
+from src.domain.models import VendorType, OptimizedPrompt, HistoryQuery
+from src.infrastructure.history import SqlHistoryRepository, export_entries
+from src.infrastructure.history import export as export_module
+from src.tools.export_history import export_history
+
+
+def result(original: str, vendor: VendorType = VendorType.OPENAI) -> OptimizedPrompt:
+    return OptimizedPrompt(
+        original=original,
+        optimized=f"Optimized: {original}",
+        vendor=vendor,
+        enhancement_notes="notes",
+        metadata={"vendor": vendor.value, "usage": {"completion_tokens": 12}}
+    )
+
+
+@pytest.fixture
+async def history(tmp_path):
+    repository = SqlHistoryRepository(f"sqlite:///{tmp_path / 'history.db'}")
+    for i in range(5):
+        await repository.add(result(f"prompt {i}, \"quoted\"\nline", VendorType.CLAUDE if i % 2 else VendorType.GROK))
+    yield repository
+    repository.engine.dispose()
+
+
+@pytest.fixture
+def history_app(history):
+    app.container.history_repository.override(history)
+    app.container.optimization_service.reset()
+    yield history
+    app.container.history_repository.reset_last_overriding()
+    app.container.optimization_service.reset()
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_iter_entries_streams_in_batches_oldest_first(history):
+    """Test cursor iteration across several fetch batches, with filters applied."""
+    everything = [entry.id async for entry in history.iter_entries(HistoryQuery(), batch_size=2)]
+    claude = [entry.vendor async for entry in history.iter_entries(HistoryQuery(vendor=VendorType.CLAUDE))]
+    matched = [entry.original async for entry in history.iter_entries(HistoryQuery(text="prompt 3"))]
+
+    assert everything == sorted(everything) and len(everything) == 5
+    assert claude == [VendorType.CLAUDE, VendorType.CLAUDE]
+    assert matched == ['prompt 3, "quoted"\nline']
+
+
+@pytest.mark.asyncio
+async def test_csv_and_jsonl_round_trip(history, monkeypatch):
+    """Test that both text formats preserve multi-line, quoted text and metadata across chunks."""
+    monkeypatch.setattr(export_module, "CHUNK_BYTES", 100)
+
+    chunks = [chunk async for chunk in export_entries(history.iter_entries(HistoryQuery()), "jsonl")]
+    rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    csv_data = await collect(export_entries(history.iter_entries(HistoryQuery()), "csv"))
+    csv_rows = list(csv.DictReader(io.StringIO(csv_data.decode())))
+
+    assert len(chunks) > 2
+    assert [row["original"] for row in rows] == [row["original"] for row in csv_rows]
+    assert rows[0]["original"] == 'prompt 0, "quoted"\nline'
+    assert rows[0]["metadata"]["usage"] == {"completion_tokens": 12}
+    assert json.loads(csv_rows[0]["metadata"]) == rows[0]["metadata"]
+    assert csv_rows[0]["created_at"] == rows[0]["created_at"]
+
+
+@pytest.mark.asyncio
+async def test_gzip_export(history):
+    """Test streamed gzip compression."""
+    data = await collect(export_entries(history.iter_entries(HistoryQuery()), "jsonl", gzip=True))
+
+    assert len(gzip.decompress(data).decode().splitlines()) == 5
+
+
+@pytest.mark.asyncio
+async def test_parquet_export(history):
+    """Test the columnar export when pyarrow is available."""
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    data = await collect(export_entries(history.iter_entries(HistoryQuery()), "parquet"))
+    table = pq.read_table(io.BytesIO(data))
+
+    assert table.num_rows == 5
+    assert table.column("vendor").to_pylist()[:2] == ["grok", "claude"]
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint(async_client: AsyncClient, history_app):
+    """Test the streaming export endpoint with filters and compression."""
+    response = await async_client.get("/api/history/export", params={"format": "csv", "vendor": "claude"})
+    compressed = await async_client.get("/api/history/export", params={"format": "jsonl", "gzip": "true"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="history.csv"' in response.headers["content-disposition"]
+    assert len(list(csv.DictReader(io.StringIO(response.text)))) == 2
+    assert compressed.headers["content-type"] == "application/gzip"
+    assert len(gzip.decompress(compressed.content).splitlines()) == 5
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_rejects_unknown_format(async_client: AsyncClient, history_app):
+    """Test format validation."""
+    response = await async_client.get("/api/history/export", params={"format": "xlsx"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_cli(history, tmp_path):
+    """Test the command-line export to a file."""
+    path = tmp_path / "export.jsonl"
+    database_url = str(history.engine.url)
+
+    with open(path, "wb") as output:
+        written = await export_history(database_url, output, "jsonl", query=HistoryQuery(vendor=VendorType.GROK))
+
+    assert written == path.stat().st_size
+    assert len(path.read_text().splitlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_parquet_without_pyarrow_is_rejected(async_client: AsyncClient, history_app, monkeypatch):
+    """Test the error when the optional Parquet dependency is missing."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    response = await async_client.get("/api/history/export", params={"format": "parquet"})
+
+    assert response.status_code == 400
+    assert "pyarrow" in response.json()["detail"]
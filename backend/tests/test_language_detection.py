@@ -0,0 +1,70 @@
+"""Tests for local language detection and the appended response-language instruction."""
+import pytest
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.language import detect_language, with_response_language
+from src.domain.models import VendorType, OptimizationRequest, LLMCompletion, LLMCapabilities
+from src.domain.registries import VendorRegistry
+
+
+@pytest.mark.parametrize("prompt, language", [
+    ("explain physics", "English"),
+    ("Write a function that sorts a list", "English"),
+    ("Write a story in a castle", "English"),
+    ("Explain a SQL join in a simple way", "English"),
+    ("Summarize a paper on a new method", "English"),
+    ("расскажи про физику", "Russian"),
+    ("напиши код на Python для сортировки", "Russian"),
+    ("розкажи про фізику", "Ukrainian"),
+    ("解释量子计算", "Chinese"),
+    ("量子コンピュータを説明して", "Japanese"),
+    ("양자 컴퓨팅 설명해줘", "Korean"),
+    ("اشرح لي الفيزياء", "Arabic"),
+    ("escribe un cuento corto para niños", "Spanish"),
+    ("écris une lettre pour mon patron", "French"),
+    ("schreibe eine E-Mail an meinen Chef", "German"),
+    ("Explique como funciona a fotossíntese", "Portuguese"),
+    ("spiega la fotosintesi in modo semplice", "Italian"),
+    ("napisz funkcję w Pythonie", "Polish"),
+    ("Giải thích vật lý lượng tử", "Vietnamese"),
+])
+def test_detects_language_from_script_and_common_words(prompt, language):
+    assert detect_language(prompt) == language
+
+
+def test_undecidable_text_and_response_language_line():
+    """Test that weak evidence is not guessed and the instruction is replaced, never duplicated."""
+    assert detect_language("") is None and detect_language("12345 + 678") is None
+    assert detect_language("explica física") is None
+    assert detect_language("def f(x): return x") is None
+
+    assert with_response_language("Explain physics.", "Russian") == "Explain physics. Respond in Russian."
+    assert with_response_language("Explain physics.\nRespond in English.", "Russian") == (
+        "Explain physics.\nRespond in Russian."
+    )
+    assert with_response_language("Step 1.\nStep 2.\n\nRespond in [detected language]", "German") == (
+        "Step 1.\nStep 2.\n\nRespond in German."
+    )
+
+
+@pytest.mark.asyncio
+async def test_detected_language_replaces_llm_side_detection():
+    """Test that the language is named in the request and the instruction is appended locally."""
+    mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities(streaming=False)
+    mock_client.generate = AsyncMock(side_effect=[
+        LLMCompletion(content="You are a physics teacher. Explain the basics of physics."),
+        LLMCompletion(content="1. Какой у вас уровень?\n2. Какая цель?"),
+    ])
+    service = OptimizationService(mock_client)
+
+    result = await service.optimize_prompt(OptimizationRequest("расскажи про физику", VendorType.QWEN))
+    await service.generate_questions("расскажи про физику", VendorType.QWEN, 2)
+
+    optimize, questions = [call.kwargs["messages"] for call in mock_client.generate.call_args_list]
+    assert "The user writes in Russian" in optimize[1]["content"]
+    assert "User's language: Russian" in questions[1]["content"]
+    assert "Detect" not in VendorRegistry.get(VendorType.QWEN).get_core_instructions()
+    assert "DETECT" not in questions[0]["content"]
+    assert result.optimized == "You are a physics teacher. Explain the basics of physics. Respond in Russian."
+    assert result.metadata["language"] == "Russian"
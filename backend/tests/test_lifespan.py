@@ -0,0 +1,51 @@
+"""Tests for the application-lifespan resource graph."""
+import httpx
+import pytest
+from httpx import AsyncClient
+from unittest.mock import AsyncMock
+from src.api.main import app
+from src.infrastructure.llm import LMStudioClient
+from src.tools.fake_llm_server import FakeLLMConfig, create_app
+
+
+@pytest.mark.asyncio
+async def test_routes_share_one_service_instance(async_client: AsyncClient):
+    """Test that requests resolve the same service singleton."""
+    first = app.container.optimization_service()
+    await async_client.post("/api/optimize", json={"prompt": "Test", "vendor": "openai"})
+    await async_client.get("/health")
+
+    assert app.container.optimization_service() is first
+    assert first.llm_client is app.container.llm_client()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_closes_llm_client():
+    """Test that shutdown releases the LLM client's connection pool."""
+    mock_llm_client = AsyncMock()
+    app.container.llm_client.override(mock_llm_client)
+    app.container.optimization_service.reset()
+    try:
+        async with app.router.lifespan_context(app):
+            mock_llm_client.close.assert_not_called()
+        mock_llm_client.close.assert_awaited_once()
+    finally:
+        app.container.llm_client.reset_last_overriding()
+        app.container.optimization_service.reset()
+
+
+@pytest.mark.asyncio
+async def test_lm_studio_client_reuses_connection_pool():
+    """Test that the LM Studio client keeps one pooled HTTP client until closed."""
+    fake = create_app(FakeLLMConfig(ttft_ms=0, tokens_per_second=100000, completion_tokens=4))
+    client = LMStudioClient(transport=httpx.ASGITransport(app=fake))
+    client.base_url = "http://fake/v1"
+
+    await client.generate(messages=[{"role": "user", "content": "one"}])
+    pool = client._http_client
+    await client.generate(messages=[{"role": "user", "content": "two"}])
+
+    assert client._http_client is pool
+    await client.close()
+    assert client._http_client is None
+    assert pool.is_closed
@@ -0,0 +1,64 @@
+"""Tests for the LM Studio client against the fake OpenAI-compatible server."""
+import httpx
+import pytest
+from src.infrastructure.llm import LMStudioClient
+from src.tools.fake_llm_server import FakeLLMConfig, create_app
+
+MESSAGES = [{"role": "user", "content": "Write a function"}]
+
+
+def make_client(stream: bool, **config) -> LMStudioClient:
+    """LM Studio client wired to an in-process fake server."""
+    values = {"ttft_ms": 0, "tokens_per_second": 100000, "completion_tokens": 12}
+    values.update(config)
+    client = LMStudioClient(transport=httpx.ASGITransport(app=create_app(FakeLLMConfig(**values))))
+    client.base_url = "http://fake/v1"
+    client.stream_responses = stream
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [True, False])
+async def test_generate_returns_usage_and_timing(stream):
+    """Test that usage, model and timing are captured in both transfer modes."""
+    completion = await make_client(stream).generate(messages=MESSAGES, max_tokens=100)
+
+    assert len(completion.content.split()) == 12
+    assert completion.model == "fake-llm"
+    assert completion.finish_reason == "stop"
+    assert completion.completion_tokens == 12
+    assert completion.prompt_tokens > 0
+    assert completion.total_tokens == completion.prompt_tokens + 12
+    assert completion.wall_time_ms >= 0
+    assert completion.truncated is False
+
+
+@pytest.mark.asyncio
+async def test_streaming_measures_time_to_first_token():
+    """Test that TTFT is recorded when streaming."""
+    completion = await make_client(True, ttft_ms=20).generate(messages=MESSAGES)
+
+    assert completion.ttft_ms >= 15
+    assert completion.wall_time_ms >= completion.ttft_ms
+
+
+@pytest.mark.asyncio
+async def test_generate_flags_length_truncation():
+    """Test that finish_reason=length is reported as truncated."""
+    completion = await make_client(True).generate(messages=MESSAGES, max_tokens=5)
+
+    assert completion.finish_reason == "length"
+    assert completion.truncated is True
+
+
+@pytest.mark.asyncio
+async def test_generate_raises_on_backend_error():
+    """Test that backend errors propagate as HTTP errors."""
+    with pytest.raises(httpx.HTTPStatusError):
+        await make_client(True, error_rate=1.0).generate(messages=MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_health_check_uses_models_endpoint():
+    """Test health check against the fake server."""
+    assert await make_client(True).health_check() is True
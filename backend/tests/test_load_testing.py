@@ -0,0 +1,159 @@
+"""Tests for the fake LLM server and the load generator."""
+import asyncio
+import json
+import pytest
+from httpx import AsyncClient
+from src.tools.fake_llm_server import FakeLLMConfig, FakeLLMServer, create_app
+from src.tools.load_generator import LoadGenerator, Sample, percentile, summarize, parse_mix
+
+
+def fast_config(**overrides) -> FakeLLMConfig:
+    """Fake server config with negligible simulated latency."""
+    values = {"ttft_ms": 0, "tokens_per_second": 100000, "completion_tokens": 16, "max_concurrency": 4}
+    values.update(overrides)
+    return FakeLLMConfig(**values)
+
+
+@pytest.mark.asyncio
+async def test_fake_server_completion_is_deterministic():
+    """Test that identical requests get identical completions with usage."""
+    payload = {"messages": [{"role": "user", "content": "Hello there"}], "max_tokens": 64}
+
+    async with AsyncClient(app=create_app(fast_config()), base_url="http://fake") as client:
+        first = (await client.post("/v1/chat/completions", json=payload)).json()
+        second = (await client.post("/v1/chat/completions", json=payload)).json()
+
+    assert first["choices"][0]["message"]["content"] == second["choices"][0]["message"]["content"]
+    assert first["choices"][0]["finish_reason"] == "stop"
+    assert first["usage"]["completion_tokens"] == 16
+    assert first["usage"]["prompt_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_fake_server_truncates_at_max_tokens():
+    """Test that max_tokens below the completion length yields finish_reason=length."""
+    payload = {"messages": [{"role": "user", "content": "Hi"}], "max_tokens": 4}
+
+    async with AsyncClient(app=create_app(fast_config()), base_url="http://fake") as client:
+        data = (await client.post("/v1/chat/completions", json=payload)).json()
+
+    assert data["choices"][0]["finish_reason"] == "length"
+    assert data["usage"]["completion_tokens"] == 4
+
+
+@pytest.mark.asyncio
+async def test_fake_server_streams_sse_with_usage():
+    """Test streaming responses emit SSE chunks, a usage chunk and [DONE]."""
+    payload = {
+        "messages": [{"role": "user", "content": "Stream please"}],
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+
+    async with AsyncClient(app=create_app(fast_config()), base_url="http://fake") as client:
+        response = await client.post("/v1/chat/completions", json=payload)
+
+    events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks if c["choices"])
+    assert len(content.split()) == 16
+    assert chunks[-1]["usage"]["completion_tokens"] == 16
+
+
+@pytest.mark.asyncio
+async def test_fake_server_stream_dropped_before_its_body_frees_its_slot():
+    """Test that a streamed response whose body is never sent is not counted as in flight."""
+    server = FakeLLMServer(fast_config())
+    body = json.dumps({"messages": [{"role": "user", "content": "Hi"}], "stream": True}).encode()
+    scope = {"type": "http", "method": "POST", "path": "/v1/chat/completions", "headers": [], "query_string": b""}
+    messages = [{"type": "http.request", "body": body, "more_body": False}, {"type": "http.disconnect"}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        # The client is gone before the response starts
+        raise OSError("Connection reset")
+
+    with pytest.raises(Exception):
+        await asyncio.wait_for(server.app(scope, receive, send), 5)
+
+    assert server._inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_fake_server_answers_question_requests_with_numbered_list():
+    """Test Think Mode style prompts get exactly N numbered questions."""
+    payload = {"messages": [
+        {"role": "system", "content": "You are an expert prompt engineer."},
+        {"role": "user", "content": 'User\'s original prompt: "tell me about physics"\n\n'
+                                    "Generate 5 essential questions to optimize this prompt perfectly."},
+    ], "max_tokens": 1024}
+
+    async with AsyncClient(app=create_app(fast_config()), base_url="http://fake") as client:
+        data = (await client.post("/v1/chat/completions", json=payload)).json()
+
+    lines = data["choices"][0]["message"]["content"].splitlines()
+    assert len(lines) == 5
+    assert lines[0].startswith("1. ")
+
+
+@pytest.mark.asyncio
+async def test_fake_server_error_injection():
+    """Test error_rate=1.0 fails every request."""
+    payload = {"messages": [{"role": "user", "content": "Hi"}]}
+
+    async with AsyncClient(app=create_app(fast_config(error_rate=1.0)), base_url="http://fake") as client:
+        response = await client.post("/v1/chat/completions", json=payload)
+        models = await client.get("/v1/models")
+
+    assert response.status_code == 500
+    assert models.status_code == 200
+
+
+def test_percentile_interpolates():
+    """Test percentile calculation."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
+
+
+def test_summarize_reports_error_breakdown():
+    """Test summary counts failures by error kind."""
+    samples = [
+        Sample("/api/optimize", 100.0, 200, None),
+        Sample("/api/optimize", 300.0, 200, None),
+        Sample("/api/optimize", 5.0, 500, "HTTP 500"),
+        Sample("/api/optimize", 5.0, None, "ReadTimeout"),
+    ]
+    report = summarize(samples, duration_seconds=2.0)
+
+    assert report["requests"] == 4
+    assert report["successes"] == 2
+    assert report["throughput_rps"] == 1.0
+    assert report["errors"] == {"HTTP 500": 1, "ReadTimeout": 1}
+    assert report["latency_ms"]["max"] == 300.0
+
+
+def test_parse_mix():
+    """Test scenario mix parsing."""
+    assert parse_mix("optimize=0.7,think=0.3") == {"optimize": 0.7, "think": 0.3}
+
+
+@pytest.mark.asyncio
+async def test_load_generator_drives_api(async_client: AsyncClient):
+    """Test a short run against the API produces a per-endpoint report."""
+    generator = LoadGenerator(async_client, mix={"optimize": 1.0, "think": 1.0}, seed=1)
+    report = await generator.run(rps=200, duration_seconds=0.1)
+
+    assert report["requests"] > 0
+    assert report["failures"] == 0
+    assert "/api/optimize" in report["endpoints"] or "/api/think/generate-questions" in report["endpoints"]
+
+
+def test_load_generator_rejects_unknown_scenarios():
+    """Test unknown scenario names are rejected."""
+    with pytest.raises(ValueError):
+        LoadGenerator(client=None, mix={"batch": 1.0})
@@ -0,0 +1,112 @@
+"""Tests for structured, queued logging."""
+import io
+import json
+import logging
+import pytest
+from httpx import AsyncClient
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.logs import JsonFormatter, SamplingFilter, configure_logging, request_id_var
+
+
+@pytest.fixture
+def log_output():
+    """Route logging into a buffer for the test, restoring the app configuration afterwards."""
+    level = logging.getLevelName(logging.getLogger().level)
+    stream = io.StringIO()
+    listener = configure_logging(
+        level="DEBUG",
+        sample_rates={"hot": 0.25},
+        redact_fields=["api_key", "prompt"],
+        max_field_chars=20,
+        stream=stream
+    )
+
+    def lines():
+        listener.stop()
+        listener.start()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield lines
+    configure_logging(level=level)
+
+
+def record(name: str = "test", level: int = logging.INFO, **extra) -> logging.LogRecord:
+    entry = logging.LogRecord(name, level, __file__, 1, "message", None, None)
+    entry.__dict__.update(extra)
+    return entry
+
+
+def test_json_formatter_redacts_and_truncates():
+    """Test redaction at any depth and truncation of long values."""
+    formatter = JsonFormatter(redact_fields=["API_KEY", "prompt"], max_field_chars=10)
+
+    entry = json.loads(formatter.format(record(
+        api_key="secret",
+        payload={"prompt": "user text", "size": 3},
+        answers=["a" * 30] * 25,
+    )))
+
+    assert entry["api_key"] == "[REDACTED]"
+    assert entry["payload"] == {"prompt": "[REDACTED]", "size": 3}
+    assert entry["answers"][0] == "aaaaaaaaaa... (+20 chars)"
+    assert len(entry["answers"]) == 21
+    assert entry["answers"][-1] == "... (+5 items)"
+    assert entry["level"] == "INFO" and entry["logger"] == "test"
+
+
+def test_sampling_keeps_a_share_of_hot_records():
+    """Test deterministic per-family sampling that never drops warnings."""
+    sampler = SamplingFilter({"api.access": 0.25})
+
+    kept = [sampler.filter(record("api.access.child")) for _ in range(8)]
+
+    assert kept == [True, False, False, False, True, False, False, False]
+    assert sampler.filter(record("api.access", logging.WARNING)) is True
+    assert sampler.filter(record("api.accessor")) is True
+
+
+def test_queued_records_are_structured(log_output):
+    """Test that records logged with extra fields, request ids and exceptions reach the output as JSON."""
+    logger = logging.getLogger("app")
+    token = request_id_var.set("req-1")
+    try:
+        logger.info("Optimizing %s", "prompt", extra={"prompt": "secret text", "vendor": "claude"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+    finally:
+        request_id_var.reset(token)
+    for _ in range(4):
+        logging.getLogger("hot.path").info("tick")
+
+    lines = log_output()
+    info, error = [line for line in lines if line["logger"] == "app"]
+    assert info["message"] == "Optimizing prompt"
+    assert info["prompt"] == "[REDACTED]"
+    assert info["vendor"] == "claude"
+    assert info["request_id"] == "req-1"
+    assert "ValueError: boom" in error["exc_info"]
+    assert len([line for line in lines if line["logger"] == "hot.path"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed_and_logged(async_client: AsyncClient, log_output):
+    """Test request id correlation through the middleware and the access log."""
+    generated = await async_client.get("/health")
+    supplied = await async_client.get("/health", headers={"X-Request-ID": "bot-42"})
+    rejected = await async_client.get("/health", headers={"X-Request-ID": "not a valid id!"})
+
+    assert len(generated.headers["x-request-id"]) == 32
+    assert supplied.headers["x-request-id"] == "bot-42"
+    assert rejected.headers["x-request-id"] != "not a valid id!"
+
+    access = [line for line in log_output() if line["logger"] == "api.access"]
+    assert any(line["request_id"] == "bot-42" and line["status"] == 200 for line in access)
+
+
+def test_sample_rates_setting_is_parsed():
+    """Test the LOG_SAMPLE_RATES format."""
+    config = Settings(log_sample_rates="api.access=0.1, httpx=0.05,")
+
+    assert config.log_sample_rates_map == {"api.access": 0.1, "httpx": 0.05}
@@ -0,0 +1,153 @@
+"""Tests for micro-batching concurrent generate calls into batched backend requests."""
+import asyncio
+import httpx
+import pytest
+from src.domain.exceptions import LLMClientException
+from src.domain.models import LLMCompletion, LLMCapabilities
+from src.infrastructure.llm import MicroBatchingLLMClient, VLLMClient
+from src.infrastructure.llm.chat_templates import render_chat
+from src.infrastructure.metrics import metrics
+from src.tools.fake_llm_server import FakeLLMConfig, FakeLLMServer
+
+
+def conversation(text):
+    return [{"role": "system", "content": "Be brief."}, {"role": "user", "content": text}]
+
+
+def fake_vllm(server: FakeLLMServer) -> VLLMClient:
+    client = VLLMClient(transport=httpx.ASGITransport(app=server.app))
+    client.base_url = "http://fake/v1"
+    client.chat_template = "chatml"
+    return client
+
+
+def test_chat_templates_end_with_the_assistant_turn():
+    """Test prompt rendering for the batch endpoint."""
+    chatml = render_chat(conversation("hi"), "chatml")
+    assert chatml == ("<|im_start|>system\nBe brief.<|im_end|>\n<|im_start|>user\nhi<|im_end|>\n"
+                      "<|im_start|>assistant\n")
+    assert render_chat(conversation("hi"), "llama3").startswith("<|begin_of_text|><|start_header_id|>system")
+    with pytest.raises(ValueError):
+        render_chat(conversation("hi"), "alpaca")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_sent_as_batches_and_demultiplexed():
+    """Test batching up to the size limit, result order and the reported batch size and wait."""
+    server = FakeLLMServer(FakeLLMConfig(ttft_ms=0, tokens_per_second=100000, max_concurrency=4))
+    client = MicroBatchingLLMClient(fake_vllm(server), max_batch_size=4, max_wait_ms=50)
+    batches_before = metrics.counter("prompt_optimizer_llm_batches_total", "").value()
+
+    completions = await asyncio.gather(*(
+        client.generate(conversation(f"prompt {i}"), temperature=0.3, max_tokens=16) for i in range(6)
+    ))
+
+    assert server.completion_batches == [4, 2]
+    assert metrics.counter("prompt_optimizer_llm_batches_total", "").value() == batches_before + 2
+    assert [c.batch_size for c in completions] == [4, 4, 4, 4, 2, 2]
+    # A full batch leaves at once; the remainder waits for the timer
+    assert completions[0].batch_wait_ms < 50 <= completions[5].batch_wait_ms
+    assert completions[0].usage_metadata()["batch_size"] == 4
+    # Request-wide usage is spread over the batch
+    assert all(c.prompt_tokens and c.completion_tokens for c in completions)
+
+
+@pytest.mark.asyncio
+async def test_different_parameters_and_constrained_calls_are_not_mixed():
+    """Test that only calls with identical sampling parameters share a batch."""
+    server = FakeLLMServer(FakeLLMConfig(ttft_ms=0, tokens_per_second=100000))
+    client = MicroBatchingLLMClient(fake_vllm(server), max_batch_size=8, max_wait_ms=5)
+
+    completions = await asyncio.gather(
+        client.generate(conversation("a"), temperature=0.3),
+        client.generate(conversation("b"), temperature=0.3),
+        client.generate(conversation("c"), temperature=0.7),
+        client.generate(conversation("d"), temperature=0.3, response_format={"type": "json_schema"}),
+    )
+
+    # The lone call at 0.7 goes to the chat endpoint as a plain generate
+    assert server.completion_batches == [2]
+    assert completions[2].batch_size == 1 and completions[2].prompt_tokens
+    assert completions[3].batch_size is None
+
+
+@pytest.mark.asyncio
+async def test_fake_batch_endpoint_rejects_requests_when_full():
+    """Test that the fake /v1/completions applies the same overload limit as chat completions."""
+    server = FakeLLMServer(FakeLLMConfig(max_concurrency=1, max_queue=0))
+    server._inflight = 1
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://fake") as client:
+        response = await client.post("/v1/completions", json={"prompt": ["a", "b"], "max_tokens": 4})
+
+    assert response.status_code == 503 and server._inflight == 1
+
+
+def test_batching_needs_an_explicit_chat_template():
+    """Test that vLLM only batches once the served model's template is configured."""
+    client = VLLMClient()
+    assert client.chat_template is None and not client.capabilities.batching
+
+    client.chat_template = "llama3"
+    assert client.capabilities.batching
+
+
+class FailingBatchBackend(VLLMClient):
+    def __init__(self):
+        super().__init__()
+        self.chat_template = "chatml"
+
+    async def generate_batch(self, conversations, temperature=0.7, max_tokens=2048):
+        await asyncio.sleep(0)
+        return [LLMCompletion(content="only one")]
+
+
+@pytest.mark.asyncio
+async def test_batch_failures_reach_every_caller_and_cancelled_callers_are_dropped():
+    """Test error fan-out and removal of callers that gave up before the batch was sent."""
+    client = MicroBatchingLLMClient(FailingBatchBackend(), max_batch_size=8, max_wait_ms=20)
+
+    waiting = asyncio.ensure_future(client.generate(conversation("gone")))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    results = await asyncio.gather(
+        client.generate(conversation("a")), client.generate(conversation("b")), return_exceptions=True
+    )
+
+    assert all(isinstance(result, LLMClientException) for result in results)
+    assert "Batch of 2 calls" in str(results[0])
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_cancels_its_callers():
+    """Test that callers do not hang when the batch request itself is cancelled."""
+    class HangingBatchBackend(FailingBatchBackend):
+        async def generate_batch(self, conversations, temperature=0.7, max_tokens=2048):
+            await asyncio.Event().wait()
+
+    client = MicroBatchingLLMClient(HangingBatchBackend(), max_batch_size=2, max_wait_ms=20)
+    callers = [asyncio.ensure_future(client.generate(conversation(text))) for text in "ab"]
+    await asyncio.sleep(0.01)
+
+    for task in list(client._in_flight):
+        task.cancel()
+    results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), 1)
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_backends_without_batching_pass_through():
+    """Test that the dispatcher is transparent for backends that cannot batch."""
+    class Plain(VLLMClient):
+        @property
+        def capabilities(self):
+            return LLMCapabilities(streaming=True)
+
+    server = FakeLLMServer(FakeLLMConfig(ttft_ms=0, tokens_per_second=100000))
+    inner = Plain(transport=httpx.ASGITransport(app=server.app))
+    inner.base_url = "http://fake/v1"
+
+    completion = await MicroBatchingLLMClient(inner).generate(conversation("a"))
+
+    assert completion.batch_size is None and server.completion_batches == []
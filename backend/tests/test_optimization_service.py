@@ -2,7 +2,7 @@
 import pytest
 from unittest.mock import AsyncMock
 from src.application.services import OptimizationService
-from src.domain.models import VendorType, OptimizationRequest, OptimizedPrompt
+from src.domain.models import VendorType, OptimizationRequest, OptimizedPrompt, LLMCompletion, LLMCapabilities
 
 
 @pytest.mark.asyncio
@@ -27,7 +27,7 @@ async def test_optimization_service_initialization():
 async def test_optimize_prompt_success():
     """Test successful prompt optimization."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="Optimized prompt content")
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized prompt content"))
 
     service = OptimizationService(mock_client)
     request = OptimizationRequest(
@@ -48,7 +48,7 @@ async def test_optimize_prompt_success():
 async def test_optimize_prompt_with_context():
     """Test prompt optimization with additional context."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="Optimized with context")
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized with context"))
 
     service = OptimizationService(mock_client)
     request = OptimizationRequest(
@@ -99,7 +99,7 @@ async def test_optimize_prompt_unsupported_vendor():
 async def test_optimize_prompt_calls_llm():
     """Test that optimization calls LLM client with correct parameters."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="Generated response")
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Generated response"))
 
     service = OptimizationService(mock_client)
     request = OptimizationRequest(
@@ -161,7 +161,7 @@ async def test_health_check_failure():
 async def test_optimize_all_vendors(vendor):
     """Test optimization works for all supported vendors."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="Optimized content")
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized content"))
 
     service = OptimizationService(mock_client)
     request = OptimizationRequest(
@@ -180,11 +180,12 @@ async def test_optimize_all_vendors(vendor):
 async def test_generate_questions_success():
     """Test successful question generation for Think Mode."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="""1. What is your current knowledge level?
+    mock_client.capabilities = LLMCapabilities()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="""1. What is your current knowledge level?
 2. What is your main goal?
 3. What format do you prefer?
 4. How much detail do you need?
-5. What is the context?""")
+5. What is the context?"""))
 
     service = OptimizationService(mock_client)
     questions = await service.generate_questions(
@@ -202,8 +203,9 @@ async def test_generate_questions_success():
 async def test_generate_questions_with_different_counts():
     """Test question generation with different counts (5, 10, 25)."""
     mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities()
     mock_response = "\n".join([f"{i}. Question {i}" for i in range(1, 26)])
-    mock_client.generate = AsyncMock(return_value=mock_response)
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content=mock_response))
 
     service = OptimizationService(mock_client)
 
@@ -220,12 +222,13 @@ async def test_generate_questions_with_different_counts():
 async def test_generate_questions_parsing():
     """Test question parsing handles various formats."""
     mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities()
     # Test with different numbering styles
-    mock_client.generate = AsyncMock(return_value="""1. First question
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="""1. First question
 2) Second question
 - Third question
 • Fourth question
-5. Fifth question""")
+5. Fifth question"""))
 
     service = OptimizationService(mock_client)
     questions = await service.generate_questions(
@@ -244,7 +247,7 @@ async def test_generate_questions_parsing():
 async def test_optimize_with_answers_success():
     """Test optimization with user answers to questions."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="Perfectly optimized prompt based on answers")
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Perfectly optimized prompt based on answers"))
 
     service = OptimizationService(mock_client)
     questions = [
@@ -275,7 +278,7 @@ async def test_optimize_with_answers_success():
     # Verify Q&A was included in the prompt
     call_kwargs = mock_client.generate.call_args[1]
     messages = call_kwargs["messages"]
-    user_message = messages[1]["content"]
+    user_message = messages[-1]["content"]
     assert "What is your knowledge level?" in user_message
     assert "Beginner" in user_message
 
@@ -284,7 +287,7 @@ async def test_optimize_with_answers_success():
 async def test_optimize_with_answers_with_context():
     """Test optimization with answers and additional context."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="Optimized with context and answers")
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized with context and answers"))
 
     service = OptimizationService(mock_client)
     questions = ["Question 1?"]
@@ -301,7 +304,7 @@ async def test_optimize_with_answers_with_context():
     assert isinstance(result, OptimizedPrompt)
     call_kwargs = mock_client.generate.call_args[1]
     messages = call_kwargs["messages"]
-    user_message = messages[1]["content"]
+    user_message = messages[-1]["content"]
     assert "For educational purposes" in user_message
 
 
@@ -309,7 +312,7 @@ async def test_optimize_with_answers_with_context():
 async def test_optimize_with_answers_uses_adapter():
     """Test that optimize_with_answers uses vendor adapter correctly."""
     mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(return_value="Adapter-enhanced optimization")
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Adapter-enhanced optimization"))
 
     service = OptimizationService(mock_client)
     result = await service.optimize_with_answers(
@@ -322,3 +325,39 @@ async def test_optimize_with_answers_uses_adapter():
     assert result.vendor == VendorType.DEEPSEEK
     assert result.metadata is not None
     assert result.enhancement_notes is not None
+
+
+@pytest.mark.asyncio
+async def test_optimize_prompt_surfaces_usage_metadata():
+    """Test that LLM usage and timing end up in the result metadata."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(
+        content="Optimized", model="qwen3-30b", finish_reason="stop",
+        prompt_tokens=420, completion_tokens=80, wall_time_ms=1500.0, ttft_ms=210.0
+    ))
+
+    service = OptimizationService(mock_client)
+    result = await service.optimize_prompt(
+        OptimizationRequest(original_prompt="Test", target_vendor=VendorType.OPENAI)
+    )
+
+    assert result.metadata["usage"]["model"] == "qwen3-30b"
+    assert result.metadata["usage"]["prompt_tokens"] == 420
+    assert result.metadata["usage"]["total_tokens"] == 500
+    assert result.metadata["usage"]["ttft_ms"] == 210.0
+    assert result.metadata["truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_optimize_with_answers_flags_truncation():
+    """Test that finish_reason=length marks the result as truncated."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Cut off", finish_reason="length"))
+
+    service = OptimizationService(mock_client)
+    result = await service.optimize_with_answers(
+        prompt="Test", vendor=VendorType.CLAUDE, questions=["Q1?"], answers=["A1"]
+    )
+
+    assert result.metadata["truncated"] is True
+    assert result.metadata["usage"]["finish_reason"] == "length"
@@ -0,0 +1,137 @@
+"""Tests for the heuristic prompt scorer."""
+import pytest
+from httpx import AsyncClient
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.models import VendorType, OptimizationRequest, LLMCompletion
+from src.domain.scoring import PromptScorer, extract_features
+
+STRUCTURED_CLAUDE_PROMPT = """<task>You are a business analyst. Analyze the following business proposal.</task>
+
+<instructions>
+1. Evaluate market viability
+2. Assess financial projections
+3. Identify risks and opportunities
+4. Provide actionable recommendations
+</instructions>
+
+<output_format>
+Structure your analysis with clear headings for each section. Include at least 3 risks and limit the
+summary to 200 words.
+</output_format>
+
+Respond in English."""
+
+
+def test_features_capture_structure_and_conventions():
+    """Test feature extraction on a structured prompt."""
+    features = extract_features(STRUCTURED_CLAUDE_PROMPT)
+
+    assert features.xml_tags == 3
+    assert features.list_items == 4
+    assert features.has_role is True
+    assert features.has_response_language is True
+    assert features.ascii_ratio == 1.0
+
+
+def test_specific_prompt_outscores_vague_prompt():
+    """Test that a detailed prompt scores higher than a vague one on every generic metric."""
+    scorer = PromptScorer()
+    vague, detailed = scorer.score_many(["help me with stuff", STRUCTURED_CLAUDE_PROMPT], VendorType.OPENAI)
+
+    assert detailed.clarity > vague.clarity
+    assert detailed.specificity > vague.specificity
+    assert detailed.overall > vague.overall
+    for score in (vague, detailed):
+        for value in (score.clarity, score.specificity, score.structure, score.vendor_compliance, score.overall):
+            assert 0.0 <= value <= 1.0
+
+
+def test_claude_rewards_xml_for_complex_prompts():
+    """Test that Claude compliance prefers XML sections on long prompts, unlike Grok."""
+    scorer = PromptScorer()
+    plain = STRUCTURED_CLAUDE_PROMPT
+    for tag in ("task", "instructions", "output_format"):
+        plain = plain.replace(f"<{tag}>", "").replace(f"</{tag}>", "")
+
+    assert scorer.score(STRUCTURED_CLAUDE_PROMPT, VendorType.CLAUDE).vendor_compliance > \
+        scorer.score(plain, VendorType.CLAUDE).vendor_compliance
+    assert scorer.score(STRUCTURED_CLAUDE_PROMPT, VendorType.GROK).vendor_compliance < \
+        scorer.score(plain, VendorType.GROK).vendor_compliance
+
+
+def test_non_english_prompt_loses_compliance():
+    """Test the shared rule that optimized prompts are written in English."""
+    scorer = PromptScorer()
+    english = scorer.score("Explain physics. Respond in Russian.", VendorType.QWEN)
+    russian = scorer.score("расскажи про физику", VendorType.QWEN)
+
+    assert english.vendor_compliance > russian.vendor_compliance
+
+
+def test_score_many_matches_single_scoring():
+    """Test that batch scoring returns one score per prompt, in order."""
+    scorer = PromptScorer()
+    prompts = ["Write a function", STRUCTURED_CLAUDE_PROMPT, "explain something"]
+
+    assert scorer.score_many(prompts, VendorType.DEEPSEEK) == [
+        scorer.score(prompt, VendorType.DEEPSEEK) for prompt in prompts
+    ]
+
+
+@pytest.mark.asyncio
+async def test_high_scoring_prompt_skips_llm():
+    """Test that prompts above the threshold are returned unchanged without an LLM call."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized"))
+    service = OptimizationService(mock_client, score_skip_threshold=0.8)
+
+    result = await service.optimize_prompt(
+        OptimizationRequest(original_prompt=STRUCTURED_CLAUDE_PROMPT, target_vendor=VendorType.CLAUDE)
+    )
+
+    mock_client.generate.assert_not_called()
+    assert result.optimized == STRUCTURED_CLAUDE_PROMPT
+    assert result.metadata["skipped_llm"] is True
+    assert result.metadata["score"]["overall"] >= 0.8
+    assert result.metadata["language"] == "English"
+
+
+@pytest.mark.asyncio
+async def test_low_scoring_or_contextual_prompts_still_use_llm():
+    """Test that the threshold only short-circuits good prompts without extra context."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized"))
+    service = OptimizationService(mock_client, score_skip_threshold=0.8)
+
+    await service.optimize_prompt(OptimizationRequest(original_prompt="help", target_vendor=VendorType.CLAUDE))
+    await service.optimize_prompt(OptimizationRequest(
+        original_prompt=STRUCTURED_CLAUDE_PROMPT,
+        target_vendor=VendorType.CLAUDE,
+        context="The proposal is for a bakery"
+    ))
+
+    assert mock_client.generate.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_score_endpoint(async_client: AsyncClient):
+    """Test scoring several prompts through the API."""
+    response = await async_client.post(
+        "/api/score",
+        json={"prompts": ["help me with stuff", STRUCTURED_CLAUDE_PROMPT], "vendor": "claude"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["vendor"] == "claude"
+    assert len(data["scores"]) == 2
+    assert data["scores"][1]["overall"] > data["scores"][0]["overall"]
+
+
+@pytest.mark.asyncio
+async def test_score_endpoint_requires_prompts(async_client: AsyncClient):
+    """Test validation of an empty batch."""
+    response = await async_client.post("/api/score", json={"prompts": [], "vendor": "claude"})
+
+    assert response.status_code == 422
@@ -0,0 +1,61 @@
+"""Tests for the Think Mode question cache."""
+import pytest
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.models import VendorType, LLMCompletion, LLMCapabilities
+from src.infrastructure.cache import InMemoryResultCache
+
+
+def numbered(questions) -> LLMCompletion:
+    return LLMCompletion(content="\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1)))
+
+
+def question_service(*completions) -> OptimizationService:
+    mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities(streaming=False)
+    mock_client.generate = AsyncMock(side_effect=list(completions))
+    return OptimizationService(mock_client, result_cache=InMemoryResultCache(max_bytes=1 << 20))
+
+
+@pytest.mark.asyncio
+async def test_smaller_requests_are_served_from_the_largest_set():
+    """Test that 5 or 10 questions come from a cached 25 without an LLM call."""
+    questions = [f"Question {i}?" for i in range(1, 26)]
+    service = question_service(numbered(questions))
+
+    assert await service.generate_questions("explain linear algebra", VendorType.CLAUDE, 25) == questions
+    assert await service.generate_questions("  Explain   linear algebra ", VendorType.CLAUDE, 5) == questions[:5]
+    assert await service.generate_questions("explain linear algebra", VendorType.CLAUDE, 10) == questions[:10]
+
+    assert service.llm_client.generate.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_larger_requests_generate_only_the_missing_questions():
+    """Test that cached questions are sent as context and only the difference is generated."""
+    first = [f"Question {i}?" for i in range(1, 6)]
+    more = [f"Question {i}?" for i in range(6, 11)]
+    service = question_service(numbered(first), numbered(more))
+
+    await service.generate_questions("explain physics", VendorType.QWEN, 5)
+    assert await service.generate_questions("explain physics", VendorType.QWEN, 10) == first + more
+    assert await service.generate_questions("explain physics", VendorType.QWEN, 10) == first + more
+
+    calls = service.llm_client.generate.call_args_list
+    assert len(calls) == 2
+    extension = calls[1].kwargs["messages"]
+    assert "Generate 5 essential questions" in extension[-1]["content"]
+    assert all(question in extension[-2]["content"] for question in first)
+
+    # The questions turn is the one the final step for 10 questions resends
+    service.llm_client.generate.side_effect = [LLMCompletion(content="Optimized")]
+    await service.optimize_with_answers(
+        "explain physics", VendorType.QWEN, first, ["A"] * 5, asked=first + more, num_questions=10
+    )
+    assert service.llm_client.generate.call_args.kwargs["messages"][:2] == extension[:2]
+    assert "Generate 10 essential questions" in extension[1]["content"]
+
+    # Another vendor has its own set
+    service.llm_client.generate.side_effect = [numbered(first)]
+    await service.generate_questions("explain physics", VendorType.CLAUDE, 5)
+    assert service.llm_client.generate.call_count == 4
@@ -0,0 +1,157 @@
+"""Tests for streamed, early-stopping Think Mode question generation."""
+import httpx
+import pytest
+from typing import AsyncIterator
+from src.application.services import OptimizationService, TokenEstimator
+from src.application.services.question_parser import QuestionStreamParser
+from src.domain.interfaces import ILLMClient
+from src.domain.models import VendorType, LLMCompletion, LLMCapabilities
+from src.infrastructure.llm import LMStudioClient, RecordingLLMClient
+from src.infrastructure.recording import TrafficLog, read_traffic
+from src.infrastructure.tokenizers import ApproximateTokenizer
+from src.tools.fake_llm_server import FakeLLMConfig, create_app
+
+
+class ChunkedClient(ILLMClient):
+    """Streaming client that yields pre-set chunks and tracks how many were consumed."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.pulled = 0
+        self.closed = False
+        self.calls = []
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return LLMCapabilities(streaming=True, json_schema=True)
+
+    async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None) -> LLMCompletion:
+        raise AssertionError("generate should not be used when streaming is available")
+
+    async def stream(self, messages, temperature=0.7, max_tokens=2048, response_format=None) -> AsyncIterator[str]:
+        self.calls.append(response_format)
+        try:
+            for chunk in self.chunks:
+                self.pulled += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+    async def health_check(self) -> bool:
+        return True
+
+
+def fake_backend_client() -> LMStudioClient:
+    config = FakeLLMConfig(ttft_ms=0, tokens_per_second=100000)
+    client = LMStudioClient(transport=httpx.ASGITransport(app=create_app(config)))
+    client.base_url = "http://fake/v1"
+    return client
+
+
+def test_parser_ignores_preamble_and_waits_for_complete_lines():
+    """Test list parsing across chunk boundaries, skipping non-question lines."""
+    parser = QuestionStreamParser(3)
+    for chunk in ["Sure! Here are your questions:\n1. Wh", "at is the goal?\n2) Who is ", "it for?\n- Which form", "at?"]:
+        parser.feed(chunk)
+
+    assert parser.questions == ["What is the goal?", "Who is it for?"]
+    assert parser.done is False
+    assert parser.finish() == ["What is the goal?", "Who is it for?", "Which format?"]
+
+
+def test_parser_accepts_numbers_without_a_period():
+    """Test numbered lines with a dash or no separator after the number."""
+    parser = QuestionStreamParser(3)
+    parser.feed("1 What is the goal?\n2- Who is it for?\n3.Which format?\n")
+
+    assert parser.questions == ["What is the goal?", "Who is it for?", "Which format?"]
+
+
+def test_parser_reads_json_strings_as_they_close():
+    """Test JSON parsing of split chunks with escaped characters."""
+    parser = QuestionStreamParser(2, json_output=True)
+    parser.feed('{"questions": ["Is \\"fast\\"')
+    assert parser.questions == []
+    parser.feed(' enough?", "Какой уровень?", "Extra?"')
+
+    assert parser.done is True
+    assert parser.finish() == ['Is "fast" enough?', "Какой уровень?"]
+
+
+@pytest.mark.asyncio
+async def test_generation_stops_once_enough_questions_arrived():
+    """Test that the stream is closed as soon as N questions are parsed."""
+    chunks = ["1. First?\n2. Sec", "ond?", "\n3. Third?\n"] + ["trailing tokens "] * 50
+    client = ChunkedClient(chunks)
+    service = OptimizationService(client)
+
+    questions = await service.generate_questions("Explain physics", VendorType.OPENAI, 2)
+
+    assert questions == ["First?", "Second?"]
+    assert client.pulled == 3  # "Second?" only counts once its line ends
+    assert client.closed is True
+    assert client.calls == [None]
+
+
+@pytest.mark.asyncio
+async def test_json_questions_send_schema_when_supported():
+    """Test that JSON mode requests a schema with exactly N items."""
+    client = ChunkedClient(['{"questions": ["A?", "B?"]}'])
+    service = OptimizationService(client, json_questions=True)
+
+    questions = await service.generate_questions("Explain physics", VendorType.CLAUDE, 2)
+
+    assert questions == ["A?", "B?"]
+    schema = client.calls[0]["json_schema"]["schema"]["properties"]["questions"]
+    assert schema["minItems"] == schema["maxItems"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("json_questions", [False, True])
+async def test_questions_from_fake_backend(json_questions):
+    """Test both output formats end to end through the LM Studio client."""
+    service = OptimizationService(fake_backend_client(), json_questions=json_questions)
+
+    questions = await service.generate_questions("Explain physics", VendorType.GEMINI, 5)
+
+    assert len(questions) == 5
+    assert all(question.startswith("What ") for question in questions)
+
+
+@pytest.mark.asyncio
+async def test_lm_studio_stream_yields_deltas():
+    """Test that the client streams content deltas that add up to the completion."""
+    client = fake_backend_client()
+    messages = [{"role": "user", "content": "Write a function"}]
+
+    streamed = "".join([chunk async for chunk in client.stream(messages=messages)])
+    completion = await client.generate(messages=messages)
+
+    assert streamed == completion.content
+    assert client.streamed_model == completion.model
+
+
+@pytest.mark.asyncio
+async def test_recording_client_records_partial_stream(tmp_path):
+    """Test that an early-stopped stream is recorded with the text received."""
+    log = TrafficLog(str(tmp_path / "traffic.jsonl"))
+    client = RecordingLLMClient(ChunkedClient(["1. A?\n", "2. B?\n", "3. C?\n", "4. D?\n"]), log)
+    service = OptimizationService(client)
+
+    await service.generate_questions("Explain physics", VendorType.QWEN, 2)
+    log.close()
+
+    record = list(read_traffic(str(tmp_path / "traffic.jsonl")))[-1]
+    assert record["response"] == "1. A?\n2. B?\n"
+    assert record["error"] is None
+
+
+@pytest.mark.asyncio
+async def test_streamed_question_generation_is_observed():
+    """Test that the token estimator learns from streamed question generation too."""
+    client = ChunkedClient(["1. A?\n", "2. B?\n", "3. C?\n"])
+    service = OptimizationService(client, token_estimator=TokenEstimator(ApproximateTokenizer(), default_output_tokens=500))
+
+    await service.generate_questions("Explain physics", VendorType.QWEN, 3)
+
+    assert service.token_estimator.predicted_output_tokens("questions:qwen", 2048) < 500
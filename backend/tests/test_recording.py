@@ -0,0 +1,163 @@
+"""Tests for LLM traffic recording and replay."""
+import pytest
+from httpx import AsyncClient
+from unittest.mock import AsyncMock
+from src.domain.exceptions import LLMClientException
+from src.domain.models import LLMCompletion, LLMCapabilities
+from src.infrastructure.llm import RecordingLLMClient, ReplayLLMClient
+from src.infrastructure.recording import TrafficLog, TrafficRecorderMiddleware, read_traffic, capture_id_var
+from src.tools.replay_traffic import replay, compare
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+@pytest.mark.asyncio
+async def test_recording_client_writes_call_records(tmp_path):
+    """Test that every call is recorded with messages, params, response and timing."""
+    inner = AsyncMock()
+    inner.capabilities = LLMCapabilities(streaming=True)
+    inner.generate = AsyncMock(return_value=LLMCompletion(content="Hi there"))
+    log = TrafficLog(str(tmp_path / "traffic.jsonl"))
+    client = RecordingLLMClient(inner, log)
+
+    result = await client.generate(messages=MESSAGES, temperature=0.3, max_tokens=100)
+    log.close()
+
+    assert result.content == "Hi there"
+    records = list(read_traffic(log.path))
+    assert len(records) == 2
+    assert records[0]["kind"] == "capabilities" and records[0]["capabilities"]["streaming"] is True
+    records = records[1:]
+    assert records[0]["kind"] == "llm"
+    assert records[0]["messages"] == MESSAGES
+    assert records[0]["params"] == {"temperature": 0.3, "max_tokens": 100}
+    assert records[0]["response"] == "Hi there"
+    assert records[0]["duration_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_recording_client_records_failures(tmp_path):
+    """Test that failed calls are recorded and re-raised."""
+    inner = AsyncMock()
+    inner.capabilities = LLMCapabilities(streaming=True)
+    inner.generate = AsyncMock(side_effect=RuntimeError("boom"))
+    log = TrafficLog(str(tmp_path / "traffic.jsonl"))
+    client = RecordingLLMClient(inner, log)
+
+    with pytest.raises(RuntimeError):
+        await client.generate(messages=MESSAGES)
+    log.close()
+
+    record = next(r for r in read_traffic(log.path) if r["kind"] == "llm")
+    assert record["response"] is None
+    assert "boom" in record["error"]
+
+
+def test_traffic_log_rotates_and_reads_oldest_first(tmp_path):
+    """Test size-based rotation keeps backups and reading preserves order."""
+    log = TrafficLog(str(tmp_path / "traffic.jsonl"), max_bytes=200, backup_count=3)
+    for i in range(20):
+        log.write({"kind": "llm", "n": i, "padding": "x" * 40})
+    log.close()
+
+    assert (tmp_path / "traffic.jsonl.1").exists()
+    assert not (tmp_path / "traffic.jsonl.4").exists()
+    numbers = [record["n"] for record in read_traffic(log.path)]
+    assert numbers == sorted(numbers)
+    assert numbers[-1] == 19
+
+
+@pytest.mark.asyncio
+async def test_replay_client_serves_recorded_responses(tmp_path):
+    """Test that replay returns recorded responses for matching calls."""
+    inner = AsyncMock()
+    inner.capabilities = LLMCapabilities(streaming=True)
+    inner.generate = AsyncMock(return_value=LLMCompletion(content="Recorded answer"))
+    log = TrafficLog(str(tmp_path / "traffic.jsonl"))
+    await RecordingLLMClient(inner, log).generate(messages=MESSAGES, temperature=0.3, max_tokens=100)
+    log.close()
+
+    replay_client = ReplayLLMClient(read_traffic(log.path))
+
+    assert replay_client.capabilities == LLMCapabilities(streaming=True)
+    result = await replay_client.generate(messages=MESSAGES, temperature=0.3, max_tokens=100)
+    assert result.content == "Recorded answer"
+    with pytest.raises(LLMClientException):
+        await replay_client.generate(messages=[{"role": "user", "content": "Unknown"}])
+    assert replay_client.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_capabilities_survive_rotation(tmp_path):
+    """Test that every rotated file starts with the capabilities, so replay keeps them after old files go."""
+    inner = AsyncMock()
+    inner.capabilities = LLMCapabilities(streaming=False)
+    inner.generate = AsyncMock(return_value=LLMCompletion(content="x" * 100))
+    log = TrafficLog(str(tmp_path / "traffic.jsonl"), max_bytes=600, backup_count=1)
+    client = RecordingLLMClient(inner, log)
+    for i in range(10):
+        await client.generate(messages=[{"role": "user", "content": f"Call {i}"}])
+    log.close()
+
+    records = list(read_traffic(log.path))
+    assert records[0]["kind"] == "capabilities"
+    assert not any(record["messages"][0]["content"] == "Call 0" for record in records if record["kind"] == "llm")
+    assert ReplayLLMClient(records).capabilities == LLMCapabilities(streaming=False)
+
+
+@pytest.mark.asyncio
+async def test_replay_client_falls_back_to_capture_order():
+    """Test that changed prompts still replay via the originating request's calls."""
+    records = [{
+        "kind": "llm", "capture_id": "abc", "fingerprint": "old", "response": "From capture",
+        "error": None, "duration_ms": 20.0,
+    }]
+    replay_client = ReplayLLMClient(records, emulate_timing=True)
+
+    token = capture_id_var.set("abc")
+    try:
+        result = await replay_client.generate(messages=MESSAGES)
+    finally:
+        capture_id_var.reset(token)
+
+    assert result.content == "From capture"
+    assert replay_client.served_ms["abc"] == pytest.approx(20.0)
+
+
+@pytest.mark.asyncio
+async def test_middleware_and_replay_round_trip(async_client: AsyncClient, tmp_path):
+    """Test capturing API traffic and replaying it against the app."""
+    from src.api.main import app
+
+    log = TrafficLog(str(tmp_path / "traffic.jsonl"))
+    recording_app = TrafficRecorderMiddleware(app, traffic_log=log)
+    original_client = app.container.llm_client()
+    app.container.llm_client.override(RecordingLLMClient(original_client, log))
+    app.container.optimization_service.reset()
+    try:
+        async with AsyncClient(app=recording_app, base_url="http://test") as client:
+            response = await client.post("/api/optimize", json={"prompt": "Write a function", "vendor": "openai"})
+    finally:
+        app.container.llm_client.reset_last_overriding()
+        app.container.optimization_service.reset()
+    log.close()
+
+    assert response.status_code == 200
+    records = list(read_traffic(log.path))
+    http_record = next(r for r in records if r["kind"] == "http")
+    llm_record = next(r for r in records if r["kind"] == "llm")
+    assert http_record["body"]["prompt"] == "Write a function"
+    assert llm_record["capture_id"] == http_record["id"]
+
+    original_client.generate.reset_mock()
+    report = await replay(app, records)
+    assert app.container.llm_client() is original_client
+    original_client.generate.assert_not_called()
+
+    stats = report["endpoints"]["/api/optimize"]
+    assert report["llm_misses"] == 0
+    assert stats["requests"] == 1
+    assert stats["status_mismatches"] == 0
+
+    compared = compare(report, report)
+    assert compared["endpoints"]["/api/optimize"]["delta_vs_baseline_ms"]["p50"] == 0
@@ -0,0 +1,173 @@
+"""Tests for incremental refinement of earlier optimizations."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import create_engine, inspect
+from unittest.mock import AsyncMock
+from src.api.main import app
+from src.application.services import OptimizationService
+from src.domain.models import VendorType, OptimizedPrompt, RefinementRequest, LLMCompletion, LLMCapabilities
+from src.domain.refinement import apply_revisions, describe_changes, diff_prompts, parse_revisions
+from src.infrastructure.history import SqlHistoryRepository
+
+ORIGINAL = (
+    "Write a function that sorts a list of numbers using merge sort. Explain the time complexity, "
+    "include unit tests, and add comments to every step so a beginner can follow along."
+)
+OPTIMIZED = "Write a Python merge sort for a list of numbers.\nExplain its time complexity.\nInclude unit tests."
+
+
+def previous() -> OptimizedPrompt:
+    return OptimizedPrompt(
+        original=ORIGINAL, optimized=OPTIMIZED, vendor=VendorType.CLAUDE, enhancement_notes="notes", metadata={}
+    )
+
+
+def edit_block(find: str, replace: str) -> str:
+    return f"<<<<<<< FIND\n{find}\n=======\n{replace}\n>>>>>>> REPLACE"
+
+
+@pytest.fixture
+def history(tmp_path):
+    repository = SqlHistoryRepository(f"sqlite:///{tmp_path / 'history.db'}")
+    yield repository
+    repository.engine.dispose()
+
+
+def test_prompt_diff_lists_word_edits_or_the_whole_prompt():
+    """Test word-level edits, merging across whitespace and the shorter-rewrite fallback."""
+    edited = ORIGINAL.replace("numbers", "strings").replace("a beginner", "an intern")
+
+    assert [(edit.before, edit.after) for edit in diff_prompts(ORIGINAL, edited)] == [
+        ("numbers", "strings"), ("a beginner", "an intern")
+    ]
+    changes = describe_changes(ORIGINAL, edited)
+    assert '- replace "numbers" with "strings" (after "a list of")' in changes
+    assert ORIGINAL not in changes
+    assert describe_changes("explain physics", "teach me chemistry").endswith('now reads:\n"teach me chemistry"')
+    assert describe_changes(ORIGINAL, ORIGINAL.replace(" ", "  ")) == ""
+
+
+def test_revisions_apply_all_or_nothing():
+    """Test edit block parsing, NO_CHANGES and rejection of edits that do not match."""
+    reply = "Sure:\n" + edit_block("list of numbers", "list of strings") + "\n" + edit_block(
+        "Include unit tests.", "Include unit tests.\nUse type hints."
+    )
+
+    revisions = parse_revisions(reply)
+    assert apply_revisions(OPTIMIZED, revisions) == (
+        "Write a Python merge sort for a list of strings.\nExplain its time complexity.\n"
+        "Include unit tests.\nUse type hints."
+    )
+    assert parse_revisions("NO_CHANGES") == []
+    assert parse_revisions("Here is the new prompt: ...") is None
+    assert apply_revisions(OPTIMIZED, revisions + parse_revisions(edit_block("quick sort", "heap sort"))) is None
+
+
+@pytest.mark.asyncio
+async def test_refinement_sends_the_diff_and_records_lineage(history):
+    """Test that only the change is sent, edits are applied locally and the parent is linked."""
+    mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(
+        content=edit_block("list of numbers", "list of strings")
+    ))
+    service = OptimizationService(mock_client, history=history)
+    parent_id = await history.add(previous())
+
+    result = await service.refine_optimization(RefinementRequest(
+        edited_prompt=ORIGINAL.replace("numbers", "strings"), parent_id=parent_id
+    ))
+
+    messages = mock_client.generate.call_args.kwargs["messages"]
+    assert ORIGINAL not in messages[1]["content"] and OPTIMIZED in messages[1]["content"]
+    assert result.optimized == OPTIMIZED.replace("numbers", "strings") + "\n\nRespond in English."
+    assert result.original == ORIGINAL.replace("numbers", "strings")
+    assert result.metadata["refinement"]["strategy"] == "edits" and result.metadata["refinement"]["edits"] == 1
+    entry = await history.get(result.metadata["history_id"])
+    assert entry.mode == "refine" and entry.parent_id == parent_id
+
+
+@pytest.mark.asyncio
+async def test_edits_that_do_not_apply_fall_back_to_a_rewrite():
+    """Test one full rewrite after unusable edits, and validation of empty requests."""
+    mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities()
+    mock_client.generate = AsyncMock(side_effect=[
+        LLMCompletion(content=edit_block("bubble sort", "heap sort")),
+        LLMCompletion(content="Rewritten prompt"),
+    ])
+    service = OptimizationService(mock_client)
+
+    result = await service.refine_optimization(RefinementRequest(feedback="Ask for type hints", previous=previous()))
+
+    assert result.optimized == "Rewritten prompt Respond in English."
+    assert result.metadata["refinement"]["strategy"] == "rewrite"
+    rewrite = mock_client.generate.call_args_list[1].kwargs["messages"]
+    assert "complete revised prompt" in rewrite[0]["content"] and "Ask for type hints" in rewrite[1]["content"]
+    with pytest.raises(ValueError):
+        await service.refine_optimization(RefinementRequest(edited_prompt=ORIGINAL, previous=previous()))
+    with pytest.raises(ValueError):
+        await service.refine_optimization(RefinementRequest(feedback="Shorter"))
+
+
+def test_existing_history_table_gains_parent_column(tmp_path):
+    """Test that a database created before lineage tracking is migrated in place."""
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE optimization_history (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at DATETIME NOT NULL, "
+            "vendor VARCHAR(32) NOT NULL, mode VARCHAR(16) NOT NULL, original TEXT NOT NULL, "
+            "optimized TEXT NOT NULL, enhancement_notes TEXT NOT NULL, result_metadata JSON NOT NULL)"
+        )
+    engine.dispose()
+
+    repository = SqlHistoryRepository(url)
+    entry_id = repository._add(previous(), "refine", 1)
+    repository.engine.dispose()
+    reopened = SqlHistoryRepository(url)
+
+    assert reopened._get(entry_id).parent_id == 1
+    assert "ix_optimization_history_parent_id" in {
+        index["name"] for index in inspect(reopened.engine).get_indexes("optimization_history")
+    }
+    reopened.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_refine_endpoint(async_client: AsyncClient, history):
+    """Test refining by history id and by a passed-back result over HTTP."""
+    assert (await async_client.post("/api/refine", json={"history_id": 1, "feedback": "Shorter"})).status_code == 404
+
+    app.container.history_repository.override(history)
+    app.container.optimization_service.reset()
+    try:
+        optimized = await async_client.post("/api/optimize", json={"prompt": "explain physics", "vendor": "qwen"})
+        parent_id = optimized.json()["metadata"]["history_id"]
+
+        refined = await async_client.post("/api/refine", json={"history_id": parent_id, "feedback": "Shorter"})
+        passed_back = await async_client.post("/api/refine", json={
+            "previous": {
+                "original": "explain physics", "optimized": optimized.json()["optimized"], "vendor": "qwen",
+                "history_id": parent_id
+            },
+            "prompt": "explain quantum physics"
+        })
+        forged = await async_client.post("/api/refine", json={
+            "previous": {"original": "explain physics", "optimized": "Something else", "vendor": "qwen",
+                         "history_id": parent_id},
+            "prompt": "explain quantum physics"
+        })
+        nothing = await async_client.post("/api/refine", json={"history_id": parent_id})
+        entry = await async_client.get(f"/api/history/{refined.json()['metadata']['history_id']}")
+    finally:
+        app.container.history_repository.reset_last_overriding()
+        app.container.optimization_service.reset()
+
+    assert refined.status_code == 200 and refined.json()["metadata"]["refinement"]["parent_id"] == parent_id
+    assert passed_back.status_code == 200 and passed_back.json()["original"] == "explain quantum physics"
+    # A result passed back inline stays linked to the entry it was stored as, but only if it matches it
+    assert passed_back.json()["metadata"]["refinement"]["parent_id"] == parent_id
+    assert forged.status_code == 200 and forged.json()["metadata"]["refinement"]["parent_id"] is None
+    assert nothing.status_code == 400
+    assert entry.json()["mode"] == "refine" and entry.json()["parent_id"] == parent_id
@@ -0,0 +1,181 @@
+"""Tests for result cache backends."""
+import asyncio
+import fcntl
+import os
+import subprocess
+import sys
+import textwrap
+import pytest
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.models import VendorType, OptimizationRequest, LLMCompletion
+from src.infrastructure.cache import InMemoryResultCache, MmapResultCache, mmap_cache
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used():
+    """Test that the in-memory cache stays within its byte budget."""
+    cache = InMemoryResultCache(max_bytes=60)
+    await cache.set("a", {"v": "x" * 20})
+    await cache.set("b", {"v": "y" * 20})
+    assert await cache.get("a") is not None  # a becomes most recently used
+    await cache.set("c", {"v": "z" * 20})
+
+    assert await cache.get("a") == {"v": "x" * 20}
+    assert await cache.get("b") is None
+    assert await cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_round_trip(tmp_path):
+    """Test storing and reading values, including unicode and overwrites."""
+    cache = MmapResultCache(str(tmp_path / "cache.bin"), max_bytes=4096, num_slots=64)
+    await cache.set("key", {"optimized": "Respond in Russian: расскажи"})
+    await cache.set("key", {"optimized": "updated"})
+
+    assert await cache.get("key") == {"optimized": "updated"}
+    assert await cache.get("missing") is None
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_survives_restart(tmp_path):
+    """Test that entries persist when the file is reopened."""
+    path = str(tmp_path / "cache.bin")
+    cache = MmapResultCache(path, max_bytes=4096, num_slots=64)
+    await cache.set("persisted", {"value": 1})
+    await cache.close()
+
+    reopened = MmapResultCache(path, max_bytes=4096, num_slots=64)
+    assert await reopened.get("persisted") == {"value": 1}
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_resets_on_geometry_change(tmp_path):
+    """Test that a file with a different layout is reinitialized."""
+    path = str(tmp_path / "cache.bin")
+    cache = MmapResultCache(path, max_bytes=4096, num_slots=64)
+    await cache.set("old", {"value": 1})
+    await cache.close()
+
+    resized = MmapResultCache(path, max_bytes=8192, num_slots=64)
+    assert await resized.get("old") is None
+    await resized.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_evicts_within_byte_budget(tmp_path):
+    """Test FIFO eviction keeps the data region within max_bytes."""
+    path = str(tmp_path / "cache.bin")
+    cache = MmapResultCache(path, max_bytes=1024, num_slots=256)
+    for i in range(100):
+        await cache.set(f"key-{i}", {"value": "x" * 50, "i": i})
+
+    assert await cache.get("key-0") is None
+    assert await cache.get("key-99") == {"value": "x" * 50, "i": 99}
+    assert os.path.getsize(path) <= 1024 + 256 * 24 + 64
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_rejects_oversized_values(tmp_path):
+    """Test values larger than the whole budget are not stored."""
+    cache = MmapResultCache(str(tmp_path / "cache.bin"), max_bytes=128, num_slots=16)
+    await cache.set("big", {"value": "x" * 500})
+
+    assert await cache.get("big") is None
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_is_shared_across_processes(tmp_path):
+    """Test that a value written by another process is visible here."""
+    path = str(tmp_path / "cache.bin")
+    cache = MmapResultCache(path, max_bytes=4096, num_slots=64)
+
+    code = textwrap.dedent(f"""
+        import asyncio
+        from src.infrastructure.cache import MmapResultCache
+        cache = MmapResultCache({path!r}, max_bytes=4096, num_slots=64)
+        asyncio.run(cache.set("from-worker", {{"pid": "other"}}))
+    """)
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, check=True)
+
+    assert await cache.get("from-worker") == {"pid": "other"}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_waits_for_a_held_lock_without_blocking_the_loop(tmp_path):
+    """Test that a lock held by another process delays cache access but not other coroutines."""
+    path = str(tmp_path / "cache.bin")
+    cache = MmapResultCache(path, max_bytes=4096, num_slots=64)
+    await cache.set("key", {"value": 1})
+    # A separate open file description conflicts with the cache's lock like another process would
+    other = os.open(path, os.O_RDWR)
+    fcntl.flock(other, fcntl.LOCK_EX)
+
+    pending = asyncio.create_task(cache.get("key"))
+    await asyncio.sleep(0.01)
+    assert not pending.done()
+
+    fcntl.flock(other, fcntl.LOCK_UN)
+    os.close(other)
+    assert await asyncio.wait_for(pending, 1) == {"value": 1}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_cache_gives_up_on_a_lock_held_too_long(tmp_path, monkeypatch):
+    """Test that a lock held past the timeout turns a read into a miss and skips the write."""
+    monkeypatch.setattr(mmap_cache, "LOCK_TIMEOUT_SECONDS", 0.02)
+    path = str(tmp_path / "cache.bin")
+    cache = MmapResultCache(path, max_bytes=4096, num_slots=64)
+    await cache.set("key", {"value": 1})
+    other = os.open(path, os.O_RDWR)
+    fcntl.flock(other, fcntl.LOCK_EX)
+
+    assert await asyncio.wait_for(cache.get("key"), 1) is None
+    await asyncio.wait_for(cache.set("other", {"value": 2}), 1)
+
+    fcntl.flock(other, fcntl.LOCK_UN)
+    os.close(other)
+    assert await cache.get("key") == {"value": 1}
+    assert await cache.get("other") is None
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_service_serves_repeated_requests_from_cache(tmp_path):
+    """Test that identical optimization requests skip the LLM on a cache hit."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized", finish_reason="stop"))
+    cache = MmapResultCache(str(tmp_path / "cache.bin"), max_bytes=65536, num_slots=64)
+    service = OptimizationService(mock_client, result_cache=cache)
+    request = OptimizationRequest(original_prompt="Write a function", target_vendor=VendorType.OPENAI)
+
+    first = await service.optimize_prompt(request)
+    second = await service.optimize_prompt(request)
+
+    mock_client.generate.assert_called_once()
+    assert second.optimized == first.optimized
+    assert second.metadata["cached"] is True
+    assert "cached" not in first.metadata
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_service_does_not_cache_truncated_results():
+    """Test that truncated generations are not cached."""
+    mock_client = AsyncMock()
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Cut", finish_reason="length"))
+    service = OptimizationService(mock_client, result_cache=InMemoryResultCache(max_bytes=65536))
+    request = OptimizationRequest(original_prompt="Write a function", target_vendor=VendorType.CLAUDE)
+
+    await service.optimize_prompt(request)
+    await service.optimize_prompt(request)
+
+    assert mock_client.generate.call_count == 2
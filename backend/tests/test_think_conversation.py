@@ -0,0 +1,114 @@
+"""Tests for Think Mode as one conversation with a shared, slot-pinned prefix."""
+import json
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+from src.application.services import OptimizationService
+from src.domain.affinity import affinity_var, pinned
+from src.domain.models import VendorType, OptimizationRequest, LLMCompletion, LLMCapabilities
+from src.infrastructure.llm import LlamaCppClient
+from src.tools.fake_llm_server import FakeLLMConfig, create_app
+
+
+class CapturingTransport(httpx.ASGITransport):
+    """Fake backend transport that keeps every request payload."""
+
+    def __init__(self):
+        super().__init__(app=create_app(FakeLLMConfig(ttft_ms=0, tokens_per_second=100000)))
+        self.payloads = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.payloads.append(json.loads(request.content))
+        return await super().handle_async_request(request)
+
+
+def fake_backend_client(slots=None) -> LlamaCppClient:
+    client = LlamaCppClient(transport=CapturingTransport())
+    client.base_url = "http://fake/v1"
+    client.slots = slots
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("json_questions", [False, True])
+async def test_final_step_extends_the_questions_conversation(json_questions):
+    """Test that the final step resends the questions step unchanged and appends new turns."""
+    mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities(streaming=False, json_schema=True)
+    mock_client.generate = AsyncMock(side_effect=[
+        LLMCompletion(content='{"questions": ["Level?", "Goal?", "Format?"]}' if json_questions
+                      else "1. Level?\n2. Goal?\n3. Format?"),
+        LLMCompletion(content="Optimized"),
+    ])
+    service = OptimizationService(mock_client, json_questions=json_questions)
+
+    asked = await service.generate_questions("explain physics", VendorType.CLAUDE, 3)
+    await service.optimize_with_answers(
+        "explain physics", VendorType.CLAUDE, ["Goal?"], ["Exams"], context="High school", asked=asked
+    )
+
+    first, second = [call.kwargs["messages"] for call in mock_client.generate.call_args_list]
+    assert second[:2] == first
+    assert [m["role"] for m in second] == ["system", "user", "assistant", "user"]
+    for question in asked:
+        assert question in second[2]["content"]
+    assert second[3]["content"].startswith("Clarifying Q&A:\nQ: Goal?\nA: Exams")
+    assert "Level?" not in second[3]["content"] and "High school" in second[3]["content"]
+
+
+@pytest.mark.asyncio
+async def test_final_step_keeps_the_requested_question_count():
+    """Test that the questions turn is unchanged when fewer questions were parsed than requested."""
+    mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities(streaming=False)
+    mock_client.generate = AsyncMock(side_effect=[
+        LLMCompletion(content="1. Level?\n2. Goal?\n3. Format?\n4. Depth?"),
+        LLMCompletion(content="Optimized"),
+        LLMCompletion(content="Optimized"),
+    ])
+    service = OptimizationService(mock_client)
+
+    asked = await service.generate_questions("explain physics", VendorType.CLAUDE, 5)
+    await service.optimize_with_answers(
+        "explain physics", VendorType.CLAUDE, asked, ["A"] * 4, num_questions=5
+    )
+    await service.optimize_with_answers(
+        "explain physics", VendorType.CLAUDE, asked[:1], ["A"], asked=asked, num_questions=5
+    )
+
+    generation, final, partial = [call.kwargs["messages"] for call in mock_client.generate.call_args_list]
+    assert len(asked) == 4
+    assert final[:2] == generation and partial[:2] == generation
+    assert "numbered 1-5" in final[1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_think_mode_steps_are_pinned_to_one_slot():
+    """Test that both Think Mode steps ask llama.cpp for the same slot."""
+    client = fake_backend_client(slots=4)
+    service = OptimizationService(client)
+
+    asked = await service.generate_questions("explain physics", VendorType.QWEN, 5)
+    await service.optimize_with_answers("explain physics", VendorType.QWEN, asked[:1], ["Beginner"], asked=asked)
+    await service.optimize_prompt(OptimizationRequest("explain physics", VendorType.QWEN))
+
+    questions, final, plain = client.transport.payloads
+    assert questions["cache_prompt"] is True and final["cache_prompt"] is True
+    assert questions["n_predict"] == questions["max_tokens"]
+    assert questions["id_slot"] == final["id_slot"] and 0 <= final["id_slot"] < 4
+    assert final["messages"][:2] == questions["messages"]
+    # Regular optimizations are not pinned, so best-of candidates can use every slot
+    assert "id_slot" not in plain
+    assert affinity_var.get() is None
+
+
+@pytest.mark.asyncio
+async def test_no_slot_hints_without_configured_slots():
+    """Test that no slot is requested when the server's slots are not configured."""
+    client = fake_backend_client()
+
+    with pinned("conversation"):
+        await client.generate(messages=[{"role": "user", "content": "hi"}])
+
+    assert "id_slot" not in client.transport.payloads[0]
+    assert affinity_var.get() is None
@@ -0,0 +1,173 @@
+"""Tests for the Think Mode WebSocket session."""
+import asyncio
+import threading
+import time
+import pytest
+from typing import AsyncIterator
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from src.api.main import app
+from src.api.disconnect import cancelled_requests
+from src.domain.interfaces import ILLMClient
+from src.domain.models import LLMCapabilities, LLMCompletion
+from src.infrastructure.config import settings
+
+QUESTIONS = ["1. What is your level?\n", "2. Which topics?\n", "3. How deep?\n", "4. Any format?\n", "5. Deadline?\n"]
+
+
+class ScriptedClient(ILLMClient):
+    """Streams questions (optionally pausing after some) and then the optimized prompt in chunks."""
+
+    def __init__(self, pause_after: int = None):
+        self.pause_after = pause_after
+        self.resume = threading.Event()
+        self.closed = threading.Event()
+        self.prompts = []
+
+    @property
+    def capabilities(self) -> LLMCapabilities:
+        return LLMCapabilities(streaming=True)
+
+    async def generate(self, messages, temperature=0.7, max_tokens=2048, response_format=None) -> LLMCompletion:
+        raise AssertionError("Think Mode sessions should stream")
+
+    async def stream(self, messages, temperature=0.7, max_tokens=2048, response_format=None) -> AsyncIterator[str]:
+        self.prompts.append(messages[-1]["content"])
+        try:
+            if max_tokens == 1024:
+                for i, question in enumerate(QUESTIONS):
+                    if i == self.pause_after:
+                        while not self.resume.is_set():
+                            await asyncio.sleep(0.01)
+                    yield question
+            else:
+                for chunk in ["Optimized ", "prompt ", "text"]:
+                    yield chunk
+        finally:
+            self.closed.set()
+
+    async def health_check(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def scripted():
+    def install(client: ScriptedClient) -> TestClient:
+        app.container.llm_client.override(client)
+        app.container.optimization_service.reset()
+        return TestClient(app)
+
+    yield install
+    app.container.llm_client.reset_last_overriding()
+    app.container.optimization_service.reset()
+
+
+def start(ws, num_questions: int = 5) -> None:
+    ws.send_json({"type": "start", "prompt": "explain linear algebra", "vendor": "claude", "num_questions": num_questions})
+
+
+def test_full_session_streams_questions_and_result(scripted):
+    """Test the whole conversation: pushed questions, answers (one revised), tokens, then the result."""
+    client = ScriptedClient()
+
+    with scripted(client).websocket_connect("/api/think/ws") as ws:
+        start(ws)
+        pushed = [ws.receive_json() for _ in range(6)]
+        ws.send_json({"type": "answer", "index": 0, "answer": "Novice"})
+        ws.send_json({"type": "answer", "index": 0, "answer": "Beginner"})
+        for i in range(1, 5):
+            ws.send_json({"type": "answer", "index": i, "answer": f"answer {i}"})
+        tokens = [ws.receive_json() for _ in range(3)]
+        result = ws.receive_json()
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+
+    assert pushed[0] == {"type": "question", "index": 0, "text": "What is your level?"}
+    assert pushed[5] == {"type": "questions_done", "total": 5}
+    assert "".join(token["text"] for token in tokens) == "Optimized prompt text"
+    assert result["type"] == "result"
+    assert result["optimized"] == "Optimized prompt text Respond in English."
+    assert result["vendor"] == "claude"
+    assert result["metadata"]["usage"]["ttft_ms"] is not None
+    assert "Q: What is your level?\nA: Beginner" in client.prompts[1]
+    assert closed.value.code == 1000
+
+
+def test_answers_before_generation_ends_and_finish_early(scripted):
+    """Test answering while questions are still generating, then finishing with a partial set."""
+    client = ScriptedClient(pause_after=2)
+
+    with scripted(client).websocket_connect("/api/think/ws") as ws:
+        start(ws)
+        first, second = ws.receive_json(), ws.receive_json()
+        ws.send_json({"type": "answer", "index": 1, "answer": "Vectors"})
+        ws.send_json({"type": "finish"})
+        tokens = [ws.receive_json() for _ in range(3)]
+        result = ws.receive_json()
+
+    assert (first["index"], second["index"]) == (0, 1)
+    assert tokens[0]["type"] == "token"
+    assert result["enhancement_notes"].endswith("Enhanced with 1 clarifying questions for precision.")
+    assert "Q: Which topics?\nA: Vectors" in client.prompts[1]
+    assert "What is your level?" not in client.prompts[1]
+    assert client.closed.is_set()
+
+
+def test_idle_session_is_closed(scripted, monkeypatch):
+    """Test the idle timeout while the server is waiting on the client."""
+    monkeypatch.setattr(settings, "think_ws_idle_timeout_seconds", 0.05)
+
+    with scripted(ScriptedClient()).websocket_connect("/api/think/ws") as ws:
+        error = ws.receive_json()
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+
+    assert error == {"type": "error", "detail": "Session idle timeout"}
+    assert closed.value.code == 4408
+
+
+@pytest.mark.parametrize("messages", [
+    [{"type": "start", "prompt": "explain", "vendor": "unknown", "num_questions": 5}],
+    [{"type": "start", "prompt": "explain", "vendor": "claude", "num_questions": 5}, {"type": "answer", "index": 7, "answer": "x"}],
+])
+def test_invalid_messages_close_the_session(scripted, messages):
+    """Test schema violations and answers to questions that were never sent."""
+    with scripted(ScriptedClient(pause_after=1)).websocket_connect("/api/think/ws") as ws:
+        for message in messages:
+            ws.send_json(message)
+        received = [ws.receive_json() for _ in range(len(messages))]
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+
+    assert received[-1]["type"] == "error"
+    assert closed.value.code == 1008
+
+
+def test_binary_frame_closes_the_session(scripted):
+    """Test that a binary frame ends the session at once instead of leaving it waiting."""
+    with scripted(ScriptedClient(pause_after=1)).websocket_connect("/api/think/ws") as ws:
+        start(ws)
+        ws.receive_json()
+        ws.send_bytes(b"\x00\x01")
+        error = ws.receive_json()
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+
+    assert error == {"type": "error", "detail": "Only JSON text frames are accepted"}
+    assert closed.value.code == 1003
+
+
+def test_disconnect_cancels_generation(scripted):
+    """Test that leaving mid-generation closes the upstream stream."""
+    client = ScriptedClient(pause_after=1)
+    before = cancelled_requests.value(endpoint="think_ws")
+
+    with scripted(client).websocket_connect("/api/think/ws") as ws:
+        start(ws)
+        ws.receive_json()
+
+    assert client.closed.wait(timeout=2)
+    deadline = time.monotonic() + 2
+    while cancelled_requests.value(endpoint="think_ws") == before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cancelled_requests.value(endpoint="think_ws") == before + 1
@@ -0,0 +1,107 @@
+"""Tests for local token accounting, /api/estimate and context window checks."""
+import pytest
+from unittest.mock import AsyncMock
+from src.api.main import app
+from src.application.services import OptimizationService, TokenEstimator
+from src.domain.exceptions import ContextWindowExceededException
+from src.domain.models import VendorType, OptimizationRequest, LLMCompletion, LLMCapabilities
+from src.domain.registries import VendorRegistry
+from src.infrastructure.tokenizers import ApproximateTokenizer, create_tokenizer
+
+
+def test_approximate_tokenizer_tracks_bpe_counts():
+    """Test that English words are about one token and other scripts cost more per character."""
+    tokenizer = ApproximateTokenizer()
+
+    assert tokenizer.count("") == 0
+    assert tokenizer.count("Hello, world!") == 4
+    assert 6 <= tokenizer.count("explain linear algebra fundamentals including vectors") <= 9
+    assert tokenizer.count("расскажи про физику") > tokenizer.count("tell me about physics")
+    assert tokenizer.count("2025") == 2
+    messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi"}]
+    assert tokenizer.count_messages(messages) == tokenizer.count("Be brief.") + tokenizer.count("Hi") + 11
+
+
+def test_create_tokenizer_falls_back_when_exact_tokenizer_is_unavailable(tmp_path):
+    """Test the spec parsing and the fallback for missing packages or files."""
+    assert create_tokenizer("approximate").name == "approximate"
+    fallback = create_tokenizer(f"huggingface:{tmp_path / 'missing' / 'tokenizer.json'}")
+    assert fallback.name == "approximate" and not fallback.exact
+    with pytest.raises(ValueError):
+        create_tokenizer("sentencepiece:model")
+
+
+def test_estimator_learns_from_observed_completions():
+    """Test output length and throughput predictions following observed completions."""
+    estimator = TokenEstimator(ApproximateTokenizer(), default_output_tokens=500, smoothing=0.5)
+    messages = [{"role": "user", "content": "explain physics"}]
+
+    first = estimator.estimate(messages, "optimize:claude", max_tokens=2048)
+    assert first.predicted_output_tokens == 500
+    assert first.estimated_latency_ms == pytest.approx(1000 * (first.input_tokens / 1000 + 500 / 30), abs=0.1)
+
+    estimator.observe("optimize:claude", first.input_tokens, LLMCompletion(
+        content="x", prompt_tokens=2000, completion_tokens=101, ttft_ms=500, wall_time_ms=2500
+    ))
+    estimator.observe("optimize:claude", first.input_tokens, LLMCompletion(
+        content="x", prompt_tokens=2000, completion_tokens=501, ttft_ms=1000, wall_time_ms=21000
+    ))
+    # The first observation replaces the defaults; later ones are averaged in
+    assert estimator.predicted_output_tokens("optimize:claude", 2048) == 301
+    assert estimator.prefill_tokens_per_second == pytest.approx(3000)
+    assert estimator.decode_tokens_per_second == pytest.approx(37.5)
+    # Other request kinds, truncated outputs and caps keep their own predictions
+    estimator.observe("optimize:claude", 10, LLMCompletion(content="x", completion_tokens=2048, finish_reason="length"))
+    assert estimator.predicted_output_tokens("optimize:claude", 2048) == 301
+    assert estimator.predicted_output_tokens("optimize:qwen", 2048) == 500
+    assert estimator.predicted_output_tokens("optimize:claude", 2048, max_length=400) == 100
+    assert estimator.estimate(messages, "optimize:qwen", 2048, candidates=3).total_output_tokens == 1500
+
+
+@pytest.mark.asyncio
+async def test_request_over_context_window_is_rejected_before_the_llm_call():
+    """Test that the service refuses a prompt that cannot fit instead of sending it."""
+    mock_client = AsyncMock()
+    mock_client.capabilities = LLMCapabilities(context_window=2048)
+    mock_client.generate = AsyncMock(return_value=LLMCompletion(content="Optimized", completion_tokens=40))
+    service = OptimizationService(mock_client, token_estimator=TokenEstimator(ApproximateTokenizer()))
+
+    with pytest.raises(ContextWindowExceededException):
+        await service.optimize_prompt(OptimizationRequest("word " * 3000, VendorType.OPENAI))
+    mock_client.generate.assert_not_called()
+
+    await service.optimize_prompt(OptimizationRequest("explain physics", VendorType.OPENAI))
+    assert service.token_estimator.predicted_output_tokens("optimize:openai", 2048) < 512
+
+
+@pytest.mark.asyncio
+async def test_estimate_endpoint_counts_the_exact_prompt(async_client):
+    """Test /api/estimate against the messages the service would send."""
+    service = app.container.optimization_service()
+    request = {"prompt": "explain linear algebra", "vendor": "claude", "best_of": 2}
+
+    response = await async_client.post("/api/estimate", json=request)
+
+    assert response.status_code == 200
+    data = response.json()
+    messages = service._optimization_messages(
+        OptimizationRequest("explain linear algebra", VendorType.CLAUDE, best_of=2),
+        VendorRegistry.get(VendorType.CLAUDE)
+    )
+    assert data["input_tokens"] == service.token_estimator.tokenizer.count_messages(messages)
+    assert data["total_output_tokens"] == 2 * data["predicted_output_tokens"]
+    assert data["tokenizer"] == "approximate" and data["fits_context"] is True
+    assert data["estimated_latency_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_endpoints_return_413_when_context_window_is_too_small(async_client):
+    """Test the HTTP mapping of context window rejections."""
+    app.container.llm_client().capabilities = LLMCapabilities(context_window=256)
+
+    optimize = await async_client.post("/api/optimize", json={"prompt": "explain physics", "vendor": "qwen"})
+    estimate = await async_client.post("/api/estimate", json={"prompt": "explain physics", "vendor": "qwen"})
+
+    assert optimize.status_code == 413
+    assert "context window" in optimize.json()["detail"]
+    assert estimate.status_code == 200 and estimate.json()["fits_context"] is False
@@ -0,0 +1,48 @@
+"""Python client for the Local LLM Prompt Optimizer API."""
+
+from .client import AsyncPromptOptimizer, PromptOptimizer
+from .errors import APIConnectionError, APIStatusError, DeadlineExceededError, PromptOptimizerError
+from .models import (
+    Vendor,
+    OptimizeRequest,
+    OptimizeResponse,
+    EstimateResponse,
+    GenerateQuestionsRequest,
+    GenerateQuestionsResponse,
+    OptimizeWithAnswersRequest,
+    RefineRequest,
+    ScoreRequest,
+    ScoreResponse,
+    PromptScore,
+    HistoryEntry,
+    HistoryPage,
+    HealthResponse
+)
+from .retry import RetryPolicy, NO_RETRY
+
+__version__ = "0.1.0"
+
+__all__ = [
+    "AsyncPromptOptimizer",
+    "PromptOptimizer",
+    "RetryPolicy",
+    "NO_RETRY",
+    "PromptOptimizerError",
+    "APIConnectionError",
+    "APIStatusError",
+    "DeadlineExceededError",
+    "Vendor",
+    "OptimizeRequest",
+    "OptimizeResponse",
+    "EstimateResponse",
+    "GenerateQuestionsRequest",
+    "GenerateQuestionsResponse",
+    "OptimizeWithAnswersRequest",
+    "RefineRequest",
+    "ScoreRequest",
+    "ScoreResponse",
+    "PromptScore",
+    "HistoryEntry",
+    "HistoryPage",
+    "HealthResponse"
+]
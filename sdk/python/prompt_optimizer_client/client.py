@@ -0,0 +1,358 @@
+"""Async client for the prompt optimizer API and its synchronous wrapper.
+
+One client keeps one pooled ``httpx.AsyncClient`` for its whole lifetime, so requests reuse
+connections instead of opening a new one each time. Create it once and share it::
+
+    async with AsyncPromptOptimizer("http://localhost:8000") as client:
+        result = await client.optimize("explain linear algebra", Vendor.CLAUDE)
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterator, Coroutine, Dict, Iterable, Iterator, List, Optional, TypeVar, Union
+
+import httpx
+
+from .errors import APIConnectionError, APIStatusError, DeadlineExceededError
+from .models import (
+    GenerateQuestionsRequest,
+    EstimateResponse,
+    GenerateQuestionsResponse,
+    HealthResponse,
+    HistoryEntry,
+    HistoryPage,
+    OptimizeRequest,
+    OptimizeResponse,
+    OptimizeWithAnswersRequest,
+    RefineRequest,
+    ScoreRequest,
+    ScoreResponse,
+    Vendor
+)
+from .retry import RetryPolicy, parse_retry_after
+
+T = TypeVar("T")
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+
+
+def _status_error(response: httpx.Response) -> APIStatusError:
+    try:
+        detail = response.json().get("detail", response.text)
+    except ValueError:
+        detail = response.text
+    error = DeadlineExceededError if response.status_code == 504 else APIStatusError
+    return error(response.status_code, str(detail), parse_retry_after(response.headers.get("Retry-After")))
+
+
+def _history_params(**filters: Any) -> Dict[str, Any]:
+    params = {}
+    for key, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, Vendor):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, bool):
+            value = str(value).lower()
+        params[key] = value
+    return params
+
+
+class AsyncPromptOptimizer:
+    """Pooled async client with retries honouring ``Retry-After``.
+
+    ``timeout`` also travels to the backend as ``X-Request-Timeout-Ms`` (minus a small
+    margin), so the server stops working on a request once the caller has stopped waiting.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 120.0,
+        max_connections: int = 20,
+        retry: Optional[RetryPolicy] = None,
+        headers: Optional[Dict[str, str]] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.retry = retry or RetryPolicy()
+        default_headers = {"X-Request-Timeout-Ms": str(int(max(timeout - 2, 1) * 1000))}
+        default_headers.update(headers or {})
+        self._http = http_client or httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            headers=default_headers,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    async def __aenter__(self) -> "AsyncPromptOptimizer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request, retrying transient failures; returns the decoded JSON body."""
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # The request never reached the server, so it is always safe to resend
+                delay = self.retry.delay(attempt)
+                if delay is None:
+                    raise APIConnectionError(str(e) or type(e).__name__) from e
+            except httpx.TransportError as e:
+                raise APIConnectionError(str(e) or type(e).__name__) from e
+            else:
+                if response.is_success:
+                    return response.json()
+                delay = self.retry.delay(attempt, response)
+                if delay is None:
+                    raise _status_error(response)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def optimize(
+        self,
+        prompt: Union[str, OptimizeRequest],
+        vendor: Optional[Vendor] = None,
+        context: Optional[str] = None,
+        max_length: Optional[int] = None,
+        best_of: int = 1
+    ) -> OptimizeResponse:
+        """Optimize a prompt for a vendor (``POST /api/optimize``)."""
+        request = prompt if isinstance(prompt, OptimizeRequest) else OptimizeRequest(
+            prompt=prompt, vendor=Vendor(vendor), context=context, max_length=max_length, best_of=best_of
+        )
+        return OptimizeResponse.from_json(await self._request("POST", "/api/optimize", json=request.to_json()))
+
+    async def estimate(
+        self,
+        prompt: Union[str, OptimizeRequest],
+        vendor: Optional[Vendor] = None,
+        context: Optional[str] = None,
+        max_length: Optional[int] = None,
+        best_of: int = 1
+    ) -> EstimateResponse:
+        """Token counts and latency ``optimize`` would incur, without an LLM call (``POST /api/estimate``)."""
+        request = prompt if isinstance(prompt, OptimizeRequest) else OptimizeRequest(
+            prompt=prompt, vendor=Vendor(vendor), context=context, max_length=max_length, best_of=best_of
+        )
+        return EstimateResponse.from_json(await self._request("POST", "/api/estimate", json=request.to_json()))
+
+    async def optimize_many(
+        self,
+        requests: Iterable[OptimizeRequest],
+        concurrency: int = 8,
+        return_exceptions: bool = False
+    ) -> List[Union[OptimizeResponse, Exception]]:
+        """Optimize several prompts concurrently over the shared pool; results keep the input order.
+
+        With ``return_exceptions`` a failed prompt yields its exception instead of failing the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(request: OptimizeRequest) -> OptimizeResponse:
+            async with semaphore:
+                return await self.optimize(request)
+
+        return await asyncio.gather(*(one(request) for request in requests), return_exceptions=return_exceptions)
+
+    async def generate_questions(self, prompt: str, vendor: Vendor, num_questions: int = 5) -> GenerateQuestionsResponse:
+        """Generate Think Mode clarifying questions."""
+        request = GenerateQuestionsRequest(prompt=prompt, vendor=Vendor(vendor), num_questions=num_questions)
+        return GenerateQuestionsResponse.from_json(
+            await self._request("POST", "/api/think/generate-questions", json=request.to_json())
+        )
+
+    async def optimize_with_answers(
+        self,
+        prompt: str,
+        vendor: Vendor,
+        questions: List[str],
+        answers: List[str],
+        context: Optional[str] = None,
+        asked: Optional[List[str]] = None,
+        num_questions: Optional[int] = None
+    ) -> OptimizeResponse:
+        """Optimize a prompt with answers to the clarifying questions (Think Mode).
+
+        Pass ``num_questions`` as requested from ``generate_questions``, and ``asked`` with every
+        question it returned when only some are answered, so the backend can reuse the cached
+        conversation prefix.
+        """
+        request = OptimizeWithAnswersRequest(
+            prompt=prompt, vendor=Vendor(vendor), questions=questions, answers=answers, context=context,
+            asked=asked, num_questions=num_questions
+        )
+        return OptimizeResponse.from_json(
+            await self._request("POST", "/api/think/optimize-with-answers", json=request.to_json())
+        )
+
+    async def refine(
+        self,
+        previous: Union[int, OptimizeResponse],
+        prompt: Optional[str] = None,
+        feedback: Optional[str] = None
+    ) -> OptimizeResponse:
+        """Revise an earlier result (its history id or the response itself) for an edited prompt and/or feedback."""
+        request = RefineRequest(prompt=prompt, feedback=feedback)
+        if isinstance(previous, OptimizeResponse):
+            request.previous = previous
+        else:
+            request.history_id = previous
+        return OptimizeResponse.from_json(await self._request("POST", "/api/refine", json=request.to_json()))
+
+    async def score(self, prompts: List[str], vendor: Vendor) -> ScoreResponse:
+        """Score prompts with the backend's local heuristic scorer (no LLM call)."""
+        request = ScoreRequest(prompts=prompts, vendor=Vendor(vendor))
+        return ScoreResponse.from_json(await self._request("POST", "/api/score", json=request.to_json()))
+
+    async def health(self) -> HealthResponse:
+        return HealthResponse.from_json(await self._request("GET", "/health"))
+
+    async def search_history(
+        self,
+        q: Optional[str] = None,
+        vendor: Optional[Vendor] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[int] = None,
+        limit: int = 20
+    ) -> HistoryPage:
+        """One page of stored optimizations, newest first."""
+        params = _history_params(q=q, vendor=vendor, since=since, until=until, cursor=cursor, limit=limit)
+        return HistoryPage.from_json(await self._request("GET", "/api/history", params=params))
+
+    async def iter_history(
+        self,
+        q: Optional[str] = None,
+        vendor: Optional[Vendor] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        page_size: int = 100
+    ) -> AsyncIterator[HistoryEntry]:
+        """Iterate over every matching entry, fetching pages lazily by keyset cursor."""
+        cursor = None
+        while True:
+            page = await self.search_history(q, vendor, since, until, cursor, page_size)
+            for entry in page.entries:
+                yield entry
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    async def reuse(self, entry_id: int) -> OptimizeResponse:
+        """Return a stored optimization without an LLM call."""
+        return OptimizeResponse.from_json(await self._request("POST", f"/api/history/{entry_id}/reuse"))
+
+    async def export_history(
+        self,
+        format: str = "jsonl",
+        gzip: bool = False,
+        q: Optional[str] = None,
+        vendor: Optional[Vendor] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a history export as raw bytes, as the server produces them.
+
+        Streams are not retried: a failure part-way through cannot be resumed transparently.
+        """
+        params = _history_params(format=format, gzip=gzip, q=q, vendor=vendor, since=since, until=until)
+        try:
+            async with self._http.stream("GET", "/api/history/export", params=params) as response:
+                if not response.is_success:
+                    await response.aread()
+                    raise _status_error(response)
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        except httpx.TransportError as e:
+            raise APIConnectionError(str(e) or type(e).__name__) from e
+
+
+class PromptOptimizer:
+    """Synchronous wrapper around ``AsyncPromptOptimizer``.
+
+    The async client runs on a private event loop in a background thread, so blocking code
+    gets the same pooled connections, retries and batching (``optimize_many`` still runs
+    concurrently). Safe to call from several threads.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, **kwargs: Any):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="prompt-optimizer-client", daemon=True)
+        self._thread.start()
+        self._client = AsyncPromptOptimizer(base_url, **kwargs)
+
+    def __enter__(self) -> "PromptOptimizer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _run(self, work: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(work, self._loop).result()
+
+    def _iterate(self, items: AsyncIterator[T]) -> Iterator[T]:
+        async def step() -> T:
+            return await items.__anext__()
+
+        try:
+            while True:
+                try:
+                    yield self._run(step())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(items.aclose())
+
+    def optimize(self, *args: Any, **kwargs: Any) -> OptimizeResponse:
+        return self._run(self._client.optimize(*args, **kwargs))
+
+    def estimate(self, *args: Any, **kwargs: Any) -> EstimateResponse:
+        return self._run(self._client.estimate(*args, **kwargs))
+
+    def optimize_many(self, *args: Any, **kwargs: Any) -> List[Union[OptimizeResponse, Exception]]:
+        return self._run(self._client.optimize_many(*args, **kwargs))
+
+    def generate_questions(self, *args: Any, **kwargs: Any) -> GenerateQuestionsResponse:
+        return self._run(self._client.generate_questions(*args, **kwargs))
+
+    def optimize_with_answers(self, *args: Any, **kwargs: Any) -> OptimizeResponse:
+        return self._run(self._client.optimize_with_answers(*args, **kwargs))
+
+    def refine(self, *args: Any, **kwargs: Any) -> OptimizeResponse:
+        return self._run(self._client.refine(*args, **kwargs))
+
+    def score(self, *args: Any, **kwargs: Any) -> ScoreResponse:
+        return self._run(self._client.score(*args, **kwargs))
+
+    def health(self) -> HealthResponse:
+        return self._run(self._client.health())
+
+    def search_history(self, *args: Any, **kwargs: Any) -> HistoryPage:
+        return self._run(self._client.search_history(*args, **kwargs))
+
+    def iter_history(self, *args: Any, **kwargs: Any) -> Iterator[HistoryEntry]:
+        return self._iterate(self._client.iter_history(*args, **kwargs))
+
+    def reuse(self, entry_id: int) -> OptimizeResponse:
+        return self._run(self._client.reuse(entry_id))
+
+    def export_history(self, *args: Any, **kwargs: Any) -> Iterator[bytes]:
+        return self._iterate(self._client.export_history(*args, **kwargs))
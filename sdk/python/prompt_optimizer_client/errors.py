@@ -0,0 +1,25 @@
+"""Exceptions raised by the client."""
+
+from typing import Optional
+
+
+class PromptOptimizerError(Exception):
+    """Base class for client errors."""
+
+
+class APIConnectionError(PromptOptimizerError):
+    """The API could not be reached (connection refused, reset, or timed out)."""
+
+
+class APIStatusError(PromptOptimizerError):
+    """The API answered with an error status."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(APIStatusError):
+    """The backend gave up because the request deadline passed (HTTP 504)."""
@@ -0,0 +1,213 @@
+"""Typed request and response models mirroring the backend's ``api/schemas``."""
+
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+
+class Vendor(str, Enum):
+    """Target LLM vendors."""
+    OPENAI = "openai"
+    CLAUDE = "claude"
+    GROK = "grok"
+    GEMINI = "gemini"
+    QWEN = "qwen"
+    DEEPSEEK = "deepseek"
+
+
+def _payload(model) -> Dict[str, Any]:
+    """JSON body for a request model, leaving out unset optional fields."""
+    return {
+        key: value.value if isinstance(value, Enum) else value
+        for key, value in asdict(model).items()
+        if value is not None
+    }
+
+
+@dataclass
+class OptimizeRequest:
+    prompt: str
+    vendor: Vendor
+    context: Optional[str] = None
+    max_length: Optional[int] = None
+    best_of: int = 1
+
+    def to_json(self) -> Dict[str, Any]:
+        return _payload(self)
+
+
+@dataclass
+class GenerateQuestionsRequest:
+    prompt: str
+    vendor: Vendor
+    num_questions: int
+
+    def to_json(self) -> Dict[str, Any]:
+        return _payload(self)
+
+
+@dataclass
+class OptimizeWithAnswersRequest:
+    prompt: str
+    vendor: Vendor
+    questions: List[str]
+    answers: List[str]
+    context: Optional[str] = None
+    asked: Optional[List[str]] = None
+    num_questions: Optional[int] = None
+
+    def to_json(self) -> Dict[str, Any]:
+        return _payload(self)
+
+
+@dataclass
+class ScoreRequest:
+    prompts: List[str]
+    vendor: Vendor
+
+    def to_json(self) -> Dict[str, Any]:
+        return _payload(self)
+
+
+@dataclass
+class OptimizeResponse:
+    original: str
+    optimized: str
+    vendor: Vendor
+    enhancement_notes: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "OptimizeResponse":
+        return cls(
+            original=data["original"],
+            optimized=data["optimized"],
+            vendor=Vendor(data["vendor"]),
+            enhancement_notes=data["enhancement_notes"],
+            metadata=data.get("metadata") or {}
+        )
+
+
+@dataclass
+class RefineRequest:
+    """Refinement of an earlier result, given by ``history_id`` or passed back as ``previous``."""
+    history_id: Optional[int] = None
+    previous: Optional[OptimizeResponse] = None
+    prompt: Optional[str] = None
+    feedback: Optional[str] = None
+
+    def to_json(self) -> Dict[str, Any]:
+        payload = _payload(replace(self, previous=None))
+        if self.previous is not None:
+            payload["previous"] = {
+                "original": self.previous.original,
+                "optimized": self.previous.optimized,
+                "vendor": Vendor(self.previous.vendor).value
+            }
+            if self.previous.metadata.get("history_id") is not None:
+                payload["previous"]["history_id"] = self.previous.metadata["history_id"]
+        return payload
+
+
+@dataclass
+class GenerateQuestionsResponse:
+    questions: List[str]
+    total: int
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "GenerateQuestionsResponse":
+        return cls(questions=list(data["questions"]), total=data["total"])
+
+
+@dataclass
+class PromptScore:
+    clarity: float
+    specificity: float
+    structure: float
+    vendor_compliance: float
+    overall: float
+
+
+@dataclass
+class ScoreResponse:
+    vendor: Vendor
+    scores: List[PromptScore]
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ScoreResponse":
+        return cls(vendor=Vendor(data["vendor"]), scores=[PromptScore(**score) for score in data["scores"]])
+
+
+@dataclass
+class EstimateResponse:
+    vendor: Vendor
+    input_tokens: int
+    predicted_output_tokens: int
+    total_output_tokens: int
+    estimated_latency_ms: float
+    context_window: Optional[int]
+    fits_context: bool
+    tokenizer: str
+    exact: bool
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "EstimateResponse":
+        fields = {key: data.get(key) for key in cls.__dataclass_fields__ if key != "vendor"}
+        return cls(vendor=Vendor(data["vendor"]), **fields)
+
+
+@dataclass
+class HistoryEntry:
+    id: int
+    created_at: datetime
+    mode: str
+    original: str
+    optimized: str
+    vendor: Vendor
+    enhancement_notes: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    parent_id: Optional[int] = None
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "HistoryEntry":
+        return cls(
+            id=data["id"],
+            # fromisoformat only accepts a trailing "Z" from Python 3.11
+            created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")),
+            mode=data["mode"],
+            original=data["original"],
+            optimized=data["optimized"],
+            vendor=Vendor(data["vendor"]),
+            enhancement_notes=data["enhancement_notes"],
+            metadata=data.get("metadata") or {},
+            parent_id=data.get("parent_id")
+        )
+
+
+@dataclass
+class HistoryPage:
+    entries: List[HistoryEntry]
+    next_cursor: Optional[int] = None
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "HistoryPage":
+        return cls(
+            entries=[HistoryEntry.from_json(entry) for entry in data["entries"]],
+            next_cursor=data.get("next_cursor")
+        )
+
+
+@dataclass
+class HealthResponse:
+    status: str
+    lm_studio_available: bool
+    vendor_adapters: int
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "HealthResponse":
+        return cls(
+            status=data["status"],
+            lm_studio_available=data["lm_studio_available"],
+            vendor_adapters=data["vendor_adapters"]
+        )
@@ -0,0 +1,57 @@
+"""Retry policy for transient API failures."""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+import httpx
+
+# 504 is not retried: the backend only returns it once the request's own deadline has passed
+RETRY_STATUSES = frozenset({429, 502, 503})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff for connection failures and overload responses.
+
+    A ``Retry-After`` header from the server takes precedence over the computed backoff,
+    capped at ``max_backoff``.
+    """
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    statuses: FrozenSet[int] = RETRY_STATUSES
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Seconds to wait before retry number ``attempt + 1``, or ``None`` to give up.
+
+        ``response`` is the failed response; ``None`` means the connection itself failed.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if response is not None:
+            if response.status_code not in self.statuses:
+                return None
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
@@ -0,0 +1,255 @@
+"""Tests for the prompt optimizer client."""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from prompt_optimizer_client import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncPromptOptimizer,
+    DeadlineExceededError,
+    NO_RETRY,
+    OptimizeRequest,
+    PromptOptimizer,
+    RetryPolicy,
+    Vendor
+)
+from prompt_optimizer_client.retry import parse_retry_after
+
+FAST_RETRY = RetryPolicy(max_retries=3, backoff=0)
+
+
+def optimize_body(request: httpx.Request) -> dict:
+    payload = json.loads(request.content)
+    return {
+        "original": payload["prompt"],
+        "optimized": f"Optimized: {payload['prompt']}",
+        "vendor": payload["vendor"],
+        "enhancement_notes": "notes",
+        "metadata": {"usage": {"completion_tokens": 3}}
+    }
+
+
+def client_for(handler, retry: RetryPolicy = FAST_RETRY, **kwargs) -> AsyncPromptOptimizer:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://api")
+    return AsyncPromptOptimizer(retry=retry, http_client=http, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_optimize_sends_typed_request_and_parses_response():
+    """Test the request body (unset optional fields omitted) and the typed response."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json=optimize_body(request))
+
+    async with client_for(handler) as client:
+        result = await client.optimize("explain physics", Vendor.CLAUDE, context="for kids")
+
+    assert seen == [{"prompt": "explain physics", "vendor": "claude", "context": "for kids", "best_of": 1}]
+    assert result.optimized == "Optimized: explain physics"
+    assert result.vendor is Vendor.CLAUDE
+    assert result.metadata["usage"]["completion_tokens"] == 3
+
+
+@pytest.mark.asyncio
+async def test_estimate_parses_token_accounting():
+    """Test the pre-flight estimate call."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/estimate"
+        return httpx.Response(200, json={
+            "vendor": "qwen", "input_tokens": 600, "predicted_output_tokens": 150, "total_output_tokens": 300,
+            "estimated_latency_ms": 5600.0, "context_window": 8192, "fits_context": True,
+            "tokenizer": "approximate", "exact": False
+        })
+
+    async with client_for(handler) as client:
+        estimate = await client.estimate("explain physics", Vendor.QWEN, best_of=2)
+
+    assert estimate.vendor is Vendor.QWEN
+    assert estimate.input_tokens == 600 and estimate.total_output_tokens == 300 and estimate.fits_context
+
+
+@pytest.mark.asyncio
+async def test_retries_honour_retry_after(monkeypatch):
+    """Test that overload responses are retried after the server-advised delay."""
+    responses = [
+        httpx.Response(503, headers={"Retry-After": "2"}, json={"detail": "busy"}),
+        httpx.Response(429, json={"detail": "slow down"}),
+    ]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0) if responses else httpx.Response(200, json=optimize_body(request))
+
+    async with client_for(handler, retry=RetryPolicy(backoff=0.5)) as client:
+        result = await client.optimize("a", "qwen")
+
+    assert result.vendor is Vendor.QWEN
+    assert sleeps == [2.0, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_typed_and_not_retried_when_permanent():
+    """Test client errors, deadline errors and exhausted retries."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/api/score":
+            return httpx.Response(400, json={"detail": "Unsupported vendor"})
+        if request.url.path == "/api/optimize":
+            return httpx.Response(504, json={"detail": "Request deadline exceeded for optimize"})
+        return httpx.Response(503, text="overloaded")
+
+    async with client_for(handler) as client:
+        with pytest.raises(APIStatusError) as bad_request:
+            await client.score(["x"], Vendor.GROK)
+        with pytest.raises(DeadlineExceededError):
+            await client.optimize("x", Vendor.GROK)
+        with pytest.raises(APIStatusError) as overloaded:
+            await client.health()
+
+    assert bad_request.value.status_code == 400 and bad_request.value.detail == "Unsupported vendor"
+    assert overloaded.value.detail == "overloaded"
+    assert calls.count("/api/score") == 1 and calls.count("/api/optimize") == 1
+    assert calls.count("/health") == 4
+
+
+@pytest.mark.asyncio
+async def test_connection_failures_are_retried_then_raised():
+    """Test that requests which never reached the server are resent."""
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200, json={"status": "healthy", "lm_studio_available": True, "vendor_adapters": 6})
+
+    async with client_for(handler) as client:
+        health = await client.health()
+    async with client_for(lambda request: (_ for _ in ()).throw(httpx.ConnectError("down")), NO_RETRY) as client:
+        with pytest.raises(APIConnectionError):
+            await client.health()
+
+    assert health.vendor_adapters == 6 and len(attempts) == 3
+
+
+@pytest.mark.asyncio
+async def test_optimize_many_keeps_order_and_bounds_concurrency():
+    """Test the batch helper over one shared client."""
+    in_flight = []
+    peak = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        if b"broken" in request.content:
+            return httpx.Response(400, json={"detail": "bad prompt"})
+        return httpx.Response(200, json=optimize_body(request))
+
+    requests = [OptimizeRequest(f"prompt {i}", Vendor.GEMINI) for i in range(5)]
+    requests.insert(2, OptimizeRequest("broken", Vendor.GEMINI))
+    async with client_for(handler) as client:
+        results = await client.optimize_many(requests, concurrency=2, return_exceptions=True)
+
+    assert max(peak) == 2
+    assert [r.original for r in results if not isinstance(r, Exception)] == [f"prompt {i}" for i in range(5)]
+    assert isinstance(results[2], APIStatusError)
+
+
+@pytest.mark.asyncio
+async def test_history_iteration_and_export_stream():
+    """Test lazy keyset pagination and the streamed export."""
+    def entry(entry_id: int) -> dict:
+        return {
+            "id": entry_id, "created_at": "2026-01-05T10:00:00Z", "mode": "optimize", "original": "o",
+            "optimized": "p", "vendor": "openai", "enhancement_notes": "n", "metadata": {}
+        }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/history/export":
+            assert request.url.params["gzip"] == "true"
+            return httpx.Response(200, content=b'{"id": 1}\n{"id": 2}\n')
+        cursor = request.url.params.get("cursor")
+        if cursor is None:
+            return httpx.Response(200, json={"entries": [entry(3), entry(2)], "next_cursor": 2})
+        return httpx.Response(200, json={"entries": [entry(1)], "next_cursor": None})
+
+    async with client_for(handler) as client:
+        ids = [item.id async for item in client.iter_history(vendor=Vendor.OPENAI, page_size=2)]
+        exported = b"".join([chunk async for chunk in client.export_history(gzip=True)])
+        first = await client.search_history(since=datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    assert ids == [3, 2, 1]
+    assert exported.splitlines() == [b'{"id": 1}', b'{"id": 2}']
+    assert first.entries[0].created_at == datetime(2026, 1, 5, 10, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_refine_sends_history_id_or_previous_result():
+    """Test both ways of naming the result to refine."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        seen.append(payload)
+        previous = payload.get("previous") or {"original": "o", "vendor": "qwen"}
+        return httpx.Response(200, json={
+            "original": payload.get("prompt", previous["original"]), "optimized": "Revised",
+            "vendor": previous["vendor"], "enhancement_notes": "n",
+            "metadata": {"refinement": {"parent_id": 7}, "history_id": 8}
+        })
+
+    async with client_for(handler) as client:
+        by_id = await client.refine(7, prompt="explain quantum physics")
+        passed_back = await client.refine(by_id, feedback="Shorter")
+
+    assert seen[0] == {"history_id": 7, "prompt": "explain quantum physics"}
+    assert seen[1] == {
+        "previous": {"original": "explain quantum physics", "optimized": "Revised", "vendor": "qwen", "history_id": 8},
+        "feedback": "Shorter"
+    }
+    assert passed_back.metadata["refinement"]["parent_id"] == 7
+
+
+def test_sync_wrapper_shares_the_pooled_client():
+    """Test the blocking API, including batching and iterators, on the background loop."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/history":
+            return httpx.Response(200, json={"entries": [], "next_cursor": None})
+        return httpx.Response(200, json=optimize_body(request))
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://api")
+    with PromptOptimizer(http_client=http) as client:
+        single = client.optimize("hello", Vendor.DEEPSEEK)
+        batch = client.optimize_many([OptimizeRequest("a", Vendor.OPENAI), OptimizeRequest("b", Vendor.OPENAI)])
+        history = list(client.iter_history())
+
+    assert single.optimized == "Optimized: hello"
+    assert [result.original for result in batch] == ["a", "b"]
+    assert history == []
+    assert http.is_closed
+
+
+def test_timeout_is_sent_as_request_deadline_and_retry_after_dates_parse():
+    """Test the deadline header default and HTTP-date Retry-After values."""
+    client = AsyncPromptOptimizer(timeout=30)
+    in_ten_seconds = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+
+    assert client._http.headers["X-Request-Timeout-Ms"] == "28000"
+    assert 8 <= parse_retry_after(in_ten_seconds) <= 10
+    assert parse_retry_after("soon") is None
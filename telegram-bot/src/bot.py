@@ -1,6 +1,8 @@
 import os
+import atexit
 import logging
-import httpx
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from io import BytesIO
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -13,17 +15,25 @@ from telegram.ext import (
     filters
 )
 from dotenv import load_dotenv
+from prompt_optimizer_client import AsyncPromptOptimizer, OptimizeResponse, PromptOptimizerError
 
 load_dotenv()
 
 # API Configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://backend:8000")
-
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+API_TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", "120"))
+# One pooled client for the whole bot; it also sends our timeout budget as X-Request-Timeout-Ms
+# so the backend gives up slightly before we do
+api = AsyncPromptOptimizer(API_BASE_URL, timeout=API_TIMEOUT_SECONDS)
+
+# Configure logging: handlers only enqueue records, a background thread writes them
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(handlers=[QueueHandler(_log_queue)], level=os.getenv("LOG_LEVEL", "INFO"))
+_log_listener = QueueListener(_log_queue, _log_output)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -172,41 +182,33 @@ async def vendor_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     try:
         # Call API to optimize
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{API_BASE_URL}/api/optimize",
-                json={
-                    "prompt": prompt,
-                    "vendor": vendor_str
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
+        result = await api.optimize(prompt, vendor_str)
+        vendor = result.vendor.value
 
         # Create clean prompt file - just the prompt, nothing else
-        file_content = result['optimized']
+        file_content = result.optimized
 
         # Send as file
         file_buffer = BytesIO(file_content.encode('utf-8'))
-        file_buffer.name = f"optimized_prompt_{result['vendor']}.txt"
+        file_buffer.name = f"optimized_prompt_{vendor}.txt"
 
         # Send info message with recommendations
         info_message = f"""✅ <b>Optimization Complete!</b>
 
-<b>Vendor:</b> {result['vendor'].upper()}
-<b>Format:</b> {result['metadata'].get('format', 'N/A')}
-<b>Recommended Model:</b> {result['metadata'].get('model_recommendation', 'N/A')}
-<b>Temperature:</b> {result['metadata'].get('temperature_recommendation', 'N/A')}
+<b>Vendor:</b> {vendor.upper()}
+<b>Format:</b> {result.metadata.get('format', 'N/A')}
+<b>Recommended Model:</b> {result.metadata.get('model_recommendation', 'N/A')}
+<b>Temperature:</b> {result.metadata.get('temperature_recommendation', 'N/A')}
 
 <b>Enhancement Notes:</b>
-{result['enhancement_notes']}
+{result.enhancement_notes}
 
 📎 Clean prompt attached - ready to copy & paste!"""
 
         await query.message.reply_text(info_message, parse_mode='HTML')
         await query.message.reply_document(
             document=file_buffer,
-            filename=f"optimized_prompt_{result['vendor']}.txt"
+            filename=f"optimized_prompt_{vendor}.txt"
         )
 
         # Send credits as separate message
@@ -217,7 +219,7 @@ async def vendor_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         await query.message.reply_text(credits, parse_mode='HTML', disable_web_page_preview=True)
 
-    except httpx.HTTPError as e:
+    except PromptOptimizerError as e:
         logger.error(f"API error: {e}", exc_info=True)
         await query.message.reply_text(
             f"❌ Optimization failed: API error\\n\\nPlease check if backend service is running."
@@ -298,20 +300,11 @@ async def think_num_questions(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     try:
         # Call API to generate questions
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{API_BASE_URL}/api/think/generate-questions",
-                json={
-                    "prompt": prompt,
-                    "vendor": vendor,
-                    "num_questions": num_questions
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
+        result = await api.generate_questions(prompt, vendor, num_questions)
 
         # Store questions and initialize answers
-        context.user_data['questions'] = result['questions']
+        context.user_data['questions'] = result.questions
+        context.user_data['num_questions'] = num_questions
         context.user_data['answers'] = []
         context.user_data['current_question_index'] = 0
 
@@ -375,28 +368,18 @@ async def finalize_think_mode(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
     try:
-        # Debug logging
-        logger.info(f"Think Mode finalize - Questions: {len(questions) if questions else 0}, Answers: {len(answers) if answers else 0}")
-        logger.info(f"Questions: {questions}")
-        logger.info(f"Answers: {answers}")
+        logger.info(
+            "Think Mode finalize - Questions: %d, Answers: %d",
+            len(questions) if questions else 0, len(answers) if answers else 0
+        )
+        # Contents are user data; only written when explicitly debugging
+        logger.debug("Questions: %s", questions)
+        logger.debug("Answers: %s", answers)
 
         # Call API to optimize with answers
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{API_BASE_URL}/api/think/optimize-with-answers",
-                json={
-                    "prompt": prompt,
-                    "vendor": vendor,
-                    "questions": questions,
-                    "answers": answers
-                }
-            )
-
-            if not response.is_success:
-                logger.error(f"API error response: {response.text}")
-
-            response.raise_for_status()
-            result = response.json()
+        result = await api.optimize_with_answers(
+            prompt, vendor, questions, answers, num_questions=context.user_data.get('num_questions')
+        )
 
         # Delete processing message
         await processing_msg.delete()
@@ -411,30 +394,32 @@ async def finalize_think_mode(update: Update, context: ContextTypes.DEFAULT_TYPE
     return ConversationHandler.END
 
 
-async def send_optimized_prompt(update: Update, result: dict):
+async def send_optimized_prompt(update: Update, result: OptimizeResponse):
     """Send the optimized prompt to the user."""
+    vendor = result.vendor.value
+
     # Create clean prompt file
-    file_content = result['optimized']
+    file_content = result.optimized
     file_buffer = BytesIO(file_content.encode('utf-8'))
-    file_buffer.name = f"optimized_prompt_{result['vendor']}.txt"
+    file_buffer.name = f"optimized_prompt_{vendor}.txt"
 
     # Send info message
     info_message = f"""✅ <b>Optimization Complete!</b>
 
-<b>Vendor:</b> {result['vendor'].upper()}
-<b>Format:</b> {result['metadata'].get('format', 'N/A')}
-<b>Recommended Model:</b> {result['metadata'].get('model_recommendation', 'N/A')}
-<b>Temperature:</b> {result['metadata'].get('temperature_recommendation', 'N/A')}
+<b>Vendor:</b> {vendor.upper()}
+<b>Format:</b> {result.metadata.get('format', 'N/A')}
+<b>Recommended Model:</b> {result.metadata.get('model_recommendation', 'N/A')}
+<b>Temperature:</b> {result.metadata.get('temperature_recommendation', 'N/A')}
 
 <b>Enhancement Notes:</b>
-{result['enhancement_notes']}
+{result.enhancement_notes}
 
 📎 Clean prompt attached - ready to copy & paste!"""
 
     await update.effective_message.reply_text(info_message, parse_mode='HTML')
     await update.effective_message.reply_document(
         document=file_buffer,
-        filename=f"optimized_prompt_{result['vendor']}.txt"
+        filename=f"optimized_prompt_{vendor}.txt"
     )
 
     # Send credits
@@ -452,6 +437,11 @@ async def cancel_think_mode(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return ConversationHandler.END
 
 
+async def close_api_client(application: Application):
+    """Close the pooled API client when the bot shuts down."""
+    await api.aclose()
+
+
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle errors."""
     logger.error(f"Update {update} caused error {context.error}", exc_info=context.error)
@@ -464,7 +454,7 @@ def main():
         return
 
     # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = Application.builder().token(BOT_TOKEN).post_shutdown(close_api_client).build()
 
     # Think Mode conversation handler
     think_mode_conversation = ConversationHandler(